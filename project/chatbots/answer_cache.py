@@ -0,0 +1,245 @@
+# chatbots/answer_cache.py
+"""
+챗봇 답변 캐시와 같은 질문 동시 요청 합치기(singleflight).
+
+같은 강의 PDF 에 여러 학생이 같은 질문을 하는 경우가 많아, 프롬프트가 같으면 Upstage 를 다시 부르지 않는다.
+- 키: (문서 내용, 모델, 정규화한 질문, 정규화한 시스템 프롬프트) 의 SHA-256.
+  문서 내용은 파일의 sha256(ContentBlob) 이라 학생마다 따로 올린 같은 파일끼리 답변을 공유한다.
+  (해시 기반 중복 제거 이전에 올라온 문서는 blob 이 없어 문서 id + version 을 쓴다)
+  답변이 달라질 수 있는 나머지 입력(제목, 참고 자료 — 하이라이트/선택한 글/OCR 발췌, chatbots/context.py)은
+  모두 시스템 프롬프트에 들어 있으므로, 그것들이 바뀌면 키도 바뀌어 예전 답변은 쓰이지 않는다.
+- 저장: settings.CHAT_ANSWER_CACHE 의 backend (pdf_documents/response_cache.py 와 같은 LocMemLRUBackend /
+  DjangoCacheBackend, CHAT_ANSWER_CACHE_TTL 초). DjangoCacheBackend 를 쓰면 여러 프로세스가 답변을 같이 쓴다.
+- 합치기: 같은 키의 요청이 진행 중이면 새로 부르지 않고 그 결과를 기다린다. (프로세스 안에서만)
+  sync 뷰(스레드)는 threading.Event, async 뷰는 같은 이벤트 루프의 Future 로 기다린다.
+  실패한 결과는 저장하지 않고 기다리던 요청에도 같은 예외를 돌려준다.
+- async 뷰는 aget / aset / aget_or_call 을 쓴다. backend 호출(공유 캐시면 네트워크 I/O)은 sync_to_async 로
+  스레드에서 실행해 이벤트 루프를 막지 않는다. (Django 의 async 캐시 API 와 같은 방식)
+- 지표: hit / miss / coalesced 횟수, hit_rate, 아낀 upstream 시간(saved_upstream_ms) — 프로세스별.
+  항목 수 / 제거 / 만료 횟수는 backend 의 stats() 를 따른다.
+"""
+import asyncio
+import hashlib
+import json
+import re
+import threading
+import time
+import unicodedata
+import weakref
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+
+from pdf_documents.response_cache import make_backend
+
+HIT = "hit"
+MISS = "miss"
+COALESCED = "coalesced"
+
+_SPACES = re.compile(r"\s+")
+_TRAILING = re.compile(r"[\s?!.。？！]+$")
+
+
+def normalize_question(text):
+    """공백, 전각/반각, 대소문자, 끝의 물음표/마침표 차이를 무시한다."""
+    text = unicodedata.normalize("NFKC", text or "").casefold()
+    return _TRAILING.sub("", _SPACES.sub(" ", text).strip())
+
+
+def document_identity(pdf):
+    """
+    답변 키에 쓰는 문서 내용 식별자. pdf.blob 을 읽으므로 select_related("blob") 로 조회해 둔다.
+    (async 뷰에서는 지연 로딩을 할 수 없음)
+    """
+    if pdf.blob_id is not None:
+        return ["blob", pdf.blob.sha256]
+    return ["pdf", pdf.id, pdf.version]
+
+
+def answer_key(pdf, model, messages):
+    system = next((m["content"] for m in messages if m["role"] == "system"), "")
+    question = next((m["content"] for m in reversed(messages) if m["role"] == "user"), "")
+    raw = json.dumps(
+        [document_identity(pdf), model, normalize_question(question), _SPACES.sub(" ", system).strip()],
+        ensure_ascii=False,
+    )
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+class _Call:
+    """진행 중인 upstream 호출 하나 (sync 합치기용)"""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.reply = None
+        self.error = None
+        self.upstream_ms = 0.0
+
+
+class AnswerCache:
+    def __init__(self, backend, ttl=3600, coalesce_timeout=120):
+        self.backend = backend
+        self.ttl = ttl
+        self.coalesce_timeout = coalesce_timeout
+        self._lock = threading.Lock()
+        self._calls = {}            # key → _Call
+        self._async_calls = weakref.WeakKeyDictionary()  # 이벤트 루프 → {key: Future}
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.saved_upstream_ms = 0.0
+
+    # --- 저장소 ---
+    # backend 는 bytes 를 저장하므로 (답변, upstream_ms) 를 JSON 으로 넣는다.
+    # 공유 캐시 호출이 있을 수 있으므로 self._lock 밖에서 부른다.
+
+    def _lookup(self, key):
+        body = self.backend.get(key)
+        if body is None:
+            return None
+        reply, upstream_ms = json.loads(body)
+        with self._lock:
+            self.hits += 1
+            self.saved_upstream_ms += upstream_ms
+        return reply
+
+    def get(self, key):
+        return self._lookup(key)
+
+    def set(self, key, reply, upstream_ms):
+        body = json.dumps([reply, upstream_ms], ensure_ascii=False).encode("utf-8")
+        self.backend.set(key, body, timeout=self.ttl)
+
+    async def aget(self, key):
+        return await sync_to_async(self._lookup)(key)
+
+    async def aset(self, key, reply, upstream_ms):
+        await sync_to_async(self.set)(key, reply, upstream_ms)
+
+    # --- sync 뷰 ---
+
+    def get_or_call(self, key, call):
+        """
+        캐시에 있으면 그 답변, 같은 키 호출이 진행 중이면 그 결과, 아니면 call() 결과를 저장해서 반환한다.
+        (답변, HIT / COALESCED / MISS)
+        """
+        reply = self._lookup(key)
+        if reply is not None:
+            return reply, HIT
+        with self._lock:
+            pending = self._calls.get(key)
+            if pending is None:
+                pending = self._calls[key] = _Call()
+                leader = True
+            else:
+                leader = False
+
+        if not leader:
+            if pending.done.wait(self.coalesce_timeout):
+                if pending.error is not None:
+                    raise pending.error
+                with self._lock:
+                    self.coalesced += 1
+                    self.saved_upstream_ms += pending.upstream_ms
+                return pending.reply, COALESCED
+            # 먼저 간 요청이 너무 오래 걸리면 직접 부른다
+            return self._call_and_store(key, call), MISS
+
+        try:
+            pending.reply = self._call_and_store(key, call, pending)
+            return pending.reply, MISS
+        except Exception as e:
+            pending.error = e
+            raise
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+            pending.done.set()
+
+    def _call_and_store(self, key, call, pending=None):
+        with self._lock:
+            self.misses += 1
+        started = time.perf_counter()
+        reply = call()
+        upstream_ms = (time.perf_counter() - started) * 1000
+        if pending is not None:
+            pending.upstream_ms = upstream_ms
+        self.set(key, reply, upstream_ms)
+        return reply
+
+    # --- async 뷰 ---
+
+    async def aget_or_call(self, key, acall):
+        """get_or_call 의 async 버전 (acall 은 답변을 반환하는 코루틴 함수)"""
+        reply = await self.aget(key)
+        if reply is not None:
+            return reply, HIT
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            calls = self._async_calls.setdefault(loop, {})
+            future = calls.get(key)
+            if future is None:
+                future = calls[key] = loop.create_future()
+                self.misses += 1
+                leader = True
+            else:
+                leader = False
+
+        if not leader:
+            # 먼저 간 요청이 취소돼도 기다리던 요청은 취소되지 않도록 shield
+            reply, upstream_ms = await asyncio.shield(future)
+            with self._lock:
+                self.coalesced += 1
+                self.saved_upstream_ms += upstream_ms
+            return reply, COALESCED
+
+        try:
+            started = time.perf_counter()
+            reply = await acall()
+            upstream_ms = (time.perf_counter() - started) * 1000
+            await self.aset(key, reply, upstream_ms)
+            future.set_result((reply, upstream_ms))
+            return reply, MISS
+        except BaseException as e:
+            future.set_exception(e if isinstance(e, Exception) else RuntimeError("upstream call cancelled"))
+            # 기다리는 요청이 없으면 '예외를 꺼내지 않았다'는 경고가 나지 않도록
+            future.exception()
+            raise
+        finally:
+            with self._lock:
+                calls.pop(key, None)
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses + self.coalesced
+            data = {
+                "hits": self.hits,
+                "misses": self.misses,
+                "coalesced": self.coalesced,
+                "hit_rate": round((self.hits + self.coalesced) / lookups, 4) if lookups else None,
+                "saved_upstream_ms": round(self.saved_upstream_ms, 2),
+            }
+        backend_stats = self.backend.stats()
+        data.update({name: backend_stats.get(name) for name in ("entries", "evictions", "expired")})
+        data["backend"] = type(self.backend).__name__
+        return data
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_answer_cache():
+    """settings 로 만든 프로세스 공용 답변 캐시 (CHAT_ANSWER_CACHE_ENABLED 가 False 면 None)"""
+    global _cache
+    if not settings.CHAT_ANSWER_CACHE_ENABLED:
+        return None
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = AnswerCache(
+                    make_backend(settings.CHAT_ANSWER_CACHE),
+                    ttl=settings.CHAT_ANSWER_CACHE_TTL,
+                    coalesce_timeout=settings.CHAT_ANSWER_COALESCE_TIMEOUT,
+                )
+    return _cache
@@ -1,6 +1,6 @@
-from django.apps import AppConfig
-
-
-class ChatbotsConfig(AppConfig):
-    default_auto_field = 'django.db.models.BigAutoField'
-    name = 'chatbots'
+from django.apps import AppConfig
+
+
+class ChatbotsConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'chatbots'
@@ -0,0 +1,183 @@
+# chatbots/context.py
+"""
+챗봇 참고 자료(context) 구성.
+
+- 조회: 선택한 figure 의 MatchedText, 하이라이트, 선택 텍스트의 페이지 번호를
+  관련 필드까지 values_list 로 한 번에 읽는다. (선택 개수와 무관하게 쿼리 최대 3번)
+- 중복 제거: 공백/대소문자를 무시하고 같은 내용이거나 다른 항목에 포함된 내용은 뺀다.
+  (같은 문장이 figure 설명과 하이라이트에 함께 들어오는 경우 등)
+- 예산: 로컬 추정 토큰 수가 settings.CHAT_CONTEXT_TOKEN_BUDGET 을 넘지 않도록
+  사용자 선택 텍스트 → 하이라이트 → figure 순으로 담고, 넘치는 항목은 잘라서 넣거나 뺀다.
+- 선택한 참고 자료가 하나도 없으면 질문으로 문서의 청크 색인(searches/retrieval.py)을 검색해
+  상위 CHAT_RETRIEVAL_TOP_K 개 발췌를 참고 자료로 쓴다.
+"""
+import math
+import re
+import time
+from dataclasses import dataclass
+
+from django.conf import settings
+
+from highlights.models import Highlight
+from pdf_documents.models import PDFpage, MatchedText
+from searches.retrieval import retrieve_passages
+
+# 예산을 채울 때의 우선순위 (작을수록 먼저). 프롬프트에는 원래 순서(figure → 하이라이트 → 선택 텍스트)로 넣는다
+KIND_FIGURE = "figure"
+KIND_HIGHLIGHT = "highlight"
+KIND_SELECTED = "selected"
+KIND_RETRIEVED = "retrieved"
+PACK_PRIORITY = {KIND_SELECTED: 0, KIND_HIGHLIGHT: 1, KIND_FIGURE: 2, KIND_RETRIEVED: 3}
+SECTION_ORDER = {KIND_FIGURE: 0, KIND_HIGHLIGHT: 1, KIND_SELECTED: 2, KIND_RETRIEVED: 3}
+
+_WIDE = re.compile(r"[^\x00-\x7f]")
+_SPACES = re.compile(r"\s+")
+
+
+def estimate_tokens(text):
+    """
+    tokenizer 없이 쓰는 보수적인 토큰 수 추정.
+    한글/한자 등 비ASCII 문자는 글자당 1토큰, ASCII 는 4글자당 1토큰으로 센다.
+    """
+    wide = len(_WIDE.findall(text))
+    return wide + math.ceil((len(text) - wide) / 4)
+
+
+def truncate_to_tokens(text, max_tokens):
+    """추정 토큰 수가 max_tokens 이하가 되도록 뒤를 자른다."""
+    if estimate_tokens(text) <= max_tokens:
+        return text
+    cut = len(text) * max_tokens // max(estimate_tokens(text), 1)
+    while cut > 0 and estimate_tokens(text[:cut]) + 1 > max_tokens:
+        cut = cut * 9 // 10
+    return text[:cut].rstrip() + "…"
+
+
+def _normalized(text):
+    return _SPACES.sub(" ", text).strip().casefold()
+
+
+@dataclass
+class ContextItem:
+    kind: str
+    label: str
+    text: str
+    order: int  # 같은 종류 안에서의 순서
+
+    def render(self, text=None):
+        return f"[{self.label}]: {self.text if text is None else text}"
+
+
+def load_context_items(pdf, figure_ids, highlight_ids, selected_texts):
+    """요청에 들어온 참고 자료를 ContextItem 목록으로 읽는다. (다른 문서의 id 는 무시)"""
+    items = []
+
+    # (A) 선택한 figure 의 MatchedText (+ figure_type) — 쿼리 1번
+    if figure_ids:
+        matches = (
+            MatchedText.objects.filter(figure_id__in=figure_ids, page_id__pdf_id=pdf)
+            .order_by("figure_id", "id")
+            .values_list("figure_id__figure_type", "page_num", "raw_text")
+        )
+        for order, (fig_type, page_num, raw_text) in enumerate(matches):
+            items.append(ContextItem(
+                KIND_FIGURE, f"참고 할만한 figure의 타입 및 지정 페이지와 관련 텍스트 내용 ({fig_type}, Page {page_num})",
+                raw_text, order,
+            ))
+
+    # (B) 하이라이트 (+ 태그, 페이지 번호) — 쿼리 1번
+    if highlight_ids:
+        highlights = (
+            Highlight.objects.filter(id__in=highlight_ids, pdf_id=pdf)
+            .order_by("id")
+            .values_list("Tag_id__tag_detail", "page_id__page_num", "highlight_text")
+        )
+        for order, (tag_detail, page_num, text) in enumerate(highlights):
+            items.append(ContextItem(
+                KIND_HIGHLIGHT, f"하이라이트한 내용 (Tag: {tag_detail or 'No Tag'}, Page {page_num})", text, order,
+            ))
+
+    # (C) 사용자 선택 텍스트 — 페이지 번호만 쿼리 1번
+    if selected_texts:
+        page_ids = {item['page_id'] for item in selected_texts}
+        page_nums = dict(PDFpage.objects.filter(id__in=page_ids, pdf_id=pdf).values_list("id", "page_num"))
+        for order, item in enumerate(selected_texts):
+            page = page_nums.get(item['page_id'], item['page_id'])
+            items.append(ContextItem(KIND_SELECTED, f"사용자 선택 텍스트 (Page {page})", item['text'], order))
+
+    return items
+
+
+def retrieved_items(pdf, question):
+    """질문으로 찾은 문서 발췌 (관련도 순)"""
+    return [
+        ContextItem(KIND_RETRIEVED, f"문서 발췌 (Page {passage['page_num']})", passage["text"], order)
+        for order, passage in enumerate(retrieve_passages(pdf, question))
+    ]
+
+
+def dedupe_items(items):
+    """같은 내용이거나 다른 항목 안에 포함된 항목을 뺀다. (우선순위가 높은 항목을 남김)"""
+    ranked = sorted(items, key=lambda item: (PACK_PRIORITY[item.kind], item.order))
+    kept, kept_texts = [], []
+    for item in ranked:
+        text = _normalized(item.text)
+        if not text:
+            continue
+        if any(text in other for other in kept_texts):
+            continue
+        # 새 항목이 이미 담은 같은 종류의 항목을 포함하면 그 항목을 대신한다
+        for index in range(len(kept) - 1, -1, -1):
+            if kept[index].kind == item.kind and kept_texts[index] in text:
+                del kept[index], kept_texts[index]
+        kept.append(item)
+        kept_texts.append(text)
+    return kept
+
+
+def pack_items(items, budget):
+    """
+    우선순위대로 budget(추정 토큰)까지 담고 (렌더링된 줄 목록, 통계) 를 반환한다.
+    예산을 넘는 항목은 남은 예산이 CHAT_CONTEXT_MIN_ITEM_TOKENS 이상이면 잘라서 넣는다.
+    """
+    min_tokens = settings.CHAT_CONTEXT_MIN_ITEM_TOKENS
+    separator = estimate_tokens("\n\n")
+    used, packed, truncated, dropped = 0, [], 0, 0
+    for item in sorted(items, key=lambda item: (PACK_PRIORITY[item.kind], item.order)):
+        line = item.render()
+        cost = estimate_tokens(line) + separator
+        if used + cost <= budget:
+            packed.append((item, line))
+            used += cost
+            continue
+        remaining = budget - used - separator - estimate_tokens(item.render(""))
+        if remaining >= min_tokens:
+            line = item.render(truncate_to_tokens(item.text, remaining))
+            packed.append((item, line))
+            used += estimate_tokens(line) + separator
+            truncated += 1
+        else:
+            dropped += 1
+
+    packed.sort(key=lambda pair: (SECTION_ORDER[pair[0].kind], pair[0].order))
+    stats = {"items": len(packed), "truncated": truncated, "dropped": dropped, "tokens": used}
+    return [line for _, line in packed], stats
+
+
+def build_context(pdf, figure_ids, highlight_ids, selected_texts, question=None, budget=None):
+    """
+    프롬프트에 넣을 참고 자료 문자열과 통계
+    (items / duplicates / truncated / dropped / tokens / retrieved / retrieval_ms)
+    """
+    budget = settings.CHAT_CONTEXT_TOKEN_BUDGET if budget is None else budget
+    items = load_context_items(pdf, figure_ids or [], highlight_ids or [], selected_texts or [])
+    retrieved, retrieval_ms = 0, None
+    if not items and question and settings.CHAT_RETRIEVAL_ENABLED:
+        started = time.perf_counter()
+        items = retrieved_items(pdf, question)
+        retrieval_ms = round((time.perf_counter() - started) * 1000, 2)
+        retrieved = len(items)
+    unique = dedupe_items(items)
+    lines, stats = pack_items(unique, budget)
+    stats.update(duplicates=len(items) - len(unique), retrieved=retrieved, retrieval_ms=retrieval_ms)
+    return "\n\n".join(lines), stats
@@ -0,0 +1,74 @@
+import time
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+
+from chatbots.context import build_context, estimate_tokens
+from highlights.models import Tag, Highlight
+from pdf_documents.ingest import to_box_dict
+from pdf_documents.management.commands.bench_list_serializers import make_rows
+from pdf_documents.models import PDFpage, MatchedText
+from pdf_figures.models import PDFfigure
+
+
+def legacy_context(figure_ids, highlight_ids):
+    """이전 ChatBotView 의 참고 자료 구성 (행마다 figure / tag / page 조회, 크기 제한 없음)"""
+    context_parts = []
+    for record in MatchedText.objects.filter(figure_id__in=figure_ids):
+        context_parts.append(
+            f"[참고 할만한 figure의 타입 및 지정 페이지와 관련 텍스트 내용 "
+            f"({record.figure_id.figure_type}, Page {record.page_num})]: {record.raw_text}"
+        )
+    for hl in Highlight.objects.filter(id__in=highlight_ids):
+        tag_info = hl.Tag_id.tag_detail if hl.Tag_id else "No Tag"
+        context_parts.append(f"[하이라이트한 내용 (Tag: {tag_info}, Page {hl.page_id.page_num})]: {hl.highlight_text}")
+    return "\n\n".join(context_parts)
+
+
+class Command(BaseCommand):
+    help = (
+        "챗봇 참고 자료 구성 비교: 이전 방식(행마다 관계 조회, 크기 제한 없음) vs chatbots/context.py "
+        "(고정 쿼리 수, 중복 제거, 토큰 예산). 선택한 figure / 하이라이트 수별 쿼리 수, 시간, 추정 토큰 수를 출력합니다."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--selected", type=int, nargs="+", default=[10, 100, 1000])
+
+    def handle(self, *args, **options):
+        self.stdout.write(f"{'selected':>8} {'path':>7} {'queries':>8} {'ms':>9} {'tokens':>8}")
+        for count in options["selected"]:
+            # 측정용 데이터는 남기지 않도록 항상 롤백
+            with transaction.atomic():
+                user = get_user_model().objects.create_user(email="bench-chat-context@example.com")
+                origin_pdf = make_rows(user, count)
+                page = PDFpage.objects.filter(pdf_id=origin_pdf).order_by("page_num").first()
+                tag = Tag.objects.create(pdf_id=origin_pdf, color="yellow", tag_detail="중요")
+                # 절반은 figure 설명과 같은 문장 (중복 제거 대상)
+                Highlight.objects.bulk_create(
+                    [
+                        Highlight(pdf_id=origin_pdf, page_id=page, Tag_id=tag,
+                                  highlight_text="그림 1" if i % 2 else f"하이라이트 {i} " * 20,
+                                  highlight_box=to_box_dict([0, 0, 1, 1]))
+                        for i in range(count)
+                    ],
+                    batch_size=1000,
+                )
+                figure_ids = list(PDFfigure.objects.filter(pdf_id=origin_pdf).values_list("id", flat=True))
+                highlight_ids = list(Highlight.objects.filter(pdf_id=origin_pdf).values_list("id", flat=True))
+
+                cases = (
+                    ("legacy", lambda: legacy_context(figure_ids, highlight_ids)),
+                    ("context", lambda: build_context(origin_pdf, figure_ids, highlight_ids, [])[0]),
+                )
+                for name, build in cases:
+                    with CaptureQueriesContext(connection) as ctx:
+                        started = time.perf_counter()
+                        text = build()
+                        ms = (time.perf_counter() - started) * 1000
+                    self.stdout.write(
+                        f"{count:>8} {name:>7} {len(ctx.captured_queries):>8} {ms:>9.1f} {estimate_tokens(text):>8}"
+                    )
+
+                transaction.set_rollback(True)
@@ -0,0 +1,53 @@
+# chatbots/metrics.py
+"""
+챗봇 응답 지연 지표 (프로세스 단위).
+mode 별로 최근 window 건의 첫 토큰까지 시간(ttft)과 전체 시간(duration)을 보관해 p50 / p95 를 계산한다.
+일반 응답(json / async)과 캐시 답변(cached)은 답변 전체가 한 번에 오므로 ttft 가 duration 과 같다.
+"""
+import threading
+from collections import deque
+
+
+def _percentile(values, ratio):
+    if not values:
+        return None
+    ordered = sorted(values)
+    return round(ordered[min(len(ordered) - 1, int(len(ordered) * ratio))], 2)
+
+
+class ChatMetrics:
+    def __init__(self, window=1000):
+        self.window = window
+        self._lock = threading.Lock()
+        self._modes = {}
+
+    def record(self, mode, ttft_ms, duration_ms, ok=True):
+        with self._lock:
+            data = self._modes.setdefault(mode, {
+                "requests": 0, "errors": 0,
+                "ttft": deque(maxlen=self.window), "duration": deque(maxlen=self.window),
+            })
+            data["requests"] += 1
+            if not ok:
+                data["errors"] += 1
+                return
+            if ttft_ms is not None:
+                data["ttft"].append(ttft_ms)
+            data["duration"].append(duration_ms)
+
+    def stats(self):
+        with self._lock:
+            return {
+                mode: {
+                    "requests": data["requests"],
+                    "errors": data["errors"],
+                    "ttft_ms": {"p50": _percentile(data["ttft"], 0.5), "p95": _percentile(data["ttft"], 0.95)},
+                    "duration_ms": {
+                        "p50": _percentile(data["duration"], 0.5), "p95": _percentile(data["duration"], 0.95),
+                    },
+                }
+                for mode, data in self._modes.items()
+            }
+
+
+chat_metrics = ChatMetrics()
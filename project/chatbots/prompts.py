@@ -0,0 +1,88 @@
+# chatbots/prompts.py
+"""
+챗봇 프롬프트 구성과 Upstage(OpenAI 호환) 클라이언트.
+일반 응답(ChatBotView)과 스트리밍 응답(ChatBotStreamView)이 같은 프롬프트를 쓰도록 여기서 만든다.
+"""
+import asyncio
+import logging
+import weakref
+
+from django.conf import settings
+from openai import AsyncOpenAI, OpenAI
+
+from .context import build_context
+
+logger = logging.getLogger("api")
+
+UPSTAGE_BASE_URL = "https://api.upstage.ai/v1/solar"
+UPSTAGE_CHAT_MODEL = "solar-pro"
+
+
+def get_client():
+    return OpenAI(api_key=settings.UPSTAGE_API_KEY, base_url=UPSTAGE_BASE_URL)
+
+
+# 이벤트 루프 → AsyncOpenAI. httpx 커넥션 풀은 만든 루프에서만 쓸 수 있으므로 루프마다 하나씩 공유한다
+_async_clients = weakref.WeakKeyDictionary()
+
+
+def get_async_client():
+    """현재 이벤트 루프에서 공유하는 async 클라이언트 (요청마다 TLS 연결을 새로 맺지 않도록)"""
+    loop = asyncio.get_running_loop()
+    client = _async_clients.get(loop)
+    if client is None:
+        client = _async_clients[loop] = AsyncOpenAI(api_key=settings.UPSTAGE_API_KEY, base_url=UPSTAGE_BASE_URL)
+    return client
+
+
+def complete_chat(messages):
+    """Upstage 답변 한 번 (sync)"""
+    response = get_client().chat.completions.create(model=UPSTAGE_CHAT_MODEL, messages=messages)
+    return response.choices[0].message.content
+
+
+async def acomplete_chat(messages):
+    response = await get_async_client().chat.completions.create(model=UPSTAGE_CHAT_MODEL, messages=messages)
+    return response.choices[0].message.content
+
+
+def build_messages(pdf, data):
+    """ChatRequestSerializer 의 validated_data 로 chat.completions 메시지 목록을 만든다. (ORM 조회 포함, sync)"""
+    # 참고 자료는 정해진 쿼리 수로 읽고 토큰 예산 안으로 줄인다 (chatbots/context.py)
+    # 선택한 참고 자료가 없으면 질문으로 문서에서 찾은 발췌를 쓴다
+    prompt_context, stats = build_context(
+        pdf, data['figure_ids'], data['highlight_ids'], data['selected_texts'], question=data['question'],
+    )
+    logger.info(
+        "chat context pdf=%s items=%s duplicates=%s truncated=%s dropped=%s tokens=%s retrieved=%s retrieval_ms=%s",
+        pdf.id, stats["items"], stats["duplicates"], stats["truncated"], stats["dropped"], stats["tokens"],
+        stats["retrieved"], stats["retrieval_ms"],
+    )
+
+    base_prompt = f"당신은 문서 '{pdf.title}'에 대해 질문에 답변하는 AI 비서입니다. 한국어로 답변해야 합니다. 유저가 질문한 내용을 바탕으로 답변해야하며, 참고자료가 있다면 해당 내용을 토대로 설명해야 합니다."
+
+    if prompt_context and stats["retrieved"]:
+        system_prompt = f"""
+        {base_prompt}
+        아래의 [참고 자료]는 질문과 관련해 문서에서 찾은 부분입니다.
+        해당 자료 내용을 최우선으로 참고하여 답변하세요.
+
+        [참고 자료]
+        {prompt_context}
+        """
+    elif prompt_context:
+        system_prompt = f"""
+        {base_prompt}
+        사용자가 질문과 함께 아래의 [참고 자료]를 제공했습니다.
+        해당 자료 내용을 최우선으로 참고하여 답변하세요.
+
+        [참고 자료]
+        {prompt_context}
+        """
+    else:
+        system_prompt = f"{base_prompt} 문서의 내용을 바탕으로 답변하세요."
+
+    return [
+        {"role": "system", "content": system_prompt},
+        {"role": "user", "content": data['question']},
+    ]
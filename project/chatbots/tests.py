@@ -1,3 +1,289 @@
-from django.test import TestCase
-
-# Create your tests here.
+import json
+from types import SimpleNamespace
+import asyncio
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.test import AsyncClient, TestCase, override_settings
+from django.urls import reverse
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from pdf_documents.blobs import acquire_blob
+from pdf_documents.deletion import soft_delete_documents
+from pdf_documents.models import originPDF, PDFpage
+from pdf_documents.response_cache import LocMemLRUBackend
+from searches.retrieval import build_chunk_index
+
+from .answer_cache import COALESCED, HIT, MISS, AnswerCache, answer_key
+from .context import build_context
+from .metrics import ChatMetrics
+from .views import STREAM_ERROR_MESSAGE
+
+
+def chat_messages(system, question):
+    return [{"role": "system", "content": system}, {"role": "user", "content": question}]
+
+
+class AnswerKeyTests(TestCase):
+    """답변 캐시 키는 문서 행이 아니라 파일 내용 + 프롬프트로 정한다"""
+
+    def setUp(self):
+        blob, _ = acquire_blob("c" * 64, "pdfs/lecture.pdf", 10)
+        self.pdfs = [
+            originPDF.objects.create(
+                user_id=get_user_model().objects.create_user(email=f"student{i}@example.com"),
+                title="강의 1", S3_url="https://example.com/lecture.pdf", s3_key=blob.s3_key, blob=blob,
+            )
+            for i in range(2)
+        ]
+
+    def test_same_file_shares_key_across_students(self):
+        messages = chat_messages("시스템", "그림 1 은 무엇인가요?")
+        first, second = (originPDF.objects.select_related("blob").get(id=pdf.id) for pdf in self.pdfs)
+        self.assertEqual(
+            answer_key(first, "solar-pro", messages),
+            answer_key(second, "solar-pro", chat_messages("시스템", "그림 1 은  무엇인가요")),
+        )
+
+    def test_different_prompt_or_file_changes_key(self):
+        pdf = originPDF.objects.select_related("blob").get(id=self.pdfs[0].id)
+        key = answer_key(pdf, "solar-pro", chat_messages("시스템", "질문"))
+        self.assertNotEqual(key, answer_key(pdf, "solar-pro", chat_messages("다른 참고 자료", "질문")))
+
+        legacy = originPDF.objects.create(
+            user_id=pdf.user_id, title="강의 1", S3_url="https://example.com/old.pdf", s3_key="pdfs/old.pdf",
+        )
+        self.assertNotEqual(key, answer_key(legacy, "solar-pro", chat_messages("시스템", "질문")))
+
+
+class AnswerCacheBackendTests(TestCase):
+    """답변은 response_cache 의 backend 에 유효 시간과 함께 저장된다"""
+
+    def setUp(self):
+        self.cache = AnswerCache(LocMemLRUBackend(max_entries=10), ttl=60)
+
+    def test_miss_then_hit(self):
+        call = mock.Mock(return_value="답변")
+        self.assertEqual(self.cache.get_or_call("k", call), ("답변", MISS))
+        self.assertEqual(self.cache.get_or_call("k", call), ("답변", HIT))
+        call.assert_called_once()
+        stats = self.cache.stats()
+        self.assertEqual((stats["hits"], stats["misses"], stats["entries"]), (1, 1, 1))
+        self.assertEqual(stats["backend"], "LocMemLRUBackend")
+
+    def test_entry_expires_after_ttl(self):
+        with mock.patch("pdf_documents.response_cache.time.monotonic", return_value=1000.0):
+            self.cache.set("k", "답변", 5.0)
+        with mock.patch("pdf_documents.response_cache.time.monotonic", return_value=1059.0):
+            self.assertEqual(self.cache.get("k"), "답변")
+        with mock.patch("pdf_documents.response_cache.time.monotonic", return_value=1061.0):
+            self.assertIsNone(self.cache.get("k"))
+        self.assertEqual(self.cache.stats()["expired"], 1)
+
+    async def test_async_coalesces_then_hits(self):
+        started = asyncio.Event()
+        release = asyncio.Event()
+        calls = []
+
+        async def call():
+            calls.append(1)
+            started.set()
+            await release.wait()
+            return "답변"
+
+        leader = asyncio.create_task(self.cache.aget_or_call("k", call))
+        await started.wait()
+        follower = asyncio.create_task(self.cache.aget_or_call("k", call))
+        # follower 의 캐시 조회(스레드)가 끝나 진행 중인 호출을 기다리기 시작할 때까지
+        await asyncio.sleep(0.1)
+        release.set()
+        self.assertEqual(await leader, ("답변", MISS))
+        self.assertEqual(await follower, ("답변", COALESCED))
+        self.assertEqual(await self.cache.aget_or_call("k", call), ("답변", HIT))
+        self.assertEqual(len(calls), 1)
+
+
+class RetrievalContextTests(TestCase):
+    """선택한 자료가 없으면 질문으로 찾은 문서 발췌를 참고 자료로 쓴다"""
+
+    def setUp(self):
+        user = get_user_model().objects.create_user(email="retrieval@example.com")
+        self.pdf = originPDF.objects.create(user_id=user, title="강의", S3_url="https://example.com/lecture.pdf")
+        for page_num, text in enumerate(["apple banana", "apple apple cherry", "cherry pie"], start=1):
+            PDFpage.objects.create(pdf_id=self.pdf, page_num=page_num, text=text)
+        build_chunk_index(self.pdf)
+
+    def test_uses_retrieved_passages_in_relevance_order(self):
+        context, stats = build_context(self.pdf, [], [], [], question="cherry")
+        self.assertEqual(stats["retrieved"], 2)
+        self.assertIsNotNone(stats["retrieval_ms"])
+        self.assertLess(context.index("문서 발췌 (Page 3)"), context.index("문서 발췌 (Page 2)"))
+        self.assertNotIn("Page 1", context)
+
+    def test_selected_items_skip_retrieval(self):
+        page = PDFpage.objects.get(pdf_id=self.pdf, page_num=1)
+        context, stats = build_context(
+            self.pdf, [], [], [{"page_id": page.id, "text": "선택한 문장"}], question="cherry",
+        )
+        self.assertEqual(stats["retrieved"], 0)
+        self.assertIsNone(stats["retrieval_ms"])
+        self.assertNotIn("문서 발췌", context)
+
+    @override_settings(CHAT_RETRIEVAL_ENABLED=False)
+    def test_disabled(self):
+        context, stats = build_context(self.pdf, [], [], [], question="cherry")
+        self.assertEqual((context, stats["retrieved"]), ("", 0))
+
+
+class ChatDocumentOwnerTests(TestCase):
+    """챗봇은 요청한 사용자의 삭제되지 않은 문서에만 답한다"""
+
+    def setUp(self):
+        User = get_user_model()
+        self.user = User.objects.create_user(email="asker@example.com")
+        owner = User.objects.create_user(email="owner@example.com")
+        self.others = originPDF.objects.create(user_id=owner, title="남의 문서", S3_url="https://example.com/a.pdf")
+        self.deleted = originPDF.objects.create(user_id=self.user, title="지운 문서", S3_url="https://example.com/b.pdf")
+        soft_delete_documents(originPDF.objects.filter(id=self.deleted.id))
+        self.token = str(RefreshToken.for_user(self.user).access_token)
+
+    @mock.patch("chatbots.views.complete_chat")
+    def test_sync_view(self, complete_chat):
+        client = APIClient()
+        client.force_authenticate(self.user)
+        for pdf in (self.others, self.deleted):
+            response = client.post(reverse("chatbots:chat-ask"), {"pdf_id": pdf.id, "question": "요약"}, format="json")
+            self.assertEqual(response.status_code, 404)
+        complete_chat.assert_not_called()
+
+    async def test_async_views(self):
+        client = AsyncClient()
+        for name in ("chatbots:chat-ask-async", "chatbots:chat-ask-stream"):
+            for pdf in (self.others, self.deleted):
+                response = await client.post(
+                    reverse(name), {"pdf_id": pdf.id, "question": "요약"}, content_type="application/json",
+                    headers={"Authorization": f"Bearer {self.token}"},
+                )
+                self.assertEqual(response.status_code, 404)
+
+
+class ChatAsyncViewTests(TestCase):
+    """ChatBotAsyncView: 인증 / 요청 검증 / 답변과 캐시 헤더"""
+
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(email="async-chat@example.com")
+        self.pdf = originPDF.objects.create(user_id=self.user, title="강의", S3_url="https://example.com/async.pdf")
+        self.auth = {"Authorization": f"Bearer {RefreshToken.for_user(self.user).access_token}"}
+        self.url = reverse("chatbots:chat-ask-async")
+        self.cache = AnswerCache(LocMemLRUBackend(max_entries=10), ttl=60)
+        patcher = mock.patch("chatbots.views.get_answer_cache", lambda: self.cache)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def ask(self, body, headers=None):
+        return AsyncClient().post(self.url, body, content_type="application/json", headers=headers or self.auth)
+
+    async def test_requires_token(self):
+        response = await AsyncClient().post(self.url, {"pdf_id": self.pdf.id, "question": "요약"},
+                                            content_type="application/json")
+        self.assertEqual(response.status_code, 401)
+        response = await self.ask({"pdf_id": self.pdf.id, "question": "요약"}, {"Authorization": "Bearer invalid"})
+        self.assertEqual(response.status_code, 401)
+
+    async def test_invalid_body(self):
+        self.assertEqual((await self.ask({"pdf_id": self.pdf.id})).status_code, 400)
+        response = await AsyncClient().post(self.url, "{", content_type="application/json", headers=self.auth)
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual((await self.ask({"pdf_id": self.pdf.id + 1000, "question": "요약"})).status_code, 404)
+
+    @mock.patch("chatbots.views.acomplete_chat", new_callable=mock.AsyncMock, return_value="비동기 답변")
+    async def test_reply_then_cache_hit(self, acomplete_chat):
+        for expected in (MISS, HIT):
+            response = await self.ask({"pdf_id": self.pdf.id, "question": "요약"})
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(response.json(), {"reply": "비동기 답변", "status": "success"})
+            self.assertEqual(response["X-Answer-Cache"], expected)
+        acomplete_chat.assert_awaited_once()
+
+
+class FakeStream:
+    """openai 스트리밍 응답 흉내: delta 를 차례로 내고, error 가 있으면 마지막에 예외"""
+
+    def __init__(self, deltas, error=None):
+        self.deltas = deltas
+        self.error = error
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        return False
+
+    async def __aiter__(self):
+        for delta in self.deltas:
+            yield SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content=delta))])
+        if self.error is not None:
+            raise self.error
+
+
+def fake_client(stream):
+    return SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(create=mock.AsyncMock(return_value=stream))))
+
+
+class ChatStreamTests(TestCase):
+    """ChatBotStreamView 의 SSE 이벤트 순서와 기록하는 지표"""
+
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(email="stream@example.com")
+        self.pdf = originPDF.objects.create(user_id=self.user, title="강의", S3_url="https://example.com/stream.pdf")
+        self.token = str(RefreshToken.for_user(self.user).access_token)
+        self.metrics = ChatMetrics()
+        self.cache = AnswerCache(LocMemLRUBackend(max_entries=10), ttl=60)
+        for target, value in (("chat_metrics", self.metrics), ("get_answer_cache", lambda: self.cache)):
+            patcher = mock.patch(f"chatbots.views.{target}", value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    async def ask(self, stream):
+        with mock.patch("chatbots.views.get_async_client", return_value=fake_client(stream)):
+            response = await AsyncClient().post(
+                reverse("chatbots:chat-ask-stream"), {"pdf_id": self.pdf.id, "question": "요약해 줘"},
+                content_type="application/json", headers={"Authorization": f"Bearer {self.token}"},
+            )
+            self.assertEqual(response["Content-Type"], "text/event-stream; charset=utf-8")
+            body = b"".join([chunk async for chunk in response.streaming_content]).decode("utf-8")
+        events = []
+        for block in body.strip().split("\n\n"):
+            event, data = block.split("\n")
+            events.append((event.removeprefix("event: "), json.loads(data.removeprefix("data: "))))
+        return events
+
+    async def test_tokens_then_done_then_cached(self):
+        events = await self.ask(FakeStream(["안녕", "하세요"]))
+        self.assertEqual([name for name, _ in events], ["token", "token", "done"])
+        self.assertEqual([data["delta"] for _, data in events[:2]], ["안녕", "하세요"])
+        done = events[-1][1]
+        self.assertEqual((done["reply"], done["status"], done["cached"]), ("안녕하세요", "success", False))
+        self.assertLessEqual(done["ttft_ms"], done["duration_ms"])
+
+        # 같은 질문은 저장된 답변을 한 번에 보낸다
+        events = await self.ask(FakeStream(["다른 답변"]))
+        self.assertEqual([name for name, _ in events], ["token", "done"])
+        self.assertEqual(events[0][1]["delta"], "안녕하세요")
+        self.assertTrue(events[1][1]["cached"])
+
+        stats = self.metrics.stats()
+        self.assertEqual((stats["stream"]["requests"], stats["stream"]["errors"]), (1, 0))
+        self.assertEqual(stats["cached"]["requests"], 1)
+        self.assertEqual((self.cache.stats()["hits"], self.cache.stats()["entries"]), (1, 1))
+
+    async def test_upstream_error_sends_generic_event(self):
+        events = await self.ask(FakeStream(["안녕"], error=RuntimeError("upstream secret: 401 invalid api key")))
+        self.assertEqual([name for name, _ in events], ["token", "error"])
+        self.assertEqual(events[1][1], {"error": STREAM_ERROR_MESSAGE})
+
+        stats = self.metrics.stats()["stream"]
+        self.assertEqual((stats["requests"], stats["errors"]), (1, 1))
+        # 실패한 답변은 저장하지 않는다
+        self.assertEqual(self.cache.stats()["entries"], 0)
@@ -1,9 +1,12 @@
-from django.urls import path, include
-from rest_framework.routers import DefaultRouter
-from .views import *
-
-app_name = "chatbots"
-
-urlpatterns = [
-    path('ask/', ChatBotView.as_view(), name='chat-ask'),
+from django.urls import path, include
+from rest_framework.routers import DefaultRouter
+from .views import *
+
+app_name = "chatbots"
+
+urlpatterns = [
+    path('ask/', ChatBotView.as_view(), name='chat-ask'),
+    path('ask/async/', ChatBotAsyncView.as_view(), name='chat-ask-async'),
+    path('ask/stream/', ChatBotStreamView.as_view(), name='chat-ask-stream'),
+    path('metrics/', ChatMetricsView.as_view(), name='chat-metrics'),
 ]
\ No newline at end of file
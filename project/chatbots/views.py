@@ -1,147 +1,275 @@
-import os
-from rest_framework.views import APIView
-from rest_framework.response import Response
-from rest_framework.permissions import IsAuthenticated
-from django.shortcuts import get_object_or_404
-from openai import OpenAI
-from pdf_documents.models import originPDF # PDF 검색을 위해 필요
-from django.conf import settings
-from .serializers import ChatRequestSerializer, SelectedTextSerializer
-from pdf_documents.models import originPDF, MatchedText
-from highlights.models import Highlight
-
-from drf_yasg.utils import swagger_auto_schema
-from drf_yasg import openapi
-
-UPSTAGE_API_KEY = settings.UPSTAGE_API_KEY
-
-class ChatBotView(APIView):
-    permission_classes = [IsAuthenticated]
-
-    @swagger_auto_schema(
-        operation_summary="챗봇에게 질문하기 (RAG + Stateless)",
-        operation_description="""
-        사용자의 질문과 참고 자료(이미지 ID, 하이라이트 ID, 선택 텍스트)를 받아 AI 답변을 생성합니다.
-        서버에 대화 내용을 저장하지 않으므로, 이전 대화 목록(history)을 매번 함께 보내야 합니다.
-        """,
-        tags=["ChatBot"],
-        # 1. 요청 Body: 우리가 만든 ChatRequestSerializer 연결
-        request_body=ChatRequestSerializer,
-        
-        # 2. 응답 Schema: 성공 시 반환되는 JSON 구조 정의
-        responses={
-            200: openapi.Response(
-                description="AI 응답 성공",
-                schema=openapi.Schema(
-                    type=openapi.TYPE_OBJECT,
-                    properties={
-                        'reply': openapi.Schema(type=openapi.TYPE_STRING, description="AI의 답변 텍스트"),
-                        'status': openapi.Schema(type=openapi.TYPE_STRING, description="성공 여부 (success)")
-                    }
-                )
-            ),
-            400: "잘못된 요청 (필수 필드 누락 등)",
-            404: "PDF 문서가 존재하지 않음",
-            500: "AI 서비스 호출 실패 또는 서버 에러"
-        }
-    )
-    def post(self, request):
-        # 1. 클라이언트로부터 데이터 수신
-        # request 요청 형식
-        # { question: "문자열로 질문자의 query가 들어옴", figure_ids[int]: "사용자가 질문 또는 지식으로 사용하려는 피규어 아이디 목록",
-        # highlight_ids[int]: "사용자가 질문 또는 지식으로 사용하려는 하이라이트 아이디 목록",
-        # selected_texts[dict]: { "text": "사용자가 질문 또는 지식으로 사용하기 위한 텍스트들", "page_id": int 해당 텍스트가 속한 페이지 아이디} }
-
-        serializer = ChatRequestSerializer(data=request.data)
-        if not serializer.is_valid():
-            return Response(serializer.errors, status=400)
-
-        data = serializer.validated_data
-        
-        pdf_id = data['pdf_id']
-        question = data['question']
-        
-        # iOS에서 보낸 ID 리스트
-        figure_ids = data['figure_ids']       # 예: [10, 12] (PDFFigure의 ID들)
-        highlight_ids = data['highlight_ids']
-        selected_texts = data['selected_texts']
-
-        # PDF 존재 확인
-        pdf = get_object_or_404(originPDF, id=pdf_id)
-
-        context_parts = []
-
-        # (A) Figure IDs 처리 (MatchedText 조회)
-        # 사용자가 선택한 Figure ID를 외래키로 가지고 있는 MatchedText를 찾습니다.
-        if figure_ids:
-            # MatchedText 모델의 figure_id 필드가 figure_ids 리스트 안에 있는 경우를 필터링
-            matched_records = MatchedText.objects.filter(figure_id__in=figure_ids)
-            
-            for record in matched_records:
-                # 사용자의 의도대로 'raw_text'를 가져옴
-                text_content = record.raw_text 
-                page_num = record.page_num
-                
-                # figure_type은 MatchedText -> PDFfigure 관계를 통해 가져옴
-                fig_type = record.figure_id.figure_type 
-                
-                context_parts.append(f"[참고 할만한 figure의 타입 및 지정 페이지와 관련 텍스트 내용 ({fig_type}, Page {page_num})]: {text_content}")
-
-        # (B) Highlight IDs 처리
-        if highlight_ids:
-            highlights = Highlight.objects.filter(id__in=highlight_ids)
-            for hl in highlights:
-                tag_info = hl.Tag_id.tag_detail if hl.Tag_id else "No Tag"
-                context_parts.append(f"[하이라이트한 내용 (Tag: {tag_info}, Page {hl.page_id.page_num})]: {hl.highlight_text}")
-
-        # (C) Selected Texts 처리
-        if selected_texts:
-            for item in selected_texts:
-                context_parts.append(f"[사용자 선택 텍스트 (Page {item['page_id']})]: {item['text']}")
-
-        # 문맥 합치기
-        prompt_context = "\n\n".join(context_parts)
-
-        # =========================================================
-        # [AI Prompting]
-        # =========================================================
-        
-        base_prompt = f"당신은 문서 '{pdf.title}'에 대해 질문에 답변하는 AI 비서입니다. 한국어로 답변해야 합니다. 유저가 질문한 내용을 바탕으로 답변해야하며, 참고자료가 있다면 해당 내용을 토대로 설명해야 합니다."
-        
-        if prompt_context:
-            system_prompt = f"""
-            {base_prompt}
-            사용자가 질문과 함께 아래의 [참고 자료]를 제공했습니다.
-            해당 자료 내용을 최우선으로 참고하여 답변하세요.
-            
-            [참고 자료]
-            {prompt_context}
-            """
-        else:
-            system_prompt = f"{base_prompt} 문서의 내용을 바탕으로 답변하세요."
-
-        try:
-            client = OpenAI(
-                api_key=UPSTAGE_API_KEY,
-                base_url="https://api.upstage.ai/v1/solar"
-            )
-
-            # 메시지 구성
-            messages_payload = [{"role": "system", "content": system_prompt}]
-            messages_payload.append({"role": "user", "content": question})
-
-            # AI 호출
-            response = client.chat.completions.create(
-                model="solar-pro",
-                messages=messages_payload
-            )
-
-            bot_reply = response.choices[0].message.content
-
-            return Response({
-                "reply": bot_reply,
-                "status": "success"
-            }, status=200)
-
-        except Exception as e:
-            return Response({"error": str(e)}, status=500)
\ No newline at end of file
+import json
+import logging
+import time
+
+from asgiref.sync import sync_to_async
+from rest_framework.views import APIView
+from rest_framework.response import Response
+from rest_framework.permissions import IsAdminUser, IsAuthenticated
+from django.http import JsonResponse, StreamingHttpResponse
+from django.shortcuts import get_object_or_404
+from django.views import View
+from pdf_documents.models import originPDF # PDF 검색을 위해 필요
+from .serializers import ChatRequestSerializer
+from .prompts import UPSTAGE_CHAT_MODEL, acomplete_chat, build_messages, complete_chat, get_async_client
+from .metrics import chat_metrics
+from .answer_cache import MISS, answer_key, get_answer_cache
+from config.async_api import aauthenticate, parse_json_body
+
+from drf_yasg.utils import swagger_auto_schema
+from drf_yasg import openapi
+
+logger = logging.getLogger("api")
+
+# 스트리밍 중 실패했을 때 error 이벤트로 보내는 문구 (upstream 예외 내용은 클라이언트에 보내지 않음)
+STREAM_ERROR_MESSAGE = "답변을 생성하는 중 오류가 발생했습니다."
+
+class ChatBotView(APIView):
+    permission_classes = [IsAuthenticated]
+
+    @swagger_auto_schema(
+        operation_summary="챗봇에게 질문하기 (RAG + Stateless)",
+        operation_description="""
+        사용자의 질문과 참고 자료(이미지 ID, 하이라이트 ID, 선택 텍스트)를 받아 AI 답변을 생성합니다.
+        서버에 대화 내용을 저장하지 않으므로, 이전 대화 목록(history)을 매번 함께 보내야 합니다.
+        참고 자료는 같은 내용을 한 번만 넣고, 추정 토큰 수가 예산(CHAT_CONTEXT_TOKEN_BUDGET)을 넘으면
+        선택 텍스트 → 하이라이트 → figure 순으로 담아 남는 항목은 잘라내거나 뺍니다. (다른 문서의 ID는 무시)
+        참고 자료를 하나도 보내지 않으면 OCR 때 만든 청크 색인에서 질문과 관련 높은 발췌를 찾아 사용합니다.
+        같은 문서(버전)·질문·참고 자료의 답변은 캐시에서 반환하며, 응답 헤더 X-Answer-Cache 로
+        hit / miss / coalesced(동시에 들어온 같은 질문의 결과를 함께 받음)를 알려 줍니다.
+        ASGI(uvicorn)로 실행 중이면 같은 요청/응답의 async 버전 POST /chatbots/ask/async/ 를 쓸 수 있습니다.
+        답변을 생성되는 대로 받으려면 같은 요청 본문으로 POST /chatbots/ask/stream/ 을 호출합니다.
+        (text/event-stream: `token` 이벤트마다 {"delta": "..."}, 마지막에 `done` 이벤트로 {"reply", "status", "ttft_ms", "duration_ms"},
+        실패 시 `error` 이벤트로 {"error"})
+        """,
+        tags=["ChatBot"],
+        # 1. 요청 Body: 우리가 만든 ChatRequestSerializer 연결
+        request_body=ChatRequestSerializer,
+        
+        # 2. 응답 Schema: 성공 시 반환되는 JSON 구조 정의
+        responses={
+            200: openapi.Response(
+                description="AI 응답 성공",
+                schema=openapi.Schema(
+                    type=openapi.TYPE_OBJECT,
+                    properties={
+                        'reply': openapi.Schema(type=openapi.TYPE_STRING, description="AI의 답변 텍스트"),
+                        'status': openapi.Schema(type=openapi.TYPE_STRING, description="성공 여부 (success)")
+                    }
+                )
+            ),
+            400: "잘못된 요청 (필수 필드 누락 등)",
+            404: "PDF 문서가 존재하지 않음 (다른 사용자의 문서 / 삭제된 문서 포함)",
+            500: "AI 서비스 호출 실패 또는 서버 에러"
+        }
+    )
+    def post(self, request):
+        # 1. 클라이언트로부터 데이터 수신
+        # request 요청 형식
+        # { question: "문자열로 질문자의 query가 들어옴", figure_ids[int]: "사용자가 질문 또는 지식으로 사용하려는 피규어 아이디 목록",
+        # highlight_ids[int]: "사용자가 질문 또는 지식으로 사용하려는 하이라이트 아이디 목록",
+        # selected_texts[dict]: { "text": "사용자가 질문 또는 지식으로 사용하기 위한 텍스트들", "page_id": int 해당 텍스트가 속한 페이지 아이디} }
+
+        serializer = ChatRequestSerializer(data=request.data)
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=400)
+
+        data = serializer.validated_data
+        
+        pdf_id = data['pdf_id']
+
+        # 요청한 사용자의 (삭제되지 않은) PDF 인지 확인 (blob 은 답변 캐시 키에 쓴다)
+        pdf = get_object_or_404(originPDF.objects.select_related("blob"), id=pdf_id, user_id=request.user)
+
+        # 참고 자료를 모아 시스템 프롬프트 구성 (chatbots/prompts.py)
+        messages_payload = build_messages(pdf, data)
+
+        # 같은 파일 / 질문 / 참고 자료면 (다른 학생이 올린 문서라도) 저장된 답변을 쓰고, 같은 질문이 진행 중이면 그 결과를 기다린다
+        cache = get_answer_cache()
+        started = time.perf_counter()
+        try:
+            # AI 호출
+            if cache is None:
+                bot_reply, source = complete_chat(messages_payload), MISS
+            else:
+                key = answer_key(pdf, UPSTAGE_CHAT_MODEL, messages_payload)
+                bot_reply, source = cache.get_or_call(key, lambda: complete_chat(messages_payload))
+
+            duration = (time.perf_counter() - started) * 1000
+            chat_metrics.record("json" if source == MISS else "cached", duration, duration)
+            return Response({
+                "reply": bot_reply,
+                "status": "success"
+            }, status=200, headers={"X-Answer-Cache": source})
+
+        except Exception as e:
+            chat_metrics.record("json", None, (time.perf_counter() - started) * 1000, ok=False)
+            return Response({"error": str(e)}, status=500)
+
+
+def sse_event(event, data):
+    """Server-Sent Events 한 건 (data 는 JSON 한 줄)"""
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+
+async def aprepare_chat(request):
+    """async 챗봇 뷰 공통: 인증, 요청 검증, PDF 조회, 메시지 구성. (user, pdf, messages, 오류 응답)"""
+    user, error = await aauthenticate(request)
+    if error:
+        return None, None, None, error
+    body, error = parse_json_body(request)
+    if error:
+        return None, None, None, error
+
+    serializer = ChatRequestSerializer(data=body)
+    if not serializer.is_valid():
+        return None, None, None, JsonResponse(serializer.errors, status=400)
+    data = serializer.validated_data
+
+    # blob 은 답변 캐시 키에 쓴다 (이벤트 루프에서는 지연 로딩을 할 수 없으므로 같이 읽음)
+    pdf = await originPDF.objects.select_related("blob").filter(id=data['pdf_id'], user_id=user).afirst()
+    if pdf is None:
+        return None, None, None, JsonResponse({"detail": "해당 PDF를 찾을 수 없습니다."}, status=404)
+
+    # 참고 자료 조회는 sync ORM 이므로 스레드에서 실행
+    messages_payload = await sync_to_async(build_messages)(pdf, data)
+    return user, pdf, messages_payload, None
+
+
+class ChatBotAsyncView(View):
+    """
+    ChatBotView 의 async 버전 (같은 요청/응답 JSON). ASGI 에서 Upstage 응답을 기다리는 동안
+    워커 스레드를 점유하지 않으므로 한 프로세스가 많은 요청을 동시에 기다릴 수 있다.
+    """
+
+    async def post(self, request, *args, **kwargs):
+        user, pdf, messages_payload, error = await aprepare_chat(request)
+        if error:
+            return error
+
+        cache = get_answer_cache()
+        started = time.perf_counter()
+        try:
+            if cache is None:
+                reply, source = await acomplete_chat(messages_payload), MISS
+            else:
+                key = answer_key(pdf, UPSTAGE_CHAT_MODEL, messages_payload)
+                reply, source = await cache.aget_or_call(key, lambda: acomplete_chat(messages_payload))
+        except Exception as e:
+            chat_metrics.record("async", None, (time.perf_counter() - started) * 1000, ok=False)
+            return JsonResponse({"error": str(e)}, status=500)
+
+        duration = (time.perf_counter() - started) * 1000
+        chat_metrics.record("async" if source == MISS else "cached", duration, duration)
+        response = JsonResponse({"reply": reply, "status": "success"}, status=200)
+        response["X-Answer-Cache"] = source
+        return response
+
+
+class ChatBotStreamView(View):
+    """
+    ChatBotView 의 스트리밍 버전. Upstage 응답 토큰을 받는 대로 SSE 로 전달한다.
+    async 뷰이므로 ASGI(config/asgi.py, 예: uvicorn config.asgi:application)에서 실행해야
+    생성 중에 워커를 점유하지 않고 토큰이 바로 전달된다. (WSGI 에서는 응답 전체를 모은 뒤 보낸다)
+    DRF APIView 는 async 를 지원하지 않아 Django View 로 만들고 인증은 config/async_api.py 를 쓴다.
+    """
+
+    async def post(self, request, *args, **kwargs):
+        user, pdf, messages_payload, error = await aprepare_chat(request)
+        if error:
+            return error
+
+        response = StreamingHttpResponse(
+            self._stream(user, pdf, messages_payload), content_type="text/event-stream; charset=utf-8",
+        )
+        response["Cache-Control"] = "no-cache"
+        # nginx 가 응답을 모아서 보내지 않도록
+        response["X-Accel-Buffering"] = "no"
+        return response
+
+    async def _stream(self, user, pdf, messages_payload):
+        started = time.perf_counter()
+        cache = get_answer_cache()
+        key = answer_key(pdf, UPSTAGE_CHAT_MODEL, messages_payload) if cache is not None else None
+        reply = await cache.aget(key) if cache is not None else None
+        if reply is not None:
+            # 저장된 답변은 한 번에 보낸다 (스트리밍은 진행 중인 요청과 합치지 않음)
+            duration = (time.perf_counter() - started) * 1000
+            chat_metrics.record("cached", duration, duration)
+            yield sse_event("token", {"delta": reply})
+            yield sse_event("done", {
+                "reply": reply, "status": "success", "cached": True,
+                "ttft_ms": round(duration, 2), "duration_ms": round(duration, 2),
+            })
+            return
+
+        ttft = None
+        parts = []
+        ok = False
+        try:
+            stream = await get_async_client().chat.completions.create(
+                model=UPSTAGE_CHAT_MODEL,
+                messages=messages_payload,
+                stream=True,
+            )
+            async with stream:
+                async for chunk in stream:
+                    delta = chunk.choices[0].delta.content if chunk.choices else None
+                    if not delta:
+                        continue
+                    if ttft is None:
+                        ttft = (time.perf_counter() - started) * 1000
+                    parts.append(delta)
+                    yield sse_event("token", {"delta": delta})
+
+            ok = True
+            duration = (time.perf_counter() - started) * 1000
+            if cache is not None:
+                await cache.aset(key, "".join(parts), duration)
+            yield sse_event("done", {
+                "reply": "".join(parts),
+                "status": "success",
+                "cached": False,
+                "ttft_ms": round(ttft if ttft is not None else duration, 2),
+                "duration_ms": round(duration, 2),
+            })
+        except Exception:
+            # 응답 헤더는 이미 나갔으므로 오류도 이벤트로 알린다 (자세한 내용은 로그에만 남김)
+            logger.exception("chat stream failed pdf=%s", pdf.id)
+            yield sse_event("error", {"error": STREAM_ERROR_MESSAGE})
+        finally:
+            # 클라이언트가 연결을 끊어 취소된 경우도 여기서 기록
+            duration = (time.perf_counter() - started) * 1000
+            chat_metrics.record("stream", ttft, duration, ok=ok)
+            logger.info(
+                "chat stream user=%s pdf=%s ok=%s ttft=%sms duration=%.2fms chunks=%d",
+                user.pk, pdf.id, ok, round(ttft, 2) if ttft is not None else "-", duration, len(parts),
+            )
+
+
+class ChatMetricsView(APIView):
+    """
+    챗봇 응답 지연 지표(chatbots/metrics.py) 조회
+    """
+    permission_classes = [IsAdminUser]
+
+    @swagger_auto_schema(
+        operation_summary="챗봇 응답 지표",
+        operation_description=(
+            "`latency`: 일반(json) / async / 스트리밍(stream) / 캐시 답변(cached)별 요청 수, 실패 수, "
+            "첫 토큰까지 시간(ttft_ms)과 전체 시간(duration_ms)의 p50 / p95\n"
+            "`answer_cache`: 답변 캐시 hit / miss / coalesced(진행 중인 같은 질문과 합침) 횟수, hit_rate, "
+            "아낀 Upstage 호출 시간(saved_upstream_ms), 저장소(backend)와 항목 수, 제거/만료 횟수 "
+            "(공유 캐시 backend 면 항목 수 등은 null, 캐시를 끄면 answer_cache 가 null)\n"
+            "지표는 이 요청을 처리한 프로세스의 최근 요청 기준입니다.\n"
+            "- 관리자(staff)만 호출할 수 있습니다."
+        ),
+        tags=["ChatBot"],
+        responses={200: "응답 지표", 403: "관리자 아님"},
+    )
+    def get(self, request):
+        cache = get_answer_cache()
+        return Response({
+            "latency": chat_metrics.stats(),
+            "answer_cache": cache.stats() if cache is not None else None,
+        }, status=200)
@@ -0,0 +1,55 @@
+# config/async_api.py
+"""
+DRF APIView 는 async 핸들러를 지원하지 않으므로, async 뷰(Django View 의 async def)에서
+DRF 와 같은 JWT 인증과 JSON 응답을 쓰기 위한 도우미.
+"""
+import json
+
+from asgiref.sync import sync_to_async
+from django.db import connections
+from django.http import JsonResponse
+from rest_framework import exceptions
+from rest_framework_simplejwt.authentication import JWTAuthentication
+
+
+async def aauthenticate(request):
+    """
+    Authorization: Bearer <access_token> 을 검증하고 user 를 반환한다.
+    인증 정보가 없거나 잘못되면 (None, 401 JsonResponse).
+    """
+    try:
+        # 토큰 검증 후 user 조회(ORM)가 있으므로 스레드에서 실행
+        result = await sync_to_async(JWTAuthentication().authenticate)(request)
+    except exceptions.AuthenticationFailed as exc:
+        # DRF 와 같은 본문 (simplejwt 의 InvalidToken 은 detail 이 dict)
+        body = exc.detail if isinstance(exc.detail, dict) else {"detail": exc.detail}
+        return None, JsonResponse(body, status=401)
+    if result is None:
+        return None, JsonResponse({"detail": "자격 인증데이터(authentication credentials)가 제공되지 않았습니다."}, status=401)
+    user, _ = result
+    request.user = user
+    return user, None
+
+
+def parse_json_body(request):
+    """요청 본문 JSON. 형식이 잘못되면 (None, 400 JsonResponse)"""
+    try:
+        return json.loads(request.body or b"{}"), None
+    except ValueError:
+        return None, JsonResponse({"detail": "JSON 형식이 올바르지 않습니다."}, status=400)
+
+
+async def run_blocking(func, *args, **kwargs):
+    """
+    boto3(S3) 처럼 async 클라이언트가 없는 blocking 호출을 공용 스레드 풀에서 실행한다.
+    sync_to_async 기본값(thread_sensitive=True)은 모든 호출이 스레드 하나를 같이 쓰므로
+    오래 걸리는 호출끼리 줄을 서게 된다. 여기서는 호출마다 다른 스레드를 쓰고,
+    그 스레드에서 연 DB 커넥션은 끝날 때 닫는다.
+    """
+    def call():
+        try:
+            return func(*args, **kwargs)
+        finally:
+            connections.close_all()
+
+    return await sync_to_async(call, thread_sensitive=False)()
@@ -1,392 +1,499 @@
-from pathlib import Path
-import os, json
-from django.core.exceptions import ImproperlyConfigured
-from datetime import timedelta
-
-import pymysql
-pymysql.install_as_MySQLdb()
-
-# Build paths inside the project like this: BASE_DIR / 'subdir'.
-BASE_DIR = Path(__file__).resolve().parent.parent
-
-secret_file = os.path.join(BASE_DIR, 'secrets.json') 
-
-with open(secret_file) as f:
-    secrets = json.loads(f.read())
-
-def get_secret(setting, secrets=secrets): 
-# secret 변수를 가져오거나 그렇지 못 하면 예외를 반환
-    try:
-        return secrets[setting]
-    except KeyError:
-        error_msg = "Set the {} environment variable".format(setting)
-        raise ImproperlyConfigured(error_msg)
-
-SECRET_KEY = get_secret("SECRET_KEY")
-# SECURITY WARNING: don't run with debug turned on in production!
-DEBUG = True
-
-ALLOWED_HOSTS = ['*']
-
-
-# Application definition
-
-DJANGO_APPS = [
-    'django.contrib.admin',
-    'django.contrib.auth',
-    'django.contrib.contenttypes',
-    'django.contrib.sessions',
-    'django.contrib.messages',
-    'django.contrib.staticfiles',
-    'django.contrib.sites'
-]
-
-PROJECT_APPS = [
-    'accounts',
-    'pdf_documents',
-    'pdf_figures',
-    'highlights',
-    'chatbots',
-]
-
-THIRD_PARTY_APPS = [
-    "corsheaders",
-    # DRF를 위한 패키지
-    "rest_framework",
-    # JWT를 위한 패키지
-    'rest_framework_simplejwt',
-
-    "dj_rest_auth",
-    "dj_rest_auth.registration",
-    # OAuth를 위한 패키지
-    "allauth",
-    "allauth.account",
-    "allauth.socialaccount",
-    "allauth.socialaccount.providers.google",
-
-    # 다양한 스토리지를 사용하기 위한 패키지
-    "storages",
-    # swagger를 위한 패키지
-    "drf_yasg",
-
-    "rest_framework_simplejwt.token_blacklist"
-]
-
-INSTALLED_APPS = DJANGO_APPS + PROJECT_APPS + THIRD_PARTY_APPS
-
-MIDDLEWARE = [
-    'corsheaders.middleware.CorsMiddleware',  # CORS 미들웨어를 맨 위에 추가
-    'django.middleware.security.SecurityMiddleware',
-    'django.contrib.sessions.middleware.SessionMiddleware',
-    'django.middleware.common.CommonMiddleware',
-    #'django.middleware.csrf.CsrfViewMiddleware',
-    'django.contrib.auth.middleware.AuthenticationMiddleware',
-    'config.middleware.APILoggingMiddleware',  # 커스텀 API 로깅 미들웨어 추가
-    'django.contrib.messages.middleware.MessageMiddleware',
-    'django.middleware.clickjacking.XFrameOptionsMiddleware',
-    "allauth.account.middleware.AccountMiddleware", # allauth 미들웨어
-]
-
-ROOT_URLCONF = 'config.urls'
-
-TEMPLATES = [
-    {
-        'BACKEND': 'django.template.backends.django.DjangoTemplates',
-        'DIRS': [],
-        'APP_DIRS': True,
-        'OPTIONS': {
-            'context_processors': [
-                'django.template.context_processors.debug',
-                'django.template.context_processors.request',
-                'django.contrib.auth.context_processors.auth',
-                'django.contrib.messages.context_processors.messages',
-            ],
-        },
-    },
-]
-
-WSGI_APPLICATION = 'config.wsgi.application'
-
-# Custom User Model
-AUTH_USER_MODEL = 'accounts.User'
-
-
-# Database
-# https://docs.djangoproject.com/en/5.1/ref/settings/#databases
-RDS_HOST = get_secret("RDS_HOST")
-RDS_PORT = get_secret("RDS_PORT")
-RDS_DB_NAME = get_secret("RDS_DB_NAME")
-RDS_USERNAME = get_secret("RDS_USERNAME")
-RDS_PASSWORD = get_secret("RDS_PASSWORD")
-DATABASES = {
-	'default': {
-		'ENGINE': 'django.db.backends.mysql',
-		'NAME': RDS_DB_NAME,
-		'USER': RDS_USERNAME,
-		'PASSWORD': RDS_PASSWORD,
-		'HOST': RDS_HOST,
-		'PORT': RDS_PORT,
-	}
-}
-
-# 로컬 테스트용
-# DATABASES = {
-#     'default': {
-#         'ENGINE': 'django.db.backends.sqlite3',
-#         'NAME': BASE_DIR / 'db.sqlite3',
-#     }
-# }
-
-
-# Password validation
-# https://docs.djangoproject.com/en/5.1/ref/settings/#auth-password-validators
-
-AUTH_PASSWORD_VALIDATORS = [
-    {
-        'NAME': 'django.contrib.auth.password_validation.UserAttributeSimilarityValidator',
-    },
-    {
-        'NAME': 'django.contrib.auth.password_validation.MinimumLengthValidator',
-    },
-    {
-        'NAME': 'django.contrib.auth.password_validation.CommonPasswordValidator',
-    },
-    {
-        'NAME': 'django.contrib.auth.password_validation.NumericPasswordValidator',
-    },
-]
-
-
-# Internationalization
-# https://docs.djangoproject.com/en/5.1/topics/i18n/
-
-LANGUAGE_CODE = 'en-us'
-
-# 타임존을 서울로 변경
-# TIME_ZONE = 'UTC'
-TIME_ZONE = 'Asia/Seoul'
-
-USE_I18N = True
-
-USE_TZ = True
-
-
-# Static files (CSS, JavaScript, Images)
-# https://docs.djangoproject.com/en/5.1/howto/static-files/
-
-STATIC_URL = 'static/'
-
-# Default primary key field type
-# https://docs.djangoproject.com/en/5.1/ref/settings/#default-auto-field
-
-DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
-
-# 인증 관련 요청(쿠키, 세션 등)을 허용
-# 예를 들어 브라우저가 백엔드 서버로 쿠키를 전송하거나, 백엔드에서 쿠키를 응답으로 보낼 수 있음
-CORS_ALLOW_CREDENTIALS = True
-
-# 서버로 요청 보낼 수 있는 도메인들 정의
-# 여기에서의 localhost는 EC2 인스턴스의 로컬환경이 아니라 프론트엔드 개발 로컬 환경 의미
-# 3000 포트는 프론트엔드 React 애플리케이션의 포트 번호
-# 추후 프론트엔드에서 웹 페이지 배포 후 도메인 매핑했다면 해당 도메인 추가 필요
-CORS_ALLOWED_ORIGINS = [ 
-    "http://localhost:8000",
-    "http://127.0.0.1:8000",
-]
-
-# DRF (Django Rest Framework) 설정
-REST_FRAMEWORK = {
-    'DEFAULT_AUTHENTICATION_CLASSES': (
-        # API 요청 시 인증을 위해 'simplejwt'의 JWT 인증을 사용
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
-    )
-}
-
-# REST_USE_JWT = True
-
-# REST_AUTH_TOKEN_MODEL = None
-
-# # JWT가 HTTP 헤더가 아닌 쿠키를 통해 전송되도록 설정 (API 서버-클라이언트 방식이므로 False)
-# # dj-rest-auth 기본값은 False이지만 명시적으로 설정
-# JWT_AUTH_COOKIE = None 
-# JWT_AUTH_REFRESH_COOKIE = None
-
-# ----- dj-rest-auth v5 설정 -----
-REST_AUTH = {
-    # 토큰 모델을 끄면 authtoken을 요구하지 않음
-    'TOKEN_MODEL': None,
-    'REST_SESSION_LOGIN': False,
-    # JWT 사용
-    'USE_JWT': True,
-
-    # (쿠키를 안 쓸 거면 None 유지)
-    # 'JWT_AUTH_COOKIE': None,
-    # 'JWT_AUTH_REFRESH_COOKIE': None,
-
-    "JWT_AUTH_COOKIE": "access_token",
-    "JWT_AUTH_REFRESH_COOKIE": "refresh_token",
-    "JWT_AUTH_HTTPONLY": False,
-    # 필요하면 여기에 다른 옵션들도 REST_AUTH 안에 넣습니다.
-    "LOGOUT_VIEW_CLASS": "accounts.views.LogoutView",
-}
-
-
-
-# allauth가 사용하는 기본 사이트 ID. (django.contrib.sites 앱이 필요함)
-# DJANGO_APPS에 'django.contrib.sites'를 추가해야 합니다.
-SITE_ID = 1
-
-# allauth 관련 설정
-# ------------------------------------------------
-# 인증 백엔드: Django 기본 인증 + allauth 이메일 인증
-AUTHENTICATION_BACKENDS = (
-    'django.contrib.auth.backends.ModelBackend', # Django 기본 인증
-    'allauth.account.auth_backends.AuthenticationBackend', # allauth 인증
-)
-
-# 소셜 로그인 시 이메일 주소는 필수로 받음
-SOCIALACCOUNT_EMAIL_REQUIRED = True
-# 소셜 로그인 시 사용자에게 별도로 이메일 확인을 받지 않음 (개발 편의성)
-ACCOUNT_EMAIL_VERIFICATION = 'none' 
-# 사용자 이름(username) 대신 이메일을 ID로 사용
-ACCOUNT_AUTHENTICATION_METHOD = 'email'
-ACCOUNT_EMAIL_REQUIRED = True
-ACCOUNT_USERNAME_REQUIRED = False # username 필드를 사용하지 않음
-ACCOUNT_USER_MODEL_USERNAME_FIELD = None # username 필드를 사용하지 않음
-
-
-# Google 소셜 로그인 관련 설정
-# ------------------------------------------------
-SOCIALACCOUNT_PROVIDERS = {
-    'google': {
-        'APP': {
-            # 🔑 이 부분은 secrets.json에서 불러오도록 수정하세요.
-            'client_id': get_secret("GOOGLE_CLIENT_ID_WEB"),
-            'secret': get_secret("GOOGLE_CLIENT_SECRET_WEB"),
-        },
-        'SCOPE': [ # Google로부터 요청할 사용자 정보 범위
-            'openid',
-            'profile',
-            'email',
-        ],
-        'AUTH_PARAMS': {
-            'access_type': 'offline',
-        }
-    }
-}
-
-
-SIMPLE_JWT = {
-    # 1. 우리가 사용할 기본 키 필드 지정 (기본값: 'id')
-    'USER_ID_FIELD': 'user_id',
-    
-    # 2. JWT 토큰의 "user_id" 클레임 이름 (기본값: 'user_id')
-    'USER_ID_CLAIM': 'user_id', # 이것도 user_id로 명시
-
-    # 3. 토큰 유효 시간 설정 (선택 사항이지만 권장)
-    'ACCESS_TOKEN_LIFETIME': timedelta(hours=1),   # Access Token 유효 시간 (예: 1시간)
-    'REFRESH_TOKEN_LIFETIME': timedelta(days=7),    # Refresh Token 유효 시간 (예: 7일)
-    
-    # 4. 기타 설정
-    'AUTH_HEADER_TYPES': ('Bearer',), # 인증 헤더 타입 (Bearer <token>)
-    'AUTH_HEADER_NAME': 'HTTP_AUTHORIZATION', # 인증 헤더 이름
-}
-
-###AWS###
-AWS_ACCESS_KEY_ID = get_secret("AWS_ACCESS_KEY_ID") # .csv 파일에 있는 내용을 입력 Access key ID. IAM 계정 관련
-AWS_SECRET_ACCESS_KEY = get_secret("AWS_SECRET_ACCESS_KEY") # .csv 파일에 있는 내용을 입력 Secret access key. IAM 계정 관련
-AWS_REGION = 'ap-northeast-2'
-
-###S3###
-AWS_STORAGE_BUCKET_NAME = get_secret("AWS_STORAGE_BUCKET_NAME")
-#AWS_S3_CUSTOM_DOMAIN = '%s.s3.%s.amazonaws.com' % (AWS_STORAGE_BUCKET_NAME,AWS_REGION)
-AWS_S3_CUSTOM_DOMAIN = f"{AWS_STORAGE_BUCKET_NAME}.s3.{AWS_REGION}.amazonaws.com"
-
-AWS_S3_OBJECT_PARAMETERS = {
-    'CacheControl': 'max-age=86400',
-}
-
-OCR_SERVER = get_secret("OCR_SERVER")
-
-SWAGGER_SETTINGS = {
-    "SECURITY_DEFINITIONS": {
-        "Bearer": {
-            "type": "apiKey",
-            "name": "Authorization",
-            "in": "header",
-            "description": 'JWT 토큰 입력. 예) "Bearer <access_token>"',
-        }
-    },
-    "USE_SESSION_AUTH": False,  # 세션 인증 버튼 비표시 (JWT만 쓸 때 권장)
-}
-
-
-
-# --- 로깅 설정 시작 ---
-
-LOG_DIR = BASE_DIR / "logs"
-
-try:
-    LOG_DIR.mkdir(parents=True, exist_ok=True)
-except Exception as e:
-    # 디렉토리 생성 실패 시, 파일 로그 없이 콘솔 로그만 쓰도록 fallback
-    LOG_DIR = None
-
-LOGGING = {
-    "version": 1,
-    "disable_existing_loggers": False,
-
-    "formatters": {
-        "verbose": {
-            "format": "[{asctime}] [{levelname}] [{name}] {message}",
-            "style": "{",
-        },
-    },
-
-    "handlers": {
-        "console": {
-            "class": "logging.StreamHandler",
-            "formatter": "verbose",
-        },
-        # 여기서 LOG_DIR 이 있을 때만 파일 핸들러 추가
-        **(
-            {
-                "api_file": {
-                    "class": "logging.handlers.TimedRotatingFileHandler",
-                    "filename": str(LOG_DIR / "api.log"),
-                    "when": "midnight",
-                    "backupCount": 7,
-                    "encoding": "utf-8",
-                    "formatter": "verbose",
-                }
-            }
-            if LOG_DIR is not None
-            else {}
-        ),
-    },
-
-    "loggers": {
-        # 우리가 직접 쓰는 API 로거
-        "api": {
-            "handlers": ["console", "api_file"],
-            "level": "INFO",    # 개발 중이라면 DEBUG로 내려도 됨
-            "propagate": False,
-        },
-
-        # 기본 django 로그(경고 이상만)
-        "django": {
-            "handlers": ["console"],
-            "level": "WARNING",
-            "propagate": True,
-        },
-        "django.request": {
-            "handlers": ["console"],
-            "level": "ERROR",
-            "propagate": False,
-        },
-    },
-}
-
-# --- 로깅 설정 끝 ---
-
-UPSTAGE_API_KEY = get_secret("UPSTAGE_API_KEY")
\ No newline at end of file
+from pathlib import Path
+import os, json
+from django.core.exceptions import ImproperlyConfigured
+from datetime import timedelta
+
+import pymysql
+pymysql.install_as_MySQLdb()
+
+# Build paths inside the project like this: BASE_DIR / 'subdir'.
+BASE_DIR = Path(__file__).resolve().parent.parent
+
+secret_file = os.path.join(BASE_DIR, 'secrets.json') 
+
+with open(secret_file) as f:
+    secrets = json.loads(f.read())
+
+def get_secret(setting, secrets=secrets): 
+# secret 변수를 가져오거나 그렇지 못 하면 예외를 반환
+    try:
+        return secrets[setting]
+    except KeyError:
+        error_msg = "Set the {} environment variable".format(setting)
+        raise ImproperlyConfigured(error_msg)
+
+SECRET_KEY = get_secret("SECRET_KEY")
+# SECURITY WARNING: don't run with debug turned on in production!
+DEBUG = True
+
+ALLOWED_HOSTS = ['*']
+
+
+# Application definition
+
+DJANGO_APPS = [
+    'django.contrib.admin',
+    'django.contrib.auth',
+    'django.contrib.contenttypes',
+    'django.contrib.sessions',
+    'django.contrib.messages',
+    'django.contrib.staticfiles',
+    'django.contrib.sites'
+]
+
+PROJECT_APPS = [
+    'accounts',
+    'pdf_documents',
+    'pdf_figures',
+    'highlights',
+    'chatbots',
+    'searches',
+]
+
+THIRD_PARTY_APPS = [
+    "corsheaders",
+    # DRF를 위한 패키지
+    "rest_framework",
+    # JWT를 위한 패키지
+    'rest_framework_simplejwt',
+
+    "dj_rest_auth",
+    "dj_rest_auth.registration",
+    # OAuth를 위한 패키지
+    "allauth",
+    "allauth.account",
+    "allauth.socialaccount",
+    "allauth.socialaccount.providers.google",
+
+    # 다양한 스토리지를 사용하기 위한 패키지
+    "storages",
+    # swagger를 위한 패키지
+    "drf_yasg",
+
+    "rest_framework_simplejwt.token_blacklist"
+]
+
+INSTALLED_APPS = DJANGO_APPS + PROJECT_APPS + THIRD_PARTY_APPS
+
+MIDDLEWARE = [
+    'corsheaders.middleware.CorsMiddleware',  # CORS 미들웨어를 맨 위에 추가
+    'django.middleware.security.SecurityMiddleware',
+    'django.contrib.sessions.middleware.SessionMiddleware',
+    'django.middleware.common.CommonMiddleware',
+    #'django.middleware.csrf.CsrfViewMiddleware',
+    'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'config.middleware.APILoggingMiddleware',  # 커스텀 API 로깅 미들웨어 추가
+    'django.contrib.messages.middleware.MessageMiddleware',
+    'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    "allauth.account.middleware.AccountMiddleware", # allauth 미들웨어
+]
+
+ROOT_URLCONF = 'config.urls'
+
+TEMPLATES = [
+    {
+        'BACKEND': 'django.template.backends.django.DjangoTemplates',
+        'DIRS': [],
+        'APP_DIRS': True,
+        'OPTIONS': {
+            'context_processors': [
+                'django.template.context_processors.debug',
+                'django.template.context_processors.request',
+                'django.contrib.auth.context_processors.auth',
+                'django.contrib.messages.context_processors.messages',
+            ],
+        },
+    },
+]
+
+WSGI_APPLICATION = 'config.wsgi.application'
+# async 뷰(챗봇 스트리밍, async 업로드 등)는 uvicorn config.asgi:application 으로 실행
+ASGI_APPLICATION = 'config.asgi.application'
+
+# Custom User Model
+AUTH_USER_MODEL = 'accounts.User'
+
+
+# Database
+# https://docs.djangoproject.com/en/5.1/ref/settings/#databases
+RDS_HOST = get_secret("RDS_HOST")
+RDS_PORT = get_secret("RDS_PORT")
+RDS_DB_NAME = get_secret("RDS_DB_NAME")
+RDS_USERNAME = get_secret("RDS_USERNAME")
+RDS_PASSWORD = get_secret("RDS_PASSWORD")
+DATABASES = {
+	'default': {
+		'ENGINE': 'django.db.backends.mysql',
+		'NAME': RDS_DB_NAME,
+		'USER': RDS_USERNAME,
+		'PASSWORD': RDS_PASSWORD,
+		'HOST': RDS_HOST,
+		'PORT': RDS_PORT,
+	}
+}
+
+# 로컬 테스트용
+# DATABASES = {
+#     'default': {
+#         'ENGINE': 'django.db.backends.sqlite3',
+#         'NAME': BASE_DIR / 'db.sqlite3',
+#     }
+# }
+
+
+# Password validation
+# https://docs.djangoproject.com/en/5.1/ref/settings/#auth-password-validators
+
+AUTH_PASSWORD_VALIDATORS = [
+    {
+        'NAME': 'django.contrib.auth.password_validation.UserAttributeSimilarityValidator',
+    },
+    {
+        'NAME': 'django.contrib.auth.password_validation.MinimumLengthValidator',
+    },
+    {
+        'NAME': 'django.contrib.auth.password_validation.CommonPasswordValidator',
+    },
+    {
+        'NAME': 'django.contrib.auth.password_validation.NumericPasswordValidator',
+    },
+]
+
+
+# Internationalization
+# https://docs.djangoproject.com/en/5.1/topics/i18n/
+
+LANGUAGE_CODE = 'en-us'
+
+# 타임존을 서울로 변경
+# TIME_ZONE = 'UTC'
+TIME_ZONE = 'Asia/Seoul'
+
+USE_I18N = True
+
+USE_TZ = True
+
+
+# Static files (CSS, JavaScript, Images)
+# https://docs.djangoproject.com/en/5.1/howto/static-files/
+
+STATIC_URL = 'static/'
+
+# Default primary key field type
+# https://docs.djangoproject.com/en/5.1/ref/settings/#default-auto-field
+
+DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
+
+# 인증 관련 요청(쿠키, 세션 등)을 허용
+# 예를 들어 브라우저가 백엔드 서버로 쿠키를 전송하거나, 백엔드에서 쿠키를 응답으로 보낼 수 있음
+CORS_ALLOW_CREDENTIALS = True
+
+# 서버로 요청 보낼 수 있는 도메인들 정의
+# 여기에서의 localhost는 EC2 인스턴스의 로컬환경이 아니라 프론트엔드 개발 로컬 환경 의미
+# 3000 포트는 프론트엔드 React 애플리케이션의 포트 번호
+# 추후 프론트엔드에서 웹 페이지 배포 후 도메인 매핑했다면 해당 도메인 추가 필요
+CORS_ALLOWED_ORIGINS = [ 
+    "http://localhost:8000",
+    "http://127.0.0.1:8000",
+]
+
+# DRF (Django Rest Framework) 설정
+REST_FRAMEWORK = {
+    'DEFAULT_AUTHENTICATION_CLASSES': (
+        # API 요청 시 인증을 위해 'simplejwt'의 JWT 인증을 사용
+        'rest_framework_simplejwt.authentication.JWTAuthentication',
+    )
+}
+
+# REST_USE_JWT = True
+
+# REST_AUTH_TOKEN_MODEL = None
+
+# # JWT가 HTTP 헤더가 아닌 쿠키를 통해 전송되도록 설정 (API 서버-클라이언트 방식이므로 False)
+# # dj-rest-auth 기본값은 False이지만 명시적으로 설정
+# JWT_AUTH_COOKIE = None 
+# JWT_AUTH_REFRESH_COOKIE = None
+
+# ----- dj-rest-auth v5 설정 -----
+REST_AUTH = {
+    # 토큰 모델을 끄면 authtoken을 요구하지 않음
+    'TOKEN_MODEL': None,
+    'REST_SESSION_LOGIN': False,
+    # JWT 사용
+    'USE_JWT': True,
+
+    # (쿠키를 안 쓸 거면 None 유지)
+    # 'JWT_AUTH_COOKIE': None,
+    # 'JWT_AUTH_REFRESH_COOKIE': None,
+
+    "JWT_AUTH_COOKIE": "access_token",
+    "JWT_AUTH_REFRESH_COOKIE": "refresh_token",
+    "JWT_AUTH_HTTPONLY": False,
+    # 필요하면 여기에 다른 옵션들도 REST_AUTH 안에 넣습니다.
+    "LOGOUT_VIEW_CLASS": "accounts.views.LogoutView",
+}
+
+
+
+# allauth가 사용하는 기본 사이트 ID. (django.contrib.sites 앱이 필요함)
+# DJANGO_APPS에 'django.contrib.sites'를 추가해야 합니다.
+SITE_ID = 1
+
+# allauth 관련 설정
+# ------------------------------------------------
+# 인증 백엔드: Django 기본 인증 + allauth 이메일 인증
+AUTHENTICATION_BACKENDS = (
+    'django.contrib.auth.backends.ModelBackend', # Django 기본 인증
+    'allauth.account.auth_backends.AuthenticationBackend', # allauth 인증
+)
+
+# 소셜 로그인 시 이메일 주소는 필수로 받음
+SOCIALACCOUNT_EMAIL_REQUIRED = True
+# 소셜 로그인 시 사용자에게 별도로 이메일 확인을 받지 않음 (개발 편의성)
+ACCOUNT_EMAIL_VERIFICATION = 'none' 
+# 사용자 이름(username) 대신 이메일을 ID로 사용
+ACCOUNT_AUTHENTICATION_METHOD = 'email'
+ACCOUNT_EMAIL_REQUIRED = True
+ACCOUNT_USERNAME_REQUIRED = False # username 필드를 사용하지 않음
+ACCOUNT_USER_MODEL_USERNAME_FIELD = None # username 필드를 사용하지 않음
+
+
+# Google 소셜 로그인 관련 설정
+# ------------------------------------------------
+SOCIALACCOUNT_PROVIDERS = {
+    'google': {
+        'APP': {
+            # 🔑 이 부분은 secrets.json에서 불러오도록 수정하세요.
+            'client_id': get_secret("GOOGLE_CLIENT_ID_WEB"),
+            'secret': get_secret("GOOGLE_CLIENT_SECRET_WEB"),
+        },
+        'SCOPE': [ # Google로부터 요청할 사용자 정보 범위
+            'openid',
+            'profile',
+            'email',
+        ],
+        'AUTH_PARAMS': {
+            'access_type': 'offline',
+        }
+    }
+}
+
+
+SIMPLE_JWT = {
+    # 1. 우리가 사용할 기본 키 필드 지정 (기본값: 'id')
+    'USER_ID_FIELD': 'user_id',
+    
+    # 2. JWT 토큰의 "user_id" 클레임 이름 (기본값: 'user_id')
+    'USER_ID_CLAIM': 'user_id', # 이것도 user_id로 명시
+
+    # 3. 토큰 유효 시간 설정 (선택 사항이지만 권장)
+    'ACCESS_TOKEN_LIFETIME': timedelta(hours=1),   # Access Token 유효 시간 (예: 1시간)
+    'REFRESH_TOKEN_LIFETIME': timedelta(days=7),    # Refresh Token 유효 시간 (예: 7일)
+    
+    # 4. 기타 설정
+    'AUTH_HEADER_TYPES': ('Bearer',), # 인증 헤더 타입 (Bearer <token>)
+    'AUTH_HEADER_NAME': 'HTTP_AUTHORIZATION', # 인증 헤더 이름
+}
+
+###AWS###
+AWS_ACCESS_KEY_ID = get_secret("AWS_ACCESS_KEY_ID") # .csv 파일에 있는 내용을 입력 Access key ID. IAM 계정 관련
+AWS_SECRET_ACCESS_KEY = get_secret("AWS_SECRET_ACCESS_KEY") # .csv 파일에 있는 내용을 입력 Secret access key. IAM 계정 관련
+AWS_REGION = 'ap-northeast-2'
+
+###S3###
+AWS_STORAGE_BUCKET_NAME = get_secret("AWS_STORAGE_BUCKET_NAME")
+#AWS_S3_CUSTOM_DOMAIN = '%s.s3.%s.amazonaws.com' % (AWS_STORAGE_BUCKET_NAME,AWS_REGION)
+AWS_S3_CUSTOM_DOMAIN = f"{AWS_STORAGE_BUCKET_NAME}.s3.{AWS_REGION}.amazonaws.com"
+
+AWS_S3_OBJECT_PARAMETERS = {
+    'CacheControl': 'max-age=86400',
+}
+
+# 프로세스 공용 S3 클라이언트 설정 (pdf_documents/storage.py)
+# 커넥션 풀 크기: 스트리밍 업로드/OCR 구간 업로드 스레드가 함께 쓰므로 동시 part 수보다 넉넉하게
+AWS_S3_MAX_POOL_CONNECTIONS = 32
+AWS_S3_CONNECT_TIMEOUT = 5
+AWS_S3_READ_TIMEOUT = 60
+# 재시도 포함 최대 시도 횟수 (botocore standard retry mode)
+AWS_S3_MAX_ATTEMPTS = 5
+
+# 삭제된 문서의 S3 객체 정리 (purge_deleted_pdfs 명령)
+# key 하나당 최대 시도 횟수 (넘으면 대기열에 남기고 더 시도하지 않음)
+S3_PURGE_MAX_ATTEMPTS = 8
+# 실패 시 재시도 간격의 기준(초). 시도할 때마다 두 배
+S3_PURGE_RETRY_BASE_SECONDS = 30
+
+# 브라우저 → S3 직접 업로드 (pdf_documents/direct_upload.py)
+# 업로드 가능한 최대 크기 (presigned POST 정책과 confirm 시 HEAD 검사에 사용)
+PDF_UPLOAD_MAX_BYTES = 200 * 1024 * 1024
+# 이 크기 이상이면 presigned POST 대신 multipart upload URL 을 발급
+PDF_UPLOAD_MULTIPART_THRESHOLD = 32 * 1024 * 1024
+PDF_UPLOAD_PART_SIZE = 16 * 1024 * 1024
+# presigned URL 유효 시간(초)
+PDF_UPLOAD_URL_EXPIRES = 900
+# upload_token 으로 confirm 할 수 있는 시간(초)
+PDF_UPLOAD_TOKEN_MAX_AGE = 6 * 60 * 60
+
+# 서버 경유 업로드(PDFUploadView): 요청 본문을 받는 대로 S3 multipart part 로 올림 (pdf_documents/uploads.py)
+PDF_STREAM_UPLOAD_ENABLED = True
+# part 크기 (S3 최소 5MiB)
+PDF_STREAM_UPLOAD_PART_SIZE = 8 * 1024 * 1024
+# 동시에 올릴 part 수
+PDF_STREAM_UPLOAD_CONCURRENCY = 4
+# 요청 하나가 part 버퍼로 쓸 수 있는 최대 메모리
+PDF_STREAM_UPLOAD_MAX_MEMORY = 48 * 1024 * 1024
+
+OCR_SERVER = get_secret("OCR_SERVER")
+# 페이지 분할 모드에서 요청을 나눠 보낼 OCR 서버 목록 (secrets.json 에 없으면 OCR_SERVER 하나만 사용)
+OCR_SERVERS = secrets.get("OCR_SERVERS") or [OCR_SERVER]
+# 0 이면 문서 전체를 한 번에 요청, N 이면 N 페이지씩 나눠서 병렬로 요청
+OCR_SHARD_PAGES = 0
+# 동시에 진행할 구간 요청 수
+OCR_SHARD_CONCURRENCY = 4
+# 구간별 재시도 횟수 (실패한 구간만 다시 요청)
+OCR_SHARD_RETRIES = 2
+# 구간마다 앞뒤로 더 붙여 보낼 페이지 수. 본문과 그림이 이 페이지 수 안에 있으면 구간이 달라도 매칭된다
+# (더 멀리 떨어진 본문-그림 매칭은 구간을 나누면 빠짐)
+OCR_SHARD_OVERLAP_PAGES = 2
+# born-digital PDF 는 텍스트 레이어를 로컬에서 읽고, 텍스트가 없거나 이미지가 있는 페이지만 OCR 서버로 보냄 (text_layer.py)
+# 주의: OCR 서버로 보내지 않은 페이지의 본문은 그림과 매칭되지 않는다 (다른 페이지의 그림을 가리키는 본문도 포함).
+# 또 켜면 모든 작업이 원본 PDF 를 워커로 내려받는다. 매칭보다 OCR 비용/지연이 중요한 배포에서만 켠다
+OCR_TEXT_LAYER_ENABLED = False
+# 공백 제외 이 글자 수 이상이면 텍스트 레이어를 그대로 사용
+OCR_TEXT_LAYER_MIN_CHARS = 30
+# OCR 서버 응답의 page_num 시작 번호 (로컬 텍스트 페이지 번호도 이 기준으로 저장)
+OCR_PAGE_NUM_BASE = 1
+# OCR 결과 저장 시 bulk_create 한 번에 넣을 행 수
+OCR_INGEST_BATCH_SIZE = 500
+# OCR 응답을 스트리밍으로 읽을 때 한 번에 읽을 바이트 수
+OCR_STREAM_CHUNK_SIZE = 64 * 1024
+# running 작업의 heartbeat 갱신 간격(초). 이 시간(초) 넘게 갱신이 없으면 워커가 죽은 것으로 보고 다시 queued 로 돌림
+OCR_JOB_HEARTBEAT_INTERVAL = 30
+OCR_JOB_HEARTBEAT_TIMEOUT = 5 * 60
+# 작업 하나를 워커가 집어갈 수 있는 최대 횟수 (넘으면 다시 queued 로 돌리지 않고 실패 처리)
+OCR_JOB_MAX_ATTEMPTS = 3
+
+# PDFpageGetView cursor 페이지네이션 (limit 파라미터 기본값 / 최대값)
+PDF_PAGE_LIST_PAGE_SIZE = 50
+PDF_PAGE_LIST_MAX_PAGE_SIZE = 500
+
+# 문서 검색 (searches 앱)
+# 색인 생성 시 메모리에 모았다가 term 별 한 행으로 묶어 저장할 (검색 단위, term) 개수
+SEARCH_INDEX_BATCH_SIZE = 200000
+# 검색 결과 limit 파라미터 기본값 / 최대값
+SEARCH_RESULT_LIMIT = 20
+SEARCH_RESULT_MAX_LIMIT = 100
+# 서재 전체 검색에서 문서마다 보여줄 상위 항목 수
+SEARCH_HITS_PER_DOCUMENT = 3
+
+# 문서 조회 응답(JSON) 캐시 (pdf_documents/response_cache.py)
+# 기본은 프로세스 메모리 LRU. 운영에서 여러 프로세스가 공유하려면 secrets.json 에
+# {"BACKEND": "pdf_documents.response_cache.DjangoCacheBackend", "OPTIONS": {"alias": "default"}} 처럼 지정
+PDF_RESPONSE_CACHE = secrets.get("PDF_RESPONSE_CACHE") or {
+    "BACKEND": "pdf_documents.response_cache.LocMemLRUBackend",
+    "OPTIONS": {"max_entries": 1000, "max_bytes": 64 * 1024 * 1024},
+}
+
+SWAGGER_SETTINGS = {
+    "SECURITY_DEFINITIONS": {
+        "Bearer": {
+            "type": "apiKey",
+            "name": "Authorization",
+            "in": "header",
+            "description": 'JWT 토큰 입력. 예) "Bearer <access_token>"',
+        }
+    },
+    "USE_SESSION_AUTH": False,  # 세션 인증 버튼 비표시 (JWT만 쓸 때 권장)
+}
+
+
+
+# --- 로깅 설정 시작 ---
+
+LOG_DIR = BASE_DIR / "logs"
+
+try:
+    LOG_DIR.mkdir(parents=True, exist_ok=True)
+except Exception as e:
+    # 디렉토리 생성 실패 시, 파일 로그 없이 콘솔 로그만 쓰도록 fallback
+    LOG_DIR = None
+
+LOGGING = {
+    "version": 1,
+    "disable_existing_loggers": False,
+
+    "formatters": {
+        "verbose": {
+            "format": "[{asctime}] [{levelname}] [{name}] {message}",
+            "style": "{",
+        },
+    },
+
+    "handlers": {
+        "console": {
+            "class": "logging.StreamHandler",
+            "formatter": "verbose",
+        },
+        # 여기서 LOG_DIR 이 있을 때만 파일 핸들러 추가
+        **(
+            {
+                "api_file": {
+                    "class": "logging.handlers.TimedRotatingFileHandler",
+                    "filename": str(LOG_DIR / "api.log"),
+                    "when": "midnight",
+                    "backupCount": 7,
+                    "encoding": "utf-8",
+                    "formatter": "verbose",
+                }
+            }
+            if LOG_DIR is not None
+            else {}
+        ),
+    },
+
+    "loggers": {
+        # 우리가 직접 쓰는 API 로거
+        "api": {
+            "handlers": ["console", "api_file"],
+            "level": "INFO",    # 개발 중이라면 DEBUG로 내려도 됨
+            "propagate": False,
+        },
+
+        # 기본 django 로그(경고 이상만)
+        "django": {
+            "handlers": ["console"],
+            "level": "WARNING",
+            "propagate": True,
+        },
+        "django.request": {
+            "handlers": ["console"],
+            "level": "ERROR",
+            "propagate": False,
+        },
+    },
+}
+
+# --- 로깅 설정 끝 ---
+
+UPSTAGE_API_KEY = get_secret("UPSTAGE_API_KEY")
+# 챗봇 참고 자료(chatbots/context.py) 최대 추정 토큰 수, 잘라서라도 넣을 항목의 최소 토큰 수
+CHAT_CONTEXT_TOKEN_BUDGET = 3000
+CHAT_CONTEXT_MIN_ITEM_TOKENS = 50
+# 선택한 참고 자료가 없을 때 문서 청크 색인에서 찾아 넣을 발췌 (searches/retrieval.py)
+CHAT_RETRIEVAL_ENABLED = True
+CHAT_RETRIEVAL_CHUNK_CHARS = 600
+CHAT_RETRIEVAL_CHUNK_OVERLAP = 100
+CHAT_RETRIEVAL_TOP_K = 4
+# 프로세스에 읽어 둘 문서 청크 색인 수 (LRU)
+CHAT_RETRIEVAL_CACHE_SIZE = 64
+# 챗봇 답변 캐시 (chatbots/answer_cache.py): 저장소(PDF_RESPONSE_CACHE 와 같은 backend), 유효 시간(초),
+# 진행 중인 같은 질문의 결과를 기다리는 최대 시간(초, 넘으면 직접 호출)
+# 여러 프로세스가 답변을 공유하려면 secrets.json 에
+# {"BACKEND": "pdf_documents.response_cache.DjangoCacheBackend", "OPTIONS": {"alias": "default", "key_prefix": "chat-answer"}}
+CHAT_ANSWER_CACHE_ENABLED = True
+CHAT_ANSWER_CACHE = secrets.get("CHAT_ANSWER_CACHE") or {
+    "BACKEND": "pdf_documents.response_cache.LocMemLRUBackend",
+    "OPTIONS": {"max_entries": 1000, "max_bytes": 16 * 1024 * 1024},
+}
+CHAT_ANSWER_CACHE_TTL = 60 * 60
+CHAT_ANSWER_COALESCE_TIMEOUT = 120
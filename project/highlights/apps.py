@@ -1,6 +1,10 @@
-from django.apps import AppConfig
-
-
-class HighlightsConfig(AppConfig):
-    default_auto_field = 'django.db.models.BigAutoField'
-    name = 'highlights'
+from django.apps import AppConfig
+
+
+class HighlightsConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'highlights'
+
+    def ready(self):
+        # Tag / Highlight 변경 시 문서 버전 증가
+        from . import signals  # noqa: F401
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.6 on 2026-10-18 16:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('highlights', '0003_highlight_page_id_highlight_pdf_id'),
+        ('pdf_documents', '0011_hot_lookup_indexes'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='highlight',
+            index=models.Index(fields=['pdf_id', 'page_id'], name='highlight_pdf_page_idx'),
+        ),
+    ]
@@ -1,14 +1,14 @@
-from rest_framework import serializers
-from .models import Tag, Highlight
-
-class TagSerializer(serializers.ModelSerializer):
-    class Meta:
-        model = Tag
-        fields = ['id', 'pdf_id', 'color', 'tag_detail']
-        read_only_fields = ['id']
-
-class HighlightSerializer(serializers.ModelSerializer):
-    class Meta:
-        model = Highlight
-        fields = ['id', 'pdf_id', 'page_id', 'Tag_id', 'highlight_text', 'highlight_box']
+from rest_framework import serializers
+from .models import Tag, Highlight
+
+class TagSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = Tag
+        fields = ['id', 'pdf_id', 'color', 'tag_detail']
+        read_only_fields = ['id']
+
+class HighlightSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = Highlight
+        fields = ['id', 'pdf_id', 'page_id', 'Tag_id', 'highlight_text', 'highlight_box']
         read_only_fields = ['id', 'created_at']
\ No newline at end of file
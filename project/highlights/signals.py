@@ -0,0 +1,21 @@
+# highlights/signals.py
+"""
+Tag / Highlight 가 바뀌면 소속 문서의 주석 버전(highlight_version)을 올린다
+(tags / highlights / bundle 조회의 ETag 무효화, pdf_documents/versions.py).
+문서 버전(version)은 그대로 두므로 pages / figures / matches 의 ETag 와 응답 캐시는 유지된다.
+queryset.update() / bulk_create() 는 signal 을 보내지 않으므로 그런 경로는 직접 bump_highlight_version 을 호출한다.
+"""
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from pdf_documents.versions import bump_highlight_version
+
+from .models import Tag, Highlight
+
+
+@receiver(post_save, sender=Tag)
+@receiver(post_delete, sender=Tag)
+@receiver(post_save, sender=Highlight)
+@receiver(post_delete, sender=Highlight)
+def bump_document_highlight_version(sender, instance, **kwargs):
+    bump_highlight_version(instance.pdf_id_id)
@@ -1,3 +1,142 @@
-from django.test import TestCase
-
-# Create your tests here.
+from unittest import skipUnless
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from pdf_documents.management.commands.bench_pdf_delete import make_document
+from pdf_documents.models import originPDF, PDFpage
+from pdf_documents.query_plans import EXPECTED_INDEXES, explain_problems, hot_queries
+from pdf_documents.response_cache import get_response_cache
+
+from .models import Tag, Highlight
+
+
+def make_pdf(user, title="test"):
+    return originPDF.objects.create(
+        user_id=user, title=title, S3_url="https://example.com/test.pdf", s3_key=f"pdfs/{title}.pdf",
+    )
+
+
+class HighlightETagTests(TestCase):
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(email="highlights-etag@example.com")
+        self.origin_pdf = make_pdf(self.user)
+        self.page = PDFpage.objects.create(pdf_id=self.origin_pdf, page_num=1, text="page")
+        self.tag = Tag.objects.create(pdf_id=self.origin_pdf, color="yellow", tag_detail="중요")
+        self.highlight = Highlight.objects.create(
+            pdf_id=self.origin_pdf, page_id=self.page, Tag_id=self.tag,
+            highlight_text="문장", highlight_box={"min_x": 0, "min_y": 0, "max_x": 1, "max_y": 1},
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.highlights_url = reverse("highlights:get_highlights_by_origin_pdf", args=[self.origin_pdf.id])
+        self.tags_url = reverse("highlights:tag_list")
+
+    def assert_not_modified(self, url, params=None):
+        response = self.client.get(url, params)
+        self.assertEqual(response.status_code, 200)
+        etag = response["ETag"]
+        response = self.client.get(url, params, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        return etag
+
+    def test_highlights_not_modified(self):
+        etag = self.assert_not_modified(self.highlights_url)
+        self.highlight.highlight_text = "다른 문장"
+        self.highlight.save()
+        response = self.client.get(self.highlights_url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()[0]["highlight_text"], "다른 문장")
+
+    def test_tags_not_modified(self):
+        etag = self.assert_not_modified(self.tags_url, {"pdf_id": self.origin_pdf.id})
+        Tag.objects.create(pdf_id=self.origin_pdf, color="red", tag_detail="질문")
+        response = self.client.get(self.tags_url, {"pdf_id": self.origin_pdf.id}, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.json()), 2)
+
+    def test_other_users_document_is_404(self):
+        other = get_user_model().objects.create_user(email="highlights-other@example.com")
+        self.client.force_authenticate(other)
+        self.assertEqual(self.client.get(self.highlights_url).status_code, 404)
+        self.assertEqual(self.client.get(self.tags_url, {"pdf_id": self.origin_pdf.id}).status_code, 404)
+        # pdf_id 없이 조회해도 다른 사용자의 Tag 는 보이지 않는다
+        self.assertEqual(self.client.get(self.tags_url).json(), [])
+
+    def test_missing_document_is_404(self):
+        url = reverse("highlights:get_highlights_by_origin_pdf", args=[self.origin_pdf.id + 100])
+        self.assertEqual(self.client.get(url).status_code, 404)
+        self.assertEqual(self.client.get(self.tags_url, {"pdf_id": self.origin_pdf.id + 100}).status_code, 404)
+
+
+
+class HighlightVersionTests(TestCase):
+    """하이라이트 / 태그 변경은 주석 버전만 올리고 문서 내용(pages / figures / matches)의 ETag 는 두고 간다"""
+
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(email="highlights-version@example.com")
+        self.origin_pdf = make_pdf(self.user)
+        self.page = PDFpage.objects.create(pdf_id=self.origin_pdf, page_num=1, text="page")
+        self.tag = Tag.objects.create(pdf_id=self.origin_pdf, color="yellow", tag_detail="중요")
+        # 테스트마다 롤백되어 같은 (pdf_id, version) 이 다시 나오므로 이전 테스트의 응답을 지운다
+        get_response_cache().backend.clear()
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def etags(self):
+        urls = {
+            "figures": reverse("pdf_figures:get_figures_by_origin_pdf", args=[self.origin_pdf.id]),
+            "matches": reverse("pdf_documents:pdf-matched-texts", args=[self.origin_pdf.id]),
+            "highlights": reverse("highlights:get_highlights_by_origin_pdf", args=[self.origin_pdf.id]),
+            "bundle": reverse("pdf_documents:pdf-bundle", args=[self.origin_pdf.id]),
+        }
+        return {name: self.client.get(url)["ETag"] for name, url in urls.items()}
+
+    def test_highlight_write_keeps_document_version(self):
+        before = self.etags()
+        version = originPDF.objects.get(id=self.origin_pdf.id).version
+        Highlight.objects.create(
+            pdf_id=self.origin_pdf, page_id=self.page, Tag_id=self.tag,
+            highlight_text="문장", highlight_box={"min_x": 0, "min_y": 0, "max_x": 1, "max_y": 1},
+        )
+        after = self.etags()
+
+        self.assertEqual(originPDF.objects.get(id=self.origin_pdf.id).version, version)
+        self.assertEqual(after["figures"], before["figures"])
+        self.assertEqual(after["matches"], before["matches"])
+        self.assertNotEqual(after["highlights"], before["highlights"])
+        self.assertNotEqual(after["bundle"], before["bundle"])
+
+    def test_page_write_keeps_highlight_etag(self):
+        before = self.etags()
+        self.page.text = "changed"
+        self.page.save()
+        after = self.etags()
+        self.assertEqual(after["highlights"], before["highlights"])
+        self.assertNotEqual(after["figures"], before["figures"])
+        self.assertNotEqual(after["bundle"], before["bundle"])
+
+
+@skipUnless(connection.vendor == "mysql", "고른 인덱스 이름은 MySQL EXPLAIN 으로 확인한다")
+class HighlightQueryPlanTests(TestCase):
+    """문서의 하이라이트는 (pdf_id, page_id) 인덱스 순서로 읽는다"""
+
+    @classmethod
+    def setUpTestData(cls):
+        user = get_user_model().objects.create_user(email="highlight-plans@example.com")
+        # 다른 문서의 하이라이트도 있어야 pdf_id 선두 컬럼으로 범위를 좁히는지 확인할 수 있다
+        make_document(user, 100)
+        cls.queries = dict(hot_queries(user, make_document(user, 300)))
+
+    def test_highlights_by_pdf_use_composite_index(self):
+        for name in ("GetHighlightByOriginPDFAPIView", "PDFBundleView highlights"):
+            with self.subTest(name):
+                self.assertEqual(explain_problems(self.queries[name], EXPECTED_INDEXES[name]), [])
+
+    def test_tags_by_pdf_use_fk_index(self):
+        for name in ("Tag by pdf_id", "PDFBundleView tags"):
+            with self.subTest(name):
+                self.assertEqual(explain_problems(self.queries[name], EXPECTED_INDEXES[name]), [])
@@ -1,171 +1,208 @@
-# highlights/views.py
-from rest_framework.permissions import IsAuthenticated
-from rest_framework.views import APIView
-from rest_framework.response import Response
-from rest_framework import status
-
-from .models import Tag, Highlight
-from .serializers import TagSerializer, HighlightSerializer
-
-from drf_yasg.utils import swagger_auto_schema
-from drf_yasg import openapi
-
-class TagListCreateAPIView(APIView):
-    permission_classes = [IsAuthenticated]
-
-    @swagger_auto_schema(
-        operation_id="getTags",
-        operation_description="PDF에 연결된 Tag 목록을 조회합니다. ?pdf_id= 로 필터링 가능",
-        tags=["Tag"],
-        responses={200: TagSerializer(many=True), 401: openapi.Response("Unauthorized")},
-    )
-    def get(self, request):
-        pdf_id = request.query_params.get("pdf_id")
-        qs = Tag.objects.all()
-        if pdf_id is not None:
-            qs = qs.filter(pdf_id=pdf_id)
-        return Response(TagSerializer(qs, many=True).data, status=status.HTTP_200_OK)
-
-    @swagger_auto_schema(
-        operation_id="createTag",
-        operation_description="새로운 Tag를 생성합니다.",
-        tags=["Tag"],
-        request_body=TagSerializer,
-        responses={201: TagSerializer, 400: openapi.Response("Invalid data"), 401: openapi.Response("Unauthorized")},
-    )
-    def post(self, request):
-        s = TagSerializer(data=request.data)
-        if s.is_valid():
-            s.save()
-            return Response(s.data, status=status.HTTP_201_CREATED)
-        return Response(s.errors, status=status.HTTP_400_BAD_REQUEST)
-
-
-class TagDetailAPIView(APIView):
-    permission_classes = [IsAuthenticated]
-
-    @swagger_auto_schema(
-        operation_id="updateTag",
-        operation_description="특정 Tag를 부분 업데이트합니다(Partial Update, Tag의 pk를 파라미터로 삽입).",
-        tags=["Tag"],
-        request_body=TagSerializer,
-        responses={
-            200: TagSerializer,
-            400: openapi.Response("Invalid data"),
-            401: openapi.Response("Unauthorized"),
-            404: openapi.Response("Tag not found."),
-        },
-    )
-    def put(self, request, pk):
-        try:
-            tag = Tag.objects.get(pk=pk)
-        except Tag.DoesNotExist:
-            return Response({"detail": "Tag not found."}, status=status.HTTP_404_NOT_FOUND)
-
-        s = TagSerializer(tag, data=request.data, partial=True)
-        if s.is_valid():
-            s.save()
-            return Response(s.data, status=status.HTTP_200_OK)
-        return Response(s.errors, status=status.HTTP_400_BAD_REQUEST)
-
-    @swagger_auto_schema(
-        operation_id="deleteTag",
-        operation_description="특정 Tag를 삭제합니다(Tag의 pk를 파라미터로 삽입).",
-        tags=["Tag"],
-        responses={204: openapi.Response("No Content"), 401: openapi.Response("Unauthorized"), 404: openapi.Response("Tag not found.")},
-    )
-    def delete(self, request, pk):
-        try:
-            Tag.objects.get(pk=pk).delete()
-            return Response(status=status.HTTP_204_NO_CONTENT)
-        except Tag.DoesNotExist:
-            return Response({"detail": "Tag not found."}, status=status.HTTP_404_NOT_FOUND)
-        
-class HighlightCreateAPIView(APIView):
-    permission_classes = [IsAuthenticated]
-
-    @swagger_auto_schema(
-        operation_id="createHighlight",
-        operation_description="새로운 Highlight를 생성합니다.",
-        tags=["Highlight"],
-        request_body=HighlightSerializer,
-        responses={201: HighlightSerializer, 400: openapi.Response("Invalid data"), 401: openapi.Response("Unauthorized")},
-    )
-    def post(self, request):
-        s = HighlightSerializer(data=request.data)
-        if s.is_valid():
-            s.save()
-            return Response(s.data, status=status.HTTP_201_CREATED)
-        return Response(s.errors, status=status.HTTP_400_BAD_REQUEST)
-
-class HighlightGetAPIView(APIView):
-    permission_classes = [IsAuthenticated]
-
-    @swagger_auto_schema(
-        operation_id="getHighlights",
-        operation_description="PDF 페이지에 연결된 Highlight 목록을 조회합니다. ?page_id= 로 필터링 가능.\n 쿼리 파라미터가 없으면 모든 Highlight를 반환합니다.",
-        tags=["Highlight"],
-        responses={200: HighlightSerializer(many=True), 401: openapi.Response("Unauthorized")},
-    )
-    def get(self, request):
-        page_id = request.query_params.get("page_id")
-        qs = Highlight.objects.all()
-        if page_id is not None:
-            qs = qs.filter(page_id=page_id)
-        return Response(HighlightSerializer(qs, many=True).data, status=status.HTTP_200_OK)
-    
-class HighlightDetailAPIView(APIView):
-    permission_classes = [IsAuthenticated]
-
-    @swagger_auto_schema(
-        operation_id="deleteHighlight",
-        operation_description="특정 Highlight를 삭제합니다(Highlight의 pk를 파라미터로 삽입).",
-        tags=["Highlight"],
-        responses={204: openapi.Response("No Content"), 401: openapi.Response("Unauthorized"), 404: openapi.Response("Highlight not found.")},
-    )
-    def delete(self, request, pk):
-        try:
-            Highlight.objects.get(pk=pk).delete()
-            return Response(status=status.HTTP_204_NO_CONTENT)
-        except Highlight.DoesNotExist:
-            return Response({"detail": "Highlight not found."}, status=status.HTTP_404_NOT_FOUND)
-        
-    @swagger_auto_schema(
-        operation_id="updateHighlight",
-        operation_description="특정 Highlight를 부분 업데이트합니다(Partial Update, Highlight의 pk를 파라미터로 삽입).",
-        tags=["Highlight"],
-        responses={
-            200: HighlightSerializer,
-            400: openapi.Response("Invalid data"),
-            401: openapi.Response("Unauthorized"),
-            404: openapi.Response("Highlight not found."),
-        },
-    )
-    def put(self, request, pk):
-        try:
-            highlight = Highlight.objects.get(pk=pk)
-        except Highlight.DoesNotExist:
-            return Response({"detail": "Highlight not found."}, status=status.HTTP_404_NOT_FOUND)
-
-        s = HighlightSerializer(highlight, data=request.data, partial=True)
-        if s.is_valid():
-            s.save()
-            return Response(s.data, status=status.HTTP_200_OK)
-        return Response(s.errors, status=status.HTTP_400_BAD_REQUEST)
-    
-class GetHighlightByOriginPDFAPIView(APIView):
-    permission_classes = [IsAuthenticated]
-
-    @swagger_auto_schema(
-        operation_id="getHighlightsByPDF",
-        operation_description="특정 PDF(originPDF)의 pk를 기준으로 해당 PDF에 연결된 Highlight 목록을 조회합니다.",
-        tags=["Highlight"],
-        responses={
-            200: HighlightSerializer(many=True),
-            401: openapi.Response("Unauthorized"),
-        },
-    )
-    def get(self, request, pdf_id):
-        qs = Highlight.objects.filter(pdf_id=pdf_id)
-        serializer = HighlightSerializer(qs, many=True)
-        return Response(serializer.data, status=status.HTTP_200_OK)
\ No newline at end of file
+# highlights/views.py
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.views import APIView
+from rest_framework.response import Response
+from rest_framework import status
+
+from pdf_documents.models import originPDF
+from pdf_documents.versions import document_etag, etag_headers, not_modified
+
+from .models import Tag, Highlight
+from .serializers import TagSerializer, HighlightSerializer
+
+from drf_yasg.utils import swagger_auto_schema
+from drf_yasg import openapi
+
+class TagListCreateAPIView(APIView):
+    permission_classes = [IsAuthenticated]
+
+    @swagger_auto_schema(
+        operation_id="getTags",
+        operation_description="PDF에 연결된 Tag 목록을 조회합니다. ?pdf_id= 로 필터링 가능\n pdf_id를 주면 ETag를 If-None-Match로 보내 문서가 바뀌지 않은 경우 304를 받을 수 있습니다.",
+        tags=["Tag"],
+        responses={
+            200: TagSerializer(many=True),
+            304: openapi.Response("Not Modified"),
+            401: openapi.Response("Unauthorized"),
+            404: openapi.Response("Not Found"),
+        },
+    )
+    def get(self, request):
+        pdf_id = request.query_params.get("pdf_id")
+        # 내 문서(삭제 표시되지 않은)의 Tag 만
+        qs = Tag.objects.filter(pdf_id__user_id=request.user, pdf_id__deleted_at__isnull=True)
+        headers = {}
+        if pdf_id is not None:
+            origin_pdf = originPDF.objects.filter(id=pdf_id, user_id=request.user).only("id", "highlight_version").first()
+            if origin_pdf is None:
+                return Response(
+                    {"detail": "해당 PDF를 찾을 수 없습니다."},
+                    status=status.HTTP_404_NOT_FOUND
+                )
+            # 문서 버전이 그대로면 Tag 를 읽지 않고 304
+            etag = document_etag(origin_pdf, "tags")
+            cached = not_modified(request, etag)
+            if cached is not None:
+                return cached
+            headers = etag_headers(etag)
+            qs = qs.filter(pdf_id=origin_pdf)
+        return Response(TagSerializer(qs, many=True).data, status=status.HTTP_200_OK, headers=headers)
+
+    @swagger_auto_schema(
+        operation_id="createTag",
+        operation_description="새로운 Tag를 생성합니다.",
+        tags=["Tag"],
+        request_body=TagSerializer,
+        responses={201: TagSerializer, 400: openapi.Response("Invalid data"), 401: openapi.Response("Unauthorized")},
+    )
+    def post(self, request):
+        s = TagSerializer(data=request.data)
+        if s.is_valid():
+            s.save()
+            return Response(s.data, status=status.HTTP_201_CREATED)
+        return Response(s.errors, status=status.HTTP_400_BAD_REQUEST)
+
+
+class TagDetailAPIView(APIView):
+    permission_classes = [IsAuthenticated]
+
+    @swagger_auto_schema(
+        operation_id="updateTag",
+        operation_description="특정 Tag를 부분 업데이트합니다(Partial Update, Tag의 pk를 파라미터로 삽입).",
+        tags=["Tag"],
+        request_body=TagSerializer,
+        responses={
+            200: TagSerializer,
+            400: openapi.Response("Invalid data"),
+            401: openapi.Response("Unauthorized"),
+            404: openapi.Response("Tag not found."),
+        },
+    )
+    def put(self, request, pk):
+        try:
+            tag = Tag.objects.get(pk=pk)
+        except Tag.DoesNotExist:
+            return Response({"detail": "Tag not found."}, status=status.HTTP_404_NOT_FOUND)
+
+        s = TagSerializer(tag, data=request.data, partial=True)
+        if s.is_valid():
+            s.save()
+            return Response(s.data, status=status.HTTP_200_OK)
+        return Response(s.errors, status=status.HTTP_400_BAD_REQUEST)
+
+    @swagger_auto_schema(
+        operation_id="deleteTag",
+        operation_description="특정 Tag를 삭제합니다(Tag의 pk를 파라미터로 삽입).",
+        tags=["Tag"],
+        responses={204: openapi.Response("No Content"), 401: openapi.Response("Unauthorized"), 404: openapi.Response("Tag not found.")},
+    )
+    def delete(self, request, pk):
+        try:
+            Tag.objects.get(pk=pk).delete()
+            return Response(status=status.HTTP_204_NO_CONTENT)
+        except Tag.DoesNotExist:
+            return Response({"detail": "Tag not found."}, status=status.HTTP_404_NOT_FOUND)
+        
+class HighlightCreateAPIView(APIView):
+    permission_classes = [IsAuthenticated]
+
+    @swagger_auto_schema(
+        operation_id="createHighlight",
+        operation_description="새로운 Highlight를 생성합니다.",
+        tags=["Highlight"],
+        request_body=HighlightSerializer,
+        responses={201: HighlightSerializer, 400: openapi.Response("Invalid data"), 401: openapi.Response("Unauthorized")},
+    )
+    def post(self, request):
+        s = HighlightSerializer(data=request.data)
+        if s.is_valid():
+            s.save()
+            return Response(s.data, status=status.HTTP_201_CREATED)
+        return Response(s.errors, status=status.HTTP_400_BAD_REQUEST)
+
+class HighlightGetAPIView(APIView):
+    permission_classes = [IsAuthenticated]
+
+    @swagger_auto_schema(
+        operation_id="getHighlights",
+        operation_description="PDF 페이지에 연결된 Highlight 목록을 조회합니다. ?page_id= 로 필터링 가능.\n 쿼리 파라미터가 없으면 모든 Highlight를 반환합니다.",
+        tags=["Highlight"],
+        responses={200: HighlightSerializer(many=True), 401: openapi.Response("Unauthorized")},
+    )
+    def get(self, request):
+        page_id = request.query_params.get("page_id")
+        qs = Highlight.objects.all()
+        if page_id is not None:
+            qs = qs.filter(page_id=page_id)
+        return Response(HighlightSerializer(qs, many=True).data, status=status.HTTP_200_OK)
+    
+class HighlightDetailAPIView(APIView):
+    permission_classes = [IsAuthenticated]
+
+    @swagger_auto_schema(
+        operation_id="deleteHighlight",
+        operation_description="특정 Highlight를 삭제합니다(Highlight의 pk를 파라미터로 삽입).",
+        tags=["Highlight"],
+        responses={204: openapi.Response("No Content"), 401: openapi.Response("Unauthorized"), 404: openapi.Response("Highlight not found.")},
+    )
+    def delete(self, request, pk):
+        try:
+            Highlight.objects.get(pk=pk).delete()
+            return Response(status=status.HTTP_204_NO_CONTENT)
+        except Highlight.DoesNotExist:
+            return Response({"detail": "Highlight not found."}, status=status.HTTP_404_NOT_FOUND)
+        
+    @swagger_auto_schema(
+        operation_id="updateHighlight",
+        operation_description="특정 Highlight를 부분 업데이트합니다(Partial Update, Highlight의 pk를 파라미터로 삽입).",
+        tags=["Highlight"],
+        responses={
+            200: HighlightSerializer,
+            400: openapi.Response("Invalid data"),
+            401: openapi.Response("Unauthorized"),
+            404: openapi.Response("Highlight not found."),
+        },
+    )
+    def put(self, request, pk):
+        try:
+            highlight = Highlight.objects.get(pk=pk)
+        except Highlight.DoesNotExist:
+            return Response({"detail": "Highlight not found."}, status=status.HTTP_404_NOT_FOUND)
+
+        s = HighlightSerializer(highlight, data=request.data, partial=True)
+        if s.is_valid():
+            s.save()
+            return Response(s.data, status=status.HTTP_200_OK)
+        return Response(s.errors, status=status.HTTP_400_BAD_REQUEST)
+    
+class GetHighlightByOriginPDFAPIView(APIView):
+    permission_classes = [IsAuthenticated]
+
+    @swagger_auto_schema(
+        operation_id="getHighlightsByPDF",
+        operation_description="특정 PDF(originPDF)의 pk를 기준으로 해당 PDF에 연결된 Highlight 목록을 조회합니다.\n ETag를 If-None-Match로 보내면 문서가 바뀌지 않은 경우 304를 반환합니다.",
+        tags=["Highlight"],
+        responses={
+            200: HighlightSerializer(many=True),
+            304: openapi.Response("Not Modified"),
+            401: openapi.Response("Unauthorized"),
+            404: openapi.Response("Not Found"),
+        },
+    )
+    def get(self, request, pdf_id):
+        origin_pdf = originPDF.objects.filter(id=pdf_id, user_id=request.user).only("id", "highlight_version").first()
+        if origin_pdf is None:
+            return Response(
+                {"detail": "해당 PDF를 찾을 수 없습니다."},
+                status=status.HTTP_404_NOT_FOUND
+            )
+
+        # 문서 버전이 그대로면 Highlight 를 읽지 않고 304
+        etag = document_etag(origin_pdf, "highlights")
+        cached = not_modified(request, etag)
+        if cached is not None:
+            return cached
+
+        qs = Highlight.objects.filter(pdf_id=origin_pdf).order_by("page_id", "id")
+        serializer = HighlightSerializer(qs, many=True)
+        return Response(serializer.data, status=status.HTTP_200_OK, headers=etag_headers(etag))
\ No newline at end of file
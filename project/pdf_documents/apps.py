@@ -1,6 +1,10 @@
-from django.apps import AppConfig
-
-
-class PdfDocumentsConfig(AppConfig):
-    default_auto_field = 'django.db.models.BigAutoField'
-    name = 'pdf_documents'
+from django.apps import AppConfig
+
+
+class PdfDocumentsConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'pdf_documents'
+
+    def ready(self):
+        # PDFpage / PDFfigure / MatchedText 변경 시 문서 버전 증가, 사용자 삭제 시 문서 삭제 표시
+        from . import signals  # noqa: F401
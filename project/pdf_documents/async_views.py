@@ -0,0 +1,67 @@
+# pdf_documents/async_views.py
+"""
+I/O 대기가 긴 엔드포인트의 async 버전 (ASGI 전용, config/asgi.py 를 uvicorn 으로 실행).
+
+ASGI 에서 sync 뷰는 sync_to_async(thread_sensitive=True) 로 실행되어 프로세스 안의 모든 sync 뷰가
+스레드 하나를 같이 쓴다. 그래서 S3 업로드 하나가 끝날 때까지 다른 요청이 기다리게 된다.
+여기 뷰들은 이벤트 루프에서 돌고,
+- S3 호출은 config.async_api.run_blocking 으로 공용 스레드 풀에서 (boto3 에는 async 클라이언트가 없음)
+- 짧은 DB 조회는 async ORM(aget 등)으로, 트랜잭션이 필요한 저장은 sync_to_async 로 처리한다.
+요청/응답 형식은 같은 이름의 sync 뷰(views.py)와 같다.
+DRF APIView 는 async 를 지원하지 않아 Django View 로 만들었으며 swagger 문서에는 sync 뷰만 나온다.
+"""
+from asgiref.sync import sync_to_async
+from django.http import HttpResponse, JsonResponse
+from django.views import View
+
+from config.async_api import aauthenticate, run_blocking
+
+from .deletion import soft_delete_documents
+from .models import originPDF
+from .ocr import enqueue_ocr_job
+from .serializers import OCRJobSerializer
+from .views import store_uploaded_pdf
+
+
+class AsyncPDFUploadView(View):
+    """PDFUploadView 의 async 버전 (multipart 파싱 + S3 업로드 + DB 저장을 스레드 풀에서)"""
+
+    async def post(self, request, *args, **kwargs):
+        user, error = await aauthenticate(request)
+        if error:
+            return error
+        body, code = await run_blocking(store_uploaded_pdf, request, user)
+        return JsonResponse(body, status=code)
+
+
+class AsyncPDFDeleteView(View):
+    """PDFDeleteView 의 async 버전"""
+
+    async def delete(self, request, id, *args, **kwargs):
+        user, error = await aauthenticate(request)
+        if error:
+            return error
+        deleted = await sync_to_async(soft_delete_documents)(originPDF.objects.filter(id=id, user_id=user))
+        if not deleted:
+            return JsonResponse({"detail": "해당 PDF를 찾을 수 없습니다."}, status=404)
+        return HttpResponse(status=204)
+
+
+class AsyncPDFwithOCRView(View):
+    """PDFwithOCRView 의 async 버전 (OCR 서버 호출은 run_ocr_worker 가 한다)"""
+
+    async def post(self, request, pdf_id, *args, **kwargs):
+        user, error = await aauthenticate(request)
+        if error:
+            return error
+        try:
+            origin_pdf = await originPDF.objects.aget(id=pdf_id, user_id=user)
+        except originPDF.DoesNotExist:
+            return JsonResponse({"detail": "해당 PDF를 찾을 수 없거나 권한이 없습니다."}, status=404)
+
+        if not origin_pdf.s3_key:
+            return JsonResponse({"detail": "해당 PDF에는 s3_key가 저장되어 있지 않습니다."}, status=400)
+
+        # select_for_update 트랜잭션이므로 sync 로 실행
+        job, _ = await sync_to_async(enqueue_ocr_job)(origin_pdf)
+        return JsonResponse(OCRJobSerializer(job).data, status=202)
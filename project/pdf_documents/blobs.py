@@ -0,0 +1,61 @@
+# pdf_documents/blobs.py
+"""
+내용 해시(SHA-256) 기반 S3 객체 공유 / 참조 카운트 관리.
+"""
+from django.db import transaction
+from django.db.models import F
+
+from .models import ContentBlob, S3PurgeTask
+
+
+class BlobPurged(Exception):
+    """find_blob 으로 찾은 객체가 공유하기 전에 삭제된 경우"""
+
+
+def find_blob(sha256):
+    """
+    트랜잭션 밖에서 업로드를 건너뛸지 정하는 용도. 돌려받은 blob 은 acquire_blob 전에
+    마지막 참조가 사라질 수 있으므로, acquire_blob 이 새로 만들었다면 reclaim_purged_key 로 확인한다.
+    """
+    return ContentBlob.objects.filter(sha256=sha256).first()
+
+
+def acquire_blob(sha256, s3_key, size):
+    """
+    sha256 에 해당하는 blob 의 참조를 하나 늘려서 반환한다.
+    없으면 (방금 업로드한) s3_key 로 새로 만든다.
+    반환값의 두 번째 값은 새로 만들었는지 여부로, False 이면서 s3_key 가 다르면
+    동시에 같은 파일이 올라온 경우이므로 호출한 쪽이 자기 업로드 객체를 지워야 한다.
+    """
+    with transaction.atomic():
+        blob, created = ContentBlob.objects.select_for_update().get_or_create(
+            sha256=sha256,
+            defaults={"s3_key": s3_key, "size": size},
+        )
+        ContentBlob.objects.filter(pk=blob.pk).update(ref_count=F("ref_count") + 1)
+        blob.ref_count += 1
+    return blob, created
+
+
+def reclaim_purged_key(s3_key):
+    """
+    마지막 참조가 사라져 삭제 대기열(S3PurgeTask)에 들어간 key 를 다시 쓰기 전에 (같은 트랜잭션 안에서) 호출한다.
+    아직 처리되지 않은 삭제 작업을 지웠으면 True (객체가 남아 있음),
+    purge 워커가 이미 가져갔거나 처리했으면 False (객체가 지워졌거나 지워지는 중) 를 반환한다.
+    워커가 잡고 있는 행이면 워커의 트랜잭션이 끝날 때까지 기다린다.
+    """
+    return S3PurgeTask.objects.filter(s3_key=s3_key).delete()[0] > 0
+
+
+def release_blob(blob_id, count=1):
+    """
+    참조를 count 개 줄인다. 마지막 참조였다면 blob 행을 지우고 S3 key 를 반환한다.
+    (S3 객체 삭제는 호출한 쪽에서 같은 트랜잭션 안에서 처리)
+    """
+    blob = ContentBlob.objects.select_for_update().get(pk=blob_id)
+    if blob.ref_count <= count:
+        # originPDF.blob 이 PROTECT 이므로 originPDF 를 먼저 지우거나 blob 을 비운 뒤 호출해야 한다
+        blob.delete()
+        return blob.s3_key
+    ContentBlob.objects.filter(pk=blob.pk).update(ref_count=F("ref_count") - count)
+    return None
@@ -0,0 +1,62 @@
+# pdf_documents/bundle.py
+"""
+문서 열기용 묶음 응답 (PDFBundleView).
+
+메타데이터 / 페이지 목록 / figures / matches / tags / highlights 를
+섹션당 쿼리 1번(.values(), pdf_id 조건)으로 읽는다. 행 수와 관계없이 쿼리 수가 고정되고
+모델 인스턴스나 FK 객체를 만들지 않는다.
+각 섹션의 필드 이름은 기존 개별 API(OriginPDFGetView, GetFiguresByOriginPDFAPIView 등)와 같다.
+"""
+from highlights.models import Highlight, Tag
+from pdf_figures.models import PDFfigure
+
+from .models import PDFpage, MatchedText
+from .serializers import OriginPDFSerializer
+
+# 응답 섹션 (meta 는 이미 읽은 originPDF 를 쓰므로 쿼리 없음)
+BUNDLE_SECTIONS = ("meta", "pages", "figures", "matches", "tags", "highlights")
+
+
+def bundle_querysets(origin_pdf):
+    """섹션 이름 → values() queryset. query_plans 의 점검 대상과 같다."""
+    return {
+        # 페이지 본문(text)은 크므로 목록에는 넣지 않는다 (본문은 PDFpageGetView 의 start/end 로)
+        "pages": PDFpage.objects.filter(pdf_id=origin_pdf).order_by("page_num").values("id", "page_num"),
+        "figures": PDFfigure.objects.filter(pdf_id=origin_pdf).order_by("id").values(
+            "id", "page_id", "figure_type", "figure_box",
+        ),
+        "matches": MatchedText.objects.filter(pdf_id=origin_pdf).order_by("id").values(
+            "id", "pdf_id", "page_id", "figure_id", "page_num", "raw_text", "matched_text", "text_box",
+        ),
+        "tags": Tag.objects.filter(pdf_id=origin_pdf).order_by("id").values("id", "pdf_id", "color", "tag_detail"),
+        "highlights": Highlight.objects.filter(pdf_id=origin_pdf).order_by("page_id", "id").values(
+            "id", "pdf_id", "page_id", "Tag_id", "highlight_text", "highlight_box",
+        ),
+    }
+
+
+def parse_sections(value):
+    """
+    `sections` 쿼리 파라미터(쉼표 구분)를 섹션 목록으로 바꾼다. 비어 있으면 전체.
+    알 수 없는 섹션이 있으면 ValueError.
+    """
+    if not value:
+        return list(BUNDLE_SECTIONS)
+    sections = [name.strip() for name in value.split(",") if name.strip()]
+    unknown = set(sections) - set(BUNDLE_SECTIONS)
+    if unknown:
+        raise ValueError(f"알 수 없는 섹션: {', '.join(sorted(unknown))}")
+    # 응답 키 순서는 항상 BUNDLE_SECTIONS 순서
+    return [name for name in BUNDLE_SECTIONS if name in sections]
+
+
+def build_bundle(origin_pdf, sections):
+    querysets = bundle_querysets(origin_pdf)
+    data = {}
+    for name in sections:
+        if name == "meta":
+            data["meta"] = OriginPDFSerializer(origin_pdf).data
+        else:
+            data[name] = list(querysets[name])
+    return data
+
@@ -0,0 +1,206 @@
+# pdf_documents/deletion.py
+"""
+문서 삭제 처리.
+
+PDFDeleteView 는 S3 를 기다리지 않는다. 한 트랜잭션 안에서
+1) originPDF.deleted_at 을 채워 바로 목록/조회에서 숨기고
+2) ContentBlob 참조를 놓은 뒤 더 이상 쓰는 문서가 없는 S3 key 를 S3PurgeTask 에 넣는다.
+실제 S3 객체 삭제(delete_objects, 최대 1000개씩)와 DB 행 삭제는
+`python manage.py purge_deleted_pdfs` 워커가 처리한다.
+
+DB 행 삭제(delete_documents)는 Django 삭제 collector 를 쓰지 않는다.
+collector 는 연관된 PDFpage / PDFfigure / MatchedText / Tag / Highlight 를 모두 메모리로 읽은 뒤 지우므로
+주석이 많은 큰 문서에서는 객체 수만 개를 만들게 된다. 대신 참조하는 쪽부터
+`DELETE ... WHERE <pdf_id 조건>` 을 모델별로 한 번씩 실행해서 메모리 사용량이 문서 크기와 무관하다.
+(QuerySet.update 와 마찬가지로 pre_delete / post_delete 시그널은 보내지 않는다)
+
+진행 중인 OCR 작업도 대기 중인 작업과 함께 failed 로 바꾼다. 워커는 결과를 저장할 때
+(ocr.ingest_transaction) 문서 행을 먼저 잠그고 삭제 여부와 작업 소유를 다시 확인하므로,
+삭제된 문서에는 아무것도 저장하지 않고 complete_ocr_job 도 후처리 없이 끝난다.
+
+soft_delete_documents 는 queryset 단위로 동작하므로
+계정 정리처럼 문서 수천 개를 한 번에 지울 때도 쿼리 수가 문서 수에 비례하지 않는다.
+"""
+import logging
+from collections import Counter
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import CASCADE, F
+from django.utils import timezone
+
+from highlights.models import Highlight, Tag
+from pdf_figures.models import PDFfigure
+from searches.indexing import unindex_documents
+from searches.models import SearchPosting, SearchIndexStats, ChunkIndex
+
+from . import storage
+from .blobs import release_blob
+from .models import originPDF, PDFpage, MatchedText, OCRJob, S3PurgeTask
+
+logger = logging.getLogger("api")
+
+# S3 DeleteObjects 한 번에 보낼 수 있는 최대 key 수
+DELETE_OBJECTS_MAX_KEYS = 1000
+
+# 문서 하나를 지울 때 실행할 DELETE 순서 (참조하는 쪽부터).
+# (모델, 삭제할 originPDF id 로 거르는 lookup) — lookup 마다 DELETE 한 번
+# originPDF 아래 CASCADE 관계를 모두 다루는지와 순서는 tests.DeleteDocumentsTests 가 확인한다
+DELETE_PLAN = [
+    (SearchPosting, "pdf_id"),
+    (SearchIndexStats, "pdf_id"),
+    (ChunkIndex, "pdf_id"),
+    (MatchedText, "pdf_id"),
+    (Highlight, "pdf_id"),
+    (Highlight, "page_id__pdf_id"),
+    (Highlight, "Tag_id__pdf_id"),
+    (Tag, "pdf_id"),
+    (PDFfigure, "pdf_id"),
+    (PDFpage, "pdf_id"),
+    (OCRJob, "pdf_id"),
+]
+
+
+def enqueue_s3_purge(keys):
+    S3PurgeTask.objects.bulk_create(
+        [S3PurgeTask(s3_key=key) for key in keys],
+        batch_size=DELETE_OBJECTS_MAX_KEYS,
+    )
+
+
+def soft_delete_documents(queryset):
+    """
+    queryset 의 (아직 삭제되지 않은) 문서를 삭제 표시하고, 지울 S3 key 를 대기열에 넣는다.
+    삭제 표시한 문서 수를 반환한다.
+    """
+    with transaction.atomic():
+        rows = list(
+            queryset.filter(deleted_at__isnull=True)
+            .select_for_update()
+            .values_list("id", "s3_key", "blob_id")
+        )
+        if not rows:
+            return 0
+        ids = [row[0] for row in rows]
+        # 서재 검색 통계에서 뺀다 (색인 행은 purge 워커가 지운다)
+        unindex_documents(ids)
+
+        # blob 을 비워야 마지막 참조일 때 ContentBlob 행을 지울 수 있다 (PROTECT)
+        # 버전도 올려서 이전에 받은 ETag 로는 304 가 나오지 않게 한다
+        originPDF.all_objects.filter(id__in=ids).update(
+            deleted_at=timezone.now(), blob=None, version=F("version") + 1,
+        )
+        # running 작업은 워커가 결과를 저장하거나 완료 처리할 때 더 이상 자기 것이 아님을 보고 버린다
+        OCRJob.objects.filter(
+            pdf_id__in=ids, status__in=(OCRJob.STATUS_QUEUED, OCRJob.STATUS_RUNNING),
+        ).update(
+            status=OCRJob.STATUS_FAILED, error="문서가 삭제되었습니다.", finished_at=timezone.now(),
+        )
+
+        # blob 이 없는(중복 제거 이전) 문서는 자기 key 를 바로 지우고,
+        # blob 을 공유하는 문서는 마지막 참조가 사라질 때만 지운다
+        keys = [s3_key for _, s3_key, blob_id in rows if blob_id is None and s3_key]
+        for blob_id, count in Counter(row[2] for row in rows if row[2] is not None).items():
+            s3_key = release_blob(blob_id, count)
+            if s3_key:
+                keys.append(s3_key)
+        enqueue_s3_purge(keys)
+    return len(ids)
+
+
+def purge_s3_batch(batch_size=DELETE_OBJECTS_MAX_KEYS):
+    """
+    재시도 시각이 된 S3PurgeTask 를 최대 batch_size 개 집어 delete_objects 한 번으로 지운다.
+    여러 워커가 동시에 떠 있어도 SKIP LOCKED 로 같은 key 를 집지 않는다.
+    (처리한 작업 수, 실패한 작업 수) 를 반환한다.
+    """
+    batch_size = min(batch_size, DELETE_OBJECTS_MAX_KEYS)
+    with transaction.atomic():
+        tasks = list(
+            S3PurgeTask.objects.select_for_update(skip_locked=True)
+            .filter(next_attempt_at__lte=timezone.now(), attempts__lt=settings.S3_PURGE_MAX_ATTEMPTS)
+            .order_by("id")[:batch_size]
+        )
+        if not tasks:
+            return 0, 0
+
+        errors = {}
+        try:
+            response = storage.get_s3_client().delete_objects(
+                Bucket=settings.AWS_STORAGE_BUCKET_NAME,
+                Delete={"Objects": [{"Key": key} for key in {task.s3_key for task in tasks}], "Quiet": True},
+            )
+            for error in response.get("Errors", []):
+                # 이미 없는 객체는 지워진 것으로 본다
+                if error.get("Code") not in ("NoSuchKey", "NotFound"):
+                    errors[error["Key"]] = f"{error.get('Code')}: {error.get('Message')}"
+        except Exception as e:
+            logger.warning("S3 purge batch failed (%s keys): %s", len(tasks), e)
+            errors = {task.s3_key: str(e) for task in tasks}
+
+        failed = [task for task in tasks if task.s3_key in errors]
+        S3PurgeTask.objects.filter(id__in=[task.id for task in tasks if task.s3_key not in errors]).delete()
+        for task in failed:
+            # 지수 백오프 (상한 1시간)
+            delay = min(settings.S3_PURGE_RETRY_BASE_SECONDS * 2 ** task.attempts, 3600)
+            S3PurgeTask.objects.filter(id=task.id).update(
+                attempts=F("attempts") + 1,
+                next_attempt_at=timezone.now() + timedelta(seconds=delay),
+                last_error=errors[task.s3_key],
+            )
+            if task.attempts + 1 >= settings.S3_PURGE_MAX_ATTEMPTS:
+                logger.error("S3 purge gave up key=%s: %s", task.s3_key, errors[task.s3_key])
+    return len(tasks), len(failed)
+
+
+def _plan_covers_relations():
+    """
+    DELETE_PLAN 이 originPDF 아래로 CASCADE 되는 모든 모델을 다루는지 확인한다.
+    (새 모델이 originPDF/PDFpage 등을 참조하도록 추가됐는데 DELETE_PLAN 에 빠져 있으면 collector 로 지운다)
+    """
+    handled = {originPDF} | {model for model, _ in DELETE_PLAN}
+    for model in handled:
+        for relation in model._meta.related_objects:
+            if relation.on_delete is CASCADE and relation.related_model not in handled:
+                return False
+    return True
+
+
+def delete_documents(pdf_ids):
+    """
+    originPDF 와 연관 행 전체를 모델별 DELETE 문으로 지운다. 모델 label → 지운 행 수를 반환한다.
+    ContentBlob / S3 정리는 soft_delete_documents 에서 이미 끝났다고 가정한다.
+    """
+    pdf_ids = list(pdf_ids)
+    if not pdf_ids:
+        return {}
+    if not _plan_covers_relations():
+        logger.warning("DELETE_PLAN does not cover every cascade relation; falling back to collector delete")
+        _, counts = originPDF.all_objects.filter(id__in=pdf_ids).delete()
+        return counts
+
+    counts = Counter()
+    with transaction.atomic():
+        for model, lookup in DELETE_PLAN:
+            queryset = model._base_manager.filter(**{f"{lookup}__in": pdf_ids})
+            counts[model._meta.label] += queryset._raw_delete(queryset.db)
+        queryset = originPDF.all_objects.filter(id__in=pdf_ids)
+        counts[originPDF._meta.label] += queryset._raw_delete(queryset.db)
+    return dict(counts)
+
+
+def purge_deleted_documents(batch_size=100):
+    """
+    삭제 표시된 문서의 DB 행(페이지, figure, 매칭, 하이라이트 등)을 batch_size 문서씩 실제로 지운다.
+    지운 문서 수를 반환한다.
+    """
+    with transaction.atomic():
+        ids = list(
+            originPDF.all_objects.filter(deleted_at__isnull=False)
+            .select_for_update(skip_locked=True)
+            .order_by("id")
+            .values_list("id", flat=True)[:batch_size]
+        )
+        delete_documents(ids)
+    return len(ids)
@@ -0,0 +1,129 @@
+# pdf_documents/direct_upload.py
+"""
+브라우저 → S3 직접 업로드 (presigned POST / multipart upload).
+
+PDFUploadView 는 파일을 Django 가 받아서(메모리/임시파일) 다시 S3 로 올리므로
+파일이 EC2 를 두 번 지나가고 전송하는 동안 워커 하나가 묶인다.
+이 모듈은
+1) 서버가 key(pdfs/<uuid>.pdf)를 정해서 presigned POST 또는 part 별 presigned URL 을 발급하고
+2) 클라이언트가 S3 에 직접 올린 뒤 confirm 을 호출하면 HEAD 로 객체를 확인하고 originPDF 를 만든다.
+발급한 key / upload_id / title 은 서명된 upload_token 에 담아 두므로 별도 테이블이 필요 없다.
+
+완료되지 않은 multipart upload 는 버킷 lifecycle 규칙(AbortIncompleteMultipartUpload)으로 정리한다.
+"""
+import base64
+import math
+import uuid
+
+from django.conf import settings
+from django.core import signing
+
+TOKEN_SALT = "pdf_documents.direct_upload"
+
+# S3 multipart 제약: part 는 최소 5MiB (마지막 part 제외), 최대 10,000 개
+MIN_PART_SIZE = 5 * 1024 * 1024
+MAX_PARTS = 10000
+
+
+class DirectUploadError(Exception):
+    """클라이언트 요청이 잘못된 경우 (400 으로 응답)"""
+
+
+def new_upload_key():
+    return f"pdfs/{uuid.uuid4().hex}.pdf"
+
+
+def make_upload_token(user_id, key, title, upload_id=None):
+    return signing.dumps({"u": user_id, "k": key, "t": title, "m": upload_id}, salt=TOKEN_SALT)
+
+
+def read_upload_token(token, user_id):
+    """upload_token 을 검증하고 (key, title, upload_id) 를 반환"""
+    try:
+        data = signing.loads(token, salt=TOKEN_SALT, max_age=settings.PDF_UPLOAD_TOKEN_MAX_AGE)
+    except signing.SignatureExpired:
+        raise DirectUploadError("upload_token 이 만료되었습니다. 업로드 URL 을 다시 발급받으세요.")
+    except signing.BadSignature:
+        raise DirectUploadError("잘못된 upload_token 입니다.")
+    if data.get("u") != user_id:
+        raise DirectUploadError("다른 사용자의 upload_token 입니다.")
+    return data["k"], data.get("t") or "", data.get("m")
+
+
+def part_size_for(size):
+    """size 바이트를 MAX_PARTS 개 이하로 나눌 수 있는 part 크기"""
+    part_size = max(settings.PDF_UPLOAD_PART_SIZE, MIN_PART_SIZE)
+    return max(part_size, math.ceil(size / MAX_PARTS))
+
+
+def create_presigned_post(s3, key):
+    """단일 요청(form POST)용 presigned POST. 크기 제한과 Content-Type 을 정책에 넣는다."""
+    return s3.generate_presigned_post(
+        Bucket=settings.AWS_STORAGE_BUCKET_NAME,
+        Key=key,
+        Fields={"Content-Type": "application/pdf"},
+        Conditions=[
+            {"Content-Type": "application/pdf"},
+            ["content-length-range", 1, settings.PDF_UPLOAD_MAX_BYTES],
+        ],
+        ExpiresIn=settings.PDF_UPLOAD_URL_EXPIRES,
+    )
+
+
+def create_multipart_upload(s3, key, size):
+    """multipart upload 를 시작하고 part 별 presigned PUT URL 을 발급한다."""
+    part_size = part_size_for(size)
+    upload = s3.create_multipart_upload(
+        Bucket=settings.AWS_STORAGE_BUCKET_NAME,
+        Key=key,
+        ContentType="application/pdf",
+    )
+    upload_id = upload["UploadId"]
+    parts = [
+        {
+            "part_number": part_number,
+            "url": s3.generate_presigned_url(
+                ClientMethod="upload_part",
+                Params={
+                    "Bucket": settings.AWS_STORAGE_BUCKET_NAME,
+                    "Key": key,
+                    "UploadId": upload_id,
+                    "PartNumber": part_number,
+                },
+                ExpiresIn=settings.PDF_UPLOAD_URL_EXPIRES,
+            ),
+        }
+        for part_number in range(1, math.ceil(size / part_size) + 1)
+    ]
+    return upload_id, part_size, parts
+
+
+def complete_multipart_upload(s3, key, upload_id, parts):
+    """클라이언트가 받은 part 별 ETag 로 multipart upload 를 완료한다."""
+    if not parts:
+        raise DirectUploadError("multipart 업로드는 parts(part_number, etag) 목록이 필요합니다.")
+    s3.complete_multipart_upload(
+        Bucket=settings.AWS_STORAGE_BUCKET_NAME,
+        Key=key,
+        UploadId=upload_id,
+        MultipartUpload={
+            "Parts": [
+                {"PartNumber": part["part_number"], "ETag": part["etag"]}
+                for part in sorted(parts, key=lambda p: p["part_number"])
+            ]
+        },
+    )
+
+
+def head_upload(s3, key):
+    """
+    업로드된 객체를 HEAD 로 확인하고 (size, sha256 hex 또는 None) 을 반환한다.
+    S3 가 전체 객체 SHA-256 체크섬을 갖고 있을 때만(클라이언트가 x-amz-checksum-sha256 으로 올린 단일 객체)
+    sha256 을 돌려주고, multipart 체크섬("...-N")은 전체 파일 해시가 아니므로 쓰지 않는다.
+    """
+    head = s3.head_object(Bucket=settings.AWS_STORAGE_BUCKET_NAME, Key=key, ChecksumMode="ENABLED")
+    checksum = head.get("ChecksumSHA256")
+    sha256 = None
+    if checksum and "-" not in checksum:
+        sha256 = base64.b64decode(checksum).hex()
+    return head["ContentLength"], sha256
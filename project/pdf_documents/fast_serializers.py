@@ -0,0 +1,38 @@
+# pdf_documents/fast_serializers.py
+"""
+큰 목록 응답용 경량 직렬화.
+
+ModelSerializer(many=True)는 행마다 모델 인스턴스를 만들고 필드마다 to_representation 을 호출하므로
+수만 행짜리 문서에서는 이 부분이 CPU 대부분을 차지한다.
+ValuesListSerializer 는 같은 필드를 .values_list() 로 읽어 바로 dict 로 만들며,
+필드 목록은 기존 ModelSerializer 의 Meta.fields 를 그대로 써서 클라이언트가 받는 JSON 모양이 같다.
+
+모델의 일반 필드(FK 는 pk 값)로만 이루어진 serializer 에만 쓸 수 있다.
+(source 를 바꾸거나 SerializerMethodField 등 계산 필드가 있으면 안 됨)
+"""
+from .serializers import MatchedTextDataGetSerializer, PDFpageSerializer
+
+
+class ValuesListSerializer:
+    """
+    사용법: MatchedTextValuesSerializer(queryset).data
+    serializer_class 의 Meta.fields 순서대로 키를 가진 dict 목록을 반환한다.
+    """
+    serializer_class = None
+
+    def __init__(self, queryset, fields=None):
+        self.queryset = queryset
+        self.fields = tuple(fields or self.serializer_class.Meta.fields)
+
+    @property
+    def data(self):
+        fields = self.fields
+        return [dict(zip(fields, row)) for row in self.queryset.values_list(*fields)]
+
+
+class MatchedTextValuesSerializer(ValuesListSerializer):
+    serializer_class = MatchedTextDataGetSerializer
+
+
+class PDFpageValuesSerializer(ValuesListSerializer):
+    serializer_class = PDFpageSerializer
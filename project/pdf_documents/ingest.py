@@ -0,0 +1,348 @@
+# pdf_documents/ingest.py
+"""
+OCR 결과(pages / figures / matches) 일괄 저장 로직.
+
+행마다 objects.create() 를 호출하면 300 페이지짜리 문서 하나에 RDS 왕복이
+수천 번 발생하므로, 의존 순서(pages → figures → matches)대로 모아서
+청크 단위 bulk_create 로 저장한다.
+"""
+from django.conf import settings
+
+from .models import PDFpage, MatchedText
+from .versions import bump_version
+from pdf_figures.models import PDFfigure
+
+
+def to_box_dict(box_list):
+    """[min_x, min_y, max_x, max_y] 리스트를 모델 주석의 dict 형태로 변환"""
+    if isinstance(box_list, list) and len(box_list) == 4:
+        return {
+            "min_x": box_list[0],
+            "min_y": box_list[1],
+            "max_x": box_list[2],
+            "max_y": box_list[3],
+        }
+    return box_list
+
+
+def _join_text(value):
+    if isinstance(value, list):
+        return " ".join(value)
+    return str(value)
+
+
+def _fill_pks(objs, queryset):
+    """
+    MySQL 은 bulk_create 후 PK 를 돌려주지 않으므로, 방금 넣은 행들의 id 를
+    한 번의 조회로 가져와 삽입 순서대로 채워 넣는다.
+    (같은 문서에 대한 OCR 저장은 워커 하나만 수행하므로 최근 id 들이 곧 이번 배치다)
+    """
+    if not objs or objs[0].pk is not None:
+        return
+    ids = list(queryset.order_by("-id").values_list("id", flat=True)[:len(objs)])
+    ids.reverse()
+    for obj, pk in zip(objs, ids):
+        obj.pk = pk
+
+
+def _box_key(box):
+    """figure_box(저장된 dict 또는 OCR 의 list)를 비교용 tuple 로"""
+    if isinstance(box, dict):
+        return tuple(box.get(name) for name in ("min_x", "min_y", "max_x", "max_y"))
+    if isinstance(box, list):
+        return tuple(box)
+    return None
+
+
+class OCRIngestor:
+    """
+    OCR 결과 행을 add_page / add_figure / add_match 로 받아 batch_size 단위로 저장한다.
+    figures 는 pages 의 PK 가, matches 는 figures 의 PK 가 필요하므로
+    다음 단계 행이 들어오면 앞 단계의 남은 행을 먼저 flush 한다.
+    참조할 page / figure id 는 배치를 저장할 때 그 배치가 가리키는 것만 DB 에서 한 번에 찾으므로
+    (pdfpage_pdf_page_num_idx / pdf_id 인덱스) 메모리에 남는 것은 현재 배치뿐이다.
+    트랜잭션은 호출하는 쪽에서 관리한다.
+    """
+
+    def __init__(self, origin_pdf, batch_size=None):
+        self.origin_pdf = origin_pdf
+        self.batch_size = batch_size or settings.OCR_INGEST_BATCH_SIZE
+
+        self.pages_created = 0
+        self.figures_created = 0
+        self.matches_created = 0
+
+        self._pending_pages = []
+        self._pending_figures = []  # OCR figure dict
+        self._pending_matches = []  # OCR match dict
+
+    # ----- 입력 -----
+
+    def add_page(self, p):
+        page_num = p.get("page_num")
+        if page_num is None:
+            return
+
+        self._pending_pages.append(PDFpage(
+            pdf_id=self.origin_pdf,
+            page_num=page_num,
+            text=p.get("text", ""),
+        ))
+        if len(self._pending_pages) >= self.batch_size:
+            self._flush_pages()
+
+    def add_figure(self, f):
+        self._flush_pages()
+        if f.get("page_num") is None:
+            return
+        self._pending_figures.append(f)
+        if len(self._pending_figures) >= self.batch_size:
+            self._flush_figures()
+
+    def add_match(self, m):
+        self._flush_pages()
+        self._flush_figures()
+        if m.get("page_num") is None:
+            return
+        self._pending_matches.append(m)
+        if len(self._pending_matches) >= self.batch_size:
+            self._flush_matches()
+
+    def finish(self):
+        """남은 행을 모두 저장하고 생성 개수를 반환한다."""
+        self._flush_pages()
+        self._flush_figures()
+        self._flush_matches()
+        # bulk_create 는 signal 을 보내지 않으므로 문서 버전은 여기서 올린다
+        bump_version(self.origin_pdf.id)
+        return {
+            "pages_created": self.pages_created,
+            "figures_created": self.figures_created,
+            "matches_created": self.matches_created,
+        }
+
+    # ----- id 조회 (배치 단위) -----
+
+    def _page_ids(self, page_nums):
+        """page_num → PDFpage.id (같은 번호가 여러 번 오면 마지막 행)"""
+        rows = (
+            PDFpage.objects.filter(pdf_id=self.origin_pdf, page_num__in=set(page_nums))
+            .order_by("id").values_list("page_num", "id")
+        )
+        return dict(rows)
+
+    def _figure_ids(self, page_nums):
+        """(page_num, box tuple) → PDFfigure.id (같은 위치가 여러 번 오면 마지막 행)"""
+        rows = (
+            PDFfigure.objects.filter(pdf_id=self.origin_pdf, page_id__page_num__in=set(page_nums))
+            .order_by("id").values_list("page_id__page_num", "figure_box", "id")
+        )
+        return {(page_num, _box_key(box)): figure_id for page_num, box, figure_id in rows}
+
+    # ----- 저장 -----
+
+    def _flush_pages(self):
+        objs = self._pending_pages
+        if not objs:
+            return
+        self._pending_pages = []
+
+        PDFpage.objects.bulk_create(objs)
+        self.pages_created += len(objs)
+
+    def _flush_figures(self):
+        pending = self._pending_figures
+        if not pending:
+            return
+        self._pending_figures = []
+
+        page_ids = self._page_ids(f["page_num"] for f in pending)
+        objs = [
+            PDFfigure(
+                pdf_id=self.origin_pdf,
+                page_id_id=page_ids[f["page_num"]],
+                figure_type=f.get("figure_type", ""),
+                figure_box=to_box_dict(f.get("figure_box", [])),
+            )
+            for f in pending
+            # 해당 페이지가 없으면 스킵
+            if f["page_num"] in page_ids
+        ]
+        PDFfigure.objects.bulk_create(objs)
+        self.figures_created += len(objs)
+
+    def _flush_matches(self):
+        pending = self._pending_matches
+        if not pending:
+            return
+        self._pending_matches = []
+
+        page_ids = self._page_ids(m["page_num"] for m in pending)
+        # figure_page 가 0-based / 1-based 어느 쪽일지 몰라 앞뒤 페이지도 같이 본다
+        figure_pages = {
+            m["figure_page"] + delta
+            for m in pending if isinstance(m.get("figure_page"), int)
+            for delta in (0, 1, -1)
+        }
+        figure_ids = self._figure_ids(figure_pages)
+
+        objs = []
+        for m in pending:
+            text_page_num = m["page_num"]          # 텍스트 페이지 번호
+            figure_page_num = m.get("figure_page")  # 그림이 있는 페이지 번호
+            box_list = m.get("figure_box", [])
+
+            if text_page_num not in page_ids:
+                # 해당 텍스트 페이지가 없으면 스킵
+                continue
+
+            figure_id = None
+            if isinstance(figure_page_num, int) and isinstance(box_list, list):
+                key = tuple(box_list)
+                figure_id = (
+                    figure_ids.get((figure_page_num, key)) or        # 0-based일 가능성
+                    figure_ids.get((figure_page_num + 1, key)) or    # 1-based일 가능성
+                    figure_ids.get((figure_page_num - 1, key))       # 안전빵 백업
+                )
+
+            # figure_id 가 null 허용이 아니므로 못 찾으면 스킵
+            if figure_id is None:
+                continue
+
+            objs.append(MatchedText(
+                pdf_id=self.origin_pdf,
+                page_id_id=page_ids[text_page_num],
+                figure_id_id=figure_id,
+                page_num=text_page_num,
+                raw_text=_join_text(m.get("raw_text", [])),
+                matched_text=_join_text(m.get("figure_text", [])),
+                text_box=to_box_dict(m.get("text_box", {})),
+            ))
+
+        MatchedText.objects.bulk_create(objs)
+        self.matches_created += len(objs)
+
+
+# figures 는 pages 가, matches 는 figures 가 먼저 저장되어 있어야 한다
+_STAGES = ("pages", "figures", "matches")
+
+
+def ingest_ocr_items(origin_pdf, items, batch_size=None):
+    """
+    (section, item) 스트림(ocr_stream.iter_ocr_items)을 받아 저장하고
+    생성된 개수를 반환한다. (count 재조회 없음)
+    OCR 응답이 pages → figures → matches 순서면 원소를 받는 즉시 배치에 넣고,
+    순서가 다르면 앞 단계가 끝날 때까지 해당 section 원소만 잠시 모아 둔다.
+    """
+    ingestor = OCRIngestor(origin_pdf, batch_size=batch_size)
+    add = {
+        "pages": ingestor.add_page,
+        "figures": ingestor.add_figure,
+        "matches": ingestor.add_match,
+    }
+    finished = set()
+    deferred = {section: [] for section in _STAGES}
+
+    def ready(section):
+        earlier = _STAGES[:_STAGES.index(section)]
+        return all(s in finished and not deferred[s] for s in earlier)
+
+    def drain():
+        for section in _STAGES:
+            if deferred[section] and ready(section):
+                for item in deferred[section]:
+                    add[section](item)
+                deferred[section] = []
+
+    current = None
+    for section, item in items:
+        if section != current:
+            if current is not None:
+                finished.add(current)
+                drain()
+            current = section
+
+        if section not in add or not isinstance(item, dict):
+            continue
+        if ready(section):
+            add[section](item)
+        else:
+            deferred[section].append(item)
+
+    # 응답이 끝났으면 빠진 section 이 있어도 남은 원소를 순서대로 저장
+    finished.update(_STAGES)
+    drain()
+    return ingestor.finish()
+
+
+def ingest_ocr_result(origin_pdf, data, batch_size=None):
+    """파싱이 끝난 OCR 결과(dict)를 저장하고 생성된 개수를 반환한다."""
+    items = ((section, item) for section in _STAGES for item in data.get(section, []))
+    return ingest_ocr_items(origin_pdf, items, batch_size=batch_size)
+
+
+def iter_keyset(queryset, fields, batch_size):
+    """id 순서로 batch_size 개씩 끊어서 읽는다. (큰 문서도 메모리에 한 번에 올리지 않음)"""
+    last_id = 0
+    while True:
+        rows = list(
+            queryset.filter(id__gt=last_id).order_by("id").values_list("id", *fields)[:batch_size]
+        )
+        if not rows:
+            return
+        yield rows
+        last_id = rows[-1][0]
+
+
+def copy_ocr_result(source_pdf, target_pdf, batch_size=None):
+    """
+    같은 내용(ContentBlob)의 다른 문서에 이미 저장된 OCR 결과를
+    pages → figures → matches 순서로 bulk 복사하고 생성된 개수를 반환한다.
+    (OCR 서버는 호출하지 않음, 트랜잭션은 호출하는 쪽에서 관리)
+    """
+    batch_size = batch_size or settings.OCR_INGEST_BATCH_SIZE
+    page_ids = {}    # 원본 PDFpage.id → 복사본 PDFpage.id
+    figure_ids = {}  # 원본 PDFfigure.id → 복사본 PDFfigure.id
+    counts = {"pages_created": 0, "figures_created": 0, "matches_created": 0}
+
+    pages = PDFpage.objects.filter(pdf_id=source_pdf)
+    for rows in iter_keyset(pages, ("page_num", "text"), batch_size):
+        objs = [PDFpage(pdf_id=target_pdf, page_num=page_num, text=text) for _, page_num, text in rows]
+        PDFpage.objects.bulk_create(objs)
+        _fill_pks(objs, PDFpage.objects.filter(pdf_id=target_pdf))
+        for (old_id, _, _), obj in zip(rows, objs):
+            page_ids[old_id] = obj.pk
+        counts["pages_created"] += len(objs)
+
+    figures = PDFfigure.objects.filter(pdf_id=source_pdf)
+    for rows in iter_keyset(figures, ("page_id", "figure_type", "figure_box"), batch_size):
+        objs = [
+            PDFfigure(pdf_id=target_pdf, page_id_id=page_ids[page_id], figure_type=figure_type, figure_box=figure_box)
+            for _, page_id, figure_type, figure_box in rows
+        ]
+        PDFfigure.objects.bulk_create(objs)
+        _fill_pks(objs, PDFfigure.objects.filter(pdf_id=target_pdf))
+        for (old_id, *_), obj in zip(rows, objs):
+            figure_ids[old_id] = obj.pk
+        counts["figures_created"] += len(objs)
+
+    matches = MatchedText.objects.filter(pdf_id=source_pdf)
+    fields = ("page_id", "figure_id", "page_num", "raw_text", "matched_text", "text_box")
+    for rows in iter_keyset(matches, fields, batch_size):
+        objs = [
+            MatchedText(
+                pdf_id=target_pdf,
+                page_id_id=page_ids[page_id],
+                figure_id_id=figure_ids[figure_id],
+                page_num=page_num,
+                raw_text=raw_text,
+                matched_text=matched_text,
+                text_box=text_box,
+            )
+            for _, page_id, figure_id, page_num, raw_text, matched_text, text_box in rows
+        ]
+        MatchedText.objects.bulk_create(objs)
+        counts["matches_created"] += len(objs)
+
+    bump_version(target_pdf.id)
+    return counts
@@ -0,0 +1,140 @@
+import asyncio
+import json
+import threading
+import time
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+
+import httpx
+from django.core.management.base import BaseCommand
+from openai import AsyncOpenAI, OpenAI
+
+from chatbots.prompts import UPSTAGE_CHAT_MODEL
+from pdf_documents.ocr_async import afetch_ocr_response
+
+OCR_ENDPOINT = "http://ocr.bench/ocr"
+CHAT_BASE_URL = "http://upstage.bench/v1/solar"
+
+
+def ocr_body(page_count=20):
+    pages = [{"page_num": n, "text": "벤치마크 " * 200} for n in range(1, page_count + 1)]
+    return json.dumps({"pages": pages, "figures": [], "matches": []}, ensure_ascii=False).encode("utf-8")
+
+
+def chat_body():
+    return {
+        "id": "bench", "object": "chat.completion", "created": 0, "model": UPSTAGE_CHAT_MODEL,
+        "choices": [{"index": 0, "message": {"role": "assistant", "content": "답변"}, "finish_reason": "stop"}],
+    }
+
+
+class InFlight:
+    """가짜 업스트림이 동시에 처리 중인 요청 수 (최댓값 기록)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.current = 0
+        self.peak = 0
+
+    def enter(self):
+        with self._lock:
+            self.current += 1
+            self.peak = max(self.peak, self.current)
+
+    def exit(self):
+        with self._lock:
+            self.current -= 1
+
+
+class Command(BaseCommand):
+    help = (
+        "한 프로세스가 동시에 기다릴 수 있는 OCR 서버 / Upstage 요청 수를 측정합니다. "
+        "업스트림은 --latency 초 뒤 응답하는 가짜 서버(httpx.MockTransport)이고, "
+        "async 경로(ocr_async.afetch_ocr_response, AsyncOpenAI)와 "
+        "--sync-workers 개 스레드(sync 워커 수)로 같은 요청을 보낸 경우의 전체 시간, 최대 동시 요청 수, "
+        "최대 메모리(tracemalloc peak)를 비교합니다."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--concurrency", type=int, nargs="+", default=[10, 100, 500])
+        parser.add_argument("--latency", type=float, default=0.5, help="가짜 업스트림 응답 지연(초)")
+        parser.add_argument("--sync-workers", type=int, default=4)
+
+    def handle(self, *args, **options):
+        latency = options["latency"]
+        body = ocr_body()
+        self.stdout.write(
+            f"{'kind':>5} {'path':>6} {'requests':>9} {'seconds':>8} {'req/s':>8} {'peak_inflight':>14} {'peak_kib':>10}"
+        )
+        for count in options["concurrency"]:
+            for kind in ("ocr", "chat"):
+                for path in ("async", "sync"):
+                    inflight = InFlight()
+                    if path == "async":
+                        run = lambda: asyncio.run(self._async(kind, count, latency, body, inflight))
+                    else:
+                        run = lambda: self._sync(kind, count, latency, body, inflight, options["sync_workers"])
+                    tracemalloc.start()
+                    try:
+                        started = time.perf_counter()
+                        run()
+                        seconds = time.perf_counter() - started
+                        _, peak = tracemalloc.get_traced_memory()
+                    finally:
+                        tracemalloc.stop()
+                    self.stdout.write(
+                        f"{kind:>5} {path:>6} {count:>9} {seconds:>8.2f} {count / seconds:>8.1f} "
+                        f"{inflight.peak:>14} {peak / 1024:>10.1f}"
+                    )
+
+    async def _async(self, kind, count, latency, body, inflight):
+        async def handler(request):
+            inflight.enter()
+            try:
+                await asyncio.sleep(latency)
+            finally:
+                inflight.exit()
+            if kind == "ocr":
+                return httpx.Response(200, content=body)
+            return httpx.Response(200, json=chat_body())
+
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as http_client:
+            if kind == "ocr":
+                async def call():
+                    spool = await afetch_ocr_response(http_client, OCR_ENDPOINT, "https://example.com/bench.pdf")
+                    spool.close()
+            else:
+                client = AsyncOpenAI(api_key="bench", base_url=CHAT_BASE_URL, http_client=http_client)
+
+                async def call():
+                    await client.chat.completions.create(
+                        model=UPSTAGE_CHAT_MODEL, messages=[{"role": "user", "content": "질문"}],
+                    )
+            await asyncio.gather(*(call() for _ in range(count)))
+
+    def _sync(self, kind, count, latency, body, inflight, workers):
+        def handler(request):
+            inflight.enter()
+            try:
+                time.sleep(latency)
+            finally:
+                inflight.exit()
+            if kind == "ocr":
+                return httpx.Response(200, content=body)
+            return httpx.Response(200, json=chat_body())
+
+        with httpx.Client(transport=httpx.MockTransport(handler)) as http_client:
+            if kind == "ocr":
+                def call():
+                    with http_client.stream("POST", OCR_ENDPOINT, json={"file_url": "https://example.com/bench.pdf"}) as r:
+                        for _ in r.iter_bytes():
+                            pass
+            else:
+                client = OpenAI(api_key="bench", base_url=CHAT_BASE_URL, http_client=http_client)
+
+                def call():
+                    client.chat.completions.create(
+                        model=UPSTAGE_CHAT_MODEL, messages=[{"role": "user", "content": "질문"}],
+                    )
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                list(executor.map(lambda _: call(), range(count)))
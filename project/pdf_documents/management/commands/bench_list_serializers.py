@@ -0,0 +1,99 @@
+import time
+import tracemalloc
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+from rest_framework.renderers import JSONRenderer
+
+from pdf_documents.fast_serializers import MatchedTextValuesSerializer
+from pdf_documents.ingest import to_box_dict
+from pdf_documents.models import originPDF, PDFpage, MatchedText
+from pdf_documents.serializers import MatchedTextDataGetSerializer
+from pdf_figures.models import PDFfigure
+from pdf_figures.serializers import PDFfigureSerializer, PDFfigureValuesSerializer
+
+
+def make_rows(user, row_count, rows_per_page=100):
+    """figure / MatchedText 가 row_count 개씩 있는 합성 문서"""
+    origin_pdf = originPDF.objects.create(user_id=user, title="bench", S3_url="https://example.com/bench.pdf")
+    page_count = max(1, row_count // rows_per_page)
+    PDFpage.objects.bulk_create(
+        [PDFpage(pdf_id=origin_pdf, page_num=n, text="") for n in range(1, page_count + 1)],
+        batch_size=1000,
+    )
+    page_ids = list(PDFpage.objects.filter(pdf_id=origin_pdf).order_by("page_num").values_list("id", flat=True))
+    PDFfigure.objects.bulk_create(
+        [
+            PDFfigure(pdf_id=origin_pdf, page_id_id=page_ids[i % page_count], figure_type="figure",
+                      figure_box=to_box_dict([0, 0, i, i]))
+            for i in range(row_count)
+        ],
+        batch_size=1000,
+    )
+    figures = list(PDFfigure.objects.filter(pdf_id=origin_pdf).order_by("id").values_list("id", "page_id"))
+    MatchedText.objects.bulk_create(
+        [
+            MatchedText(pdf_id=origin_pdf, page_id_id=page_id, figure_id_id=figure_id, page_num=1,
+                        raw_text="그림 1", matched_text="figure", text_box=to_box_dict([0, 0, 1, 1]))
+            for figure_id, page_id in figures
+        ],
+        batch_size=1000,
+    )
+    return origin_pdf
+
+
+class Command(BaseCommand):
+    help = (
+        "목록 응답 직렬화 비교: ModelSerializer(many=True) vs .values_list() 기반 경량 serializer "
+        "(MatchedTextListView / GetFiguresByOriginPDFAPIView). 쿼리 수, 직렬화+렌더링 시간, "
+        "최대 메모리(tracemalloc peak)를 출력하고 두 JSON 이 같은지 확인합니다."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rows", type=int, nargs="+", default=[1000, 10000, 100000])
+
+    def handle(self, *args, **options):
+        self.stdout.write(f"{'rows':>7} {'endpoint':>8} {'path':>6} {'queries':>8} {'seconds':>9} {'peak_kib':>10}")
+        renderer = JSONRenderer()
+        for row_count in options["rows"]:
+            # 측정용 데이터는 남기지 않도록 항상 롤백
+            with transaction.atomic():
+                user = get_user_model().objects.create_user(email="bench-serializers@example.com")
+                origin_pdf = make_rows(user, row_count)
+                matches = MatchedText.objects.filter(pdf_id=origin_pdf).order_by("id")
+                figures = PDFfigure.objects.filter(pdf_id=origin_pdf).order_by("id")
+
+                cases = (
+                    ("matches",
+                     lambda: MatchedTextDataGetSerializer(matches, many=True).data,
+                     lambda: MatchedTextValuesSerializer(matches).data),
+                    ("figures",
+                     lambda: PDFfigureSerializer(figures, many=True).data,
+                     lambda: PDFfigureValuesSerializer(figures).data),
+                )
+                for endpoint, model_path, values_path in cases:
+                    bodies = []
+                    for name, build in (("model", model_path), ("values", values_path)):
+                        body, queries, seconds, peak = self._run(lambda: renderer.render(build()))
+                        bodies.append(body)
+                        self.stdout.write(
+                            f"{row_count:>7} {endpoint:>8} {name:>6} {queries:>8} {seconds:>9.3f} {peak / 1024:>10.1f}"
+                        )
+                    if bodies[0] != bodies[1]:
+                        raise CommandError(f"{endpoint}: 두 serializer 의 JSON 출력이 다릅니다.")
+
+                transaction.set_rollback(True)
+
+    def _run(self, func):
+        with CaptureQueriesContext(connection) as ctx:
+            tracemalloc.start()
+            try:
+                started = time.perf_counter()
+                body = func()
+                seconds = time.perf_counter() - started
+                _, peak = tracemalloc.get_traced_memory()
+            finally:
+                tracemalloc.stop()
+        return body, len(ctx.captured_queries), seconds, peak
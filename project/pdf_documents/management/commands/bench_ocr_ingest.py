@@ -0,0 +1,91 @@
+import time
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+
+from pdf_documents.ingest import ingest_ocr_result, to_box_dict
+from pdf_documents.models import originPDF, PDFpage, MatchedText
+from pdf_figures.models import PDFfigure
+
+
+def make_payload(page_count, figures_per_page=2, matches_per_page=3, text_size=2000):
+    """OCR 서버 응답과 같은 모양의 합성 데이터"""
+    pages, figures, matches = [], [], []
+    for page_num in range(1, page_count + 1):
+        pages.append({"page_num": page_num, "text": "가" * text_size})
+        for i in range(figures_per_page):
+            box = [i * 10, i * 10, i * 10 + 5, i * 10 + 5]
+            figures.append({"page_num": page_num, "figure_type": "figure", "figure_box": box})
+        for i in range(matches_per_page):
+            box = [(i % figures_per_page) * 10, (i % figures_per_page) * 10,
+                   (i % figures_per_page) * 10 + 5, (i % figures_per_page) * 10 + 5]
+            matches.append({
+                "page_num": page_num,
+                "figure_page": page_num,
+                "figure_box": box,
+                "raw_text": ["그림", str(i)],
+                "figure_text": ["figure"],
+                "text_box": [0, 0, 1, 1],
+            })
+    return {"pages": pages, "figures": figures, "matches": matches}
+
+
+def legacy_ingest(origin_pdf, data):
+    """기존 PDFwithOCRView 방식(행마다 create + 마지막 count 재조회)"""
+    page_objs = {}
+    for p in data["pages"]:
+        page_objs[p["page_num"]] = PDFpage.objects.create(
+            pdf_id=origin_pdf, page_num=p["page_num"], text=p["text"],
+        )
+    figure_map = {}
+    for f in data["figures"]:
+        figure_map[(f["page_num"], tuple(f["figure_box"]))] = PDFfigure.objects.create(
+            page_id=page_objs[f["page_num"]],
+            figure_type=f["figure_type"],
+            figure_box=to_box_dict(f["figure_box"]),
+        )
+    for m in data["matches"]:
+        MatchedText.objects.create(
+            page_id=page_objs[m["page_num"]],
+            figure_id=figure_map[(m["figure_page"], tuple(m["figure_box"]))],
+            page_num=m["page_num"],
+            raw_text=" ".join(m["raw_text"]),
+            matched_text=" ".join(m["figure_text"]),
+            text_box=to_box_dict(m["text_box"]),
+        )
+    MatchedText.objects.filter(page_id__pdf_id=origin_pdf).count()
+
+
+class Command(BaseCommand):
+    help = "OCR 결과 저장 경로(기존 행 단위 create vs bulk_create)의 DB 왕복 수와 소요 시간을 페이지 수별로 비교합니다."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--pages", type=int, nargs="+", default=[10, 100, 300])
+        parser.add_argument("--batch-size", type=int, default=None)
+
+    def handle(self, *args, **options):
+        self.stdout.write(f"{'pages':>6} {'path':>7} {'queries':>8} {'seconds':>9}")
+        for page_count in options["pages"]:
+            data = make_payload(page_count)
+            for name, func in (
+                ("legacy", legacy_ingest),
+                ("bulk", lambda pdf, d: ingest_ocr_result(pdf, d, batch_size=options["batch_size"])),
+            ):
+                queries, seconds = self._run(func, data)
+                self.stdout.write(f"{page_count:>6} {name:>7} {queries:>8} {seconds:>9.3f}")
+
+    def _run(self, func, data):
+        # 측정용 데이터는 남기지 않도록 항상 롤백
+        with transaction.atomic():
+            user = get_user_model().objects.create_user(email="bench-ingest@example.com")
+            origin_pdf = originPDF.objects.create(user_id=user, title="bench", S3_url="https://example.com/bench.pdf")
+
+            with CaptureQueriesContext(connection) as ctx:
+                started = time.perf_counter()
+                func(origin_pdf, data)
+                seconds = time.perf_counter() - started
+
+            transaction.set_rollback(True)
+        return len(ctx.captured_queries), seconds
@@ -0,0 +1,100 @@
+import json
+import tracemalloc
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.test.utils import override_settings
+
+from pdf_documents.ingest import ingest_ocr_items
+from pdf_documents.models import originPDF
+from pdf_documents.ocr_stream import iter_ocr_items
+
+from .bench_ocr_ingest import make_payload
+
+
+def iter_response_chunks(page_count, double_encoded=False, chunk_size=64 * 1024):
+    """
+    OCR 서버 응답 본문을 흉내 낸 bytes 청크.
+    전체 응답을 한 번에 만들지 않고 페이지 단위로 생성해서 측정값에 섞이지 않게 한다.
+    """
+    sample = make_payload(1)
+
+    def parts():
+        yield "{"
+        for index, section in enumerate(("pages", "figures", "matches")):
+            yield ("," if index else "") + f'"{section}": ['
+            first = True
+            for page_num in range(1, page_count + 1):
+                for item in sample[section]:
+                    item = dict(item, page_num=page_num)
+                    if section == "matches":
+                        item["figure_page"] = page_num
+                    yield ("" if first else ",") + json.dumps(item, ensure_ascii=False)
+                    first = False
+            yield "]"
+        yield "}"
+
+    def encoded_parts():
+        if not double_encoded:
+            yield from parts()
+            return
+        # OCR 서버처럼 JSON 을 문자열로 한 번 더 감싼다
+        yield '"'
+        for part in parts():
+            yield json.dumps(part)[1:-1]
+        yield '"'
+
+    buf = bytearray()
+    for part in encoded_parts():
+        buf += part.encode("utf-8")
+        while len(buf) >= chunk_size:
+            yield bytes(buf[:chunk_size])
+            del buf[:chunk_size]
+    if buf:
+        yield bytes(buf)
+
+
+class Command(BaseCommand):
+    help = (
+        "스트리밍 OCR 응답 파싱 + 배치 저장 경로의 최대 메모리(tracemalloc peak)를 페이지 수별로 측정합니다. "
+        "--max-growth 를 주면 가장 작은 문서 대비 peak 증가율이 그 값을 넘을 때 실패합니다."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--pages", type=int, nargs="+", default=[100, 1000, 3000])
+        parser.add_argument("--double-encoded", action="store_true")
+        parser.add_argument("--max-growth", type=float, default=None,
+                            help="예: 1.5 → 가장 큰 문서의 peak 가 가장 작은 문서의 1.5배를 넘으면 실패")
+
+    def handle(self, *args, **options):
+        peaks = []
+        self.stdout.write(f"{'pages':>6} {'peak_kib':>10}")
+        # DEBUG=True 이면 실행한 쿼리가 connection.queries 에 쌓여 측정값을 오염시킨다
+        with override_settings(DEBUG=False):
+            for page_count in options["pages"]:
+                peak = self._measure(page_count, options["double_encoded"])
+                peaks.append(peak)
+                self.stdout.write(f"{page_count:>6} {peak / 1024:>10.1f}")
+
+        max_growth = options["max_growth"]
+        if max_growth is not None and len(peaks) > 1:
+            growth = max(peaks) / min(peaks)
+            if growth > max_growth:
+                raise CommandError(f"peak 메모리가 {growth:.2f}배 증가했습니다. (허용: {max_growth}배)")
+            self.stdout.write(f"peak growth {growth:.2f}x (<= {max_growth}x)")
+
+    def _measure(self, page_count, double_encoded):
+        with transaction.atomic():
+            user = get_user_model().objects.create_user(email="bench-stream@example.com")
+            origin_pdf = originPDF.objects.create(user_id=user, title="bench", S3_url="https://example.com/bench.pdf")
+
+            tracemalloc.start()
+            try:
+                ingest_ocr_items(origin_pdf, iter_ocr_items(iter_response_chunks(page_count, double_encoded)))
+                _, peak = tracemalloc.get_traced_memory()
+            finally:
+                tracemalloc.stop()
+
+            transaction.set_rollback(True)
+        return peak
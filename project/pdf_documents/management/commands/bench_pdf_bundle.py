@@ -0,0 +1,83 @@
+import time
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from highlights.views import GetHighlightByOriginPDFAPIView, TagListCreateAPIView
+from pdf_documents.views import (
+    OriginPDFGetView, PDFpageGetView, MatchedTextListView, PDFBundleView,
+)
+from pdf_figures.views import GetFiguresByOriginPDFAPIView
+
+from .bench_pdf_delete import make_document
+
+
+def separate_requests(pdf_id):
+    """iOS 앱이 문서를 열 때 보내던 개별 요청들 (view, path, kwargs)"""
+    return [
+        (OriginPDFGetView, f"/pdf_documents/pdfs/{pdf_id}", {"pdf_id": pdf_id}),
+        (PDFpageGetView, f"/pdf_documents/pdfs/{pdf_id}/pages/", {"pdf_id": pdf_id}),
+        (GetFiguresByOriginPDFAPIView, f"/pdf_figures/figures/{pdf_id}/", {"pdf_id": pdf_id}),
+        (MatchedTextListView, f"/pdf_documents/pdfs/{pdf_id}/matched-texts/", {"pdf_id": pdf_id}),
+        (GetHighlightByOriginPDFAPIView, f"/highlights/highlights/{pdf_id}/", {"pdf_id": pdf_id}),
+        (TagListCreateAPIView, f"/highlights/tags/?pdf_id={pdf_id}", {}),
+    ]
+
+
+class Command(BaseCommand):
+    help = (
+        "문서 열기 요청을 합성 문서로 비교합니다: 개별 API 6개 vs pdfs/<pdf_id>/bundle/ "
+        "(요청 수, 쿼리 수, 서버 처리 시간, 응답 크기, If-None-Match 재검증)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--pages", type=int, nargs="+", default=[50, 500])
+        parser.add_argument("--repeat", type=int, default=5)
+
+    def handle(self, *args, **options):
+        self.stdout.write(
+            f"{'pages':>6} {'path':>12} {'requests':>9} {'queries':>8} {'ms':>9} {'kib':>9}"
+        )
+        for page_count in options["pages"]:
+            # 측정용 데이터는 남기지 않도록 항상 롤백
+            with transaction.atomic():
+                user = get_user_model().objects.create_user(email="bench-bundle@example.com")
+                origin_pdf = make_document(user, page_count)
+                factory = APIRequestFactory()
+
+                def call(view, path, kwargs, **headers):
+                    request = factory.get(path, **headers)
+                    force_authenticate(request, user=user)
+                    response = view.as_view()(request, **kwargs)
+                    response.render()
+                    return response
+
+                bundle = (PDFBundleView, f"/pdf_documents/pdfs/{origin_pdf.id}/bundle/", {"pdf_id": origin_pdf.id})
+                etag = call(*bundle)["ETag"]
+
+                cases = (
+                    ("separate", separate_requests(origin_pdf.id), {}),
+                    ("bundle", [bundle], {}),
+                    ("bundle 304", [bundle], {"HTTP_IF_NONE_MATCH": etag}),
+                )
+                for name, requests, headers in cases:
+                    queries, seconds, size = self._run(call, requests, headers, options["repeat"])
+                    self.stdout.write(
+                        f"{page_count:>6} {name:>12} {len(requests):>9} {queries:>8} "
+                        f"{seconds * 1000:>9.1f} {size / 1024:>9.1f}"
+                    )
+
+                transaction.set_rollback(True)
+
+    def _run(self, call, requests, headers, repeat):
+        seconds = 0.0
+        for _ in range(repeat):
+            with CaptureQueriesContext(connection) as ctx:
+                started = time.perf_counter()
+                responses = [call(view, path, kwargs, **headers) for view, path, kwargs in requests]
+                seconds += time.perf_counter() - started
+        size = sum(len(response.content) for response in responses)
+        return len(ctx.captured_queries), seconds / repeat, size
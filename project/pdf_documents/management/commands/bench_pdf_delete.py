@@ -0,0 +1,80 @@
+import time
+import tracemalloc
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+
+from highlights.models import Highlight, Tag
+from pdf_documents.deletion import delete_documents
+from pdf_documents.ingest import ingest_ocr_result, to_box_dict
+from pdf_documents.models import originPDF, PDFpage
+
+from .bench_ocr_ingest import make_payload
+
+
+def make_document(user, page_count, highlights_per_page=2, tag_count=5):
+    """OCR 결과 + 태그/하이라이트가 달린 합성 문서"""
+    origin_pdf = originPDF.objects.create(user_id=user, title="bench", S3_url="https://example.com/bench.pdf")
+    ingest_ocr_result(origin_pdf, make_payload(page_count, text_size=200))
+
+    Tag.objects.bulk_create(
+        [Tag(pdf_id=origin_pdf, color="yellow", tag_detail=f"tag {i}") for i in range(tag_count)]
+    )
+    tag_ids = list(Tag.objects.filter(pdf_id=origin_pdf).values_list("id", flat=True))
+    page_ids = PDFpage.objects.filter(pdf_id=origin_pdf).values_list("id", flat=True)
+    Highlight.objects.bulk_create(
+        [
+            Highlight(
+                pdf_id=origin_pdf,
+                page_id_id=page_id,
+                Tag_id_id=tag_ids[(page_id + i) % len(tag_ids)],
+                highlight_text="하이라이트",
+                highlight_box=to_box_dict([0, 0, 1, 1]),
+            )
+            for page_id in page_ids.iterator()
+            for i in range(highlights_per_page)
+        ],
+        batch_size=1000,
+    )
+    return origin_pdf
+
+
+class Command(BaseCommand):
+    help = (
+        "문서 삭제 경로(Django collector 의 pdf.delete() vs pdf_documents.deletion.delete_documents)의 "
+        "쿼리 수, 소요 시간, 최대 메모리(tracemalloc peak)를 합성 문서로 비교합니다."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--pages", type=int, nargs="+", default=[1000])
+
+    def handle(self, *args, **options):
+        self.stdout.write(f"{'pages':>6} {'path':>10} {'queries':>8} {'seconds':>9} {'peak_kib':>10}")
+        for page_count in options["pages"]:
+            for name, func in (
+                ("collector", lambda pdf: originPDF.all_objects.filter(id=pdf.id).delete()),
+                ("set-based", lambda pdf: delete_documents([pdf.id])),
+            ):
+                queries, seconds, peak = self._run(func, page_count)
+                self.stdout.write(f"{page_count:>6} {name:>10} {queries:>8} {seconds:>9.3f} {peak / 1024:>10.1f}")
+
+    def _run(self, func, page_count):
+        # 측정용 데이터는 남기지 않도록 항상 롤백
+        with transaction.atomic():
+            user = get_user_model().objects.create_user(email="bench-delete@example.com")
+            origin_pdf = make_document(user, page_count)
+
+            with CaptureQueriesContext(connection) as ctx:
+                tracemalloc.start()
+                try:
+                    started = time.perf_counter()
+                    func(origin_pdf)
+                    seconds = time.perf_counter() - started
+                    _, peak = tracemalloc.get_traced_memory()
+                finally:
+                    tracemalloc.stop()
+
+            transaction.set_rollback(True)
+        return len(ctx.captured_queries), seconds, peak
@@ -0,0 +1,51 @@
+import statistics
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from pdf_documents.storage import get_s3_client, new_s3_client
+
+
+class Command(BaseCommand):
+    help = (
+        "요청마다 S3 클라이언트를 새로 만드는 방식과 프로세스 공용 클라이언트(storage.get_s3_client)의 "
+        "요청당 지연 시간을 비교합니다. 기본은 presigned URL 생성(네트워크 없음)만 측정하고, "
+        "--head-key 를 주면 해당 객체에 HEAD 요청까지 보내서 TLS 연결 재사용 효과도 측정합니다."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--iterations", type=int, default=200)
+        parser.add_argument("--head-key", default=None, help="HEAD 요청을 보낼 S3 key (예: pdfs/xxx.pdf)")
+
+    def handle(self, *args, **options):
+        iterations = options["iterations"]
+        head_key = options["head_key"]
+
+        def call(s3):
+            s3.generate_presigned_url(
+                ClientMethod="get_object",
+                Params={"Bucket": settings.AWS_STORAGE_BUCKET_NAME, "Key": head_key or "bench.pdf"},
+                ExpiresIn=60,
+            )
+            if head_key:
+                s3.head_object(Bucket=settings.AWS_STORAGE_BUCKET_NAME, Key=head_key)
+
+        # 공용 클라이언트는 첫 생성 비용을 빼고 측정 (프로세스당 한 번)
+        call(get_s3_client())
+
+        self.stdout.write(f"{'mode':>10} {'mean_ms':>9} {'p50_ms':>8} {'p95_ms':>8}")
+        for name, make_client in (
+            ("per-call", new_s3_client),
+            ("shared", get_s3_client),
+        ):
+            samples = []
+            for _ in range(iterations):
+                started = time.perf_counter()
+                call(make_client())
+                samples.append((time.perf_counter() - started) * 1000)
+            samples.sort()
+            p95 = samples[min(len(samples) - 1, int(len(samples) * 0.95))]
+            self.stdout.write(
+                f"{name:>10} {statistics.mean(samples):>9.2f} {statistics.median(samples):>8.2f} {p95:>8.2f}"
+            )
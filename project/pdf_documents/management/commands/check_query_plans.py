@@ -0,0 +1,46 @@
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from pdf_documents.models import originPDF
+from pdf_documents.query_plans import EXPECTED_INDEXES, hot_queries, explain_problems
+from searches.indexing import index_document
+
+from .bench_pdf_delete import make_document
+
+
+class Command(BaseCommand):
+    help = (
+        "API 뷰의 주 조회 쿼리를 EXPLAIN 해서 full scan / filesort 가 있거나 기대한 인덱스를 쓰지 않으면 실패합니다. "
+        "기본은 합성 문서를 만들어(끝나면 롤백) 점검하고, --pdf-id 를 주면 기존 문서로 점검합니다."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--pdf-id", type=int, default=None)
+        parser.add_argument("--seed-pages", type=int, default=300,
+                            help="합성 문서의 페이지 수 (행이 너무 적으면 옵티마이저가 full scan 을 고른다)")
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            if options["pdf_id"] is not None:
+                origin_pdf = originPDF.all_objects.select_related("user_id").get(id=options["pdf_id"])
+                user = origin_pdf.user_id
+            else:
+                user = get_user_model().objects.create_user(email="check-query-plans@example.com")
+                origin_pdf = make_document(user, options["seed_pages"])
+                index_document(origin_pdf)
+
+            failures = []
+            for name, queryset in hot_queries(user, origin_pdf):
+                problems = explain_problems(queryset, EXPECTED_INDEXES.get(name))
+                if problems:
+                    failures.append(name)
+                    self.stdout.write(self.style.ERROR(f"FAIL {name}: {'; '.join(problems)}"))
+                else:
+                    self.stdout.write(f"ok   {name}")
+
+            # 측정용 데이터는 남기지 않도록 항상 롤백
+            transaction.set_rollback(True)
+
+        if failures:
+            raise CommandError(f"{len(failures)}개 쿼리의 실행 계획에 문제가 있습니다: {', '.join(failures)}")
@@ -0,0 +1,49 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from pdf_documents.deletion import DELETE_OBJECTS_MAX_KEYS, purge_s3_batch, purge_deleted_documents
+
+
+class Command(BaseCommand):
+    help = (
+        "삭제 표시된 문서를 정리합니다. S3PurgeTask 대기열의 S3 객체를 delete_objects(최대 1000개)로 지우고, "
+        "삭제 표시된 originPDF 와 연관 행을 DB 에서 제거합니다."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--poll-interval",
+            type=float,
+            default=10.0,
+            help="처리할 작업이 없을 때 다시 확인하기까지 쉬는 시간(초)",
+        )
+        parser.add_argument(
+            "--once",
+            action="store_true",
+            help="현재 처리할 수 있는 작업만 모두 처리하고 종료",
+        )
+        parser.add_argument("--batch-size", type=int, default=DELETE_OBJECTS_MAX_KEYS,
+                            help="delete_objects 한 번에 보낼 key 수 (최대 1000)")
+
+    def handle(self, *args, **options):
+        poll_interval = options["poll_interval"]
+        once = options["once"]
+
+        self.stdout.write("PDF purge worker started")
+        while True:
+            # 오래 떠 있는 프로세스이므로 끊긴 DB 커넥션 정리
+            close_old_connections()
+
+            processed, failed = purge_s3_batch(options["batch_size"])
+            if processed:
+                self.stdout.write(f"S3 purge: {processed - failed} deleted, {failed} failed")
+            documents = purge_deleted_documents()
+            if documents:
+                self.stdout.write(f"DB purge: {documents} documents")
+
+            if not processed and not documents:
+                if once:
+                    break
+                time.sleep(poll_interval)
@@ -0,0 +1,64 @@
+import asyncio
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from pdf_documents.ocr import JobHeartbeat, claim_next_job, requeue_stale_jobs, run_ocr_job
+from pdf_documents.ocr_async import run_worker
+
+
+class Command(BaseCommand):
+    help = "DB 큐(OCRJob)에서 queued 작업을 꺼내 OCR 서버 호출 및 결과 저장을 수행합니다."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--poll-interval",
+            type=float,
+            default=2.0,
+            help="대기 중인 작업이 없을 때 다시 확인하기까지 쉬는 시간(초)",
+        )
+        parser.add_argument(
+            "--once",
+            action="store_true",
+            help="현재 대기 중인 작업만 모두 처리하고 종료",
+        )
+        parser.add_argument(
+            "--concurrency",
+            type=int,
+            default=1,
+            help="2 이상이면 async 모드로 작업을 최대 N 개까지 동시에 처리 (pdf_documents/ocr_async.py)",
+        )
+
+    def handle(self, *args, **options):
+        poll_interval = options["poll_interval"]
+        once = options["once"]
+
+        if options["concurrency"] > 1:
+            self.stdout.write(f"OCR worker started (async, concurrency={options['concurrency']})")
+            asyncio.run(run_worker(options["concurrency"], poll_interval, once, self.stdout.write))
+            return
+
+        self.stdout.write("OCR worker started")
+        last_stale_check = None
+        while True:
+            # 오래 떠 있는 프로세스이므로 끊긴 DB 커넥션 정리
+            close_old_connections()
+
+            # 다른 워커가 죽으면서 남긴 running 작업을 다시 queued 로
+            if last_stale_check is None or time.monotonic() - last_stale_check >= settings.OCR_JOB_HEARTBEAT_INTERVAL:
+                requeue_stale_jobs()
+                last_stale_check = time.monotonic()
+
+            job = claim_next_job()
+            if job is None:
+                if once:
+                    break
+                time.sleep(poll_interval)
+                continue
+
+            self.stdout.write(f"OCR job {job.id} (pdf_id={job.pdf_id_id}) started")
+            with JobHeartbeat(job):
+                job = run_ocr_job(job)
+            self.stdout.write(f"OCR job {job.id} finished: {job.status}")
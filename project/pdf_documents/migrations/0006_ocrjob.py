@@ -0,0 +1,32 @@
+# Generated by Django 5.2.6 on 2026-10-18 10:12
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('pdf_documents', '0005_matchedtext_text_box'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='OCRJob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('status', models.CharField(choices=[('queued', 'Queued'), ('running', 'Running'), ('done', 'Done'), ('failed', 'Failed')], default='queued', max_length=10)),
+                ('pages_created', models.IntegerField(default=0)),
+                ('figures_created', models.IntegerField(default=0)),
+                ('matches_created', models.IntegerField(default=0)),
+                ('error', models.TextField(blank=True, default='')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('started_at', models.DateTimeField(blank=True, null=True)),
+                ('finished_at', models.DateTimeField(blank=True, null=True)),
+                ('pdf_id', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='ocr_jobs', to='pdf_documents.originpdf')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['status', 'created_at'], name='ocrjob_status_created_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 5.2.6 on 2026-10-18 15:12
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('pdf_documents', '0007_contentblob_originpdf_blob'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='originpdf',
+            name='deleted_at',
+            field=models.DateTimeField(blank=True, default=None, null=True),
+        ),
+        migrations.CreateModel(
+            name='S3PurgeTask',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('s3_key', models.CharField(max_length=150)),
+                ('attempts', models.IntegerField(default=0)),
+                ('next_attempt_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('last_error', models.TextField(blank=True, default='')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['next_attempt_at'], name='s3purge_next_attempt_idx')],
+            },
+        ),
+    ]
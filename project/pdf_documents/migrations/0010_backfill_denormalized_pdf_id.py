@@ -0,0 +1,37 @@
+# MatchedText.pdf_id / PDFfigure.pdf_id 를 page_id.pdf_id 로 채운다.
+# 큰 테이블에서 긴 트랜잭션/락을 피하기 위해 id 구간별로 나눠서 UPDATE 하고 구간마다 커밋한다.
+
+from django.db import migrations
+from django.db.models import Max, OuterRef, Subquery
+
+CHUNK_SIZE = 5000
+
+
+def backfill(model, PDFpage):
+    last_id = model.objects.aggregate(last_id=Max("id"))["last_id"] or 0
+    page_pdf_id = PDFpage.objects.filter(id=OuterRef("page_id")).values("pdf_id")[:1]
+    for start in range(0, last_id + 1, CHUNK_SIZE):
+        model.objects.filter(
+            id__gte=start, id__lt=start + CHUNK_SIZE, pdf_id__isnull=True,
+        ).update(pdf_id=Subquery(page_pdf_id))
+
+
+def forwards(apps, schema_editor):
+    PDFpage = apps.get_model("pdf_documents", "PDFpage")
+    backfill(apps.get_model("pdf_documents", "MatchedText"), PDFpage)
+    backfill(apps.get_model("pdf_figures", "PDFfigure"), PDFpage)
+
+
+class Migration(migrations.Migration):
+
+    # 구간마다 커밋
+    atomic = False
+
+    dependencies = [
+        ('pdf_documents', '0009_matchedtext_pdf_id'),
+        ('pdf_figures', '0002_pdffigure_pdf_id'),
+    ]
+
+    operations = [
+        migrations.RunPython(forwards, migrations.RunPython.noop),
+    ]
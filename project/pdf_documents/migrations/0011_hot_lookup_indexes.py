@@ -0,0 +1,25 @@
+# Generated by Django 5.2.6 on 2026-10-18 16:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('pdf_documents', '0010_backfill_denormalized_pdf_id'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='originpdf',
+            index=models.Index(fields=['user_id', 'deleted_at', '-created_at'], name='originpdf_user_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='pdfpage',
+            index=models.Index(fields=['pdf_id', 'page_num'], name='pdfpage_pdf_page_num_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='ocrjob',
+            index=models.Index(fields=['pdf_id', 'created_at'], name='ocrjob_pdf_created_idx'),
+        ),
+    ]
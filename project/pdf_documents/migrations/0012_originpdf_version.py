@@ -0,0 +1,18 @@
+# Generated by Django 5.2.6 on 2026-10-18 17:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('pdf_documents', '0011_hot_lookup_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='originpdf',
+            name='version',
+            field=models.PositiveIntegerField(default=1),
+        ),
+    ]
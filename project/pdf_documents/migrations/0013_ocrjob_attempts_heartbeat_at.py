@@ -0,0 +1,23 @@
+# Generated by Django 5.2.6 on 2026-10-18 21:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('pdf_documents', '0012_originpdf_version'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='ocrjob',
+            name='attempts',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='ocrjob',
+            name='heartbeat_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.2.6 on 2026-10-18 22:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('pdf_documents', '0013_ocrjob_attempts_heartbeat_at'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='s3purgetask',
+            index=models.Index(fields=['s3_key'], name='s3purge_key_idx'),
+        ),
+    ]
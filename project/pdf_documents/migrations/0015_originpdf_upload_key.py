@@ -0,0 +1,18 @@
+# Generated by Django 5.2.6 on 2026-10-18 22:30
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('pdf_documents', '0014_s3purgetask_s3purge_key_idx'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='originpdf',
+            name='upload_key',
+            field=models.CharField(blank=True, default=None, max_length=150, null=True, unique=True),
+        ),
+    ]
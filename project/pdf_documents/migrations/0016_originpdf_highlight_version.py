@@ -0,0 +1,16 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('pdf_documents', '0015_originpdf_upload_key'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='originpdf',
+            name='highlight_version',
+            field=models.PositiveIntegerField(default=1),
+        ),
+    ]
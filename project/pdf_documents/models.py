@@ -1,31 +1,150 @@
-from django.db import models
-from accounts.models import User
-
-class originPDF(models.Model):
-    user_id = models.ForeignKey(User, on_delete=models.CASCADE)
-    title = models.CharField(max_length=100)
-    S3_url = models.URLField()
-    s3_key = models.CharField(max_length=150, null=True, blank=True, default=None)
-    created_at = models.DateTimeField(auto_now_add=True)
-    
-    def __str__(self):
-        return self.title
-
-class PDFpage(models.Model):
-    pdf_id = models.ForeignKey(originPDF, on_delete=models.CASCADE)
-    page_num = models.IntegerField()
-    text = models.TextField()
-    
-    def __str__(self):
-        return f"PDF: {self.pdf_id.title} - Page: {self.page_num}"
-    
-class MatchedText(models.Model):
-    page_id = models.ForeignKey(PDFpage, on_delete=models.CASCADE)
-    figure_id = models.ForeignKey('pdf_figures.PDFfigure', on_delete=models.CASCADE)
-    page_num = models.IntegerField()
-    raw_text = models.TextField()
-    matched_text = models.TextField()
-    text_box = models.JSONField(null=True, blank=True)  # { "min_x": ~, "min_y": ~, "max_x": ~, "max_y": ~  }, etc ~
-
-    def __str__(self):
-        return f"Matched Text on Page: {self.page_id.page_num} for Figure ID: {self.figure_id.id}"
\ No newline at end of file
+from django.db import models
+from django.utils import timezone
+from accounts.models import User
+
+class ContentBlob(models.Model):
+    """
+    내용(SHA-256) 기준으로 한 번만 저장되는 S3 객체.
+    같은 파일을 여러 사용자가 올리면 originPDF 여러 개가 blob 하나를 공유하고,
+    ref_count 가 0 이 될 때 S3 객체를 삭제한다.
+    """
+    sha256 = models.CharField(max_length=64, unique=True)
+    s3_key = models.CharField(max_length=150)
+    size = models.BigIntegerField(default=0)
+    ref_count = models.IntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return f"{self.sha256[:12]} ({self.ref_count} refs)"
+
+
+class ActivePDFManager(models.Manager):
+    """삭제 표시(deleted_at)된 문서는 조회되지 않도록 하는 기본 매니저"""
+
+    def get_queryset(self):
+        return super().get_queryset().filter(deleted_at__isnull=True)
+
+
+class originPDF(models.Model):
+    user_id = models.ForeignKey(User, on_delete=models.CASCADE)
+    title = models.CharField(max_length=100)
+    S3_url = models.URLField()
+    s3_key = models.CharField(max_length=150, null=True, blank=True, default=None)
+    # S3 직접 업로드(upload/confirm/)로 만든 문서의 업로드 key. 중복 파일이면 s3_key 는 공유 객체를 가리키고
+    # 업로드한 객체는 지워지므로, confirm 재시도는 이 값으로 찾는다. unique 로 동시 confirm 중 하나만 생성된다
+    upload_key = models.CharField(max_length=150, null=True, blank=True, default=None, unique=True)
+    # 해시 기반 중복 제거 이전에 올라온 PDF 는 blob 이 없다
+    blob = models.ForeignKey(ContentBlob, on_delete=models.PROTECT, null=True, blank=True, related_name="pdfs")
+    created_at = models.DateTimeField(auto_now_add=True)
+    # 삭제 요청 시각. 값이 있으면 바로 목록/조회에서 빠지고, 실제 삭제는 purge_deleted_pdfs 가 처리
+    deleted_at = models.DateTimeField(null=True, blank=True, default=None)
+    # 문서 내용(pages / figures / matches)이 바뀔 때마다 1씩 증가 (pdf_documents/versions.py)
+    # 조회 API 의 ETag 와 응답 캐시 키로 쓰인다
+    version = models.PositiveIntegerField(default=1)
+    # 사용자 주석(tags / highlights)이 바뀔 때마다 1씩 증가. 하이라이트를 저장할 때마다
+    # pages / figures / matches 의 캐시가 버려지지 않도록 version 과 나눠 둔다
+    highlight_version = models.PositiveIntegerField(default=1)
+
+    objects = ActivePDFManager()
+    all_objects = models.Manager()  # 삭제 표시된 문서 포함
+
+    class Meta:
+        indexes = [
+            # UserPDFDataView: 사용자별, 삭제되지 않은 문서를 최신순으로
+            models.Index(fields=["user_id", "deleted_at", "-created_at"], name="originpdf_user_created_idx"),
+        ]
+    
+    def __str__(self):
+        return self.title
+
+class PDFpage(models.Model):
+    pdf_id = models.ForeignKey(originPDF, on_delete=models.CASCADE)
+    page_num = models.IntegerField()
+    text = models.TextField()
+
+    class Meta:
+        indexes = [
+            # 문서의 페이지를 page_num 순서로 / 특정 페이지 번호로 조회
+            models.Index(fields=["pdf_id", "page_num"], name="pdfpage_pdf_page_num_idx"),
+        ]
+    
+    def __str__(self):
+        return f"PDF: {self.pdf_id.title} - Page: {self.page_num}"
+    
+class MatchedText(models.Model):
+    # 문서 단위 조회가 PDFpage 를 거치지 않도록 page_id.pdf_id 를 그대로 복사해 둔다 (OCR 저장 시 채움)
+    pdf_id = models.ForeignKey(originPDF, on_delete=models.CASCADE, null=True, blank=True)
+    page_id = models.ForeignKey(PDFpage, on_delete=models.CASCADE)
+    figure_id = models.ForeignKey('pdf_figures.PDFfigure', on_delete=models.CASCADE)
+    page_num = models.IntegerField()
+    raw_text = models.TextField()
+    matched_text = models.TextField()
+    text_box = models.JSONField(null=True, blank=True)  # { "min_x": ~, "min_y": ~, "max_x": ~, "max_y": ~  }, etc ~
+
+    def __str__(self):
+        return f"Matched Text on Page: {self.page_id.page_num} for Figure ID: {self.figure_id.id}"
+
+class OCRJob(models.Model):
+    """
+    originPDF 한 건에 대한 OCR 작업.
+    API 요청은 작업을 큐에 넣기만 하고, 실제 OCR 호출과 DB 저장은
+    `python manage.py run_ocr_worker` 프로세스가 처리한다.
+    """
+    STATUS_QUEUED = "queued"
+    STATUS_RUNNING = "running"
+    STATUS_DONE = "done"
+    STATUS_FAILED = "failed"
+    STATUS_CHOICES = [
+        (STATUS_QUEUED, "Queued"),
+        (STATUS_RUNNING, "Running"),
+        (STATUS_DONE, "Done"),
+        (STATUS_FAILED, "Failed"),
+    ]
+
+    pdf_id = models.ForeignKey(originPDF, on_delete=models.CASCADE, related_name="ocr_jobs")
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=STATUS_QUEUED)
+    pages_created = models.IntegerField(default=0)
+    figures_created = models.IntegerField(default=0)
+    matches_created = models.IntegerField(default=0)
+    error = models.TextField(blank=True, default="")
+    # 워커가 집어간 횟수. heartbeat 가 끊겨 다시 queued 로 돌아간 작업의 결과를 이전 워커가 저장하지 못하게 하는 데도 쓴다
+    attempts = models.IntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    # running 동안 워커가 OCR_JOB_HEARTBEAT_INTERVAL 초마다 갱신 (끊기면 ocr.requeue_stale_jobs 가 다시 queued 로)
+    heartbeat_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            # 워커가 가장 오래된 queued 작업을 집어갈 때 사용
+            models.Index(fields=["status", "created_at"], name="ocrjob_status_created_idx"),
+            # OCRStatusView: 문서의 가장 최근 작업
+            models.Index(fields=["pdf_id", "created_at"], name="ocrjob_pdf_created_idx"),
+        ]
+
+    def __str__(self):
+        return f"OCR Job {self.id} for PDF: {self.pdf_id_id} ({self.status})"
+
+
+class S3PurgeTask(models.Model):
+    """
+    삭제할 S3 객체 대기열.
+    PDFDeleteView 는 문서를 삭제 표시만 하고 key 를 여기에 넣으며,
+    `python manage.py purge_deleted_pdfs` 가 delete_objects(최대 1000개)로 모아서 지운다.
+    """
+    s3_key = models.CharField(max_length=150)
+    attempts = models.IntegerField(default=0)
+    next_attempt_at = models.DateTimeField(default=timezone.now)
+    last_error = models.TextField(blank=True, default="")
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["next_attempt_at"], name="s3purge_next_attempt_idx"),
+            # 업로드가 삭제 대기 중인 key 를 다시 쓸 때 (blobs.reclaim_purged_key)
+            models.Index(fields=["s3_key"], name="s3purge_key_idx"),
+        ]
+
+    def __str__(self):
+        return f"S3 purge {self.s3_key} (attempts={self.attempts})"
@@ -0,0 +1,279 @@
+# pdf_documents/ocr.py
+"""
+OCR 작업 처리 로직.
+
+PDFwithOCRView 는 OCRJob 을 큐에 넣기만 하고,
+실제 OCR 서버 호출과 pages / figures / matches 저장은
+run_ocr_worker 관리 명령이 이 모듈의 함수들을 이용해 처리한다.
+
+기본은 문서 전체를 OCR 서버에 한 번 요청한다. (원본 PDF 를 워커로 내려받지 않음)
+settings.OCR_TEXT_LAYER_ENABLED 이면 텍스트 레이어가 있는 페이지는 로컬에서 읽고
+나머지 페이지만 OCR 서버로 보내며(그 페이지들의 본문-그림 매칭은 빠짐), settings.OCR_SHARD_PAGES 가 0 보다 크면
+OCR 할 페이지를 구간으로 나눠 여러 OCR 서버에 병렬로 요청한다. (ocr_shard.py)
+이 두 모드만 원본 PDF 를 내려받는다.
+run_ocr_worker --concurrency N 은 ocr_async.py 로 작업 N 개를 한 프로세스에서 동시에 처리한다.
+
+워커는 running 작업의 heartbeat_at 을 주기적으로 갱신한다. (JobHeartbeat / touch_jobs)
+워커가 죽어 heartbeat 가 끊긴 작업은 requeue_stale_jobs 가 다시 queued 로 돌리고,
+결과 저장(ingest_transaction)과 상태 기록은 작업이 아직 그 워커 것(running, 같은 attempts)일 때만 한다.
+"""
+import logging
+import threading
+from contextlib import contextmanager
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import connections, transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from .ingest import ingest_ocr_items, copy_ocr_result
+from .models import originPDF, OCRJob
+from .ocr_client import OCRError, presign_get_url, post_ocr, iter_response_items
+from .ocr_shard import ShardedOCRRun
+from .signals import ocr_completed, ocr_ingested
+
+logger = logging.getLogger("api")
+
+
+class OCRJobCancelled(OCRError):
+    """작업이 더 이상 이 워커 것이 아니어서 결과를 저장하지 않음"""
+
+
+def enqueue_ocr_job(origin_pdf):
+    """
+    이미 대기/진행 중인 작업이 있으면 그 작업을, 없으면 새 작업을 반환한다.
+    (같은 PDF 에 대해 OCR 이 중복 실행되는 것을 막기 위함)
+    heartbeat 가 끊긴 running 작업은 먼저 정리하므로, 죽은 워커의 작업 때문에 다시 OCR 하지 못하는 일은 없다.
+    """
+    with transaction.atomic():
+        active = OCRJob.objects.select_for_update().filter(
+            pdf_id=origin_pdf,
+            status__in=(OCRJob.STATUS_QUEUED, OCRJob.STATUS_RUNNING),
+        )
+        requeue_stale_jobs(active)
+        job = active.order_by("-created_at").first()
+        if job is not None:
+            return job, False
+        return OCRJob.objects.create(pdf_id=origin_pdf), True
+
+
+def claim_next_job():
+    """
+    가장 오래된 queued 작업 하나를 running 으로 바꾸고 반환한다.
+    여러 워커가 동시에 떠 있어도 SKIP LOCKED 로 같은 작업을 집지 않는다.
+    """
+    with transaction.atomic():
+        job = (
+            OCRJob.objects.select_for_update(skip_locked=True)
+            .filter(status=OCRJob.STATUS_QUEUED, pdf_id__deleted_at__isnull=True)
+            .order_by("created_at")
+            .first()
+        )
+        if job is None:
+            return None
+        now = timezone.now()
+        job.status = OCRJob.STATUS_RUNNING
+        job.attempts += 1
+        job.started_at = now
+        job.heartbeat_at = now
+        job.save(update_fields=["status", "attempts", "started_at", "heartbeat_at"])
+    return job
+
+
+def requeue_stale_jobs(queryset=None):
+    """
+    heartbeat 가 OCR_JOB_HEARTBEAT_TIMEOUT 초 넘게 끊긴 running 작업(워커가 죽은 작업)을 다시 queued 로 돌린다.
+    OCR_JOB_MAX_ATTEMPTS 번 집어간 작업은 다시 돌리지 않고 실패 처리한다. 정리한 작업 수를 반환한다.
+    결과 저장은 한 트랜잭션이므로 죽은 워커가 저장하다 만 행은 남지 않는다.
+    """
+    cutoff = timezone.now() - timedelta(seconds=settings.OCR_JOB_HEARTBEAT_TIMEOUT)
+    stale = (OCRJob.objects if queryset is None else queryset).filter(
+        Q(heartbeat_at__lt=cutoff) | Q(heartbeat_at__isnull=True),
+        status=OCRJob.STATUS_RUNNING,
+    )
+    failed = stale.filter(attempts__gte=settings.OCR_JOB_MAX_ATTEMPTS).update(
+        status=OCRJob.STATUS_FAILED,
+        error="OCR 워커가 응답하지 않아 작업을 중단했습니다.",
+        finished_at=timezone.now(),
+    )
+    requeued = stale.update(status=OCRJob.STATUS_QUEUED, started_at=None, heartbeat_at=None)
+    if failed or requeued:
+        logger.warning("stale OCR jobs: requeued=%s failed=%s", requeued, failed)
+    return failed + requeued
+
+
+def _owned(job):
+    """작업이 아직 이 워커 것인지 (다시 queued 로 돌아가 다른 워커가 집어갔으면 attempts 가 다르다)"""
+    return OCRJob.objects.filter(id=job.id, status=OCRJob.STATUS_RUNNING, attempts=job.attempts)
+
+
+def touch_jobs(jobs):
+    """워커가 처리 중인 작업들의 heartbeat_at 을 한 번의 UPDATE 로 갱신한다."""
+    if not jobs:
+        return 0
+    condition = Q()
+    for job in jobs:
+        condition |= Q(id=job.id, attempts=job.attempts)
+    return OCRJob.objects.filter(condition, status=OCRJob.STATUS_RUNNING).update(heartbeat_at=timezone.now())
+
+
+class JobHeartbeat:
+    """
+    with JobHeartbeat(job):
+        run_ocr_job(job)
+
+    블록이 도는 동안 별도 스레드가 OCR_JOB_HEARTBEAT_INTERVAL 초마다 heartbeat_at 을 갱신한다.
+    (sync 워커는 OCR 서버 응답을 기다리는 동안 메인 스레드가 막혀 있으므로)
+    """
+
+    def __init__(self, job, interval=None):
+        self.job = job
+        self.interval = interval or settings.OCR_JOB_HEARTBEAT_INTERVAL
+        self._stop = threading.Event()
+        self._thread = None
+
+    def __enter__(self):
+        self._thread = threading.Thread(target=self._run, name=f"ocr-heartbeat-{self.job.id}", daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self):
+        try:
+            while not self._stop.wait(self.interval):
+                try:
+                    touch_jobs([self.job])
+                except Exception:
+                    logger.warning("OCR job %s heartbeat failed", self.job.id, exc_info=True)
+        finally:
+            # 이 스레드가 연 DB 커넥션 정리
+            connections.close_all()
+
+
+@contextmanager
+def ingest_transaction(job):
+    """
+    OCR 결과 저장 트랜잭션. 시작할 때 문서와 작업 행을 잠그고, 그 사이 문서가 삭제되었거나
+    작업이 다른 워커에게 넘어갔으면 (heartbeat 가 끊겨 다시 queued 로 돌아간 경우)
+    아무것도 저장하지 않고 OCRJobCancelled 를 낸다.
+    문서 → 작업 순서로 잠가서 soft_delete_documents 와 교착하지 않는다. (저장하면서 bump_version 이
+    어차피 문서 행을 잠근다)
+    저장이 끝나면 같은 트랜잭션에서 ocr_ingested 를 보내므로(검색 색인 등) 그쪽이 실패하면 결과도 저장되지 않는다.
+    """
+    with transaction.atomic():
+        if originPDF.objects.select_for_update().filter(id=job.pdf_id_id).values_list("id", flat=True).first() is None:
+            raise OCRJobCancelled("문서가 삭제되었습니다.")
+        if _owned(job).select_for_update().values_list("id", flat=True).first() is None:
+            raise OCRJobCancelled("작업이 다른 워커에 다시 배정되어 결과를 저장하지 않았습니다.")
+        yield
+        ocr_ingested.send(sender=OCRJob, origin_pdf=job.pdf_id, job=job)
+
+
+def run_ocr_job(job, execute=None):
+    """
+    작업 하나를 끝까지 처리하고 결과(done/failed)를 기록한다.
+    execute(job) → counts 를 주면 OCR 실행 대신 사용한다. (async 워커가 받아 둔 응답 저장 등)
+    """
+    try:
+        counts = (execute or execute_ocr)(job)
+    except Exception as e:
+        return fail_ocr_job(job, e)
+    return complete_ocr_job(job, counts)
+
+
+def execute_ocr(job):
+    """OCR 결과를 만들어 저장하고 생성 개수를 반환한다."""
+    origin_pdf = job.pdf_id
+    if not origin_pdf.s3_key:
+        raise OCRError("해당 PDF에는 s3_key가 저장되어 있지 않습니다.")
+
+    source_pdf = find_ocr_source(origin_pdf)
+    if source_pdf is not None:
+        # 같은 내용의 PDF 가 이미 OCR 되어 있으면 결과만 복사 (OCR 서버 호출 없음)
+        with ingest_transaction(job):
+            return copy_ocr_result(source_pdf, origin_pdf)
+    if settings.OCR_TEXT_LAYER_ENABLED or settings.OCR_SHARD_PAGES > 0:
+        return _run_sharded(job)
+    return _run_single(job)
+
+
+def _finish(job, **fields):
+    """작업이 아직 이 워커 것일 때만 fields 를 저장한다. 저장했으면 True"""
+    if not _owned(job).update(**fields):
+        logger.warning("OCR job %s was requeued; discarding result of attempt %s", job.id, job.attempts)
+        return False
+    for name, value in fields.items():
+        setattr(job, name, value)
+    return True
+
+
+def fail_ocr_job(job, error):
+    if isinstance(error, OCRJobCancelled):
+        logger.warning("OCR job %s cancelled (pdf_id=%s): %s", job.id, job.pdf_id_id, error)
+    else:
+        logger.error("OCR job %s failed (pdf_id=%s)", job.id, job.pdf_id_id, exc_info=error)
+    _finish(job, status=OCRJob.STATUS_FAILED, error=str(error), finished_at=timezone.now())
+    return job
+
+
+def complete_ocr_job(job, counts):
+    origin_pdf = job.pdf_id
+    finished = _finish(
+        job,
+        status=OCRJob.STATUS_DONE,
+        error="",
+        pages_created=counts["pages_created"],
+        figures_created=counts["figures_created"],
+        matches_created=counts["matches_created"],
+        finished_at=timezone.now(),
+    )
+    if not finished:
+        return job
+
+    # 여기서의 후처리가 실패해도 OCR 작업 결과는 그대로 둔다 (검색 색인은 ingest_transaction 에서 만든다)
+    for receiver, result in ocr_completed.send_robust(sender=OCRJob, origin_pdf=origin_pdf, job=job):
+        if isinstance(result, Exception):
+            logger.error("ocr_completed receiver %r failed (pdf_id=%s)", receiver, origin_pdf.id, exc_info=result)
+    return job
+
+
+def find_ocr_source(origin_pdf):
+    """같은 ContentBlob 을 공유하면서 OCR 이 끝난 다른 문서 (OCR 결과 캐시)"""
+    if origin_pdf.blob_id is None:
+        return None
+    return (
+        originPDF.objects.filter(blob_id=origin_pdf.blob_id, ocr_jobs__status=OCRJob.STATUS_DONE)
+        .exclude(id=origin_pdf.id)
+        .order_by("id")
+        .first()
+    )
+
+
+def _run_single(job):
+    """문서 전체를 settings.OCR_SERVER 에 한 번에 요청하고 응답을 스트리밍으로 저장한다."""
+    origin_pdf = job.pdf_id
+    presigned_url = presign_get_url(origin_pdf.s3_key)
+    with post_ocr(settings.OCR_SERVER, presigned_url) as ocr_response:
+        chunks = ocr_response.iter_content(chunk_size=settings.OCR_STREAM_CHUNK_SIZE)
+        # pages → figures → matches 를 한 트랜잭션으로 저장
+        with ingest_transaction(job):
+            return ingest_ocr_items(origin_pdf, iter_response_items(chunks))
+
+
+def _run_sharded(job):
+    """
+    로컬 텍스트 레이어 페이지와 페이지 구간별 OCR 결과를 모두 받은 뒤,
+    구간 순서대로 한 문서로 저장한다.
+    """
+    with ShardedOCRRun(job.pdf_id) as run:
+        return ingest_sharded(job, run)
+
+
+def ingest_sharded(job, run):
+    """OCR 이 끝난 ShardedOCRRun 의 결과를 한 트랜잭션으로 저장한다. (async 워커도 사용)"""
+    with ingest_transaction(job):
+        return ingest_ocr_items(job.pdf_id, run.iter_items())
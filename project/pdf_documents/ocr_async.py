@@ -0,0 +1,178 @@
+# pdf_documents/ocr_async.py
+"""
+OCR 작업 여러 개를 한 프로세스에서 동시에 처리하는 async 워커 (run_ocr_worker --concurrency N).
+
+sync 워커는 OCR 서버 응답을 기다리는 동안 프로세스 하나가 작업 하나에 묶인다.
+이 모드에서는 OCR 서버 호출을 httpx.AsyncClient 로 이벤트 루프에서 기다리고
+(응답 본문은 SpooledTemporaryFile 에 받아 둠), 받은 응답의 파싱/저장(ORM, 트랜잭션)만 스레드에서 한다.
+- 단일 요청 모드: 문서 전체를 OCR_SERVER 에 한 번 요청
+- 페이지 분할/텍스트 레이어 모드: 원본 다운로드·분할(pypdf)·구간 업로드(boto3)는 스레드에서 하고,
+  구간별 요청은 작업마다 OCR_SHARD_CONCURRENCY 개까지 이벤트 루프에서 동시에 보낸다 (재시도 규칙은 sync 와 같음)
+동일 파일 결과 복사는 OCR 서버를 부르지 않으므로 sync 경로를 스레드에서 그대로 실행한다.
+"""
+import asyncio
+import logging
+import time
+from functools import partial
+from tempfile import SpooledTemporaryFile
+
+import httpx
+from django.conf import settings
+
+from config.async_api import run_blocking
+
+from .ingest import ingest_ocr_items
+from .ocr import (
+    claim_next_job, complete_ocr_job, fail_ocr_job, find_ocr_source, ingest_sharded, ingest_transaction,
+    requeue_stale_jobs, run_ocr_job, touch_jobs,
+)
+from .ocr_client import OCRError, presign_get_url, iter_response_items
+from .ocr_shard import SPOOL_MAX_SIZE, ShardedOCRRun
+
+logger = logging.getLogger("api")
+
+
+async def afetch_ocr_response(client, endpoint, file_url):
+    """OCR 서버를 호출하고 응답 본문을 임시 파일에 받아 처음 위치로 되감아 반환한다."""
+    payload = {
+        "file_url": file_url,
+        "timeout": 120,
+    }
+    spool = SpooledTemporaryFile(max_size=SPOOL_MAX_SIZE)
+    try:
+        async with client.stream("POST", endpoint, json=payload) as response:
+            # 200, 201 둘 다 성공으로 취급
+            if response.status_code not in (200, 201):
+                raise OCRError(
+                    f"OCR 서버가 요청을 처리하지 못했습니다. (status={response.status_code})"
+                )
+            async for chunk in response.aiter_bytes(settings.OCR_STREAM_CHUNK_SIZE):
+                spool.write(chunk)
+    except httpx.HTTPError as e:
+        spool.close()
+        raise OCRError(f"OCR 서버 요청 실패: {e}") from e
+    except BaseException:
+        spool.close()
+        raise
+    spool.seek(0)
+    return spool
+
+
+def ingest_spooled(job, spool):
+    """afetch_ocr_response 로 받아 둔 응답을 파싱해서 저장한다."""
+    with spool:
+        chunks = iter(lambda: spool.read(settings.OCR_STREAM_CHUNK_SIZE), b"")
+        # pages → figures → matches 를 한 트랜잭션으로 저장
+        with ingest_transaction(job):
+            return ingest_ocr_items(job.pdf_id, iter_response_items(chunks))
+
+
+async def afetch_shard(run, shard, client, semaphore):
+    """구간 하나를 (잘라 둔 구간이면 업로드한 뒤) OCR 하고, 실패하면 이 구간만 다른 서버로 재시도한다."""
+    async with semaphore:
+        await run_blocking(run.upload, shard)
+
+        last_error = None
+        for attempt in range(run.retries + 1):
+            endpoint = run.endpoint_for(shard, attempt)
+            try:
+                shard.result = await afetch_ocr_response(client, endpoint, presign_get_url(shard.key))
+                return
+            except Exception as e:
+                last_error = e
+                run.attempt_failed(shard, attempt, endpoint, e)
+        raise run.shard_failed(shard, last_error)
+
+
+async def arun_sharded(job, client):
+    """페이지 분할/텍스트 레이어 모드로 OCR 하고 저장한 뒤 생성 개수를 반환한다."""
+    run = ShardedOCRRun(job.pdf_id)
+    try:
+        await run_blocking(run.prepare)
+        semaphore = asyncio.Semaphore(run.concurrency)
+        results = await asyncio.gather(
+            *(afetch_shard(run, shard, client, semaphore) for shard in run.shards),
+            return_exceptions=True,
+        )
+        # 하나라도 최종 실패하면 작업 전체 실패 (나머지 구간은 끝날 때까지 기다린 뒤 정리)
+        for result in results:
+            if isinstance(result, BaseException):
+                raise result
+        return await run_blocking(ingest_sharded, job, run)
+    finally:
+        await run_blocking(run.close)
+
+
+def _ocr_mode(job):
+    """
+    "single": 문서 전체를 한 번 요청 / "sharded": 페이지 분할·텍스트 레이어 모드 /
+    None: OCR 서버를 부르지 않는 작업 (결과 복사, s3_key 없음) — sync 경로로 처리
+    """
+    origin_pdf = job.pdf_id
+    if not origin_pdf.s3_key or find_ocr_source(origin_pdf) is not None:
+        return None
+    if settings.OCR_TEXT_LAYER_ENABLED or settings.OCR_SHARD_PAGES > 0:
+        return "sharded"
+    return "single"
+
+
+async def arun_ocr_job(job, client):
+    # job.pdf_id 도 여기서 읽어 둔다 (이벤트 루프에서는 ORM 을 부를 수 없음)
+    mode = await run_blocking(_ocr_mode, job)
+    if mode is None:
+        return await run_blocking(run_ocr_job, job)
+
+    if mode == "sharded":
+        try:
+            counts = await arun_sharded(job, client)
+        except Exception as e:
+            return await run_blocking(fail_ocr_job, job, e)
+        return await run_blocking(complete_ocr_job, job, counts)
+
+    try:
+        # presigned URL 은 로컬에서 서명만 하므로 네트워크 호출이 없다
+        spool = await afetch_ocr_response(client, settings.OCR_SERVER, presign_get_url(job.pdf_id.s3_key))
+    except Exception as e:
+        return await run_blocking(fail_ocr_job, job, e)
+    return await run_blocking(run_ocr_job, job, partial(ingest_spooled, spool=spool))
+
+
+async def run_worker(concurrency, poll_interval, once, log):
+    """queued 작업을 최대 concurrency 개까지 동시에 처리한다. log 는 진행 메시지를 받는 함수."""
+    running = {}  # task → job
+    last_beat = None
+    async with httpx.AsyncClient(timeout=httpx.Timeout(1200, connect=10)) as client:
+        while True:
+            # 처리 중인 작업의 heartbeat 를 한 번에 갱신하고, 다른 워커가 죽으면서 남긴 작업을 다시 queued 로
+            if last_beat is None or time.monotonic() - last_beat >= settings.OCR_JOB_HEARTBEAT_INTERVAL:
+                try:
+                    await run_blocking(touch_jobs, list(running.values()))
+                    await run_blocking(requeue_stale_jobs)
+                except Exception:
+                    logger.warning("OCR worker heartbeat failed", exc_info=True)
+                last_beat = time.monotonic()
+
+            # 빈 자리만큼 작업을 집는다
+            while len(running) < concurrency:
+                job = await run_blocking(claim_next_job)
+                if job is None:
+                    break
+                log(f"OCR job {job.id} (pdf_id={job.pdf_id_id}) started")
+                running[asyncio.create_task(arun_ocr_job(job, client))] = job
+
+            if not running:
+                if once:
+                    break
+                await asyncio.sleep(poll_interval)
+                continue
+
+            done, _ = await asyncio.wait(running, timeout=poll_interval, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                del running[task]
+                try:
+                    job = task.result()
+                except Exception:
+                    # 작업 상태 기록까지 실패한 경우 (DB 오류 등): 워커는 계속 돈다
+                    logger.exception("async OCR task failed")
+                    continue
+                log(f"OCR job {job.id} finished: {job.status}")
@@ -0,0 +1,65 @@
+# pdf_documents/ocr_client.py
+"""
+OCR 서버 호출 공통 함수.
+(단일 요청 모드와 페이지 분할 모드가 함께 사용)
+"""
+import requests
+
+from . import storage
+from .ocr_stream import OCRStreamError, iter_ocr_items
+
+
+class OCRError(Exception):
+    """OCR 서버 호출/응답 파싱 중 발생한 오류 (작업 실패 사유로 기록됨)"""
+
+
+def presign_get_url(key):
+    """OCR 서버가 PDF 를 내려받을 수 있는 presigned URL"""
+    try:
+        return storage.presign_get_url(key, expires_in=900)  # 15분
+    except Exception as e:
+        raise OCRError(f"Presigned URL 생성 중 오류: {e}") from e
+
+
+def post_ocr(endpoint, file_url):
+    """
+    OCR 서버 호출 (stream=True, 본문은 아직 읽지 않음)
+    호출한 쪽에서 with 문으로 응답을 닫아야 한다.
+    """
+    payload = {
+        "file_url": file_url,
+        "timeout": 120,
+    }
+
+    try:
+        ocr_response = requests.post(
+            endpoint,
+            json=payload,
+            timeout=1200,
+            stream=True,
+        )
+        ocr_response.raise_for_status()
+    except requests.exceptions.RequestException as e:
+        raise OCRError(f"OCR 서버 요청 실패: {e}") from e
+
+    # 200, 201 둘 다 성공으로 취급
+    if ocr_response.status_code not in (200, 201):
+        ocr_response.close()
+        raise OCRError(
+            f"OCR 서버가 요청을 처리하지 못했습니다. (status={ocr_response.status_code})"
+        )
+
+    return ocr_response
+
+
+def iter_response_items(byte_chunks):
+    """
+    OCR 응답 본문(bytes 청크)을 스트리밍으로 파싱해서 (section, item) 을 돌려준다.
+    (이중 인코딩된 JSON 문자열도 같은 경로로 처리됨)
+    """
+    try:
+        yield from iter_ocr_items(byte_chunks)
+    except OCRStreamError as e:
+        raise OCRError(str(e)) from e
+    except requests.exceptions.RequestException as e:
+        raise OCRError(f"OCR 응답 수신 중 오류: {e}") from e
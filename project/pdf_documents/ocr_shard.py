@@ -0,0 +1,329 @@
+# pdf_documents/ocr_shard.py
+"""
+원본 PDF 를 내려받아 처리하는 OCR 모드 (페이지 분할 / 텍스트 레이어).
+
+문서 전체를 OCR 서버 하나에 보내면 지연 시간이 페이지 수에 비례하고
+느린 페이지 하나가 전체를 붙잡는다. 이 모드에서는
+1) 원본 PDF 를 내려받아, 텍스트 레이어가 있는 페이지는 로컬에서 텍스트를 읽고
+   (settings.OCR_TEXT_LAYER_ENABLED, text_layer.py — 이 페이지들의 본문은 그림과 매칭되지 않는다)
+2) OCR 이 필요한 페이지(스캔본, figure 검출이 필요한 이미지 포함 페이지)만
+   settings.OCR_SHARD_PAGES 페이지씩 잘라 임시 S3 객체로 올린 뒤
+3) settings.OCR_SERVERS 에 최대 OCR_SHARD_CONCURRENCY 개까지 동시에 요청하고
+4) 실패한 구간만 OCR_SHARD_RETRIES 번까지 (다른 서버로 돌려가며) 다시 요청한 뒤
+5) page_num / figure_page 를 원본 기준으로 보정해서 pages → figures → matches 순서로 한 문서로 합친다.
+구간별 응답과 로컬 텍스트는 SpooledTemporaryFile 에 받아 두므로
+메모리 사용량은 구간 수/페이지 수와 무관하다.
+
+본문-그림 매칭(matches)은 OCR 서버가 요청 하나 안에서만 찾으므로, 구간마다 앞뒤로
+OCR_SHARD_OVERLAP_PAGES 페이지를 더 붙여 보낸다. 각 페이지의 pages / figures / matches 는
+그 페이지를 본 구간(core)의 결과만 쓰고, 겹친 페이지의 figure 는 옆 구간이 같은 box 로 저장한 것과 이어진다.
+따라서 본문과 그림이 OCR_SHARD_OVERLAP_PAGES 페이지 안에 있으면 나누지 않았을 때와 같이 매칭되고,
+그보다 멀리 떨어져 다른 구간에 있는 매칭은 빠진다.
+"""
+import json
+import logging
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from tempfile import SpooledTemporaryFile
+
+from django.conf import settings
+from pypdf import PdfReader, PdfWriter
+
+from .ocr_client import OCRError, presign_get_url, post_ocr, iter_response_items
+from .storage import get_s3_client
+from .text_layer import read_text_layer
+
+logger = logging.getLogger("api")
+
+# 이 크기를 넘는 임시 파일(원본 PDF, 구간 PDF, 구간 응답)은 디스크로 내려간다
+SPOOL_MAX_SIZE = 8 * 1024 * 1024
+
+# OCR 결과에서 페이지 번호를 담는 필드 (원본 기준으로 보정)
+PAGE_FIELDS = ("page_num", "figure_page")
+
+# 구간 결과를 합치는 순서 (figures 는 pages 가, matches 는 figures 가 먼저 저장되어 있어야 한다)
+SECTIONS = ("pages", "figures", "matches")
+
+
+def split_groups(page_indices, pages_per_shard, overlap=0):
+    """
+    OCR 할 페이지(0-based index) 목록을 pages_per_shard 개씩 나눈다.
+    [(보낼 페이지, 이 구간이 맡는 페이지)] — 보낼 페이지는 앞뒤로 overlap 개씩 더 붙는다.
+    """
+    groups = []
+    for start in range(0, len(page_indices), pages_per_shard):
+        end = start + pages_per_shard
+        groups.append((
+            page_indices[max(0, start - overlap):end + overlap],
+            page_indices[start:end],
+        ))
+    return groups
+
+
+class _Shard:
+    def __init__(self, index, pages, key, core=None):
+        self.index = index
+        self.pages = pages      # 이 구간에 들어간 원본 페이지 index (0-based, 겹치는 페이지 포함)
+        self.core = set(pages if core is None else core)  # 이 구간의 결과를 쓰는 페이지
+        self.key = key          # OCR 서버에 넘길 S3 key
+        self.temporary = False  # 작업이 끝나면 지워야 하는 임시 객체인지
+        self.body = None        # 구간 PDF (업로드 전)
+        self.result = None      # OCR 응답 본문
+
+        # 연속 구간이면 시작 위치만큼 더하기만 하면 된다
+        # (OCR 서버가 0-based / 1-based 중 무엇을 쓰든 원본 번호와 같아짐)
+        contiguous = pages[-1] - pages[0] + 1 == len(pages)
+        self.offset = pages[0] if contiguous else None
+
+    @property
+    def label(self):
+        return f"{self.pages[0] + 1}-{self.pages[-1] + 1}"
+
+    def owns(self, section, item):
+        """
+        보정된 OCR 결과 원소를 이 구간 결과로 쓸지.
+        page / figure 는 그 페이지, match 는 본문 페이지(page_num)를 맡은 구간의 것만 쓴다.
+        (match 의 figure_page 는 겹친 페이지일 수 있다)
+        """
+        page_num = item.get("page_num")
+        if not isinstance(page_num, int):
+            # 페이지 번호가 없는 원소는 저장 단계에서 버려진다
+            return True
+        return page_num - settings.OCR_PAGE_NUM_BASE in self.core
+
+    def rebase(self, item):
+        """구간 PDF 기준 페이지 번호를 원본 PDF 기준으로 바꾼다."""
+        if not isinstance(item, dict):
+            return item
+        base = settings.OCR_PAGE_NUM_BASE
+        for field in PAGE_FIELDS:
+            value = item.get(field)
+            if not isinstance(value, int):
+                continue
+            if self.offset is not None:
+                item[field] = value + self.offset
+            elif 0 <= value - base < len(self.pages):
+                item[field] = self.pages[value - base] + base
+        return item
+
+
+class ShardedOCRRun:
+    """
+    with ShardedOCRRun(origin_pdf) as run:
+        ingest_ocr_items(origin_pdf, run.iter_items())
+
+    with 블록에 들어갈 때 로컬 텍스트 추출과 모든 구간의 OCR 이 끝나고,
+    나올 때 임시 S3 객체와 임시 파일을 정리한다.
+    async 워커(ocr_async.arun_sharded)는 prepare() / upload() 만 스레드에서 부르고
+    구간별 OCR 요청은 이벤트 루프에서 보낸 뒤 shard.result 를 채운다.
+    """
+
+    def __init__(self, origin_pdf, pages_per_shard=None, concurrency=None, endpoints=None, retries=None,
+                 use_text_layer=None, overlap=None):
+        self.origin_pdf = origin_pdf
+        self.pages_per_shard = settings.OCR_SHARD_PAGES if pages_per_shard is None else pages_per_shard
+        self.overlap = settings.OCR_SHARD_OVERLAP_PAGES if overlap is None else overlap
+        self.concurrency = concurrency or settings.OCR_SHARD_CONCURRENCY
+        self.endpoints = list(endpoints or settings.OCR_SERVERS)
+        self.retries = settings.OCR_SHARD_RETRIES if retries is None else retries
+        self.use_text_layer = settings.OCR_TEXT_LAYER_ENABLED if use_text_layer is None else use_text_layer
+        self.s3 = get_s3_client()
+        self.shards = []
+        self.local_pages = None   # 텍스트 레이어에서 읽은 페이지 (JSON lines)
+        self.local_page_nums = set()
+
+    def __enter__(self):
+        try:
+            self.run()
+        except BaseException:
+            self.close()
+            raise
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    # ----- 실행 -----
+
+    def run(self):
+        self.prepare()
+        if not self.shards:
+            # 모든 페이지가 텍스트 레이어로 처리됨: OCR 서버 호출 없음
+            return
+
+        with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+            futures = [executor.submit(self._process, shard) for shard in self.shards]
+            # 하나라도 최종 실패하면 작업 전체 실패 (나머지 구간은 끝날 때까지 기다린 뒤 정리)
+            errors = [f.exception() for f in futures]
+        for error in errors:
+            if error is not None:
+                raise error
+
+    def prepare(self):
+        """원본 PDF 를 내려받아 로컬 텍스트를 읽고 OCR 할 구간(self.shards)을 만든다."""
+        self.shards = self._prepare()
+        logger.info(
+            "OCR run pdf_id=%s local_pages=%s ocr_pages=%s sent_pages=%s shards=%s endpoints=%s",
+            self.origin_pdf.id, len(self.local_page_nums),
+            sum(len(shard.core) for shard in self.shards), sum(len(shard.pages) for shard in self.shards),
+            len(self.shards), len(self.endpoints),
+        )
+
+    def upload(self, shard):
+        """잘라 둔 구간 PDF 를 임시 S3 객체로 올린다. (원본 객체를 그대로 쓰는 구간이면 할 일 없음)"""
+        if shard.body is None:
+            return
+        shard.body.seek(0)
+        try:
+            self.s3.upload_fileobj(
+                Fileobj=shard.body,
+                Bucket=settings.AWS_STORAGE_BUCKET_NAME,
+                Key=shard.key,
+                ExtraArgs={"ContentType": "application/pdf"},
+            )
+        except Exception as e:
+            raise OCRError(f"페이지 {shard.label} 구간 업로드 실패: {e}") from e
+        shard.temporary = True
+        shard.body.close()
+        shard.body = None
+
+    def endpoint_for(self, shard, attempt):
+        # 재시도할 때는 다른 OCR 서버로 돌려가며 요청
+        return self.endpoints[(shard.index + attempt) % len(self.endpoints)]
+
+    def attempt_failed(self, shard, attempt, endpoint, error):
+        logger.warning(
+            "OCR shard failed pdf_id=%s pages=%s attempt=%s endpoint=%s: %s",
+            self.origin_pdf.id, shard.label, attempt + 1, endpoint, error,
+        )
+
+    def shard_failed(self, shard, last_error):
+        return OCRError(f"페이지 {shard.label} 구간 OCR 실패: {last_error}")
+
+    def iter_items(self):
+        """
+        원본 기준 페이지 번호로 보정된 결과를 pages → figures → matches 순서로 (section, item) 으로 돌려준다.
+        section 마다 구간 응답을 처음부터 다시 파싱하므로, match 가 옆 구간(겹친 페이지)의
+        figure 를 가리켜도 그 figure 는 이미 저장되어 있다.
+        텍스트 레이어가 있는 페이지는 OCR 결과의 page 텍스트 대신 로컬 텍스트를 쓴다.
+        """
+        if self.local_pages is not None:
+            self.local_pages.seek(0)
+            for line in self.local_pages:
+                yield "pages", json.loads(line)
+
+        for wanted in SECTIONS:
+            for shard in self.shards:
+                shard.result.seek(0)
+                chunks = iter(lambda: shard.result.read(settings.OCR_STREAM_CHUNK_SIZE), b"")
+                for section, item in iter_response_items(chunks):
+                    if section != wanted or not isinstance(item, dict):
+                        continue
+                    item = shard.rebase(item)
+                    if not shard.owns(section, item):
+                        continue
+                    if section == "pages" and item.get("page_num") in self.local_page_nums:
+                        continue
+                    yield section, item
+
+    def close(self):
+        temporary_keys = [shard.key for shard in self.shards if shard.temporary]
+        for shard in self.shards:
+            for f in (shard.body, shard.result):
+                if f is not None:
+                    f.close()
+        if self.local_pages is not None:
+            self.local_pages.close()
+        if temporary_keys:
+            try:
+                self.s3.delete_objects(
+                    Bucket=settings.AWS_STORAGE_BUCKET_NAME,
+                    Delete={"Objects": [{"Key": key} for key in temporary_keys], "Quiet": True},
+                )
+            except Exception:
+                logger.exception("OCR shard cleanup failed (pdf_id=%s)", self.origin_pdf.id)
+
+    # ----- 내부 -----
+
+    def _prepare(self):
+        """원본 PDF 를 내려받아 로컬 텍스트를 읽고, OCR 이 필요한 페이지를 구간별 PDF 로 자른다."""
+        source = SpooledTemporaryFile(max_size=SPOOL_MAX_SIZE)
+        try:
+            try:
+                self.s3.download_fileobj(settings.AWS_STORAGE_BUCKET_NAME, self.origin_pdf.s3_key, source)
+            except Exception as e:
+                raise OCRError(f"원본 PDF 다운로드 중 오류: {e}") from e
+            source.seek(0)
+
+            try:
+                reader = PdfReader(source)
+                page_count = len(reader.pages)
+            except Exception as e:
+                raise OCRError(f"PDF 읽기 중 오류: {e}") from e
+
+            if self.use_text_layer:
+                ocr_pages = self._read_text_layer(reader)
+            else:
+                ocr_pages = list(range(page_count))
+            if not ocr_pages:
+                return []
+
+            groups = split_groups(ocr_pages, self.pages_per_shard or len(ocr_pages), self.overlap)
+            if len(groups) == 1 and len(ocr_pages) == page_count:
+                # 나눌 필요가 없으면 원본 객체를 그대로 사용
+                return [_Shard(0, ocr_pages, self.origin_pdf.s3_key)]
+
+            run_id = uuid.uuid4().hex
+            shards = []
+            for index, (pages, core) in enumerate(groups):
+                shard = _Shard(index, pages, f"ocr-shards/{run_id}/{index}.pdf", core)
+                writer = PdfWriter()
+                for page_index in pages:
+                    writer.add_page(reader.pages[page_index])
+                shard.body = SpooledTemporaryFile(max_size=SPOOL_MAX_SIZE)
+                writer.write(shard.body)
+                shards.append(shard)
+            return shards
+        finally:
+            source.close()
+
+    def _read_text_layer(self, reader):
+        """텍스트 레이어가 쓸 만한 페이지는 로컬 텍스트로 저장하고, OCR 이 필요한 페이지 index 목록을 반환"""
+        base = settings.OCR_PAGE_NUM_BASE
+        self.local_pages = SpooledTemporaryFile(max_size=SPOOL_MAX_SIZE, mode="w+", encoding="utf-8")
+        ocr_pages = []
+        for index, page in enumerate(reader.pages):
+            layer = read_text_layer(page)
+            if layer.usable:
+                page_num = index + base
+                self.local_page_nums.add(page_num)
+                self.local_pages.write(json.dumps({"page_num": page_num, "text": layer.text}, ensure_ascii=False))
+                self.local_pages.write("\n")
+            if layer.needs_ocr:
+                ocr_pages.append(index)
+        return ocr_pages
+
+    def _process(self, shard):
+        """(스레드) 구간 PDF 업로드 후 OCR 요청, 실패하면 이 구간만 재시도"""
+        self.upload(shard)
+
+        last_error = None
+        for attempt in range(self.retries + 1):
+            endpoint = self.endpoint_for(shard, attempt)
+            try:
+                presigned_url = presign_get_url(shard.key)
+                with post_ocr(endpoint, presigned_url) as ocr_response:
+                    result = SpooledTemporaryFile(max_size=SPOOL_MAX_SIZE)
+                    try:
+                        for chunk in ocr_response.iter_content(chunk_size=settings.OCR_STREAM_CHUNK_SIZE):
+                            result.write(chunk)
+                    except Exception:
+                        result.close()
+                        raise
+                shard.result = result
+                return
+            except Exception as e:
+                last_error = e
+                self.attempt_failed(shard, attempt, endpoint, e)
+
+        raise self.shard_failed(shard, last_error)
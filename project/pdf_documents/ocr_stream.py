@@ -0,0 +1,245 @@
+# pdf_documents/ocr_stream.py
+"""
+OCR 서버 응답 스트리밍 파서.
+
+응답 전체를 ocr_response.json() 으로 메모리에 올리지 않고,
+청크 단위로 읽으면서 {"pages": [...], "figures": [...], "matches": [...]} 의
+배열 원소를 하나씩 (section, item) 으로 돌려준다.
+OCR 서버가 JSON 을 문자열로 한 번 더 감싸서 보내는 경우(이중 인코딩)도
+바깥 문자열을 조각 단위로 unescape 하면서 같은 방식으로 처리한다.
+버퍼에는 "현재 원소 하나 + 청크 하나" 정도만 남으므로 문서 크기와 무관하게
+메모리 사용량이 일정하다.
+"""
+import codecs
+import json
+import re
+
+_decoder = json.JSONDecoder()
+_WHITESPACE = " \t\n\r"
+_STRING_SPECIAL = re.compile(r'["\\]')
+_ESCAPES = {
+    '"': '"', "\\": "\\", "/": "/",
+    "b": "\b", "f": "\f", "n": "\n", "r": "\r", "t": "\t",
+}
+
+
+class OCRStreamError(ValueError):
+    """OCR 응답이 예상한 JSON 형식이 아닐 때 발생"""
+
+
+def iter_decoded(byte_chunks, encoding="utf-8"):
+    """bytes 청크를 str 청크로 변환 (멀티바이트 문자가 청크 경계에 걸려도 안전)"""
+    decoder = codecs.getincrementaldecoder(encoding)()
+    for chunk in byte_chunks:
+        if chunk:
+            text = decoder.decode(chunk)
+            if text:
+                yield text
+    tail = decoder.decode(b"", final=True)
+    if tail:
+        yield tail
+
+
+def iter_unescaped(chunks):
+    """
+    여는 따옴표 바로 다음부터 시작하는 JSON 문자열 리터럴의 내용을
+    조각 단위로 unescape 해서 돌려준다. 닫는 따옴표를 만나면 끝난다.
+    """
+    pending = ""  # 청크 경계에 걸린 escape 시퀀스
+    for chunk in chunks:
+        s = pending + chunk
+        pending = ""
+        out = []
+        i, n = 0, len(s)
+        while i < n:
+            m = _STRING_SPECIAL.search(s, i)
+            if m is None:
+                out.append(s[i:])
+                break
+
+            start = m.start()
+            out.append(s[i:start])
+            if s[start] == '"':
+                # 닫는 따옴표: 문자열 끝
+                if out:
+                    yield "".join(out)
+                return
+
+            if start + 1 >= n:
+                pending = s[start:]
+                break
+
+            esc = s[start + 1]
+            if esc == "u":
+                if start + 6 > n:
+                    pending = s[start:]
+                    break
+                code = int(s[start + 2:start + 6], 16)
+                i = start + 6
+                if 0xD800 <= code < 0xDC00:
+                    # surrogate pair (\ud83d\ude00 형태)
+                    rest = s[start + 6:start + 8]
+                    if rest in ("", "\\") or (rest == "\\u" and start + 12 > n):
+                        pending = s[start:]
+                        break
+                    if rest == "\\u":
+                        low = int(s[start + 8:start + 12], 16)
+                        if 0xDC00 <= low < 0xE000:
+                            code = 0x10000 + ((code - 0xD800) << 10) + (low - 0xDC00)
+                            i = start + 12
+                out.append(chr(code))
+            elif esc in _ESCAPES:
+                out.append(_ESCAPES[esc])
+                i = start + 2
+            else:
+                raise OCRStreamError(f"잘못된 escape 시퀀스: \\{esc}")
+        if out:
+            yield "".join(out)
+
+    raise OCRStreamError("이중 인코딩된 JSON 문자열이 닫히지 않았습니다.")
+
+
+class _Reader:
+    """str 청크 이터레이터 위에서 동작하는 작은 버퍼"""
+
+    def __init__(self, chunks):
+        self._chunks = iter(chunks)
+        self.buf = ""
+        self.pos = 0
+        self.eof = False
+
+    def _read(self):
+        if self.eof:
+            return False
+        try:
+            chunk = next(self._chunks)
+        except StopIteration:
+            self.eof = True
+            return False
+        # 이미 소비한 앞부분은 버려서 버퍼가 계속 커지지 않도록 한다
+        self.buf = self.buf[self.pos:] + chunk
+        self.pos = 0
+        return True
+
+    def _read_more(self):
+        """
+        남아 있는 양만큼 더 읽는다. (큰 원소를 디코딩할 때 재시도 횟수를 로그 단위로 줄이기 위함)
+        """
+        need = max(len(self.buf) - self.pos, 1)
+        got = 0
+        while got < need:
+            before = len(self.buf) - self.pos
+            if not self._read():
+                return got > 0
+            got += (len(self.buf) - self.pos) - before
+        return True
+
+    def peek(self):
+        """공백을 건너뛴 다음 문자 (데이터가 끝났으면 "")"""
+        while True:
+            while self.pos < len(self.buf) and self.buf[self.pos] in _WHITESPACE:
+                self.pos += 1
+            if self.pos < len(self.buf):
+                return self.buf[self.pos]
+            if not self._read():
+                return ""
+
+    def take(self):
+        c = self.peek()
+        if c:
+            self.pos += 1
+        return c
+
+    def expect(self, ch):
+        c = self.take()
+        if c != ch:
+            raise OCRStreamError(f"'{ch}' 가 와야 할 위치에 {c!r} 가 있습니다.")
+
+    def decode_value(self):
+        """현재 위치의 JSON 값 하나를 디코딩한다. (필요한 만큼만 더 읽음)"""
+        self.peek()
+        while True:
+            try:
+                value, end = _decoder.raw_decode(self.buf, self.pos)
+            except json.JSONDecodeError as e:
+                if not self._read_more():
+                    raise OCRStreamError(f"OCR 응답 JSON 파싱 실패: {e}") from e
+                continue
+
+            # 숫자는 청크 경계에서 잘려도 디코딩이 성공하므로 한 번 더 읽어서 확인
+            if (
+                end == len(self.buf)
+                and not self.eof
+                and isinstance(value, (int, float))
+                and self._read_more()
+            ):
+                continue
+
+            self.pos = end
+            return value
+
+    def iter_rest(self):
+        """아직 소비하지 않은 나머지 데이터를 청크 단위로 돌려준다."""
+        if self.pos < len(self.buf):
+            yield self.buf[self.pos:]
+        self.buf, self.pos = "", 0
+        while self._read():
+            yield self.buf
+            self.buf = ""
+
+
+def _iter_object_items(reader):
+    reader.expect("{")
+    if reader.peek() == "}":
+        reader.take()
+        return
+
+    while True:
+        key = reader.decode_value()
+        if not isinstance(key, str):
+            raise OCRStreamError("OCR 응답 객체의 key 가 문자열이 아닙니다.")
+        reader.expect(":")
+
+        if reader.peek() == "[":
+            reader.take()
+            if reader.peek() == "]":
+                reader.take()
+            else:
+                while True:
+                    yield key, reader.decode_value()
+                    c = reader.take()
+                    if c == "]":
+                        break
+                    if c != ",":
+                        raise OCRStreamError(f"배열 '{key}' 의 형식이 올바르지 않습니다.")
+        else:
+            # 배열이 아닌 값(메타데이터 등)은 사용하지 않는다
+            reader.decode_value()
+
+        c = reader.take()
+        if c == "}":
+            return
+        if c != ",":
+            raise OCRStreamError("OCR 응답 객체의 형식이 올바르지 않습니다.")
+
+
+def iter_ocr_items(byte_chunks):
+    """
+    OCR 응답 바이트 청크에서 최상위 배열 원소를 (section, item) 으로 하나씩 돌려준다.
+    section 은 "pages" / "figures" / "matches" 같은 최상위 key 이다.
+    """
+    reader = _Reader(iter_decoded(byte_chunks))
+
+    first = reader.peek()
+    if first == '"':
+        # 이중 인코딩: 바깥 문자열을 풀면서 안쪽 JSON 을 다시 읽는다
+        reader.take()
+        reader = _Reader(iter_unescaped(reader.iter_rest()))
+        first = reader.peek()
+
+    if first != "{":
+        raise OCRStreamError(
+            f"OCR 서버에서 예상치 못한 JSON 형식(객체가 아님)을 받았습니다. (시작 문자: {first!r})"
+        )
+
+    yield from _iter_object_items(reader)
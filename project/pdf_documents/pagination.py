@@ -0,0 +1,16 @@
+# pdf_documents/pagination.py
+"""
+PDFpageGetView 용 cursor(keyset) 페이지네이션.
+
+OFFSET 없이 `page_num > 마지막 page_num` 으로 다음 구간을 읽으므로
+(pdf_id, page_num) 인덱스를 그대로 타고, 뒤쪽 구간도 앞쪽과 같은 비용으로 조회된다.
+"""
+from django.conf import settings
+from rest_framework.pagination import CursorPagination
+
+
+class PageNumCursorPagination(CursorPagination):
+    ordering = "page_num"
+    page_size = settings.PDF_PAGE_LIST_PAGE_SIZE
+    page_size_query_param = "limit"
+    max_page_size = settings.PDF_PAGE_LIST_MAX_PAGE_SIZE
@@ -0,0 +1,146 @@
+# pdf_documents/query_plans.py
+"""
+문서 단위 조회 쿼리의 실행 계획(EXPLAIN) 점검.
+
+check_query_plans 관리 명령과 테스트(pdf_documents/tests.py, highlights/tests.py)가 hot_queries() 의 각 쿼리를
+EXPLAIN 해서 full table scan / full index scan / filesort 가 나오거나, (MySQL 에서) 기본 테이블이
+EXPECTED_INDEXES 와 다른 인덱스를 고르면 실패로 처리한다.
+뷰의 조회 조건이나 인덱스를 바꾸면 여기의 쿼리와 기대 인덱스도 같이 맞춰 둔다.
+"""
+import json
+
+from django.db import connections
+
+from highlights.models import Highlight, Tag
+from pdf_figures.models import PDFfigure
+from searches.models import SearchPosting
+
+from .models import originPDF, PDFpage, MatchedText, OCRJob
+from .bundle import bundle_querysets
+
+# MySQL EXPLAIN access_type 중 인덱스를 타지 않는(전체를 훑는) 방식
+FULL_SCAN_ACCESS_TYPES = ("ALL", "index")
+
+# hot_queries() 이름 → 기본 테이블이 타야 하는 인덱스.
+# Meta.indexes 로 만든 인덱스는 이름으로, 이름이 자동으로 붙는 인덱스(PK / FK)는 선두 컬럼 tuple 로 적는다.
+# (MySQL InnoDB 에서 FK 인덱스 이름은 제약 이름을 따른다)
+EXPECTED_INDEXES = {
+    "UserPDFDataView": "originpdf_user_created_idx",
+    "OriginPDFGetView": ("id",),
+    "MatchedTextListView": ("pdf_id_id",),
+    "GetFiguresByOriginPDFAPIView": ("pdf_id_id",),
+    "PDFpageGetView": "pdfpage_pdf_page_num_idx",
+    "PDFpage by page_num": "pdfpage_pdf_page_num_idx",
+    "OCRStatusView": "ocrjob_pdf_created_idx",
+    "GetHighlightByOriginPDFAPIView": "highlight_pdf_page_idx",
+    "Tag by pdf_id": ("pdf_id_id",),
+    "PDFBundleView pages": "pdfpage_pdf_page_num_idx",
+    "PDFBundleView figures": ("pdf_id_id",),
+    "PDFBundleView matches": ("pdf_id_id",),
+    "PDFBundleView tags": ("pdf_id_id",),
+    "PDFBundleView highlights": "highlight_pdf_page_idx",
+    "DocumentSearchView postings": "searchposting_pdf_term_idx",
+    "DocumentSearchView prefix": "searchposting_pdf_term_idx",
+    "LibrarySearchView postings": "searchposting_user_term_idx",
+}
+
+
+def hot_queries(user, origin_pdf):
+    """(이름, queryset) 목록. 각 쿼리는 해당 API 뷰의 주 조회와 같은 조건이다."""
+    return [
+        ("UserPDFDataView", originPDF.objects.filter(user_id=user).order_by("-created_at")),
+        ("OriginPDFGetView", originPDF.objects.filter(id=origin_pdf.id, user_id=user)),
+        ("MatchedTextListView", MatchedText.objects.filter(pdf_id=origin_pdf)),
+        ("GetFiguresByOriginPDFAPIView", PDFfigure.objects.filter(pdf_id=origin_pdf.id)),
+        ("PDFpageGetView", PDFpage.objects.filter(pdf_id=origin_pdf).order_by("page_num")),
+        ("PDFpage by page_num", PDFpage.objects.filter(pdf_id=origin_pdf, page_num=1)),
+        (
+            "OCRStatusView",
+            OCRJob.objects.filter(pdf_id=origin_pdf.id, pdf_id__user_id=user).order_by("-created_at")[:1],
+        ),
+        ("GetHighlightByOriginPDFAPIView", Highlight.objects.filter(pdf_id=origin_pdf.id).order_by("page_id", "id")),
+        # Tag 는 FK 인덱스(pdf_id)로 충분하다
+        ("Tag by pdf_id", Tag.objects.filter(pdf_id=origin_pdf)),
+        *((f"PDFBundleView {name}", queryset) for name, queryset in bundle_querysets(origin_pdf).items()),
+        ("DocumentSearchView postings", SearchPosting.objects.filter(pdf_id=origin_pdf, term__in=["검색", "색인"])),
+        ("DocumentSearchView prefix", SearchPosting.objects.filter(pdf_id=origin_pdf, term__startswith="검")),
+        (
+            "LibrarySearchView postings",
+            SearchPosting.objects.filter(user_id=user, pdf_id__deleted_at__isnull=True, term__in=["검색", "색인"]),
+        ),
+    ]
+
+
+def _walk(node):
+    if isinstance(node, dict):
+        yield node
+        for value in node.values():
+            yield from _walk(value)
+    elif isinstance(node, list):
+        for value in node:
+            yield from _walk(value)
+
+
+def _mysql_problems(queryset):
+    plan = json.loads(queryset.explain(format="json"))
+    for node in _walk(plan):
+        access_type = node.get("access_type")
+        if access_type in FULL_SCAN_ACCESS_TYPES:
+            yield f"{node.get('table_name')}: full scan (access_type={access_type})"
+        if node.get("using_filesort"):
+            yield "filesort"
+        if node.get("using_temporary_table"):
+            yield "temporary table"
+
+
+def _sqlite_problems(queryset):
+    for line in queryset.explain().splitlines():
+        if " SCAN " in f" {line} ":
+            yield line.strip()
+        if "USE TEMP B-TREE" in line:
+            yield f"filesort ({line.strip()})"
+
+
+def chosen_index(queryset):
+    """MySQL 실행 계획에서 queryset 의 기본 테이블이 고른 인덱스 이름 (없으면 None)"""
+    table = queryset.model._meta.db_table
+    plan = json.loads(queryset.explain(format="json"))
+    for node in _walk(plan):
+        if node.get("table_name") == table:
+            return node.get("key")
+    return None
+
+
+def index_matches(model, index_name, expected, using="default"):
+    """index_name 이 expected(인덱스 이름 또는 선두 컬럼 tuple)에 해당하는지"""
+    if index_name is None:
+        return False
+    if isinstance(expected, str):
+        return index_name == expected
+    connection = connections[using]
+    with connection.cursor() as cursor:
+        constraints = connection.introspection.get_constraints(cursor, model._meta.db_table)
+    columns = constraints.get(index_name, {}).get("columns") or []
+    return tuple(columns[:len(expected)]) == tuple(expected)
+
+
+def _index_problems(queryset, expected):
+    index_name = chosen_index(queryset)
+    if not index_matches(queryset.model, index_name, expected, using=queryset.db):
+        yield f"{queryset.model._meta.db_table}: index {index_name} (expected {expected})"
+
+
+def explain_problems(queryset, expected_index=None):
+    """
+    queryset 의 실행 계획에서 full scan / filesort 를 찾아 설명 목록으로 반환한다.
+    expected_index(EXPECTED_INDEXES 의 값)를 주면 MySQL 에서 기본 테이블이 그 인덱스를 고르는지도 확인한다.
+    """
+    vendor = connections[queryset.db].vendor
+    if vendor == "mysql":
+        problems = list(_mysql_problems(queryset))
+        if expected_index is not None:
+            problems.extend(_index_problems(queryset, expected_index))
+        return list(dict.fromkeys(problems))
+    if vendor == "sqlite":
+        return list(dict.fromkeys(_sqlite_problems(queryset)))
+    return []
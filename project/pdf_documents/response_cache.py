@@ -0,0 +1,172 @@
+# pdf_documents/response_cache.py
+"""
+문서 단위 조회 API 의 직렬화 결과(JSON 본문) 캐시.
+
+MatchedTextListView / GetFiguresByOriginPDFAPIView / PDFpageGetView 의 응답은
+문서 내용이 바뀌기 전까지 같으므로, 한 번 직렬화·렌더링한 JSON 을
+(endpoint, pdf_id, 파라미터, 문서 버전) 키로 저장해 두고 그대로 돌려준다.
+
+무효화는 문서 버전(originPDF.version)으로 한다. PDFpage / PDFfigure / MatchedText 의
+post_save / post_delete signal 과 OCR 저장 경로가 버전을 올리면(versions.bump_version)
+이전 버전의 키는 더 이상 조회되지 않고, 저장소의 LRU 로 밀려난다.
+Highlight / Tag 는 highlight_version 만 올리므로 여기 캐시된 응답을 버리지 않는다.
+
+저장소는 settings.PDF_RESPONSE_CACHE 의 BACKEND 로 고른다.
+- LocMemLRUBackend: 프로세스 메모리, 항목 수 / 바이트 상한 LRU (로컬 / 테스트)
+- DjangoCacheBackend: settings.CACHES 의 공유 캐시 (운영, 여러 프로세스가 같이 씀).
+  크기 상한과 LRU 는 캐시 서버 설정(maxmemory-policy 등)을 따른다.
+두 backend 모두 bytes 값을 저장하고 유효 시간(timeout, 초)을 지원하며,
+챗봇 답변 캐시(chatbots/answer_cache.py, settings.CHAT_ANSWER_CACHE)도 같은 backend 를 쓴다.
+"""
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.cache import caches
+from django.http import HttpResponse
+from django.utils.module_loading import import_string
+from rest_framework.renderers import JSONRenderer
+
+
+class LocMemLRUBackend:
+    """timeout 이 None 이면 LRU 로 밀려날 때까지 유지한다. set(timeout=...) 으로 항목별로 정할 수 있다."""
+
+    def __init__(self, max_entries=1000, max_bytes=64 * 1024 * 1024, timeout=None):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.timeout = timeout
+        self._data = OrderedDict()  # key → (만료 시각 또는 None, body)
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.evictions = 0
+        self.expired = 0
+
+    def get(self, key):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+            expires_at, body = entry
+            if expires_at is not None and expires_at < time.monotonic():
+                del self._data[key]
+                self._bytes -= len(body)
+                self.expired += 1
+                return None
+            self._data.move_to_end(key)
+            return body
+
+    def set(self, key, body, timeout=None):
+        if len(body) > self.max_bytes:
+            return
+        timeout = self.timeout if timeout is None else timeout
+        expires_at = time.monotonic() + timeout if timeout is not None else None
+        with self._lock:
+            old = self._data.pop(key, None)
+            if old is not None:
+                self._bytes -= len(old[1])
+            self._data[key] = (expires_at, body)
+            self._bytes += len(body)
+            # 가장 오래 안 쓴 항목부터 제거
+            while len(self._data) > self.max_entries or self._bytes > self.max_bytes:
+                _, (_, evicted) = self._data.popitem(last=False)
+                self._bytes -= len(evicted)
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self._bytes = 0
+
+    def stats(self):
+        with self._lock:
+            return {
+                "entries": len(self._data), "bytes": self._bytes,
+                "evictions": self.evictions, "expired": self.expired,
+            }
+
+
+class DjangoCacheBackend:
+    def __init__(self, alias="default", timeout=3600, key_prefix="pdf-response"):
+        self.cache = caches[alias]
+        self.timeout = timeout
+        self.key_prefix = key_prefix
+
+    def get(self, key):
+        return self.cache.get(f"{self.key_prefix}:{key}")
+
+    def set(self, key, body, timeout=None):
+        self.cache.set(f"{self.key_prefix}:{key}", body, self.timeout if timeout is None else timeout)
+
+    def clear(self):
+        self.cache.clear()
+
+    def stats(self):
+        # 항목 수 / 제거 횟수는 캐시 서버 쪽 지표로 본다
+        return {"entries": None, "bytes": None, "evictions": None, "expired": None}
+
+
+class ResponseCache:
+    def __init__(self, backend):
+        self.backend = backend
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def make_key(endpoint, pdf_id, version, params=None):
+        # 파라미터 순서와 무관하게 같은 키가 나오도록 정렬해서 해시
+        raw = repr(sorted((params or {}).items()))
+        digest = hashlib.sha1(raw.encode("utf-8")).hexdigest()[:16]
+        return f"{endpoint}:{pdf_id}:{version}:{digest}"
+
+    def get_or_render(self, key, build):
+        """key 에 저장된 JSON 본문을 반환한다. 없으면 build() 결과를 렌더링해서 저장한다."""
+        body = self.backend.get(key)
+        with self._lock:
+            if body is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        if body is None:
+            body = JSONRenderer().render(build())
+            self.backend.set(key, body)
+        return body
+
+    def stats(self):
+        with self._lock:
+            data = {"hits": self.hits, "misses": self.misses}
+        data.update(self.backend.stats())
+        data["backend"] = type(self.backend).__name__
+        return data
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def make_backend(config):
+    """{"BACKEND": 경로, "OPTIONS": {...}} 설정으로 저장소를 만든다."""
+    return import_string(config["BACKEND"])(**config.get("OPTIONS", {}))
+
+
+def get_response_cache():
+    """settings.PDF_RESPONSE_CACHE 로 만든 프로세스 공용 캐시"""
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = ResponseCache(make_backend(settings.PDF_RESPONSE_CACHE))
+    return _cache
+
+
+def cached_json_response(endpoint, origin_pdf, params, build, headers=None):
+    """
+    문서 버전을 포함한 키로 캐시된 JSON 응답을 반환한다.
+    build 는 캐시에 없을 때만 호출되며, 직렬화된 데이터(list / dict)를 반환해야 한다.
+    """
+    cache = get_response_cache()
+    key = cache.make_key(endpoint, origin_pdf.id, origin_pdf.version, params)
+    body = cache.get_or_render(key, build)
+    return HttpResponse(body, content_type="application/json", headers=headers)
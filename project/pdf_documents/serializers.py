@@ -1,34 +1,66 @@
-from rest_framework import serializers
-from .models import originPDF, PDFpage, MatchedText
-
-class OriginPDFSerializer(serializers.ModelSerializer):
-    class Meta:
-        model = originPDF
-        fields = ['id', 'user_id', 'title', 'S3_url', 'created_at']
-        read_only_fields = ['id', 'created_at']
-
-
-class PDFUploadSerializer(serializers.Serializer):
-    title = serializers.CharField(required=False, allow_blank=True)
-    file = serializers.FileField()  # multipart/form-data 의 file
-
-
-class PDFpageSerializer(serializers.ModelSerializer):
-    class Meta:
-        model = PDFpage
-        fields = ['id', 'pdf_id', 'page_num', 'text']
-        read_only_fields = ['id']
-
-
-class MatchedTextSerializer(serializers.ModelSerializer):
-    class Meta:
-        model = MatchedText
-        fields = ['id', 'page_id', 'figure_id', 'page_num', 'raw_text', 'matched_text', 'text_box']
-        read_only_fields = ['id']
-
-class MatchedTextDataGetSerializer(serializers.ModelSerializer):
-    pdf_id = serializers.IntegerField(source='page_id.pdf_id.id', read_only=True)
-
-    class Meta:
-        model = MatchedText
-        fields = ['id', 'pdf_id', 'page_id', 'figure_id', 'page_num', 'raw_text', 'matched_text', 'text_box']
\ No newline at end of file
+from rest_framework import serializers
+from .models import originPDF, PDFpage, MatchedText, OCRJob
+
+class OriginPDFSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = originPDF
+        fields = ['id', 'user_id', 'title', 'S3_url', 'created_at']
+        read_only_fields = ['id', 'created_at']
+
+
+class PDFUploadSerializer(serializers.Serializer):
+    title = serializers.CharField(required=False, allow_blank=True)
+    file = serializers.FileField()  # multipart/form-data 의 file
+
+
+class PDFUploadURLRequestSerializer(serializers.Serializer):
+    title = serializers.CharField(required=False, allow_blank=True, default='')
+    size = serializers.IntegerField(min_value=1, help_text="업로드할 파일 크기(bytes)")
+
+
+class UploadedPartSerializer(serializers.Serializer):
+    part_number = serializers.IntegerField(min_value=1)
+    etag = serializers.CharField()
+
+
+class PDFUploadConfirmSerializer(serializers.Serializer):
+    upload_token = serializers.CharField()
+    parts = UploadedPartSerializer(many=True, required=False)  # multipart 업로드일 때만
+
+
+class PDFpageSerializer(serializers.ModelSerializer):
+    """`fields` 인자로 일부 필드만 직렬화할 수 있다. 예: PDFpageSerializer(qs, many=True, fields=['id', 'page_num'])"""
+
+    def __init__(self, *args, **kwargs):
+        fields = kwargs.pop('fields', None)
+        super().__init__(*args, **kwargs)
+        if fields is not None:
+            for name in set(self.fields) - set(fields):
+                self.fields.pop(name)
+
+    class Meta:
+        model = PDFpage
+        fields = ['id', 'pdf_id', 'page_num', 'text']
+        read_only_fields = ['id']
+
+
+class MatchedTextSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = MatchedText
+        fields = ['id', 'page_id', 'figure_id', 'page_num', 'raw_text', 'matched_text', 'text_box']
+        read_only_fields = ['id']
+
+class MatchedTextDataGetSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = MatchedText
+        fields = ['id', 'pdf_id', 'page_id', 'figure_id', 'page_num', 'raw_text', 'matched_text', 'text_box']
+
+
+class OCRJobSerializer(serializers.ModelSerializer):
+    job_id = serializers.IntegerField(source='id', read_only=True)
+
+    class Meta:
+        model = OCRJob
+        fields = ['job_id', 'pdf_id', 'status', 'pages_created', 'figures_created', 'matches_created',
+                  'error', 'attempts', 'created_at', 'started_at', 'finished_at']
+        read_only_fields = fields
@@ -0,0 +1,43 @@
+# pdf_documents/signals.py
+"""
+PDFpage / PDFfigure / MatchedText 가 개별 save / delete 로 바뀌면(관리자 화면 수정 등)
+소속 문서의 버전을 올린다. 조회 API 의 ETag 와 응답 캐시(response_cache.py)가 함께 무효화된다.
+OCR 저장(bulk_create)과 삭제 워커(_raw_delete)는 signal 을 보내지 않으므로 각자 버전을 처리한다.
+
+ocr_ingested: OCR 결과를 저장하는 트랜잭션(ocr.ingest_transaction) 안에서 저장이 끝난 직후 보낸다.
+인자: origin_pdf, job. 검색 색인(searches 앱)처럼 OCR 결과와 항상 같이 있어야 하는 데이터를 만든다.
+receiver 가 예외를 내면 OCR 결과도 함께 롤백되고 작업은 failed 가 된다.
+ocr_completed: OCR 작업이 done 으로 기록된 뒤 보낸다 (ocr.complete_ocr_job). 인자는 같다.
+실패해도 작업 결과는 그대로 두므로 알림처럼 없어도 되는 후처리에만 쓴다.
+
+사용자를 지우면 originPDF 가 CASCADE 로 바로 지워져 soft_delete_documents 를 거치지 않는다.
+그러면 ContentBlob 참조가 줄지 않고 S3 객체도 남으므로, 사용자 pre_delete 에서 먼저 삭제 표시를 한다.
+"""
+from django.conf import settings
+from django.db.models.signals import post_save, post_delete, pre_delete
+from django.dispatch import Signal, receiver
+
+from pdf_figures.models import PDFfigure
+
+from .deletion import soft_delete_documents
+from .models import originPDF, PDFpage, MatchedText
+from .versions import bump_version
+
+ocr_ingested = Signal()
+ocr_completed = Signal()
+
+
+@receiver(post_save, sender=PDFpage)
+@receiver(post_delete, sender=PDFpage)
+@receiver(post_save, sender=PDFfigure)
+@receiver(post_delete, sender=PDFfigure)
+@receiver(post_save, sender=MatchedText)
+@receiver(post_delete, sender=MatchedText)
+def bump_document_version(sender, instance, **kwargs):
+    bump_version(instance.pdf_id_id)
+
+
+@receiver(pre_delete, sender=settings.AUTH_USER_MODEL)
+def release_user_documents(sender, instance, **kwargs):
+    # 같은 트랜잭션 안에서 blob 참조를 놓고 S3 key 를 삭제 대기열에 넣은 뒤 CASCADE 로 행이 지워진다
+    soft_delete_documents(originPDF.all_objects.filter(user_id=instance))
@@ -0,0 +1,79 @@
+# pdf_documents/storage.py
+"""
+S3 접근 공통 모듈 (프로세스당 S3 클라이언트 하나를 공유).
+
+요청마다 boto3.client("s3", ...) 를 만들면 자격 증명 확인, 엔드포인트/서비스 모델 로딩,
+TLS 연결 수립을 매번 다시 하게 된다. 여기서는 처음 필요할 때 클라이언트를 한 번 만들고
+(boto3 클라이언트는 스레드 안전) 커넥션 풀을 재사용한다.
+gunicorn 등이 fork 한 뒤에는 자식 프로세스에서 새로 만든다.
+"""
+import os
+import threading
+
+import boto3
+from botocore.config import Config
+from django.conf import settings
+
+_lock = threading.Lock()
+_client = None
+_client_pid = None
+
+
+def client_config():
+    return Config(
+        region_name=settings.AWS_REGION,
+        max_pool_connections=settings.AWS_S3_MAX_POOL_CONNECTIONS,
+        tcp_keepalive=True,
+        connect_timeout=settings.AWS_S3_CONNECT_TIMEOUT,
+        read_timeout=settings.AWS_S3_READ_TIMEOUT,
+        retries={"max_attempts": settings.AWS_S3_MAX_ATTEMPTS, "mode": "standard"},
+    )
+
+
+def new_s3_client():
+    """공유하지 않는 새 클라이언트 (벤치마크 비교용)"""
+    # 기본 세션은 스레드 안전하지 않으므로 별도 세션에서 만든다
+    return boto3.session.Session().client(
+        "s3",
+        aws_access_key_id=settings.AWS_ACCESS_KEY_ID,
+        aws_secret_access_key=settings.AWS_SECRET_ACCESS_KEY,
+        config=client_config(),
+    )
+
+
+def get_s3_client():
+    global _client, _client_pid
+    pid = os.getpid()
+    if _client is None or _client_pid != pid:
+        with _lock:
+            if _client is None or _client_pid != pid:
+                _client = new_s3_client()
+                _client_pid = pid
+    return _client
+
+
+def object_url(key):
+    # settings.py: AWS_S3_CUSTOM_DOMAIN = f"{bucket}.s3.{AWS_REGION}.amazonaws.com"
+    return f"https://{settings.AWS_S3_CUSTOM_DOMAIN}/{key}"
+
+
+def upload_fileobj(fileobj, key, extra_args=None, config=None):
+    get_s3_client().upload_fileobj(
+        Fileobj=fileobj,
+        Bucket=settings.AWS_STORAGE_BUCKET_NAME,
+        Key=key,
+        ExtraArgs=extra_args,
+        Config=config,
+    )
+
+
+def delete_object(key):
+    get_s3_client().delete_object(Bucket=settings.AWS_STORAGE_BUCKET_NAME, Key=key)
+
+
+def presign_get_url(key, expires_in=900):
+    return get_s3_client().generate_presigned_url(
+        ClientMethod="get_object",
+        Params={"Bucket": settings.AWS_STORAGE_BUCKET_NAME, "Key": key},
+        ExpiresIn=expires_in,
+    )
@@ -1,3 +1,766 @@
-from django.test import TestCase
-
-# Create your tests here.
+import gc
+import json
+import tracemalloc
+from datetime import timedelta
+from io import BytesIO
+from tempfile import SpooledTemporaryFile
+from unittest import mock, skipUnless
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.db.models import CASCADE
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import AsyncClient, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from pypdf import PdfReader, PdfWriter
+from pypdf.generic import DecodedStreamObject, DictionaryObject, NameObject
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from pdf_figures.models import PDFfigure
+from searches.indexing import index_document
+from searches.retrieval import build_chunk_index
+
+from . import views
+from .blobs import acquire_blob, reclaim_purged_key, release_blob
+from .deletion import DELETE_PLAN, delete_documents, enqueue_s3_purge, soft_delete_documents
+from .direct_upload import make_upload_token
+from .fast_serializers import MatchedTextValuesSerializer, PDFpageValuesSerializer
+from .ingest import OCRIngestor, ingest_ocr_items
+from .management.commands.bench_ocr_stream_memory import iter_response_chunks
+from .management.commands.bench_pdf_delete import make_document
+from .models import originPDF, PDFpage, MatchedText, OCRJob, ContentBlob, S3PurgeTask
+from .ocr import (
+    OCRJobCancelled, claim_next_job, complete_ocr_job, enqueue_ocr_job, ingest_transaction, requeue_stale_jobs,
+)
+from .ocr_client import iter_response_items
+from .ocr_shard import ShardedOCRRun, _Shard, split_groups
+from .query_plans import EXPECTED_INDEXES, explain_problems, hot_queries
+from .response_cache import get_response_cache
+from .serializers import MatchedTextDataGetSerializer, PDFpageSerializer
+from .text_layer import read_text_layer
+
+
+def make_pdf(user, title="test"):
+    return originPDF.objects.create(
+        user_id=user, title=title, S3_url="https://example.com/test.pdf", s3_key=f"pdfs/{title}.pdf",
+    )
+
+
+class ReclaimPurgedKeyTests(TestCase):
+    """find_blob 과 acquire_blob 사이에 마지막 참조가 사라진 경우"""
+
+    def release_last(self):
+        blob, _ = acquire_blob("a" * 64, "pdfs/shared.pdf", 10)
+        key = release_blob(blob.id)
+        enqueue_s3_purge([key])
+        return key
+
+    def test_pending_purge_is_cancelled(self):
+        key = self.release_last()
+        blob, created = acquire_blob("a" * 64, key, 10)
+        self.assertTrue(created)
+        self.assertTrue(reclaim_purged_key(key))
+        self.assertFalse(S3PurgeTask.objects.filter(s3_key=key).exists())
+        self.assertEqual(ContentBlob.objects.get(id=blob.id).s3_key, key)
+
+    def test_already_purged_key_is_not_reused(self):
+        key = self.release_last()
+        # purge 워커가 이미 처리함
+        S3PurgeTask.objects.filter(s3_key=key).delete()
+        self.assertFalse(reclaim_purged_key(key))
+
+
+@mock.patch("pdf_documents.views.get_s3_client", mock.Mock())
+@mock.patch("pdf_documents.storage.object_url", lambda key: f"https://example.com/{key}")
+class UserDeleteTests(TestCase):
+    """사용자를 지우면 문서가 soft_delete_documents 를 거쳐 blob 참조와 S3 key 를 정리한다"""
+
+    def setUp(self):
+        User = get_user_model()
+        self.user = User.objects.create_user(email="leaving@example.com")
+        self.other = User.objects.create_user(email="staying@example.com")
+        self.shared, _ = acquire_blob("s" * 64, "pdfs/shared.pdf", 10)
+        acquire_blob("s" * 64, "pdfs/shared.pdf", 10)
+        self.own, _ = acquire_blob("o" * 64, "pdfs/own.pdf", 10)
+        for user, blob in ((self.user, self.shared), (self.user, self.own), (self.other, self.shared)):
+            originPDF.objects.create(
+                user_id=user, title="lecture", S3_url="https://example.com/lecture.pdf", s3_key=blob.s3_key, blob=blob,
+            )
+        # blob 이 없는(중복 제거 이전) 문서는 자기 key 를 지운다
+        make_pdf(self.user, "legacy")
+
+    def test_delete_user_releases_blobs(self):
+        self.user.delete()
+
+        self.assertFalse(originPDF.all_objects.filter(user_id=self.user.pk).exists())
+        self.assertEqual(
+            set(S3PurgeTask.objects.values_list("s3_key", flat=True)), {"pdfs/own.pdf", "pdfs/legacy.pdf"},
+        )
+        self.assertFalse(ContentBlob.objects.filter(id=self.own.id).exists())
+        # 다른 사용자가 쓰는 blob 은 참조만 하나 줄어든다
+        self.assertEqual(ContentBlob.objects.get(id=self.shared.id).ref_count, 1)
+        self.assertEqual(originPDF.objects.filter(user_id=self.other).count(), 1)
+
+
+def run_in_test_thread(func, *args, **kwargs):
+    # run_blocking 은 새 스레드(새 DB 커넥션)에서 실행해 테스트 트랜잭션의 행이 보이지 않으므로 테스트 스레드에서 실행
+    return sync_to_async(func)(*args, **kwargs)
+
+
+class AsyncViewTests(TestCase):
+    """async_views.py 의 인증 / 권한 / 성공 응답 (AsyncClient)"""
+
+    def setUp(self):
+        User = get_user_model()
+        self.user = User.objects.create_user(email="async-views@example.com")
+        self.origin_pdf = make_pdf(self.user, "async")
+        self.others = make_pdf(User.objects.create_user(email="async-other@example.com"), "others")
+        self.client = AsyncClient()
+        self.auth = {"Authorization": f"Bearer {RefreshToken.for_user(self.user).access_token}"}
+
+    async def test_requires_token(self):
+        requests = (
+            self.client.post(reverse("pdf_documents:pdf-upload-async")),
+            self.client.delete(reverse("pdf_documents:pdf-delete-async", args=[self.origin_pdf.id])),
+            self.client.post(reverse("pdf_documents:pdf-ocr-async", args=[self.origin_pdf.id])),
+            self.client.post(
+                reverse("pdf_documents:pdf-ocr-async", args=[self.origin_pdf.id]),
+                headers={"Authorization": "Bearer invalid"},
+            ),
+        )
+        for request in requests:
+            self.assertEqual((await request).status_code, 401)
+
+    @override_settings(PDF_STREAM_UPLOAD_ENABLED=False)
+    @mock.patch("pdf_documents.async_views.run_blocking", run_in_test_thread)
+    @mock.patch("pdf_documents.storage.upload_fileobj")
+    async def test_upload(self, upload_fileobj):
+        url = reverse("pdf_documents:pdf-upload-async")
+        response = await self.client.post(url, {"title": "빈 요청"}, headers=self.auth)
+        self.assertEqual(response.status_code, 400)
+
+        upload = SimpleUploadedFile("lecture.pdf", b"%PDF-1.4 async", content_type="application/pdf")
+        response = await self.client.post(url, {"title": "강의", "file": upload}, headers=self.auth)
+        self.assertEqual(response.status_code, 201)
+        upload_fileobj.assert_called_once()
+        origin_pdf = await originPDF.objects.aget(id=response.json()["id"])
+        self.assertEqual((origin_pdf.user_id_id, origin_pdf.title), (self.user.pk, "강의"))
+
+    async def test_delete(self):
+        response = await self.client.delete(
+            reverse("pdf_documents:pdf-delete-async", args=[self.others.id]), headers=self.auth,
+        )
+        self.assertEqual(response.status_code, 404)
+
+        url = reverse("pdf_documents:pdf-delete-async", args=[self.origin_pdf.id])
+        self.assertEqual((await self.client.delete(url, headers=self.auth)).status_code, 204)
+        self.assertFalse(await originPDF.objects.filter(id=self.origin_pdf.id).aexists())
+        self.assertTrue(await S3PurgeTask.objects.filter(s3_key=self.origin_pdf.s3_key).aexists())
+        # 이미 삭제된 문서
+        self.assertEqual((await self.client.delete(url, headers=self.auth)).status_code, 404)
+
+    async def test_ocr_enqueue(self):
+        response = await self.client.post(
+            reverse("pdf_documents:pdf-ocr-async", args=[self.others.id]), headers=self.auth,
+        )
+        self.assertEqual(response.status_code, 404)
+
+        response = await self.client.post(
+            reverse("pdf_documents:pdf-ocr-async", args=[self.origin_pdf.id]), headers=self.auth,
+        )
+        self.assertEqual(response.status_code, 202)
+        body = response.json()
+        self.assertEqual((body["pdf_id"], body["status"]), (self.origin_pdf.id, OCRJob.STATUS_QUEUED))
+        self.assertEqual(await OCRJob.objects.filter(pdf_id=self.origin_pdf).acount(), 1)
+
+        await originPDF.objects.filter(id=self.origin_pdf.id).aupdate(s3_key="")
+        response = await self.client.post(
+            reverse("pdf_documents:pdf-ocr-async", args=[self.origin_pdf.id]), headers=self.auth,
+        )
+        self.assertEqual(response.status_code, 400)
+
+
+class UploadConfirmRetryTests(TestCase):
+    """confirm 재시도는 업로드 key 로 찾는다 (중복 파일이면 s3_key 는 공유 객체)"""
+
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(email="confirm@example.com")
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.url = reverse("pdf_documents:pdf-upload-confirm")
+        acquire_blob("b" * 64, "pdfs/shared.pdf", 10)
+
+    def confirm(self, key):
+        token = make_upload_token(self.user.pk, key, "dup")
+        return self.client.post(self.url, {"upload_token": token}, format="json")
+
+    @mock.patch("pdf_documents.storage.delete_object")
+    def test_retry_after_dedupe_returns_existing(self, delete_object):
+        with mock.patch("pdf_documents.views.head_upload", return_value=(10, "b" * 64)):
+            with self.captureOnCommitCallbacks(execute=True):
+                first = self.confirm("pdfs/upload.pdf")
+        self.assertEqual(first.status_code, 201)
+        delete_object.assert_called_once_with("pdfs/upload.pdf")
+        origin_pdf = originPDF.objects.get(id=first.data["id"])
+        self.assertEqual((origin_pdf.s3_key, origin_pdf.upload_key), ("pdfs/shared.pdf", "pdfs/upload.pdf"))
+
+        # 업로드 객체는 이미 지워졌지만 재시도는 같은 문서를 돌려준다
+        with mock.patch("pdf_documents.views.head_upload", side_effect=AssertionError):
+            retry = self.confirm("pdfs/upload.pdf")
+        self.assertEqual(retry.status_code, 200)
+        self.assertEqual(retry.data["id"], first.data["id"])
+        self.assertEqual(ContentBlob.objects.get(sha256="b" * 64).ref_count, 2)
+
+    @mock.patch("pdf_documents.storage.delete_object")
+    def test_concurrent_confirm_returns_existing(self, delete_object):
+        with mock.patch("pdf_documents.views.head_upload", return_value=(10, "b" * 64)):
+            first = self.confirm("pdfs/upload.pdf")
+            # 처음 조회 때는 아직 없던 행을 다른 confirm 이 먼저 저장한 경우: upload_key unique 에 걸린다
+            existing = views._confirmed_response(self.user, "pdfs/upload.pdf")
+            with mock.patch("pdf_documents.views._confirmed_response", side_effect=[None, existing]):
+                second = self.confirm("pdfs/upload.pdf")
+        self.assertEqual(second.status_code, 200)
+        self.assertEqual(second.data["id"], first.data["id"])
+        self.assertEqual(originPDF.objects.filter(upload_key="pdfs/upload.pdf").count(), 1)
+        # 늦게 온 confirm 의 blob 참조 증가는 롤백된다
+        self.assertEqual(ContentBlob.objects.get(sha256="b" * 64).ref_count, 2)
+
+
+class StaleOCRJobTests(TestCase):
+    """워커가 죽어 heartbeat 가 끊긴 running 작업 처리"""
+
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(email="ocr-jobs@example.com")
+        self.origin_pdf = make_pdf(self.user)
+
+    def expire_heartbeat(self, job):
+        stale_at = timezone.now() - timedelta(seconds=settings.OCR_JOB_HEARTBEAT_TIMEOUT + 1)
+        OCRJob.objects.filter(id=job.id).update(heartbeat_at=stale_at)
+
+    def test_claim_sets_heartbeat_and_attempts(self):
+        enqueue_ocr_job(self.origin_pdf)
+        job = claim_next_job()
+        self.assertEqual(job.status, OCRJob.STATUS_RUNNING)
+        self.assertEqual(job.attempts, 1)
+        self.assertIsNotNone(job.heartbeat_at)
+
+    def test_live_running_job_is_not_requeued(self):
+        enqueue_ocr_job(self.origin_pdf)
+        job = claim_next_job()
+        self.assertEqual(requeue_stale_jobs(), 0)
+        job.refresh_from_db()
+        self.assertEqual(job.status, OCRJob.STATUS_RUNNING)
+
+    def test_stale_running_job_is_requeued(self):
+        enqueue_ocr_job(self.origin_pdf)
+        job = claim_next_job()
+        self.expire_heartbeat(job)
+
+        self.assertEqual(requeue_stale_jobs(), 1)
+        job.refresh_from_db()
+        self.assertEqual(job.status, OCRJob.STATUS_QUEUED)
+        self.assertIsNone(job.heartbeat_at)
+
+        again = claim_next_job()
+        self.assertEqual(again.id, job.id)
+        self.assertEqual(again.attempts, 2)
+
+    def test_enqueue_does_not_return_stale_running_job(self):
+        enqueue_ocr_job(self.origin_pdf)
+        job = claim_next_job()
+        self.expire_heartbeat(job)
+
+        retried, _ = enqueue_ocr_job(self.origin_pdf)
+        self.assertEqual(retried.id, job.id)
+        self.assertEqual(retried.status, OCRJob.STATUS_QUEUED)
+
+    def test_stale_job_fails_after_max_attempts(self):
+        enqueue_ocr_job(self.origin_pdf)
+        job = claim_next_job()
+        OCRJob.objects.filter(id=job.id).update(attempts=settings.OCR_JOB_MAX_ATTEMPTS)
+        self.expire_heartbeat(job)
+
+        requeue_stale_jobs()
+        job.refresh_from_db()
+        self.assertEqual(job.status, OCRJob.STATUS_FAILED)
+
+        new_job, created = enqueue_ocr_job(self.origin_pdf)
+        self.assertTrue(created)
+        self.assertNotEqual(new_job.id, job.id)
+
+    def test_result_of_requeued_attempt_is_discarded(self):
+        enqueue_ocr_job(self.origin_pdf)
+        first = claim_next_job()
+        self.expire_heartbeat(first)
+        requeue_stale_jobs()
+        second = claim_next_job()
+
+        complete_ocr_job(first, {"pages_created": 1, "figures_created": 0, "matches_created": 0})
+        second.refresh_from_db()
+        self.assertEqual(second.status, OCRJob.STATUS_RUNNING)
+        self.assertEqual(second.attempts, 2)
+        self.assertEqual(second.pages_created, 0)
+
+
+class PageListPaginationTests(TestCase):
+    """PDFpageGetView 의 cursor 페이지네이션 경계와 잘못된 파라미터"""
+
+    def setUp(self):
+        get_response_cache().backend.clear()
+        self.user = get_user_model().objects.create_user(email="page-list@example.com")
+        self.origin_pdf = make_document(self.user, 7, highlights_per_page=0)
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.url = reverse("pdf_documents:pdf-pages-get", args=[self.origin_pdf.id])
+
+    def page_nums(self, response):
+        # 성공 응답은 캐시된 JSON 을 그대로 보내는 HttpResponse (response.data 가 없음)
+        self.assertEqual(response.status_code, 200)
+        return [page["page_num"] for page in response.json()["results"]]
+
+    def test_cursor_walks_every_page_once(self):
+        response = self.client.get(self.url, {"limit": 3})
+        self.assertEqual(self.page_nums(response), [1, 2, 3])
+        self.assertIsNone(response.json()["previous"])
+
+        response = self.client.get(response.json()["next"])
+        self.assertEqual(self.page_nums(response), [4, 5, 6])
+
+        last = self.client.get(response.json()["next"])
+        self.assertEqual(self.page_nums(last), [7])
+        self.assertIsNone(last.json()["next"])
+        # 마지막 구간에서 돌아가면 바로 앞 구간
+        self.assertEqual(self.page_nums(self.client.get(last.json()["previous"])), [4, 5, 6])
+
+    def test_range_and_fields(self):
+        response = self.client.get(self.url, {"start": 2, "end": 5, "limit": 3, "fields": "id,page_num"})
+        self.assertEqual(self.page_nums(response), [2, 3, 4])
+        self.assertEqual(set(response.json()["results"][0]), {"id", "page_num"})
+        response = self.client.get(response.json()["next"])
+        self.assertEqual(self.page_nums(response), [5])
+        self.assertIsNone(response.json()["next"])
+
+        self.assertEqual(self.page_nums(self.client.get(self.url, {"start": 6, "end": 2})), [])
+        # limit 은 최대값으로 줄인다
+        with mock.patch.object(views.PageNumCursorPagination, "max_page_size", 4):
+            self.assertEqual(self.page_nums(self.client.get(self.url, {"limit": 100})), [1, 2, 3, 4])
+
+    def test_without_params_returns_full_list(self):
+        response = self.client.get(self.url)
+        self.assertEqual([page["page_num"] for page in response.json()], list(range(1, 8)))
+
+    def test_invalid_params(self):
+        for params in ({"start": "abc"}, {"end": "1.5"}, {"fields": "id,secret"}):
+            response = self.client.get(self.url, params)
+            self.assertEqual(response.status_code, 400, params)
+            self.assertIn("detail", response.data)
+
+
+class BundleTests(TestCase):
+    """PDFBundleView: 섹션 선택과 문서 크기와 무관한 쿼리 수"""
+
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(email="bundle@example.com")
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def get(self, origin_pdf, **params):
+        return self.client.get(reverse("pdf_documents:pdf-bundle", args=[origin_pdf.id]), params)
+
+    def test_section_selection(self):
+        origin_pdf = make_document(self.user, 2)
+        response = self.get(origin_pdf)
+        self.assertEqual(list(response.data), ["meta", "pages", "figures", "matches", "tags", "highlights"])
+        self.assertEqual(response.data["pages"], [
+            {"id": page.id, "page_num": page.page_num}
+            for page in PDFpage.objects.filter(pdf_id=origin_pdf).order_by("page_num")
+        ])
+        self.assertEqual(response.data["meta"]["id"], origin_pdf.id)
+
+        # 요청 순서와 관계없이 응답 키는 정해진 순서
+        response = self.get(origin_pdf, sections="highlights, meta")
+        self.assertEqual(list(response.data), ["meta", "highlights"])
+        self.assertEqual(len(response.data["highlights"]), 4)
+
+        response = self.get(origin_pdf, sections="meta,secret")
+        self.assertEqual(response.status_code, 400)
+
+    def test_query_count_is_independent_of_size(self):
+        counts = []
+        for page_count in (2, 20):
+            origin_pdf = make_document(self.user, page_count)
+            with CaptureQueriesContext(connection) as ctx:
+                response = self.get(origin_pdf)
+            self.assertEqual(len(response.data["matches"]), page_count * 3)
+            self.assertEqual(len(response.data["highlights"]), page_count * 2)
+            counts.append(len(ctx.captured_queries))
+        self.assertEqual(counts[0], counts[1])
+        # 문서 조회 1번 + meta 를 뺀 섹션마다 1번
+        self.assertEqual(counts[0], 1 + 5)
+
+    def test_other_users_document(self):
+        other = get_user_model().objects.create_user(email="bundle-other@example.com")
+        self.assertEqual(self.get(make_document(other, 1)).status_code, 404)
+
+
+class ValuesListSerializerParityTests(TestCase):
+    """values_list 직렬화는 기존 ModelSerializer 와 같은 JSON 을 만든다"""
+
+    def setUp(self):
+        user = get_user_model().objects.create_user(email="parity@example.com")
+        self.origin_pdf = make_document(user, 3, highlights_per_page=0)
+        # JSON 값 / 빈 문자열 / 한글도 같은지
+        MatchedText.objects.filter(pdf_id=self.origin_pdf).update(matched_text="")
+        MatchedText.objects.filter(id=MatchedText.objects.filter(pdf_id=self.origin_pdf).first().id).update(
+            raw_text="그림 1 설명", text_box={"x0": 0.5, "y0": 1, "x1": 2, "y1": 3},
+        )
+
+    def assertSameJSON(self, fast, model):
+        self.assertEqual(JSONRenderer().render(fast), JSONRenderer().render(model))
+
+    def test_pages(self):
+        pages = PDFpage.objects.filter(pdf_id=self.origin_pdf).order_by("page_num")
+        self.assertSameJSON(PDFpageValuesSerializer(pages).data, PDFpageSerializer(pages, many=True).data)
+        fields = ["id", "page_num"]
+        self.assertSameJSON(
+            PDFpageValuesSerializer(pages, fields=fields).data, PDFpageSerializer(pages, many=True, fields=fields).data,
+        )
+
+    def test_matched_texts(self):
+        matches = MatchedText.objects.filter(pdf_id=self.origin_pdf).order_by("id")
+        self.assertEqual(matches.count(), 9)
+        self.assertSameJSON(
+            MatchedTextValuesSerializer(matches).data, MatchedTextDataGetSerializer(matches, many=True).data,
+        )
+
+
+def cascade_models(model, seen=None):
+    """model 을 지울 때 CASCADE 로 함께 지워지는 모델 전체 (간접 참조 포함)"""
+    seen = set() if seen is None else seen
+    for relation in model._meta.related_objects:
+        if relation.on_delete is CASCADE and relation.related_model not in seen:
+            seen.add(relation.related_model)
+            cascade_models(relation.related_model, seen)
+    return seen
+
+
+class DeleteDocumentsTests(TestCase):
+    """delete_documents 는 collector 없이 모델별 DELETE 로 originPDF 아래 행을 전부 지운다"""
+
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(email="delete-documents@example.com")
+        self.origin_pdf, self.other = (make_document(self.user, 3) for _ in range(2))
+        for origin_pdf in (self.origin_pdf, self.other):
+            index_document(origin_pdf)
+            build_chunk_index(origin_pdf)
+            enqueue_ocr_job(origin_pdf)
+
+    def rows_per_model(self, origin_pdf):
+        return {
+            model._meta.label: model._base_manager.filter(**{lookup: origin_pdf.id}).count()
+            for model, lookup in DELETE_PLAN
+        }
+
+    def test_plan_covers_cascade_relations(self):
+        # 새 모델이 originPDF (또는 그 아래 모델)를 CASCADE 로 참조하면 DELETE_PLAN 에도 넣어야 한다
+        planned = [model for model, _ in DELETE_PLAN]
+        self.assertEqual(cascade_models(originPDF), set(planned))
+        # 참조하는 쪽을 먼저 지워야 외래 키 제약에 걸리지 않는다
+        for model in planned:
+            for relation in model._meta.related_objects:
+                if relation.on_delete is CASCADE:
+                    self.assertLess(
+                        max(i for i, m in enumerate(planned) if m is relation.related_model),
+                        planned.index(model),
+                        f"{relation.related_model._meta.label} must be deleted before {model._meta.label}",
+                    )
+
+    def test_deletes_every_related_row(self):
+        before = self.rows_per_model(self.origin_pdf)
+        self.assertTrue(all(before.values()), before)
+        other_before = self.rows_per_model(self.other)
+
+        soft_delete_documents(originPDF.objects.filter(id=self.origin_pdf.id))
+        counts = delete_documents([self.origin_pdf.id])
+
+        self.assertEqual(set(self.rows_per_model(self.origin_pdf).values()), {0})
+        self.assertFalse(originPDF.all_objects.filter(id=self.origin_pdf.id).exists())
+        self.assertEqual(counts[originPDF._meta.label], 1)
+        self.assertEqual(counts[PDFpage._meta.label], 3)
+        # 다른 문서의 행은 그대로
+        self.assertEqual(self.rows_per_model(self.other), other_before)
+
+
+class DeletedDuringOCRTests(TestCase):
+    """OCR 이 도는 동안 문서가 삭제되면 결과를 저장하지 않는다"""
+
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(email="ocr-deleted@example.com")
+        self.origin_pdf = make_pdf(self.user, title="deleted")
+        enqueue_ocr_job(self.origin_pdf)
+        self.job = claim_next_job()
+        soft_delete_documents(originPDF.objects.filter(id=self.origin_pdf.id))
+
+    def test_running_job_is_failed(self):
+        self.job.refresh_from_db()
+        self.assertEqual(self.job.status, OCRJob.STATUS_FAILED)
+
+    def test_ingest_is_refused(self):
+        with self.assertRaises(OCRJobCancelled):
+            with ingest_transaction(self.job):
+                PDFpage.objects.create(pdf_id=self.origin_pdf, page_num=1, text="page")
+        self.assertFalse(PDFpage.objects.filter(pdf_id=self.origin_pdf).exists())
+
+    def test_complete_is_discarded(self):
+        with mock.patch("pdf_documents.ocr.ocr_completed.send_robust") as send_robust:
+            complete_ocr_job(self.job, {"pages_created": 1, "figures_created": 0, "matches_created": 0})
+        send_robust.assert_not_called()
+        self.job.refresh_from_db()
+        self.assertEqual(self.job.status, OCRJob.STATUS_FAILED)
+        self.assertEqual(self.job.pages_created, 0)
+
+
+@override_settings(OCR_INGEST_BATCH_SIZE=10)
+class StreamingIngestMemoryTests(TestCase):
+    """
+    OCR 응답을 스트리밍으로 파싱해서 배치로 저장하면 peak 메모리가 문서 크기와 무관해야 한다.
+    (합성 응답: 페이지마다 page 1 / figure 2 / match 3, bench_ocr_stream_memory 와 같은 데이터)
+    """
+    SMALL_PAGES = 60
+    LARGE_PAGES = 600
+    # 파서 버퍼(청크 하나)가 고정 비용이므로 작은 fixture 에서도 비교가 되도록 청크를 줄인다
+    CHUNK_SIZE = 8 * 1024
+
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(email="ocr-stream@example.com")
+
+    def ingest_traced(self, page_count, double_encoded=False):
+        origin_pdf = make_pdf(self.user, title=f"stream-{page_count}-{int(double_encoded)}")
+        chunks = iter_response_chunks(page_count, double_encoded, chunk_size=self.CHUNK_SIZE)
+        # 이미 있던 객체는 gc 대상에서 빼 두어 배치마다 부르는 gc.collect() 를 가볍게 한다
+        gc.freeze()
+        tracemalloc.start()
+        try:
+            with self.collect_after_flush():
+                counts = ingest_ocr_items(origin_pdf, iter_response_items(chunks))
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+            gc.unfreeze()
+        return origin_pdf, counts, peak
+
+    def collect_after_flush(self):
+        """
+        ORM 의 INSERT 조립 과정에서 생긴 tuple 들이 인터프리터 free list 에 한도까지 계속 쌓여서
+        처리한 배치 수에 비례하는 것처럼 보인다. 배치를 저장할 때마다 free list 를 비워
+        ingest 가 실제로 붙잡고 있는 메모리만 잰다.
+        """
+        def collecting(name, pending):
+            flush = getattr(OCRIngestor, name)
+
+            def wrapper(ingestor):
+                flushed = bool(getattr(ingestor, pending))
+                flush(ingestor)
+                if flushed:
+                    gc.collect()
+            return wrapper
+
+        return mock.patch.multiple(
+            OCRIngestor,
+            _flush_pages=collecting("_flush_pages", "_pending_pages"),
+            _flush_figures=collecting("_flush_figures", "_pending_figures"),
+            _flush_matches=collecting("_flush_matches", "_pending_matches"),
+        )
+
+    def assert_rows(self, origin_pdf, counts, page_count):
+        expected = {
+            "pages_created": page_count,
+            "figures_created": page_count * 2,
+            "matches_created": page_count * 3,
+        }
+        self.assertEqual(counts, expected)
+        self.assertEqual(PDFpage.objects.filter(pdf_id=origin_pdf).count(), expected["pages_created"])
+        self.assertEqual(PDFfigure.objects.filter(pdf_id=origin_pdf).count(), expected["figures_created"])
+        self.assertEqual(MatchedText.objects.filter(pdf_id=origin_pdf).count(), expected["matches_created"])
+
+    def check_bounded(self, double_encoded, small_pages=SMALL_PAGES, large_pages=LARGE_PAGES):
+        small_pdf, small_counts, small_peak = self.ingest_traced(small_pages, double_encoded)
+        large_pdf, large_counts, large_peak = self.ingest_traced(large_pages, double_encoded)
+        self.assert_rows(small_pdf, small_counts, small_pages)
+        self.assert_rows(large_pdf, large_counts, large_pages)
+
+        # 페이지 수가 10배여도 peak 는 거의 그대로
+        self.assertLess(large_peak, small_peak * 1.5)
+        # 응답 전체를 메모리에 올리지 않는다
+        response_size = sum(len(chunk) for chunk in iter_response_chunks(large_pages, double_encoded))
+        self.assertLess(large_peak, response_size / 4)
+
+    def test_peak_memory_is_flat(self):
+        self.check_bounded(double_encoded=False)
+
+    def test_peak_memory_is_flat_double_encoded(self):
+        # 이중 인코딩 unescape 는 tracemalloc 아래에서 느리므로 페이지 수를 줄인다 (저장 쪽은 위 테스트가 본다)
+        self.check_bounded(double_encoded=True, small_pages=20, large_pages=200)
+
+
+def spooled_json(data):
+    spool = SpooledTemporaryFile()
+    spool.write(json.dumps(data).encode("utf-8"))
+    return spool
+
+
+@override_settings(OCR_PAGE_NUM_BASE=1)
+class ShardOverlapTests(TestCase):
+    """구간을 나눠 OCR 해도 겹친 페이지 안의 본문-그림 매칭은 유지되어야 한다."""
+
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(email="ocr-shards@example.com")
+        self.origin_pdf = make_pdf(self.user, title="shards")
+
+    def test_split_groups_overlap(self):
+        self.assertEqual(
+            split_groups([0, 1, 2, 3, 4], 2, overlap=1),
+            [([0, 1, 2], [0, 1]), ([1, 2, 3, 4], [2, 3]), ([3, 4], [4])],
+        )
+        self.assertEqual(split_groups([0, 1, 2], 2), [([0, 1], [0, 1]), ([2], [2])])
+
+    def test_match_across_shard_boundary(self):
+        box = [0, 0, 5, 5]
+        # 4 페이지 문서를 2 페이지씩, 앞뒤 1 페이지 겹쳐서 나눈 결과.
+        # 2 페이지 본문이 3 페이지 그림을 가리킨다 (3 페이지는 두 번째 구간 소속)
+        first = _Shard(0, [0, 1, 2], "first.pdf", core=[0, 1])
+        first.result = spooled_json({
+            "pages": [{"page_num": n, "text": f"page {n}"} for n in (1, 2, 3)],
+            "figures": [{"page_num": 3, "figure_type": "figure", "figure_box": box}],
+            "matches": [{"page_num": 2, "figure_page": 3, "figure_box": box,
+                         "raw_text": ["그림", "1"], "figure_text": ["figure"], "text_box": [0, 0, 1, 1]}],
+        })
+        second = _Shard(1, [1, 2, 3], "second.pdf", core=[2, 3])
+        second.result = spooled_json({
+            "pages": [{"page_num": n, "text": f"page {n + 1}"} for n in (1, 2, 3)],
+            "figures": [{"page_num": 2, "figure_type": "figure", "figure_box": box}],
+            # 겹친 페이지(원본 2 페이지)의 매칭은 첫 번째 구간 결과만 쓴다
+            "matches": [{"page_num": 1, "figure_page": 2, "figure_box": box,
+                         "raw_text": ["그림", "1"], "figure_text": ["figure"], "text_box": [0, 0, 1, 1]}],
+        })
+
+        run = ShardedOCRRun(self.origin_pdf, pages_per_shard=2, overlap=1, use_text_layer=False)
+        run.shards = [first, second]
+        try:
+            counts = ingest_ocr_items(self.origin_pdf, run.iter_items())
+        finally:
+            run.close()
+
+        self.assertEqual(counts, {"pages_created": 4, "figures_created": 1, "matches_created": 1})
+        pages = dict(PDFpage.objects.filter(pdf_id=self.origin_pdf).values_list("page_num", "text"))
+        self.assertEqual(pages, {n: f"page {n}" for n in (1, 2, 3, 4)})
+        match = MatchedText.objects.select_related("figure_id__page_id").get(pdf_id=self.origin_pdf)
+        self.assertEqual(match.page_num, 2)
+        self.assertEqual(match.figure_id.page_id.page_num, 3)
+
+
+def generated_pdf(pages):
+    """(텍스트, 이미지 포함 여부) 목록으로 Helvetica 텍스트 레이어가 있는 작은 PDF 를 만든다"""
+    writer = PdfWriter()
+    for text, with_image in pages:
+        page = writer.add_blank_page(612, 792)
+        font = DictionaryObject({
+            NameObject("/Type"): NameObject("/Font"),
+            NameObject("/Subtype"): NameObject("/Type1"),
+            NameObject("/BaseFont"): NameObject("/Helvetica"),
+        })
+        resources = DictionaryObject({NameObject("/Font"): DictionaryObject({NameObject("/F1"): font})})
+        operators = f"BT /F1 12 Tf 72 720 Td ({text}) Tj ET".encode() if text else b""
+        if with_image:
+            image = DecodedStreamObject()
+            image.set_data(b"\x00")
+            image.update({NameObject("/Subtype"): NameObject("/Image")})
+            resources[NameObject("/XObject")] = DictionaryObject({NameObject("/Im1"): image})
+            operators += b" q 100 0 0 100 72 500 cm /Im1 Do Q"
+        page[NameObject("/Resources")] = resources
+        contents = DecodedStreamObject()
+        contents.set_data(operators)
+        page.replace_contents(contents)
+    body = BytesIO()
+    writer.write(body)
+    body.seek(0)
+    return PdfReader(body)
+
+
+class TextLayerTests(TestCase):
+    TEXT = "Lecture notes on gradient descent and learning rates"
+
+    def setUp(self):
+        self.reader = generated_pdf([(self.TEXT, False), (self.TEXT, True), ("", False)])
+
+    def test_read_text_layer(self):
+        text_only, with_image, blank = (read_text_layer(page) for page in self.reader.pages)
+        self.assertEqual(text_only.text.strip(), self.TEXT)
+        self.assertTrue(text_only.usable)
+        self.assertFalse(text_only.needs_ocr)
+        # 텍스트가 있어도 이미지가 있으면 figure 검출을 위해 OCR 로 보낸다
+        self.assertTrue(with_image.usable)
+        self.assertTrue(with_image.needs_ocr)
+        self.assertFalse(blank.usable)
+        self.assertTrue(blank.needs_ocr)
+
+    def test_local_pages_store_text_only(self):
+        user = get_user_model().objects.create_user(email="text-layer@example.com")
+        run = ShardedOCRRun(make_pdf(user, "text-layer"), use_text_layer=True)
+        try:
+            self.assertEqual(run._read_text_layer(self.reader), [1, 2])
+            run.local_pages.seek(0)
+            local_pages = [json.loads(line) for line in run.local_pages]
+        finally:
+            run.close()
+        base = settings.OCR_PAGE_NUM_BASE
+        self.assertEqual(run.local_page_nums, {base, base + 1})
+        # 로컬에서 읽은 페이지에는 글자 위치(박스)가 없다
+        self.assertEqual([sorted(page) for page in local_pages], [["page_num", "text"], ["page_num", "text"]])
+
+
+@skipUnless(connection.vendor == "mysql", "고른 인덱스 이름은 MySQL EXPLAIN 으로 확인한다")
+class QueryPlanTests(TestCase):
+    """hot_queries() 의 실행 계획: full scan / filesort 가 없고 EXPECTED_INDEXES 의 인덱스를 고른다"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = get_user_model().objects.create_user(email="query-plans@example.com")
+        # 행이 너무 적으면 옵티마이저가 full scan 을 고르므로 check_query_plans 와 같은 크기로 만든다
+        cls.origin_pdf = make_document(cls.user, 300)
+        index_document(cls.origin_pdf)
+        # 다른 문서 / 작업도 있어야 복합 인덱스의 선두 컬럼이 의미가 있다
+        for i in range(20):
+            OCRJob.objects.create(pdf_id=make_pdf(cls.user, title=f"plans-{i}"), status=OCRJob.STATUS_DONE)
+        OCRJob.objects.create(pdf_id=cls.origin_pdf, status=OCRJob.STATUS_DONE)
+        cls.queries = dict(hot_queries(cls.user, cls.origin_pdf))
+
+    def assert_plans(self, *names):
+        for name in names:
+            with self.subTest(name):
+                self.assertEqual(explain_problems(self.queries[name], EXPECTED_INDEXES[name]), [])
+
+    def test_denormalized_pdf_id(self):
+        # MatchedText / PDFfigure 는 PDFpage 를 거치지 않고 자기 pdf_id 인덱스로 찾는다
+        self.assert_plans(
+            "MatchedTextListView",
+            "GetFiguresByOriginPDFAPIView",
+            "PDFBundleView figures",
+            "PDFBundleView matches",
+        )
+
+    def test_composite_indexes(self):
+        # 복합 인덱스 순서대로 읽어서 정렬(filesort) 없이 끝난다
+        self.assert_plans(
+            "UserPDFDataView",
+            "PDFpageGetView",
+            "PDFpage by page_num",
+            "OCRStatusView",
+            "PDFBundleView pages",
+        )
@@ -0,0 +1,68 @@
+# pdf_documents/text_layer.py
+"""
+born-digital PDF 의 텍스트 레이어를 로컬에서 읽는 함수.
+
+강의 슬라이드/논문처럼 이미 텍스트 레이어가 있는 페이지는 OCR 서버를 거치지 않고
+여기서 읽은 텍스트를 PDFpage.text 로 바로 저장한다.
+텍스트가 없거나(스캔본) 이미지가 들어 있어 figure 검출이 필요한 페이지만 OCR 서버로 보낸다.
+
+본문-그림 매칭(MatchedText)은 OCR 서버가 만들기 때문에, OCR 서버로 보내지 않은 페이지
+(텍스트만 있는 페이지)의 본문은 다른 페이지의 그림과도 매칭되지 않는다.
+born-digital 문서는 매칭 대부분이 이런 페이지에서 나오므로 기본값은 꺼져 있다.
+(settings.OCR_TEXT_LAYER_ENABLED)
+
+글자 위치는 읽지 않는다. page.extract_text() 는 텍스트만 돌려주므로 로컬에서 읽은 페이지는
+PDFpage.text 만 저장되고 본문 박스(text_box)가 없다. 박스가 필요한 기능(그림 매칭)은 OCR 서버 결과만 쓴다.
+"""
+from django.conf import settings
+
+
+class PageTextLayer:
+    def __init__(self, text, has_images):
+        self.text = text
+        self.has_images = has_images
+
+    @property
+    def usable(self):
+        """OCR 없이 그대로 써도 될 만큼 텍스트가 들어 있는지"""
+        stripped = "".join(self.text.split())
+        if len(stripped) < settings.OCR_TEXT_LAYER_MIN_CHARS:
+            return False
+        # 글꼴 매핑이 깨진 PDF 는 대체 문자(�)가 대량으로 나온다
+        broken = stripped.count("�")
+        return broken / len(stripped) < 0.05
+
+    @property
+    def needs_ocr(self):
+        return not self.usable or self.has_images
+
+
+def _has_images(resources, depth=0):
+    """페이지(또는 Form XObject) 리소스에 이미지 XObject 가 있는지 (이미지를 디코딩하지 않고 확인)"""
+    if resources is None or depth > 5:
+        return False
+    xobjects = resources.get_object().get("/XObject")
+    if not xobjects:
+        return False
+    for xobject in xobjects.get_object().values():
+        xobject = xobject.get_object()
+        subtype = xobject.get("/Subtype")
+        if subtype == "/Image":
+            return True
+        if subtype == "/Form" and _has_images(xobject.get("/Resources"), depth + 1):
+            return True
+    return False
+
+
+def read_text_layer(page):
+    """pypdf PageObject 하나의 텍스트 레이어와 이미지 포함 여부 (텍스트만, 글자 위치/박스는 없음)"""
+    try:
+        text = page.extract_text() or ""
+    except Exception:
+        # 텍스트 추출이 실패하는 페이지는 OCR 에 맡긴다
+        text = ""
+    try:
+        has_images = _has_images(page.get("/Resources"))
+    except Exception:
+        has_images = True
+    return PageTextLayer(text, has_images)
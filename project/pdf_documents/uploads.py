@@ -0,0 +1,222 @@
+# pdf_documents/uploads.py
+"""
+PDFUploadView 에서 사용하는 Django 업로드 핸들러.
+"""
+import hashlib
+import logging
+import os
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+from boto3.s3.transfer import TransferConfig
+from django.conf import settings
+from django.core.files.uploadedfile import UploadedFile
+from django.core.files.uploadhandler import FileUploadHandler, StopFutureHandlers
+
+from .direct_upload import MIN_PART_SIZE
+from .storage import get_s3_client
+
+logger = logging.getLogger("api")
+
+
+def transfer_config():
+    """upload_fileobj 용 전송 설정 (스트리밍 업로드를 끈 경우에 사용)"""
+    part_size = max(settings.PDF_STREAM_UPLOAD_PART_SIZE, MIN_PART_SIZE)
+    return TransferConfig(
+        multipart_threshold=part_size,
+        multipart_chunksize=part_size,
+        max_concurrency=settings.PDF_STREAM_UPLOAD_CONCURRENCY,
+    )
+
+
+class SHA256UploadHandler(FileUploadHandler):
+    """
+    업로드가 스트리밍되는 동안 청크 단위로 SHA-256 을 계산한다.
+    데이터는 그대로 다음 핸들러(메모리/임시파일)로 넘기므로 업로드 처리 방식은 바뀌지 않는다.
+
+    request.upload_handlers.insert(0, handler) 로 맨 앞에 넣고,
+    request.FILES 를 읽은 뒤 handler.digests[field_name] 으로 결과를 꺼낸다.
+    """
+
+    def __init__(self, request=None):
+        super().__init__(request)
+        self.digests = {}  # field_name → hex digest
+        self.sizes = {}    # field_name → bytes
+        self._hash = None
+
+    def new_file(self, *args, **kwargs):
+        super().new_file(*args, **kwargs)
+        self._hash = hashlib.sha256()
+
+    def receive_data_chunk(self, raw_data, start):
+        self._hash.update(raw_data)
+        return raw_data
+
+    def file_complete(self, file_size):
+        self.digests[self.field_name] = self._hash.hexdigest()
+        self.sizes[self.field_name] = file_size
+        # 파일 객체는 다음 핸들러가 만든다
+        return None
+
+
+class S3UploadedFile(UploadedFile):
+    """S3MultipartUploadHandler 가 이미 S3 에 올린 파일 (본문은 서버에 남아 있지 않음)"""
+
+    def __init__(self, s3_key, name, content_type, size, charset, content_type_extra=None):
+        super().__init__(None, name, content_type, size, charset, content_type_extra)
+        self.s3_key = s3_key
+
+
+class S3MultipartUploadHandler(FileUploadHandler):
+    """
+    요청 본문을 임시 파일에 다 쓰기를 기다리지 않고, 받는 대로 S3 multipart part 로 올린다.
+
+    - settings.PDF_STREAM_UPLOAD_PART_SIZE 만큼 모이면 part 하나를 스레드 풀에 넘기고
+      최대 PDF_STREAM_UPLOAD_CONCURRENCY 개의 part 를 동시에 올린다.
+    - 메모리에 올라와 있는 part 는 PDF_STREAM_UPLOAD_MAX_MEMORY 를 넘지 않는다.
+      (업로드 중인 part 가 다 차 있으면 요청 본문 읽기를 잠시 멈춤)
+    - part 하나보다 작은 파일은 multipart 없이 put_object 한 번으로 올린다.
+
+    SHA256UploadHandler 다음에 넣으면 해시 계산과 업로드가 같은 청크로 함께 진행된다.
+    request.FILES[field_name] 은 S3UploadedFile(s3_key 포함)이 된다.
+    """
+
+    def __init__(self, request=None, field_name="file"):
+        super().__init__(request)
+        self.target_field = field_name
+        self.part_size = max(settings.PDF_STREAM_UPLOAD_PART_SIZE, MIN_PART_SIZE)
+        self.concurrency = settings.PDF_STREAM_UPLOAD_CONCURRENCY
+        # 채우는 중인 버퍼 1개를 빼고 동시에 메모리에 둘 수 있는 part 수
+        self.max_inflight = max(1, settings.PDF_STREAM_UPLOAD_MAX_MEMORY // self.part_size - 1)
+        self.bucket = settings.AWS_STORAGE_BUCKET_NAME
+        self.key = None
+        self.upload_id = None
+        self._active = False
+
+    def new_file(self, field_name, file_name, content_type, content_length, charset=None, content_type_extra=None):
+        super().new_file(field_name, file_name, content_type, content_length, charset, content_type_extra)
+        if field_name != self.target_field:
+            return
+
+        # 파일명 충돌 방지: 원본 확장자는 유지
+        ext = os.path.splitext(file_name)[1] or ".pdf"
+        self.key = f"pdfs/{uuid.uuid4().hex}{ext}"
+        self.s3 = get_s3_client()
+        self._buffer = bytearray()
+        self._futures = []
+        self._executor = None
+        self._slots = threading.BoundedSemaphore(self.max_inflight)
+        self._started = time.perf_counter()
+        self._first_part_at = None
+        self._active = True
+        # 이 파일은 메모리/임시파일 핸들러로 넘기지 않는다
+        raise StopFutureHandlers()
+
+    def receive_data_chunk(self, raw_data, start):
+        if not self._active:
+            return raw_data
+        try:
+            self._buffer += raw_data
+            while len(self._buffer) >= self.part_size:
+                body = bytes(self._buffer[:self.part_size])
+                del self._buffer[:self.part_size]
+                self._submit(body)
+        except BaseException:
+            self._abort()
+            raise
+        return None
+
+    def file_complete(self, file_size):
+        if not self._active:
+            return None
+        try:
+            content_type = self.content_type or "application/pdf"
+            if self.upload_id is None:
+                self.s3.put_object(Bucket=self.bucket, Key=self.key, Body=bytes(self._buffer), ContentType=content_type)
+                part_count = 1
+            else:
+                if self._buffer:
+                    self._submit(bytes(self._buffer))
+                parts = [future.result() for future in self._futures]
+                self.s3.complete_multipart_upload(
+                    Bucket=self.bucket,
+                    Key=self.key,
+                    UploadId=self.upload_id,
+                    MultipartUpload={"Parts": parts},
+                )
+                part_count = len(parts)
+        except BaseException:
+            self._abort()
+            raise
+        finally:
+            self._buffer = bytearray()
+            if self._executor is not None:
+                self._executor.shutdown(wait=True)
+        self._active = False
+
+        if self.upload_id is not None:
+            elapsed = time.perf_counter() - self._started
+            first_part = (self._first_part_at or time.perf_counter()) - self._started
+            logger.info(
+                "S3 stream upload key=%s size=%s parts=%s first_part=%.3fs total=%.3fs throughput=%.1fMiB/s",
+                self.key, file_size, part_count, first_part, elapsed,
+                file_size / 1024 / 1024 / elapsed if elapsed else 0.0,
+            )
+        return S3UploadedFile(
+            self.key, self.file_name, content_type, file_size, self.charset, self.content_type_extra,
+        )
+
+    def upload_interrupted(self):
+        if self._active:
+            self._abort()
+
+    def upload_complete(self):
+        # file_complete 까지 가지 못하고 파싱이 끝난 경우 (잘린 요청 등)
+        if self._active:
+            self._abort()
+
+    # ----- 내부 -----
+
+    def _submit(self, body):
+        for future in self._futures:
+            if future.done() and future.exception() is not None:
+                raise future.exception()
+
+        if self.upload_id is None:
+            upload = self.s3.create_multipart_upload(
+                Bucket=self.bucket, Key=self.key, ContentType=self.content_type or "application/pdf",
+            )
+            self.upload_id = upload["UploadId"]
+            self._executor = ThreadPoolExecutor(max_workers=self.concurrency)
+
+        # 메모리 상한: 올라가는 중인 part 가 끝날 때까지 요청 본문을 더 읽지 않는다
+        self._slots.acquire()
+        part_number = len(self._futures) + 1
+        self._futures.append(self._executor.submit(self._upload_part, part_number, body))
+
+    def _upload_part(self, part_number, body):
+        """(스레드) part 하나 업로드"""
+        try:
+            response = self.s3.upload_part(
+                Bucket=self.bucket, Key=self.key, UploadId=self.upload_id, PartNumber=part_number, Body=body,
+            )
+            if self._first_part_at is None:
+                self._first_part_at = time.perf_counter()
+            return {"PartNumber": part_number, "ETag": response["ETag"]}
+        finally:
+            self._slots.release()
+
+    def _abort(self):
+        self._active = False
+        self._buffer = bytearray()
+        if self._executor is not None:
+            for future in self._futures:
+                future.cancel()
+            self._executor.shutdown(wait=True)
+        if self.upload_id is not None:
+            try:
+                self.s3.abort_multipart_upload(Bucket=self.bucket, Key=self.key, UploadId=self.upload_id)
+            except Exception:
+                logger.exception("S3 multipart abort failed key=%s", self.key)
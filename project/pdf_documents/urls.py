@@ -1,14 +1,25 @@
-from django.urls import path
-from pdf_documents.views import *
-
-app_name = "pdf_documents"
-
-urlpatterns = [
-    path('upload/', PDFUploadView.as_view(), name='pdf-upload'),
-    path('delete/<int:id>/', PDFDeleteView.as_view(), name='pdf-delete'),
-    path("pdfs/<int:pdf_id>/ocr/", PDFwithOCRView.as_view(), name="pdf-ocr"),
-    path("pdfs/<int:pdf_id>/matched-texts/", MatchedTextListView.as_view(), name="pdf-matched-texts"),
-    path("pdfs/<int:pdf_id>", OriginPDFGetView.as_view(), name="pdf-origin-get"),
-    path("pdfs/<int:pdf_id>/pages/", PDFpageGetView.as_view(), name="pdf-pages-get"),
-    path("all/", UserPDFDataView.as_view(), name="user-all-data"),
+from django.urls import path
+from pdf_documents.views import *
+from pdf_documents.async_views import AsyncPDFUploadView, AsyncPDFDeleteView, AsyncPDFwithOCRView
+
+app_name = "pdf_documents"
+
+urlpatterns = [
+    path('upload/', PDFUploadView.as_view(), name='pdf-upload'),
+    path('upload/url/', PDFUploadURLView.as_view(), name='pdf-upload-url'),
+    path('upload/confirm/', PDFUploadConfirmView.as_view(), name='pdf-upload-confirm'),
+    path('delete/<int:id>/', PDFDeleteView.as_view(), name='pdf-delete'),
+    path("pdfs/<int:pdf_id>/ocr/", PDFwithOCRView.as_view(), name="pdf-ocr"),
+    path("pdfs/<int:pdf_id>/ocr/status/", OCRStatusView.as_view(), name="pdf-ocr-status"),
+    path("pdfs/<int:pdf_id>/matched-texts/", MatchedTextListView.as_view(), name="pdf-matched-texts"),
+    path("pdfs/<int:pdf_id>", OriginPDFGetView.as_view(), name="pdf-origin-get"),
+    path("pdfs/<int:pdf_id>/pages/", PDFpageGetView.as_view(), name="pdf-pages-get"),
+    path("pdfs/<int:pdf_id>/bundle/", PDFBundleView.as_view(), name="pdf-bundle"),
+    path("all/", UserPDFDataView.as_view(), name="user-all-data"),
+    path("cache/stats/", ResponseCacheStatsView.as_view(), name="response-cache-stats"),
+
+    # async 버전 (ASGI 전용, pdf_documents/async_views.py)
+    path('async/upload/', AsyncPDFUploadView.as_view(), name='pdf-upload-async'),
+    path('async/delete/<int:id>/', AsyncPDFDeleteView.as_view(), name='pdf-delete-async'),
+    path("async/pdfs/<int:pdf_id>/ocr/", AsyncPDFwithOCRView.as_view(), name="pdf-ocr-async"),
 ]
\ No newline at end of file
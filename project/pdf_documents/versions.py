@@ -0,0 +1,65 @@
+# pdf_documents/versions.py
+"""
+문서 버전(originPDF.version / highlight_version)과 조회 API 의 ETag / If-None-Match 처리.
+
+문서 내용(pages / figures / matches)을 바꾸는 모든 경로에서 bump_version() 으로 version 을 올린다.
+- OCR 저장 / 복사: ingest.py (bulk_create 라 signal 이 오지 않으므로 직접 호출)
+- PDFpage / PDFfigure / MatchedText 개별 수정·삭제: signals.py
+- 삭제: deletion.soft_delete_documents
+사용자 주석(tags / highlights)은 자주 바뀌므로 따로 bump_highlight_version() 으로 highlight_version 을 올린다.
+(highlights/signals.py) 하이라이트를 저장해도 pages / figures / matches 의 ETag 와 응답 캐시는 그대로 쓴다.
+
+조회 뷰는 originPDF 한 행만 읽어서 ETag 를 만들고, 클라이언트의 If-None-Match 와 같으면
+행 테이블은 조회하지 않고 304 를 반환한다. 응답 캐시(response_cache.py)의 키에도 버전이 들어간다.
+"""
+from django.db.models import F
+from django.utils.http import parse_etags
+from rest_framework import status
+from rest_framework.response import Response
+
+from .models import originPDF
+
+
+def bump_version(*pdf_ids):
+    """주어진 문서들의 버전을 1 올린다. (호출한 쪽의 트랜잭션 안에서 같이 커밋됨)"""
+    ids = {pdf_id for pdf_id in pdf_ids if pdf_id is not None}
+    if ids:
+        originPDF.all_objects.filter(id__in=ids).update(version=F("version") + 1)
+
+
+def bump_highlight_version(*pdf_ids):
+    """주어진 문서들의 주석(tags / highlights) 버전을 1 올린다."""
+    ids = {pdf_id for pdf_id in pdf_ids if pdf_id is not None}
+    if ids:
+        originPDF.all_objects.filter(id__in=ids).update(highlight_version=F("highlight_version") + 1)
+
+
+# highlight_version 만 보는 응답 종류 (나머지는 version, bundle 은 둘 다)
+HIGHLIGHT_KINDS = ("tags", "highlights")
+
+
+def document_etag(origin_pdf, kind):
+    """
+    문서 버전 기반 strong ETag. kind 는 응답 종류(pages, figures 등)로,
+    같은 문서의 다른 조회 API 끼리 ETag 가 섞이지 않게 한다.
+    """
+    if kind in HIGHLIGHT_KINDS:
+        version = origin_pdf.highlight_version
+    elif kind == "bundle":
+        version = f"{origin_pdf.version}.{origin_pdf.highlight_version}"
+    else:
+        version = origin_pdf.version
+    return f'"{kind}-{origin_pdf.id}-{version}"'
+
+
+def etag_headers(etag):
+    # private: 사용자별 응답, no-cache: 쓸 때마다 ETag 로 재검증
+    return {"ETag": etag, "Cache-Control": "private, no-cache"}
+
+
+def not_modified(request, etag):
+    """If-None-Match 가 etag 와 맞으면 304 응답, 아니면 None"""
+    etags = parse_etags(request.headers.get("If-None-Match", ""))
+    if etag in etags or "*" in etags:
+        return Response(status=status.HTTP_304_NOT_MODIFIED, headers=etag_headers(etag))
+    return None
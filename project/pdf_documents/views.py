@@ -1,606 +1,769 @@
-# pdf_documents/views.py
-
-from rest_framework.views import APIView
-from rest_framework.response import Response
-from rest_framework.permissions import IsAuthenticated
-from django.db import transaction
-import requests
-from rest_framework import status
-from rest_framework.parsers import MultiPartParser, FormParser
-
-from django.conf import settings
-from botocore.exceptions import ClientError
-import boto3
-import os
-import uuid
-import json
-
-from .serializers import OriginPDFSerializer, PDFUploadSerializer, MatchedTextDataGetSerializer, PDFpageSerializer
-from .models import originPDF, PDFpage, MatchedText
-
-from pdf_figures.serializers import PDFfigureSerializer
-from pdf_figures.models import PDFfigure
-
-from drf_yasg.utils import swagger_auto_schema
-from drf_yasg import openapi
-
-class PDFUploadView(APIView):
-
-    parser_classes = [MultiPartParser, FormParser]
-
-    @swagger_auto_schema(
-        operation_summary="PDF 업로드",
-        operation_description=(
-            "S3로 PDF를 업로드하고 메타데이터(DB)에 저장합니다.\n"
-            "- Content-Type: multipart/form-data\n"
-            "- 필드: `title`(text), `file`(file)\n"
-            "- 인증: Authorization: Bearer <access_token>"
-        ),
-        tags=["PDF Documents"],
-        security=[{"Bearer": []}],
-        consumes=["multipart/form-data"],
-        request_body=PDFUploadSerializer,
-        responses={201: OriginPDFSerializer, 400: "잘못된 요청", 403: "권한/버킷", 500: "서버 오류"},
-    )
-    def post(self, request, *args, **kwargs):
-        # 1) 입력 검증
-        file_obj = request.FILES.get('file', None)
-        title = request.data.get('title', '')
-
-        if not file_obj:
-            return Response(
-                {"detail": "파일이 첨부되지 않았습니다. form-data에서 key를 'file'로 보내세요."},
-                status=status.HTTP_400_BAD_REQUEST
-            )
-
-        # 2) S3 클라이언트 (settings에서 일관되게 가져오기)
-        s3 = boto3.client(
-            "s3",
-            region_name=settings.AWS_REGION,                # settings.py에서 정의한 AWS_REGION 사용
-            aws_access_key_id=settings.AWS_ACCESS_KEY_ID,
-            aws_secret_access_key=settings.AWS_SECRET_ACCESS_KEY,
-        )
-
-        bucket = settings.AWS_STORAGE_BUCKET_NAME
-        # 파일명 충돌 방지: 원본 확장자는 유지
-        ext = os.path.splitext(file_obj.name)[1] or ".pdf"
-        key = f"pdfs/{uuid.uuid4().hex}{ext}"
-
-        # 업로드 옵션 (브라우저 열람/다운로드에 유용)
-        extra_args = {"ContentType": file_obj.content_type or "application/pdf"}
-
-        # (버킷 정책에서 SSE-KMS를 강제한다면 주석 해제하고 KMS 키 지정)
-        # extra_args.update({
-        #     "ServerSideEncryption": "aws:kms",
-        #     "SSEKMSKeyId": "<KMS 키 ARN 또는 별칭>"
-        # })
-
-        try:
-            # 3) 업로드
-            s3.upload_fileobj(
-                Fileobj=file_obj,
-                Bucket=bucket,
-                Key=key,
-                ExtraArgs=extra_args,
-            )
-        except ClientError as e:
-            # AccessDenied 등 S3에서 바로 떨어지는 에러를 사용자에게 명확히 반환
-            code = e.response.get("Error", {}).get("Code")
-            msg = e.response.get("Error", {}).get("Message")
-            return Response(
-                {
-                    "detail": "S3 업로드에 실패했습니다.",
-                    "error_code": code,
-                    "error_message": msg,
-                    "hint": "IAM 정책/버킷 정책/KMS 강제 여부를 확인하세요."
-                },
-                status=status.HTTP_403_FORBIDDEN if code in ("AccessDenied",) else status.HTTP_502_BAD_GATEWAY
-            )
-        except Exception as e:
-            return Response(
-                {"detail": f"S3 업로드 중 알 수 없는 오류: {e}"},
-                status=status.HTTP_500_INTERNAL_SERVER_ERROR
-            )
-
-        # 4) 접근 URL (리전 포함 커스텀 도메인 사용)
-        # settings.py: AWS_S3_CUSTOM_DOMAIN = f"{bucket}.s3.{AWS_REGION}.amazonaws.com"
-        s3_url = f"https://{settings.AWS_S3_CUSTOM_DOMAIN}/{key}"
-
-        # 5) DB 저장
-        try:
-            origin_pdf = originPDF.objects.create(
-                user_id=request.user,   # IsAuthenticated 전제. 비로그인 접근이면 FK 오류 가능
-                title=title,
-                S3_url=s3_url,
-                s3_key=key
-            )
-        except Exception as e:
-            # DB 실패 시, 업로드된 객체를 정리하고 싶다면 아래 주석 해제(선택)
-            # try:
-            #     s3.delete_object(Bucket=bucket, Key=key)
-            # except Exception:
-            #     pass
-            return Response(
-                {"detail": f"DB 저장에 실패했습니다: {e}"},
-                status=status.HTTP_500_INTERNAL_SERVER_ERROR
-            )
-
-        # 6) 응답
-        serializer = OriginPDFSerializer(origin_pdf)
-        return Response(serializer.data, status=status.HTTP_201_CREATED)
-    
-class PDFDeleteView(APIView):
-    permission_classes = [IsAuthenticated]
-
-    @swagger_auto_schema(
-        operation_summary="PDF 삭제",
-        operation_description=(
-            "S3에 업로드된 PDF 파일과 DB에 저장된 originPDF 레코드를 삭제합니다.\n"
-            "- HTTP Method: DELETE\n"
-            "- Path Parameter: `id` (originPDF의 PK)\n"
-            "- 인증: Authorization: Bearer <access_token>\n\n"
-            "주어진 `id`를 가진 PDF가 현재 로그인한 사용자 소유인지 확인한 뒤,\n"
-            "S3 객체를 삭제하고, DB 레코드를 제거합니다."
-        ),
-        tags=["PDF Documents"],
-        security=[{"Bearer": []}],
-        manual_parameters=[
-            openapi.Parameter(
-                "id",
-                openapi.IN_PATH,
-                description="삭제할 originPDF의 ID",
-                type=openapi.TYPE_INTEGER,
-            )
-        ],
-        responses={
-            204: "삭제 완료",
-            400: "잘못된 요청",
-            403: "권한 없음 / S3 삭제 권한 문제",
-            404: "해당 PDF 없음",
-            502: "S3 통신 오류",
-        },
-    )
-    def delete(self, request, id, *args, **kwargs):
-        # 1) 해당 유저의 PDF인지 확인
-        try:
-            pdf_obj = originPDF.objects.get(id=id, user_id=request.user)
-        except originPDF.DoesNotExist:
-            return Response(
-                {"detail": "해당 PDF를 찾을 수 없습니다."},
-                status=status.HTTP_404_NOT_FOUND
-            )
-
-        s3_key = pdf_obj.s3_key  # 업로드할 때 저장해둔 Key (예: "pdfs/uuid.pdf")
-        bucket = settings.AWS_STORAGE_BUCKET_NAME
-
-        # 2) S3 클라이언트 생성 (업로드 때와 동일하게)
-        s3 = boto3.client(
-            "s3",
-            region_name=settings.AWS_REGION,
-            aws_access_key_id=settings.AWS_ACCESS_KEY_ID,
-            aws_secret_access_key=settings.AWS_SECRET_ACCESS_KEY,
-        )
-
-        # 3) S3 객체 삭제 시도
-        if s3_key:
-            try:
-                s3.delete_object(Bucket=bucket, Key=s3_key)
-            except ClientError as e:
-                code = e.response.get("Error", {}).get("Code")
-                msg = e.response.get("Error", {}).get("Message")
-
-                # 객체가 원래 없었던 경우(NoSuchKey 등)는 용량도 안 쓰고 있는 상태이므로
-                # 그냥 DB만 지우고 성공 처리해도 됨.
-                if code not in ("NoSuchKey", "NotFound"):
-                    return Response(
-                        {
-                            "detail": "S3 객체 삭제에 실패했습니다.",
-                            "error_code": code,
-                            "error_message": msg,
-                            "hint": "IAM 권한, 버킷 정책을 확인하세요.",
-                        },
-                        status=(
-                            status.HTTP_403_FORBIDDEN
-                            if code in ("AccessDenied",)
-                            else status.HTTP_502_BAD_GATEWAY
-                        ),
-                    )
-
-        # 4) DB 레코드 삭제 (연관된 PDFpage, MatchedText, PDFfigure가
-        # on_delete=models.CASCADE라면 같이 삭제됨)
-        pdf_obj.delete()
-
-        # 보통 리소스 삭제는 204 No Content
-        return Response(status=status.HTTP_204_NO_CONTENT)
-
-class PDFwithOCRView(APIView):
-    """
-    특정 originPDF(pdf_id)에 대해:
-    1) S3 presigned URL 생성
-    2) OCR 서버 호출
-    3) pages / figures / matches 를 DB에 저장
-    """
-    @swagger_auto_schema(
-        operation_summary="PDF OCR 처리 및 DB 저장",
-        operation_description=(
-            "지정한 PDF에 대해 S3 presigned URL을 생성하고 OCR 서버에 전달하여\n"
-            "분석된 결과를 pages, figures, matches 테이블에 저장합니다.\n"
-            "- 인증: Authorization: Bearer <access_token>"
-        ),
-        tags=["PDF Documents"],
-        responses = {
-            201: openapi.Response("description='OCR 처리 및 DB 저장 완료'", schema=openapi.Schema(
-                type=openapi.TYPE_OBJECT,
-                properties={
-                    'detail': openapi.Schema(type=openapi.TYPE_STRING, description='상세 메시지'),
-                    'pdf_id': openapi.Schema(type=openapi.TYPE_INTEGER, description='처리된 PDF ID'),
-                    'pages_created': openapi.Schema(type=openapi.TYPE_INTEGER, description='생성된 페이지 수'),
-                    'figures_created': openapi.Schema(type=openapi.TYPE_INTEGER, description='생성된 그림 수'),
-                }
-            )),
-        }
-    )
-    def post(self, request, pdf_id, *args, **kwargs):
-        # 0) originPDF 조회
-        try:
-            origin_pdf = originPDF.objects.get(id=pdf_id, user_id=request.user)
-        except originPDF.DoesNotExist:
-            return Response(
-                {"detail": "해당 PDF를 찾을 수 없거나 권한이 없습니다."},
-                status=status.HTTP_404_NOT_FOUND
-            )
-
-        # s3_key 필수 체크
-        if not origin_pdf.s3_key:
-            return Response(
-                {"detail": "해당 PDF에는 s3_key가 저장되어 있지 않습니다."},
-                status=status.HTTP_400_BAD_REQUEST
-            )
-
-        bucket = settings.AWS_STORAGE_BUCKET_NAME
-        key = origin_pdf.s3_key
-
-        # 1) S3 클라이언트 및 presigned URL 생성
-        try:
-            s3 = boto3.client(
-                "s3",
-                region_name=settings.AWS_REGION,
-                aws_access_key_id=settings.AWS_ACCESS_KEY_ID,
-                aws_secret_access_key=settings.AWS_SECRET_ACCESS_KEY,
-            )
-
-            presigned_url = s3.generate_presigned_url(
-                ClientMethod="get_object",
-                Params={"Bucket": bucket, "Key": key},
-                ExpiresIn=900,  # 15분
-            )
-        except Exception as e:
-            return Response(
-                {"detail": f"Presigned URL 생성 중 오류: {e}"},
-                status=status.HTTP_500_INTERNAL_SERVER_ERROR
-            )
-
-        # 2) OCR 서버 호출
-        ocr_endpoint = settings.OCR_SERVER  # secrets.json → settings에 로드되어 있다고 가정
-
-        payload = {
-            "file_url": presigned_url,
-            "timeout": 120,
-        }
-
-        try:
-            ocr_response = requests.post(
-                ocr_endpoint,
-                json=payload,
-                timeout=1200,
-            )
-            ocr_response.raise_for_status()
-        except requests.exceptions.RequestException as e:
-            return Response(
-                {"detail": f"OCR 서버 요청 실패: {e}"},
-                status=status.HTTP_502_BAD_GATEWAY
-            )
-
-        try:
-            data = ocr_response.json()
-        except ValueError:
-            return Response(
-                {"detail": "OCR 서버에서 유효한 JSON 응답을 받지 못했습니다."},
-                status=status.HTTP_502_BAD_GATEWAY
-            )
-
-        # 1) 200, 201 둘 다 성공으로 취급
-        if ocr_response.status_code not in (200, 201):
-            return Response(
-                {
-                    "detail": "OCR 서버가 요청을 처리하지 못했습니다.",
-                    "ocr_status": ocr_response.status_code,
-                    "ocr_raw": ocr_response.text,
-                },
-                status=status.HTTP_502_BAD_GATEWAY
-            )
-
-        # 2) 첫 번째 파싱 (여기서 str 이 나옴)
-        try:
-            data = ocr_response.json()
-        except ValueError:
-            return Response(
-                {
-                    "detail": "OCR 서버에서 JSON이 아닌 응답을 받았습니다.",
-                    "ocr_raw": ocr_response.text,
-                },
-                status=status.HTTP_502_BAD_GATEWAY
-            )
-
-        # 3) OCR 서버가 JSON 문자열을 한 번 더 감싸서 보내므로,
-        #      str 이면 한 번 더 json.loads() 해서 dict 로 만든다
-        if isinstance(data, str):
-            try:
-                data = json.loads(data)
-            except ValueError:
-                return Response(
-                    {
-                        "detail": "OCR 서버에서 이중 인코딩된 JSON 문자열을 받았지만 파싱에 실패했습니다.",
-                        "parsed_data_preview": data[:200],
-                    },
-                    status=status.HTTP_502_BAD_GATEWAY
-                )
-
-        # 4) 최종적으로 dict 가 아니면 에러
-        if not isinstance(data, dict):
-            return Response(
-                {
-                    "detail": "OCR 서버에서 예상치 못한 JSON 형식(객체가 아님)을 받았습니다.",
-                    "parsed_type": str(type(data)),
-                },
-                status=status.HTTP_502_BAD_GATEWAY
-            )
-
-        # 3) DB 저장 (pages → figures → matches), 한 트랜잭션으로 처리
-        with transaction.atomic():
-            # 이미 기존 OCR 결과가 있다면 정리하고 다시 넣고 싶다면 아래 주석 해제
-            # MatchedText → PDFfigure → PDFpage 순으로 삭제
-            # MatchedText.objects.filter(page_id__pdf_id=origin_pdf).delete()
-            # PDFfigure.objects.filter(page_id__pdf_id=origin_pdf).delete()
-            # PDFpage.objects.filter(pdf_id=origin_pdf).delete()
-
-            # 3-1) pages 저장
-            page_objs = {}  # page_num → PDFpage 인스턴스
-            for p in data.get("pages", []):
-                page_num = p.get("page_num")
-                text = p.get("text", "")
-
-                if page_num is None:
-                    continue
-
-                page_obj = PDFpage.objects.create(
-                    pdf_id=origin_pdf,
-                    page_num=page_num,
-                    text=text,
-                )
-                page_objs[page_num] = page_obj
-
-            # 3-2) figures 저장 + (figure_page_num, figure_box) → PDFfigure 매핑
-            figure_map = {}  # (page_num, tuple(original_box)) → PDFfigure
-
-            for f in data.get("figures", []):
-                page_num = f.get("page_num")
-                figure_type = f.get("figure_type", "")
-                box_list = f.get("figure_box", [])
-
-                if page_num is None or page_num not in page_objs:
-                    continue
-
-                page_obj = page_objs[page_num]
-
-                # 모델의 주석엔 dict 형태 예시가 있어서, list → dict 변환 (원하면 그대로 list 저장해도 됨)
-                if isinstance(box_list, list) and len(box_list) == 4:
-                    figure_box = {
-                        "min_x": box_list[0],
-                        "min_y": box_list[1],
-                        "max_x": box_list[2],
-                        "max_y": box_list[3],
-                    }
-                else:
-                    figure_box = box_list
-
-                figure_obj = PDFfigure.objects.create(
-                    page_id=page_obj,
-                    figure_type=figure_type,
-                    figure_box=figure_box,
-                )
-
-                # matches 에서는 원래 list 형태가 오므로, key 는 원본 list 기준으로 tuple 처리
-                if isinstance(box_list, list):
-                    figure_map[(page_num, tuple(box_list))] = figure_obj
-
-            # 3-3) matches → MatchedText 저장
-            for m in data.get("matches", []):
-                text_page_num = m.get("page_num")       # 텍스트 페이지 번호
-                figure_page_num = m.get("figure_page")  # 그림이 있는 페이지 번호
-                box_list = m.get("figure_box", [])
-                text_box_list = m.get("text_box", {})
-
-                if text_page_num not in page_objs:
-                    # 해당 텍스트 페이지가 없으면 스킵
-                    continue
-
-                page_obj = page_objs[text_page_num]
-
-                # figure_obj = None
-                # if figure_page_num is not None and isinstance(box_list, list):
-                #     figure_obj = figure_map.get((figure_page_num, tuple(box_list)))
-                figure_obj = None
-                if figure_page_num is not None and isinstance(box_list, list):
-                    key = tuple(box_list)
-                    figure_obj = (
-                        figure_map.get((figure_page_num, key)) or        # 0-based일 가능성
-                        figure_map.get((figure_page_num + 1, key)) or    # 1-based일 가능성
-                        figure_map.get((figure_page_num - 1, key))       # 안전빵 백업
-                    )
-
-                # figure_id 가 null 허용이 아니므로 못 찾으면 스킵
-                if figure_obj is None:
-                    continue
-
-                raw_text_list = m.get("raw_text", [])
-                figure_text_list = m.get("figure_text", [])
-
-                if isinstance(raw_text_list, list):
-                    raw_text = " ".join(raw_text_list)
-                else:
-                    raw_text = str(raw_text_list)
-
-                if isinstance(figure_text_list, list):
-                    matched_text = " ".join(figure_text_list)
-                else:
-                    matched_text = str(figure_text_list)
-
-                if isinstance(text_box_list, list) and len(text_box_list) == 4:
-                    text_box = {
-                        "min_x": text_box_list[0],
-                        "min_y": text_box_list[1],
-                        "max_x": text_box_list[2],
-                        "max_y": text_box_list[3],
-                    }
-                else:
-                    text_box = text_box_list
-
-                MatchedText.objects.create(
-                    page_id=page_obj,
-                    figure_id=figure_obj,
-                    page_num=text_page_num,
-                    raw_text=raw_text,
-                    matched_text=matched_text,
-                    text_box=text_box,
-                )
-
-        # 4) 최종 응답 (필요하면 counts 나 상세 serializer 로 바꿔도 됨)
-        return Response(
-            {
-                "detail": "OCR 처리 및 DB 저장이 완료되었습니다.",
-                "pdf_id": origin_pdf.id,
-                "pages_created": len(page_objs),
-                "figures_created": len(figure_map),
-                "matches_created": MatchedText.objects.filter(page_id__pdf_id=origin_pdf).count(),
-            },
-            status=status.HTTP_201_CREATED
-        )
-    
-class MatchedTextListView(APIView):
-    """
-    특정 originPDF(pdf_id)에 대한 MatchedText 목록 조회
-    """
-    permission_classes = [IsAuthenticated]
-
-    @swagger_auto_schema(
-        operation_summary="PDF의 MatchedText 목록 조회",
-        operation_description=(
-            "지정한 PDF에 대해 MatchedText 항목들의 목록을 조회합니다.\n"
-            "- 인증: Authorization: Bearer <access_token>"
-        ),
-        tags=["PDF Documents"],
-        responses={200: MatchedTextDataGetSerializer(many=True)},
-    )
-    def get(self, request, pdf_id, *args, **kwargs):
-        # 1) originPDF 조회
-        try:
-            origin_pdf = originPDF.objects.get(id=pdf_id, user_id=request.user)
-        except originPDF.DoesNotExist:
-            return Response(
-                {"detail": "해당 PDF를 찾을 수 없습니다."},
-                status=status.HTTP_404_NOT_FOUND
-            )
-
-        # 2) MatchedText 조회
-        matched_texts = MatchedText.objects.filter(page_id__pdf_id=origin_pdf).select_related('page_id', 'figure_id')
-
-        # 3) 직렬화 및 응답
-        serializer = MatchedTextDataGetSerializer(matched_texts, many=True)
-        return Response(serializer.data, status=status.HTTP_200_OK)
-    
-class OriginPDFGetView(APIView):
-    """
-    특정 originPDF(pdf_id)에 대한 메타데이터 조회
-    """
-    permission_classes = [IsAuthenticated]
-
-    @swagger_auto_schema(
-        operation_summary="PDF 메타데이터 조회",
-        operation_description=(
-            "지정한 PDF에 대한 메타데이터를 조회합니다.\n"
-            "- 인증: Authorization: Bearer <access_token>"
-        ),
-        tags=["PDF Documents"],
-        responses={200: OriginPDFSerializer},
-    )
-    def get(self, request, pdf_id, *args, **kwargs):
-        # 1) originPDF 조회
-        try:
-            origin_pdf = originPDF.objects.get(id=pdf_id, user_id=request.user)
-        except originPDF.DoesNotExist:
-            return Response(
-                {"detail": "해당 PDF를 찾을 수 없습니다."},
-                status=status.HTTP_404_NOT_FOUND
-            )
-
-        # 2) 직렬화 및 응답
-        serializer = OriginPDFSerializer(origin_pdf)
-        return Response(serializer.data, status=status.HTTP_200_OK)
-    
-class PDFpageGetView(APIView):
-    """
-    특정 originPDF(pdf_id)에 대한 PDFpage 목록 조회
-    """
-    permission_classes = [IsAuthenticated]
-
-    @swagger_auto_schema(
-        operation_summary="PDF의 PDFpage 목록 조회",
-        operation_description=(
-            "지정한 PDF에 대해 PDFpage 항목들의 목록을 조회합니다.\n"
-            "- 인증: Authorization: Bearer <access_token>"
-        ),
-        tags=["PDF Documents"],
-        responses={200: PDFpageSerializer(many=True)},
-    )
-    def get(self, request, pdf_id, *args, **kwargs):
-        # 1) originPDF 조회
-        try:
-            origin_pdf = originPDF.objects.get(id=pdf_id, user_id=request.user)
-        except originPDF.DoesNotExist:
-            return Response(
-                {"detail": "해당 PDF를 찾을 수 없습니다."},
-                status=status.HTTP_404_NOT_FOUND
-            )
-
-        # 2) PDFpage 조회
-        pdf_pages = PDFpage.objects.filter(pdf_id=origin_pdf)
-
-        # 3) 직렬화 및 응답
-        serializer = PDFpageSerializer(pdf_pages, many=True)
-        return Response(serializer.data, status=status.HTTP_200_OK)
-    
-
-class UserPDFDataView(APIView):
-    permission_classes = [IsAuthenticated]
-
-    @swagger_auto_schema(
-        operation_summary="사용자 소유 PDF 목록 조회",
-        operation_description=(
-            "현재 로그인한 사용자가 소유한 모든 originPDF 항목들의 목록을 조회합니다.\n"
-            "- 인증: Authorization: Bearer <access_token>"
-        ),
-        tags=["PDF Documents"],
-        responses={200: OriginPDFSerializer(many=True)},
-    )
-    def get(self, request):
-        # 1. 현재 로그인한 유저 가져오기
-        user = request.user
-        
-        # 2. 해당 유저가 소유한 PDF만 필터링 (가장 최신순으로 정렬하고 싶다면 order_by 추가)
-        pdfs = originPDF.objects.filter(user_id=user).order_by('-created_at')
-        
-        # 3. 기존에 만들어둔 가벼운 Serializer 사용
-        serializer = OriginPDFSerializer(pdfs, many=True)
-        
+# pdf_documents/views.py
+
+from rest_framework.views import APIView
+from rest_framework.response import Response
+from rest_framework.permissions import IsAuthenticated, IsAdminUser
+from rest_framework import status
+from rest_framework.parsers import MultiPartParser, FormParser
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from botocore.exceptions import ClientError
+import os
+import uuid
+
+from .serializers import OriginPDFSerializer, PDFUploadSerializer, MatchedTextDataGetSerializer, PDFpageSerializer, OCRJobSerializer
+from .serializers import PDFUploadURLRequestSerializer, PDFUploadConfirmSerializer
+from .fast_serializers import MatchedTextValuesSerializer, PDFpageValuesSerializer
+from .models import originPDF, PDFpage, MatchedText, OCRJob
+from .ocr import enqueue_ocr_job
+from . import storage
+from .storage import get_s3_client
+from .pagination import PageNumCursorPagination
+from .bundle import parse_sections, build_bundle
+from .versions import document_etag, etag_headers, not_modified
+from .response_cache import cached_json_response, get_response_cache
+from .blobs import BlobPurged, find_blob, acquire_blob, reclaim_purged_key
+from .deletion import soft_delete_documents
+from .uploads import SHA256UploadHandler, S3MultipartUploadHandler, S3UploadedFile, transfer_config
+from .direct_upload import (
+    DirectUploadError, new_upload_key, make_upload_token, read_upload_token,
+    create_presigned_post, create_multipart_upload, complete_multipart_upload, head_upload,
+)
+
+from drf_yasg.utils import swagger_auto_schema
+from drf_yasg import openapi
+
+def _s3_error_body(e, detail):
+    """(응답 본문, 상태 코드)"""
+    code = e.response.get("Error", {}).get("Code")
+    msg = e.response.get("Error", {}).get("Message")
+    return (
+        {
+            "detail": detail,
+            "error_code": code,
+            "error_message": msg,
+            "hint": "IAM 정책/버킷 정책/KMS 강제 여부를 확인하세요."
+        },
+        status.HTTP_403_FORBIDDEN if code in ("AccessDenied",) else status.HTTP_502_BAD_GATEWAY
+    )
+
+
+def _s3_error_response(e, detail):
+    body, code = _s3_error_body(e, detail)
+    return Response(body, status=code)
+
+
+def store_uploaded_pdf(request, user):
+    """
+    multipart 요청의 `file` 을 S3 에 올리고 originPDF 를 만든다. (응답 본문, 상태 코드) 를 반환한다.
+    PDFUploadView 와 AsyncPDFUploadView(async_views.py) 가 함께 사용한다.
+    request 는 DRF Request / Django HttpRequest 모두 가능하다.
+    """
+    # 1) 입력 검증 (업로드가 스트리밍되는 동안 SHA-256 계산)
+    hasher = SHA256UploadHandler(request)
+    request.upload_handlers.insert(0, hasher)
+    if settings.PDF_STREAM_UPLOAD_ENABLED:
+        # 받는 대로 S3 multipart part 로 올림 (임시 파일을 거치지 않음)
+        request.upload_handlers.insert(1, S3MultipartUploadHandler(request))
+    try:
+        file_obj = request.FILES.get('file', None)
+    except ClientError as e:
+        return _s3_error_body(e, "S3 업로드에 실패했습니다.")
+    title = request.POST.get('title', '')
+
+    if not file_obj:
+        return (
+            {"detail": "파일이 첨부되지 않았습니다. form-data에서 key를 'file'로 보내세요."},
+            status.HTTP_400_BAD_REQUEST
+        )
+
+    # 2) 파일명 충돌 방지: 원본 확장자는 유지
+    ext = os.path.splitext(file_obj.name)[1] or ".pdf"
+
+    sha256 = hasher.digests.get('file')
+    streamed = isinstance(file_obj, S3UploadedFile)
+
+    # 업로드 옵션 (브라우저 열람/다운로드에 유용)
+    extra_args = {"ContentType": file_obj.content_type or "application/pdf"}
+
+    # (버킷 정책에서 SSE-KMS를 강제한다면 주석 해제하고 KMS 키 지정)
+    # extra_args.update({
+    #     "ServerSideEncryption": "aws:kms",
+    #     "SSEKMSKeyId": "<KMS 키 ARN 또는 별칭>"
+    # })
+
+    # 같은 내용의 파일이 이미 S3에 있으면 업로드를 건너뛰고 그 객체를 공유한다.
+    # 찾은 뒤 저장하기 전에 마지막 참조가 사라져 그 객체가 삭제되었으면 한 번 더 돌면서 직접 올린다.
+    reuse_existing = not streamed and bool(sha256)
+    while True:
+        existing_blob = None
+        if streamed:
+            # 이미 스트리밍으로 올라감. 중복 파일이면 아래 acquire_blob 에서 방금 올린 객체를 정리한다
+            key = file_obj.s3_key
+        else:
+            key = f"pdfs/{uuid.uuid4().hex}{ext}"
+            if reuse_existing:
+                existing_blob = find_blob(sha256)
+                if existing_blob is not None:
+                    key = existing_blob.s3_key
+
+        try:
+            # 3) 업로드 (스트리밍으로 이미 올라갔거나 중복 파일이면 생략)
+            if not streamed and existing_blob is None:
+                # 프로세스 공용 S3 클라이언트 사용 (pdf_documents/storage.py)
+                storage.upload_fileobj(file_obj, key, extra_args=extra_args, config=transfer_config())
+        except ClientError as e:
+            # AccessDenied 등 S3에서 바로 떨어지는 에러를 사용자에게 명확히 반환
+            return _s3_error_body(e, "S3 업로드에 실패했습니다.")
+        except Exception as e:
+            return (
+                {"detail": f"S3 업로드 중 알 수 없는 오류: {e}"},
+                status.HTTP_500_INTERNAL_SERVER_ERROR
+            )
+
+        # 4) DB 저장 (blob 참조 카운트 증가 + originPDF 생성을 한 트랜잭션으로)
+        try:
+            with transaction.atomic():
+                blob = None
+                if sha256:
+                    blob, created = acquire_blob(sha256, key, hasher.sizes.get('file', file_obj.size))
+                    if created and existing_blob is not None and not reclaim_purged_key(key):
+                        # find_blob 이후 마지막 참조가 사라지고 S3 객체까지 지워졌다: 롤백하고 직접 올린다
+                        raise BlobPurged(key)
+                    if not created and blob.s3_key != key:
+                        if existing_blob is None:
+                            # 같은 파일이 동시에 올라온 경우: 먼저 만들어진 객체를 쓰고 방금 올린 객체는 정리
+                            transaction.on_commit(lambda k=key: storage.delete_object(k))
+                        key = blob.s3_key
+
+                # 5) 접근 URL (리전 포함 커스텀 도메인 사용)
+                s3_url = storage.object_url(key)
+
+                origin_pdf = originPDF.objects.create(
+                    user_id=user,   # IsAuthenticated 전제. 비로그인 접근이면 FK 오류 가능
+                    title=title,
+                    S3_url=s3_url,
+                    s3_key=key,
+                    blob=blob,
+                )
+        except BlobPurged:
+            reuse_existing = False
+            continue
+        except Exception as e:
+            # DB 실패 시, 업로드된 객체를 정리하고 싶다면 아래 주석 해제(선택)
+            # try:
+            #     storage.delete_object(key)
+            # except Exception:
+            #     pass
+            return (
+                {"detail": f"DB 저장에 실패했습니다: {e}"},
+                status.HTTP_500_INTERNAL_SERVER_ERROR
+            )
+        break
+
+    # 6) 응답
+    serializer = OriginPDFSerializer(origin_pdf)
+    return serializer.data, status.HTTP_201_CREATED
+
+
+class PDFUploadView(APIView):
+
+    parser_classes = [MultiPartParser, FormParser]
+
+    @swagger_auto_schema(
+        operation_summary="PDF 업로드",
+        operation_description=(
+            "S3로 PDF를 업로드하고 메타데이터(DB)에 저장합니다.\n"
+            "- Content-Type: multipart/form-data\n"
+            "- 필드: `title`(text), `file`(file)\n"
+            "- 인증: Authorization: Bearer <access_token>\n"
+            "큰 파일은 `upload/url/` + `upload/confirm/`(S3 직접 업로드)을 사용하세요."
+        ),
+        tags=["PDF Documents"],
+        security=[{"Bearer": []}],
+        consumes=["multipart/form-data"],
+        request_body=PDFUploadSerializer,
+        responses={201: OriginPDFSerializer, 400: "잘못된 요청", 403: "권한/버킷", 500: "서버 오류"},
+    )
+    def post(self, request, *args, **kwargs):
+        body, code = store_uploaded_pdf(request, request.user)
+        return Response(body, status=code)
+
+
+class PDFUploadURLView(APIView):
+    """
+    S3 직접 업로드 1단계: 서버가 정한 key 로 presigned POST 또는 multipart part URL 발급
+    (파일 본문은 Django 를 거치지 않는다)
+    """
+    permission_classes = [IsAuthenticated]
+
+    @swagger_auto_schema(
+        operation_summary="PDF 직접 업로드 URL 발급",
+        operation_description=(
+            "브라우저가 S3에 직접 PDF를 올릴 수 있는 URL을 발급합니다.\n"
+            "- `size`가 PDF_UPLOAD_MULTIPART_THRESHOLD 미만이면 `method: post`\n"
+            "  → `url`에 `fields`와 `file`을 multipart/form-data로 POST\n"
+            "- 이상이면 `method: multipart`\n"
+            "  → 파일을 `part_size` 바이트씩 잘라 `parts[].url`에 PUT 하고 응답 헤더의 ETag를 모아둠\n"
+            "업로드가 끝나면 `upload/confirm/`에 `upload_token`(과 multipart면 `parts`)을 보내세요.\n"
+            "- 인증: Authorization: Bearer <access_token>"
+        ),
+        tags=["PDF Documents"],
+        security=[{"Bearer": []}],
+        request_body=PDFUploadURLRequestSerializer,
+        responses={200: "업로드 URL", 400: "잘못된 요청 / 크기 초과", 403: "권한/버킷", 502: "S3 통신 오류"},
+    )
+    def post(self, request, *args, **kwargs):
+        serializer = PDFUploadURLRequestSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        size = serializer.validated_data["size"]
+        title = serializer.validated_data["title"]
+
+        if size > settings.PDF_UPLOAD_MAX_BYTES:
+            return Response(
+                {"detail": f"파일 크기는 {settings.PDF_UPLOAD_MAX_BYTES} bytes 를 넘을 수 없습니다."},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        s3 = get_s3_client()
+        key = new_upload_key()
+        try:
+            if size < settings.PDF_UPLOAD_MULTIPART_THRESHOLD:
+                post = create_presigned_post(s3, key)
+                data = {
+                    "method": "post",
+                    "url": post["url"],
+                    "fields": post["fields"],
+                    "upload_token": make_upload_token(request.user.pk, key, title),
+                }
+            else:
+                upload_id, part_size, parts = create_multipart_upload(s3, key, size)
+                data = {
+                    "method": "multipart",
+                    "part_size": part_size,
+                    "parts": parts,
+                    "upload_token": make_upload_token(request.user.pk, key, title, upload_id),
+                }
+        except ClientError as e:
+            return _s3_error_response(e, "업로드 URL 발급에 실패했습니다.")
+
+        data["expires_in"] = settings.PDF_UPLOAD_URL_EXPIRES
+        return Response(data, status=status.HTTP_200_OK)
+
+
+def _confirmed_response(user, upload_key):
+    """같은 업로드 토큰으로 이미 만든 originPDF 가 있으면 200 응답, 없으면 None"""
+    origin_pdf = originPDF.objects.filter(user_id=user, upload_key=upload_key).first()
+    if origin_pdf is None:
+        return None
+    return Response(OriginPDFSerializer(origin_pdf).data, status=status.HTTP_200_OK)
+
+
+class PDFUploadConfirmView(APIView):
+    """
+    S3 직접 업로드 2단계: (multipart 면 완료 처리 후) HEAD 로 객체를 확인하고 originPDF 생성
+    """
+    permission_classes = [IsAuthenticated]
+
+    @swagger_auto_schema(
+        operation_summary="PDF 직접 업로드 확인",
+        operation_description=(
+            "`upload/url/`로 발급받은 URL로 업로드를 마친 뒤 호출합니다.\n"
+            "S3 객체를 HEAD로 확인하고 originPDF를 생성합니다.\n"
+            "같은 `upload_token`으로 다시 호출하면 이미 만들어진 originPDF를 200으로 반환합니다.\n"
+            "- 인증: Authorization: Bearer <access_token>"
+        ),
+        tags=["PDF Documents"],
+        security=[{"Bearer": []}],
+        request_body=PDFUploadConfirmSerializer,
+        responses={
+            200: OriginPDFSerializer,
+            201: OriginPDFSerializer,
+            400: "잘못된 토큰 / 업로드되지 않음 / 크기 초과",
+            403: "권한/버킷",
+            502: "S3 통신 오류",
+        },
+    )
+    def post(self, request, *args, **kwargs):
+        # 1) 토큰 검증
+        serializer = PDFUploadConfirmSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        try:
+            key, title, upload_id = read_upload_token(serializer.validated_data["upload_token"], request.user.pk)
+        except DirectUploadError as e:
+            return Response({"detail": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+        # 재시도 요청이면 이미 만든 레코드를 그대로 반환
+        confirmed = _confirmed_response(request.user, key)
+        if confirmed is not None:
+            return confirmed
+
+        s3 = get_s3_client()
+
+        # 2) multipart 업로드 완료 처리
+        if upload_id:
+            try:
+                complete_multipart_upload(s3, key, upload_id, serializer.validated_data.get("parts"))
+            except DirectUploadError as e:
+                return Response({"detail": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+            except ClientError as e:
+                code = e.response.get("Error", {}).get("Code")
+                # NoSuchUpload: 이전 confirm 에서 이미 완료된 경우일 수 있으므로 HEAD 로 확인
+                if code in ("InvalidPart", "InvalidPartOrder"):
+                    return Response(
+                        {"detail": "parts 의 part_number / etag 가 업로드된 part 와 맞지 않습니다."},
+                        status=status.HTTP_400_BAD_REQUEST
+                    )
+                if code != "NoSuchUpload":
+                    return _s3_error_response(e, "multipart 업로드 완료 처리에 실패했습니다.")
+
+        # 3) 업로드된 객체 확인
+        try:
+            size, sha256 = head_upload(s3, key)
+        except ClientError as e:
+            if e.response.get("Error", {}).get("Code") in ("404", "NoSuchKey", "NotFound"):
+                # 동시에 들어온 confirm 이 중복 파일로 처리하면서 업로드 객체를 지웠을 수 있다
+                confirmed = _confirmed_response(request.user, key)
+                if confirmed is not None:
+                    return confirmed
+                return Response(
+                    {"detail": "업로드된 파일을 찾을 수 없습니다. 업로드를 마친 뒤 호출하세요."},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+            return _s3_error_response(e, "업로드된 파일 확인에 실패했습니다.")
+
+        if size > settings.PDF_UPLOAD_MAX_BYTES:
+            # multipart 는 part URL 만으로 전체 크기를 제한할 수 없으므로 여기서 거른다
+            storage.delete_object(key)
+            return Response(
+                {"detail": f"파일 크기는 {settings.PDF_UPLOAD_MAX_BYTES} bytes 를 넘을 수 없습니다."},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        # 4) DB 저장 (S3 가 SHA-256 체크섬을 갖고 있으면 같은 내용의 객체를 공유)
+        upload_key = key
+        try:
+            with transaction.atomic():
+                blob = None
+                if sha256:
+                    blob, created = acquire_blob(sha256, upload_key, size)
+                    if not created and blob.s3_key != upload_key:
+                        transaction.on_commit(lambda k=upload_key: storage.delete_object(k))
+                        key = blob.s3_key
+
+                origin_pdf = originPDF.objects.create(
+                    user_id=request.user,
+                    title=title,
+                    S3_url=storage.object_url(key),
+                    s3_key=key,
+                    upload_key=upload_key,
+                    blob=blob,
+                )
+        except IntegrityError:
+            # upload_key unique: 같은 토큰의 confirm 이 먼저 저장됨 (blob 참조 증가도 함께 롤백됨)
+            confirmed = _confirmed_response(request.user, upload_key)
+            if confirmed is not None:
+                return confirmed
+            return Response(
+                {"detail": "이미 처리된 업로드 토큰입니다."},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        except Exception as e:
+            return Response(
+                {"detail": f"DB 저장에 실패했습니다: {e}"},
+                status=status.HTTP_500_INTERNAL_SERVER_ERROR
+            )
+
+        return Response(OriginPDFSerializer(origin_pdf).data, status=status.HTTP_201_CREATED)
+
+
+class PDFDeleteView(APIView):
+    permission_classes = [IsAuthenticated]
+
+    @swagger_auto_schema(
+        operation_summary="PDF 삭제",
+        operation_description=(
+            "S3에 업로드된 PDF 파일과 DB에 저장된 originPDF 레코드를 삭제합니다.\n"
+            "- HTTP Method: DELETE\n"
+            "- Path Parameter: `id` (originPDF의 PK)\n"
+            "- 인증: Authorization: Bearer <access_token>\n\n"
+            "주어진 `id`를 가진 PDF가 현재 로그인한 사용자 소유인지 확인한 뒤,\n"
+            "바로 삭제 상태로 바꿔 목록/조회에서 제외합니다.\n"
+            "S3 객체와 DB 레코드는 백그라운드 워커(purge_deleted_pdfs)가 정리합니다.\n"
+            "같은 내용의 파일을 다른 문서가 공유 중이면 S3 객체는 마지막 문서가 삭제될 때 지워집니다."
+        ),
+        tags=["PDF Documents"],
+        security=[{"Bearer": []}],
+        manual_parameters=[
+            openapi.Parameter(
+                "id",
+                openapi.IN_PATH,
+                description="삭제할 originPDF의 ID",
+                type=openapi.TYPE_INTEGER,
+            )
+        ],
+        responses={
+            204: "삭제 완료",
+            404: "해당 PDF 없음",
+        },
+    )
+    def delete(self, request, id, *args, **kwargs):
+        # 1) 해당 유저의 PDF를 삭제 표시 (한 트랜잭션, S3 호출 없음)
+        # 바로 목록/조회에서 빠지고, S3 객체와 연관 행(PDFpage, MatchedText, PDFfigure 등)은
+        # purge_deleted_pdfs 워커가 정리한다.
+        # 다른 사용자와 공유 중인 blob이면 참조 카운트만 줄이고, 마지막 참조일 때만 S3 객체를 지운다.
+        deleted = soft_delete_documents(originPDF.objects.filter(id=id, user_id=request.user))
+        if not deleted:
+            return Response(
+                {"detail": "해당 PDF를 찾을 수 없습니다."},
+                status=status.HTTP_404_NOT_FOUND
+            )
+
+        # 보통 리소스 삭제는 204 No Content
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
+class PDFwithOCRView(APIView):
+    """
+    특정 originPDF(pdf_id)에 대해 OCR 작업을 큐에 등록한다.
+    실제 처리(presigned URL 생성 → OCR 서버 호출 → pages / figures / matches 저장)는
+    `python manage.py run_ocr_worker` 가 수행하고,
+    진행 상황은 OCRStatusView 로 조회한다.
+    """
+    permission_classes = [IsAuthenticated]
+
+    @swagger_auto_schema(
+        operation_summary="PDF OCR 작업 등록",
+        operation_description=(
+            "지정한 PDF에 대한 OCR 작업을 큐에 등록하고 바로 202를 반환합니다.\n"
+            "OCR 서버 호출과 pages, figures, matches 저장은 백그라운드 워커가 처리하며,\n"
+            "`pdfs/<pdf_id>/ocr/status/` 로 진행 상태를 조회할 수 있습니다.\n"
+            "이미 대기/진행 중인 작업이 있으면 해당 작업 정보를 그대로 반환합니다.\n"
+            "- 인증: Authorization: Bearer <access_token>"
+        ),
+        tags=["PDF Documents"],
+        responses={
+            202: OCRJobSerializer,
+            400: "s3_key 없음",
+            404: "해당 PDF 없음",
+        },
+    )
+    def post(self, request, pdf_id, *args, **kwargs):
+        # 0) originPDF 조회
+        try:
+            origin_pdf = originPDF.objects.get(id=pdf_id, user_id=request.user)
+        except originPDF.DoesNotExist:
+            return Response(
+                {"detail": "해당 PDF를 찾을 수 없거나 권한이 없습니다."},
+                status=status.HTTP_404_NOT_FOUND
+            )
+
+        # s3_key 필수 체크
+        if not origin_pdf.s3_key:
+            return Response(
+                {"detail": "해당 PDF에는 s3_key가 저장되어 있지 않습니다."},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        # 1) 작업 등록 (진행 중인 작업이 있으면 재사용)
+        job, _ = enqueue_ocr_job(origin_pdf)
+
+        return Response(OCRJobSerializer(job).data, status=status.HTTP_202_ACCEPTED)
+
+
+class OCRStatusView(APIView):
+    """
+    특정 originPDF(pdf_id)의 가장 최근 OCR 작업 상태 조회
+    """
+    permission_classes = [IsAuthenticated]
+
+    @swagger_auto_schema(
+        operation_summary="PDF OCR 작업 상태 조회",
+        operation_description=(
+            "지정한 PDF의 가장 최근 OCR 작업 상태(queued/running/done/failed)와\n"
+            "생성된 pages, figures, matches 개수를 조회합니다.\n"
+            "- 인증: Authorization: Bearer <access_token>"
+        ),
+        tags=["PDF Documents"],
+        responses={200: OCRJobSerializer, 404: "해당 PDF 또는 OCR 작업 없음"},
+    )
+    def get(self, request, pdf_id, *args, **kwargs):
+        job = (
+            OCRJob.objects.filter(pdf_id=pdf_id, pdf_id__user_id=request.user)
+            .order_by("-created_at")
+            .first()
+        )
+        if job is None:
+            return Response(
+                {"detail": "해당 PDF의 OCR 작업을 찾을 수 없습니다."},
+                status=status.HTTP_404_NOT_FOUND
+            )
+
+        return Response(OCRJobSerializer(job).data, status=status.HTTP_200_OK)
+
+class MatchedTextListView(APIView):
+    """
+    특정 originPDF(pdf_id)에 대한 MatchedText 목록 조회
+    """
+    permission_classes = [IsAuthenticated]
+
+    @swagger_auto_schema(
+        operation_summary="PDF의 MatchedText 목록 조회",
+        operation_description=(
+            "지정한 PDF에 대해 MatchedText 항목들의 목록을 조회합니다.\n"
+            "- 인증: Authorization: Bearer <access_token>"
+        ),
+        tags=["PDF Documents"],
+        responses={200: MatchedTextDataGetSerializer(many=True), 304: "변경 없음 (If-None-Match)", 404: "해당 PDF 없음"},
+    )
+    def get(self, request, pdf_id, *args, **kwargs):
+        # 1) originPDF 조회
+        try:
+            origin_pdf = originPDF.objects.get(id=pdf_id, user_id=request.user)
+        except originPDF.DoesNotExist:
+            return Response(
+                {"detail": "해당 PDF를 찾을 수 없습니다."},
+                status=status.HTTP_404_NOT_FOUND
+            )
+
+        # 2) 문서 버전이 그대로면 MatchedText 를 읽지 않고 304
+        etag = document_etag(origin_pdf, "matches")
+        cached = not_modified(request, etag)
+        if cached is not None:
+            return cached
+
+        # 3) MatchedText 조회 + 직렬화 (같은 문서 버전이면 캐시된 JSON 재사용)
+        def build():
+            matched_texts = MatchedText.objects.filter(pdf_id=origin_pdf)
+            return MatchedTextValuesSerializer(matched_texts).data
+
+        return cached_json_response("matches", origin_pdf, {}, build, headers=etag_headers(etag))
+    
+class OriginPDFGetView(APIView):
+    """
+    특정 originPDF(pdf_id)에 대한 메타데이터 조회
+    """
+    permission_classes = [IsAuthenticated]
+
+    @swagger_auto_schema(
+        operation_summary="PDF 메타데이터 조회",
+        operation_description=(
+            "지정한 PDF에 대한 메타데이터를 조회합니다.\n"
+            "- 인증: Authorization: Bearer <access_token>"
+        ),
+        tags=["PDF Documents"],
+        responses={200: OriginPDFSerializer, 304: "변경 없음 (If-None-Match)", 404: "해당 PDF 없음"},
+    )
+    def get(self, request, pdf_id, *args, **kwargs):
+        # 1) originPDF 조회
+        try:
+            origin_pdf = originPDF.objects.get(id=pdf_id, user_id=request.user)
+        except originPDF.DoesNotExist:
+            return Response(
+                {"detail": "해당 PDF를 찾을 수 없습니다."},
+                status=status.HTTP_404_NOT_FOUND
+            )
+
+        # 2) 직렬화 및 응답
+        etag = document_etag(origin_pdf, "meta")
+        cached = not_modified(request, etag)
+        if cached is not None:
+            return cached
+        serializer = OriginPDFSerializer(origin_pdf)
+        return Response(serializer.data, status=status.HTTP_200_OK, headers=etag_headers(etag))
+    
+class PDFpageGetView(APIView):
+    """
+    특정 originPDF(pdf_id)에 대한 PDFpage 목록 조회
+    cursor / limit / start / end / fields 중 하나라도 주면 page_num 기준 cursor 페이지네이션으로 응답하고,
+    아무것도 주지 않으면 기존처럼 전체 목록(배열)을 반환한다.
+    """
+    permission_classes = [IsAuthenticated]
+
+    PAGE_FIELDS = ('id', 'pdf_id', 'page_num', 'text')
+    QUERY_PARAMS = ('cursor', 'limit', 'start', 'end', 'fields')
+
+    @swagger_auto_schema(
+        operation_summary="PDF의 PDFpage 목록 조회",
+        operation_description=(
+            "지정한 PDF에 대해 PDFpage 항목들의 목록을 조회합니다.\n"
+            "- 쿼리 파라미터를 주지 않으면 전체 페이지를 배열로 반환합니다.\n"
+            "- `limit`/`cursor`/`start`/`end`/`fields` 중 하나라도 주면 page_num 순서의\n"
+            "  `{next, previous, results}` 형태로 반환하며, `next` URL 로 다음 구간을 가져옵니다.\n"
+            "- 예: `?fields=id,page_num&limit=500` (페이지 목록만), `?start=10&end=14` (보이는 구간 텍스트)\n"
+            "- 인증: Authorization: Bearer <access_token>"
+        ),
+        tags=["PDF Documents"],
+        manual_parameters=[
+            openapi.Parameter("limit", openapi.IN_QUERY, type=openapi.TYPE_INTEGER,
+                              description="한 번에 가져올 페이지 수 (기본 50, 최대 500)"),
+            openapi.Parameter("cursor", openapi.IN_QUERY, type=openapi.TYPE_STRING,
+                              description="이전 응답의 next / previous URL 에 들어 있는 cursor"),
+            openapi.Parameter("start", openapi.IN_QUERY, type=openapi.TYPE_INTEGER,
+                              description="이 page_num 부터"),
+            openapi.Parameter("end", openapi.IN_QUERY, type=openapi.TYPE_INTEGER,
+                              description="이 page_num 까지"),
+            openapi.Parameter("fields", openapi.IN_QUERY, type=openapi.TYPE_STRING,
+                              description="쉼표로 구분한 필드 (id, pdf_id, page_num, text)"),
+        ],
+        responses={200: PDFpageSerializer(many=True), 304: "변경 없음 (If-None-Match)", 400: "잘못된 파라미터", 404: "해당 PDF 없음"},
+    )
+    def get(self, request, pdf_id, *args, **kwargs):
+        # 1) originPDF 조회
+        try:
+            origin_pdf = originPDF.objects.get(id=pdf_id, user_id=request.user)
+        except originPDF.DoesNotExist:
+            return Response(
+                {"detail": "해당 PDF를 찾을 수 없습니다."},
+                status=status.HTTP_404_NOT_FOUND
+            )
+
+        # 2) 문서 버전이 그대로면 PDFpage 를 읽지 않고 304
+        etag = document_etag(origin_pdf, "pages")
+        cached = not_modified(request, etag)
+        if cached is not None:
+            return cached
+
+        # 3) PDFpage 조회
+        pdf_pages = PDFpage.objects.filter(pdf_id=origin_pdf).order_by('page_num')
+
+        params = request.query_params
+        if not any(name in params for name in self.QUERY_PARAMS):
+            # 파라미터가 없으면 기존 응답 형태(전체 배열) 유지 (같은 문서 버전이면 캐시된 JSON 재사용)
+            return cached_json_response(
+                "pages", origin_pdf, {},
+                lambda: PDFpageValuesSerializer(pdf_pages).data,
+                headers=etag_headers(etag),
+            )
+
+        # 4) 페이지 범위 / 필드 선택
+        try:
+            if params.get('start'):
+                pdf_pages = pdf_pages.filter(page_num__gte=int(params['start']))
+            if params.get('end'):
+                pdf_pages = pdf_pages.filter(page_num__lte=int(params['end']))
+        except ValueError:
+            return Response(
+                {"detail": "start / end 는 정수여야 합니다."},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        fields = None
+        if params.get('fields'):
+            fields = [name.strip() for name in params['fields'].split(',') if name.strip()]
+            unknown = set(fields) - set(self.PAGE_FIELDS)
+            if unknown:
+                return Response(
+                    {"detail": f"알 수 없는 필드: {', '.join(sorted(unknown))}"},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+            # text 를 요청하지 않으면 DB 에서도 읽지 않는다 (page_num 은 cursor 계산에 필요)
+            pdf_pages = pdf_pages.only(*{'id', 'page_num', *fields})
+
+        # 5) cursor 페이지네이션 후 직렬화
+        def build():
+            paginator = PageNumCursorPagination()
+            page = paginator.paginate_queryset(pdf_pages, request, view=self)
+            serializer = PDFpageSerializer(page, many=True, fields=fields)
+            return paginator.get_paginated_response(serializer.data).data
+
+        # next / previous 가 절대 URL 이므로 host 도 키에 넣는다
+        cache_params = {name: params.getlist(name) for name in self.QUERY_PARAMS if name in params}
+        cache_params['host'] = request.build_absolute_uri('/')
+        return cached_json_response("pages", origin_pdf, cache_params, build, headers=etag_headers(etag))
+
+
+class PDFBundleView(APIView):
+    """
+    문서를 열 때 필요한 메타데이터 / 페이지 목록 / figures / matches / tags / highlights 를 한 번에 조회
+    (섹션당 쿼리 1번, pdf_documents/bundle.py)
+    """
+    permission_classes = [IsAuthenticated]
+
+    @swagger_auto_schema(
+        operation_summary="PDF 문서 묶음 조회",
+        operation_description=(
+            "문서를 열 때 필요한 데이터를 한 번의 요청으로 조회합니다.\n"
+            "- 응답 키: `meta`, `pages`(id, page_num 만), `figures`, `matches`, `tags`, `highlights`\n"
+            "- `sections`로 필요한 섹션만 받을 수 있습니다. 예: `?sections=meta,pages,highlights`\n"
+            "- 응답의 `ETag`를 `If-None-Match`로 보내면 문서가 바뀌지 않은 경우 304를 반환합니다.\n"
+            "- 페이지 본문은 `pdfs/<pdf_id>/pages/?start=&end=`로 보이는 구간만 가져오세요.\n"
+            "- 인증: Authorization: Bearer <access_token>"
+        ),
+        tags=["PDF Documents"],
+        manual_parameters=[
+            openapi.Parameter("sections", openapi.IN_QUERY, type=openapi.TYPE_STRING,
+                              description="쉼표로 구분한 섹션 (meta, pages, figures, matches, tags, highlights)"),
+        ],
+        responses={200: "문서 묶음", 304: "변경 없음 (If-None-Match)", 400: "잘못된 섹션", 404: "해당 PDF 없음"},
+    )
+    def get(self, request, pdf_id, *args, **kwargs):
+        # 1) 섹션 확인
+        try:
+            sections = parse_sections(request.query_params.get('sections'))
+        except ValueError as e:
+            return Response({"detail": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+        # 2) originPDF 조회
+        try:
+            origin_pdf = originPDF.objects.get(id=pdf_id, user_id=request.user)
+        except originPDF.DoesNotExist:
+            return Response(
+                {"detail": "해당 PDF를 찾을 수 없습니다."},
+                status=status.HTTP_404_NOT_FOUND
+            )
+
+        # 3) 문서 버전이 그대로면 섹션을 읽지 않고 304
+        etag = document_etag(origin_pdf, "bundle")
+        cached = not_modified(request, etag)
+        if cached is not None:
+            return cached
+
+        # 4) 섹션별 조회
+        data = build_bundle(origin_pdf, sections)
+        return Response(data, status=status.HTTP_200_OK, headers=etag_headers(etag))
+
+
+class ResponseCacheStatsView(APIView):
+    """
+    문서 조회 응답 캐시(pdf_documents/response_cache.py)의 hit / miss / eviction 카운터 조회
+    """
+    permission_classes = [IsAdminUser]
+
+    @swagger_auto_schema(
+        operation_summary="응답 캐시 통계",
+        operation_description=(
+            "문서 조회 응답 캐시의 hit / miss 횟수와 저장소 상태(항목 수, 바이트, 제거 횟수)를 조회합니다.\n"
+            "카운터는 이 요청을 처리한 프로세스 기준입니다.\n"
+            "- 관리자(staff)만 호출할 수 있습니다."
+        ),
+        tags=["PDF Documents"],
+        responses={200: "캐시 통계", 403: "관리자 아님"},
+    )
+    def get(self, request, *args, **kwargs):
+        return Response(get_response_cache().stats(), status=status.HTTP_200_OK)
+
+
+class UserPDFDataView(APIView):
+    permission_classes = [IsAuthenticated]
+
+    @swagger_auto_schema(
+        operation_summary="사용자 소유 PDF 목록 조회",
+        operation_description=(
+            "현재 로그인한 사용자가 소유한 모든 originPDF 항목들의 목록을 조회합니다.\n"
+            "- 인증: Authorization: Bearer <access_token>"
+        ),
+        tags=["PDF Documents"],
+        responses={200: OriginPDFSerializer(many=True)},
+    )
+    def get(self, request):
+        # 1. 현재 로그인한 유저 가져오기
+        user = request.user
+        
+        # 2. 해당 유저가 소유한 PDF만 필터링 (가장 최신순으로 정렬하고 싶다면 order_by 추가)
+        pdfs = originPDF.objects.filter(user_id=user).order_by('-created_at')
+        
+        # 3. 기존에 만들어둔 가벼운 Serializer 사용
+        serializer = OriginPDFSerializer(pdfs, many=True)
+        
         return Response(serializer.data, status=status.HTTP_200_OK)
\ No newline at end of file
@@ -1,5 +1,5 @@
-from django.apps import AppConfig
-
-class PdfFiguresConfig(AppConfig):
-    default_auto_field = 'django.db.models.BigAutoField'
-    name = 'pdf_figures'
+from django.apps import AppConfig
+
+class PdfFiguresConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'pdf_figures'
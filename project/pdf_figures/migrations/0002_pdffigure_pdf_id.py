@@ -0,0 +1,20 @@
+# Generated by Django 5.2.6 on 2026-10-18 16:02
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('pdf_documents', '0008_originpdf_deleted_at_s3purgetask'),
+        ('pdf_figures', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='pdffigure',
+            name='pdf_id',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, to='pdf_documents.originpdf'),
+        ),
+    ]
@@ -1,10 +1,12 @@
-from django.db import models
-from pdf_documents.models import PDFpage
-
-class PDFfigure(models.Model):
-    page_id = models.ForeignKey(PDFpage, on_delete=models.CASCADE)
-    figure_type = models.CharField(max_length=50)
-    figure_box = models.JSONField()  # {{ "min_x": ~, "min_y": ~, "max_x": ~, "max_y": ~  }, etc ~ }
-
-    def __str__(self):
+from django.db import models
+from pdf_documents.models import originPDF, PDFpage
+
+class PDFfigure(models.Model):
+    # 문서 단위 조회가 PDFpage 를 거치지 않도록 page_id.pdf_id 를 그대로 복사해 둔다 (OCR 저장 시 채움)
+    pdf_id = models.ForeignKey(originPDF, on_delete=models.CASCADE, null=True, blank=True)
+    page_id = models.ForeignKey(PDFpage, on_delete=models.CASCADE)
+    figure_type = models.CharField(max_length=50)
+    figure_box = models.JSONField()  # {{ "min_x": ~, "min_y": ~, "max_x": ~, "max_y": ~  }, etc ~ }
+
+    def __str__(self):
         return f"Figure on Page: {self.page_id.page_num} - Type: {self.figure_type}"
\ No newline at end of file
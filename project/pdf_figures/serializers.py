@@ -1,7 +1,13 @@
-from rest_framework import serializers
-from .models import PDFfigure
-
-class PDFfigureSerializer(serializers.ModelSerializer):
-    class Meta:
-        model = PDFfigure
-        fields = ['id', 'page_id', 'figure_type', 'figure_box']
\ No newline at end of file
+from rest_framework import serializers
+from pdf_documents.fast_serializers import ValuesListSerializer
+from .models import PDFfigure
+
+class PDFfigureSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = PDFfigure
+        fields = ['id', 'page_id', 'figure_type', 'figure_box']
+
+
+class PDFfigureValuesSerializer(ValuesListSerializer):
+    """PDFfigureSerializer 와 같은 모양을 .values_list() 로 바로 만든다 (큰 목록 응답용)"""
+    serializer_class = PDFfigureSerializer
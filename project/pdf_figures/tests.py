@@ -1,3 +1,62 @@
-from django.test import TestCase
-
-# Create your tests here.
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from pdf_documents.deletion import soft_delete_documents
+from pdf_documents.models import originPDF, PDFpage
+from pdf_documents.response_cache import get_response_cache
+
+from .models import PDFfigure
+
+
+def make_pdf(user, title="test"):
+    return originPDF.objects.create(
+        user_id=user, title=title, S3_url="https://example.com/test.pdf", s3_key=f"pdfs/{title}.pdf",
+    )
+
+
+class FiguresETagTests(TestCase):
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(email="figures-etag@example.com")
+        self.origin_pdf = make_pdf(self.user)
+        page = PDFpage.objects.create(pdf_id=self.origin_pdf, page_num=1, text="page")
+        self.figure = PDFfigure.objects.create(
+            pdf_id=self.origin_pdf, page_id=page, figure_type="figure",
+            figure_box={"min_x": 0, "min_y": 0, "max_x": 1, "max_y": 1},
+        )
+        # 테스트마다 롤백되어 같은 (pdf_id, version) 이 다시 나오므로 이전 테스트의 응답을 지운다
+        get_response_cache().backend.clear()
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.url = reverse("pdf_figures:get_figures_by_origin_pdf", args=[self.origin_pdf.id])
+
+    def test_not_modified(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([row["id"] for row in response.json()], [self.figure.id])
+        etag = response["ETag"]
+
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response["ETag"], etag)
+
+    def test_change_invalidates_etag(self):
+        etag = self.client.get(self.url)["ETag"]
+        self.figure.figure_type = "table"
+        self.figure.save()
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response["ETag"], etag)
+        self.assertEqual(response.json()[0]["figure_type"], "table")
+
+    def test_other_users_document_is_404(self):
+        other = get_user_model().objects.create_user(email="figures-other@example.com")
+        self.client.force_authenticate(other)
+        self.assertEqual(self.client.get(self.url).status_code, 404)
+
+    def test_missing_or_deleted_document_is_404(self):
+        missing = reverse("pdf_figures:get_figures_by_origin_pdf", args=[self.origin_pdf.id + 100])
+        self.assertEqual(self.client.get(missing).status_code, 404)
+        soft_delete_documents(originPDF.objects.filter(id=self.origin_pdf.id))
+        self.assertEqual(self.client.get(self.url).status_code, 404)
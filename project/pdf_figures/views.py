@@ -1,23 +1,50 @@
-from rest_framework.permissions import IsAuthenticated
-from rest_framework.views import APIView
-from rest_framework.response import Response
-from rest_framework import status
-
-from .models import PDFfigure
-from .serializers import PDFfigureSerializer
-
-from drf_yasg.utils import swagger_auto_schema
-from drf_yasg import openapi
-
-class GetFiguresByOriginPDFAPIView(APIView):
-    permission_classes = [IsAuthenticated]
-
-    @swagger_auto_schema(
-        operation_id="getFiguresByOriginPDF",
-        operation_description="주어진 PDF 문서 ID에 연결된 모든 PDF figure를 조회합니다.",
-        tags=["PDF Figures"],
-        responses={200: PDFfigureSerializer(many=True), 401: openapi.Response("Unauthorized")},
-    )
-    def get(self, request, pdf_id):
-        qs = PDFfigure.objects.filter(page_id__pdf_id=pdf_id)
-        return Response(PDFfigureSerializer(qs, many=True).data, status=status.HTTP_200_OK)
\ No newline at end of file
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.views import APIView
+from rest_framework.response import Response
+from rest_framework import status
+
+from pdf_documents.models import originPDF
+from pdf_documents.versions import document_etag, etag_headers, not_modified
+from pdf_documents.response_cache import cached_json_response
+
+from .models import PDFfigure
+from .serializers import PDFfigureSerializer, PDFfigureValuesSerializer
+
+from drf_yasg.utils import swagger_auto_schema
+from drf_yasg import openapi
+
+class GetFiguresByOriginPDFAPIView(APIView):
+    permission_classes = [IsAuthenticated]
+
+    @swagger_auto_schema(
+        operation_id="getFiguresByOriginPDF",
+        operation_description="주어진 PDF 문서 ID에 연결된 모든 PDF figure를 조회합니다.\n ETag를 If-None-Match로 보내면 문서가 바뀌지 않은 경우 304를 반환합니다.",
+        tags=["PDF Figures"],
+        responses={
+            200: PDFfigureSerializer(many=True),
+            304: openapi.Response("Not Modified"),
+            401: openapi.Response("Unauthorized"),
+            404: openapi.Response("Not Found"),
+        },
+    )
+    def get(self, request, pdf_id):
+        origin_pdf = originPDF.objects.filter(id=pdf_id, user_id=request.user).only("id", "version").first()
+        if origin_pdf is None:
+            return Response(
+                {"detail": "해당 PDF를 찾을 수 없습니다."},
+                status=status.HTTP_404_NOT_FOUND
+            )
+        qs = PDFfigure.objects.filter(pdf_id=origin_pdf)
+
+        # 문서 버전이 그대로면 figure 를 읽지 않고 304
+        etag = document_etag(origin_pdf, "figures")
+        cached = not_modified(request, etag)
+        if cached is not None:
+            return cached
+
+        # 같은 문서 버전이면 캐시된 JSON 재사용
+        return cached_json_response(
+            "figures", origin_pdf, {},
+            lambda: PDFfigureValuesSerializer(qs).data,
+            headers=etag_headers(etag),
+        )
\ No newline at end of file
@@ -0,0 +1,25 @@
+from django.contrib import admin
+from .models import SearchIndexStats, SearchUserStats, ChunkIndex
+
+@admin.register(SearchIndexStats)
+class SearchIndexStatsAdmin(admin.ModelAdmin):
+    list_display = ('id', 'pdf_id', 'page_count', 'total_length', 'unit_count', 'indexed_at')
+    list_display_links = ('id', 'pdf_id')
+    search_fields = ('pdf_id__title',)
+    ordering = ('-indexed_at',)
+
+
+@admin.register(SearchUserStats)
+class SearchUserStatsAdmin(admin.ModelAdmin):
+    list_display = ('id', 'user_id', 'unit_count', 'total_length')
+    list_display_links = ('id', 'user_id')
+    search_fields = ('user_id__email',)
+
+
+@admin.register(ChunkIndex)
+class ChunkIndexAdmin(admin.ModelAdmin):
+    list_display = ('id', 'pdf_id', 'chunk_count', 'term_count', 'built_at')
+    list_display_links = ('id', 'pdf_id')
+    search_fields = ('pdf_id__title',)
+    exclude = ('data',)
+    ordering = ('-built_at',)
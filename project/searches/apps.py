@@ -0,0 +1,10 @@
+from django.apps import AppConfig
+
+
+class SearchesConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'searches'
+
+    def ready(self):
+        # OCR 완료 시 검색 색인 생성
+        from . import signals  # noqa: F401
@@ -0,0 +1,204 @@
+# searches/indexing.py
+"""
+검색 색인 생성 / 갱신.
+
+검색 단위는 페이지 본문(PDFpage.text), OCR 매칭 텍스트(MatchedText.raw_text + matched_text),
+하이라이트(Highlight.highlight_text) 세 가지다.
+- OCR 결과를 저장하는 트랜잭션 안에서(pdf_documents.signals.ocr_ingested) 문서 전체 색인을 다시 만든다. (index_document)
+- 하이라이트는 저장/삭제 때마다 그 하이라이트 하나만 갱신한다. (index_highlight / unindex_highlight)
+- 문서를 삭제 표시하면 통계에서 빼고(unindex_documents), SearchPosting 행은 purge 워커가 지운다.
+색인이 바뀔 때마다 문서별(SearchIndexStats) / 사용자별(SearchUserStats) 통계에 증감을 반영한다.
+기존 문서는 `python manage.py rebuild_search_index` 로 색인한다.
+"""
+from array import array
+from collections import Counter, defaultdict
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F
+
+from highlights.models import Highlight
+from pdf_documents.ingest import iter_keyset
+from pdf_documents.models import originPDF, PDFpage, MatchedText
+
+from .models import SearchPosting, SearchIndexStats, SearchUserStats, pack_units, unpack_units
+from .tokenizer import tokenize
+
+
+# bulk_create 한 번에 넣을 SearchPosting 행 수 (행 하나에 단위 목록이 들어 있어 행 수 기준으로는 작게 잡는다)
+INSERT_BATCH_SIZE = 1000
+
+
+def count_terms(text):
+    """text 의 (term → tf, 토큰 수)"""
+    counts = Counter(tokenize(text))
+    return counts, sum(counts.values())
+
+
+def make_postings(user_id, pdf_id, kind, object_id, page_id, page_num, text):
+    """검색 단위 하나(하이라이트)를 term 마다 한 행으로 만든다. (항목 목록, 토큰 수)"""
+    counts, length = count_terms(text)
+    postings = [
+        SearchPosting(
+            term=term, user_id_id=user_id, pdf_id_id=pdf_id, kind=kind, object_id=object_id,
+            units=pack_units([(object_id, page_id, page_num, tf, length)]),
+        )
+        for term, tf in counts.items()
+    ]
+    return postings, length
+
+
+def _add_user_stats(user_id, units, length):
+    if not units and not length:
+        return
+    SearchUserStats.objects.get_or_create(user_id_id=user_id)
+    SearchUserStats.objects.filter(user_id_id=user_id).update(
+        unit_count=F("unit_count") + units, total_length=F("total_length") + length,
+    )
+
+
+def index_document(origin_pdf, batch_size=None):
+    """
+    문서의 색인(페이지 / 매칭 텍스트 / 하이라이트)을 새로 만들고 색인한 페이지 수를 반환한다.
+    페이지 / 매칭 텍스트는 batch_size 개 (단위, term) 마다 term 별 한 행으로 묶어 저장하므로
+    메모리에는 그만큼만 올라가고 행 수는 대략 (문서의 term 수 × 묶음 수) 이다.
+    """
+    batch_size = batch_size or settings.SEARCH_INDEX_BATCH_SIZE
+    read_batch = settings.OCR_INGEST_BATCH_SIZE
+    user_id, pdf_id = origin_pdf.user_id_id, origin_pdf.id
+    counts = Counter()
+    block = defaultdict(lambda: array("q"))  # (kind, term) → 단위 목록 (UNIT_FIELDS 개씩 이어 붙임)
+    block_size = 0
+
+    def flush():
+        nonlocal block, block_size
+        if block:
+            SearchPosting.objects.bulk_create(
+                [
+                    SearchPosting(term=term, user_id_id=user_id, pdf_id_id=pdf_id, kind=kind, units=pack_units(units))
+                    for (kind, term), units in block.items()
+                ],
+                batch_size=INSERT_BATCH_SIZE,
+            )
+        block = defaultdict(lambda: array("q"))
+        block_size = 0
+
+    def add(kind, object_id, page_id, page_num, text):
+        nonlocal block_size
+        terms, length = count_terms(text)
+        if not terms:
+            return
+        counts[f"{kind}_count"] += 1
+        counts[f"{kind}_length"] += length
+        for term, tf in terms.items():
+            block[(kind, term)].extend((object_id, page_id, page_num, tf, length))
+        block_size += len(terms)
+        # 큰 문서도 메모리에 모두 올리지 않도록 batch_size 개씩 저장
+        if block_size >= batch_size:
+            flush()
+
+    with transaction.atomic():
+        old = SearchIndexStats.objects.filter(pdf_id=origin_pdf).values_list("unit_count", "unit_length").first()
+        SearchPosting.objects.filter(pdf_id=origin_pdf).delete()
+
+        pages = PDFpage.objects.filter(pdf_id=origin_pdf)
+        for rows in iter_keyset(pages, ("page_num", "text"), read_batch):
+            for page_id, page_num, text in rows:
+                add(SearchPosting.KIND_PAGE, page_id, page_id, page_num, text)
+
+        matches = MatchedText.objects.filter(pdf_id=origin_pdf)
+        for rows in iter_keyset(matches, ("page_id", "page_num", "raw_text", "matched_text"), read_batch):
+            for match_id, page_id, page_num, raw_text, matched_text in rows:
+                add(SearchPosting.KIND_MATCH, match_id, page_id, page_num, f"{raw_text} {matched_text}")
+        flush()
+
+        # 하이라이트는 하나씩 갱신하므로 묶지 않는다 (index_highlight 와 같은 모양)
+        highlights = Highlight.objects.filter(pdf_id=origin_pdf)
+        for rows in iter_keyset(highlights, ("page_id", "page_id__page_num", "highlight_text"), read_batch):
+            postings = []
+            for highlight_id, page_id, page_num, text in rows:
+                units, length = make_postings(
+                    user_id, pdf_id, SearchPosting.KIND_HIGHLIGHT, highlight_id, page_id, page_num, text,
+                )
+                if units:
+                    counts["highlight_count"] += 1
+                    counts["highlight_length"] += length
+                    postings.extend(units)
+            SearchPosting.objects.bulk_create(postings, batch_size=INSERT_BATCH_SIZE)
+
+        kinds = (SearchPosting.KIND_PAGE, SearchPosting.KIND_MATCH, SearchPosting.KIND_HIGHLIGHT)
+        unit_count = sum(counts[f"{kind}_count"] for kind in kinds)
+        unit_length = sum(counts[f"{kind}_length"] for kind in kinds)
+        SearchIndexStats.objects.update_or_create(
+            pdf_id=origin_pdf,
+            defaults={
+                "page_count": counts["page_count"],
+                "total_length": counts["page_length"],
+                "unit_count": unit_count,
+                "unit_length": unit_length,
+            },
+        )
+        old_count, old_length = old or (0, 0)
+        _add_user_stats(user_id, unit_count - old_count, unit_length - old_length)
+    return counts["page_count"]
+
+
+def _document_owner(pdf_id):
+    """삭제 표시되지 않은 문서의 소유자 id. 삭제된 문서면 None (통계에서 이미 빠졌으므로 갱신하지 않는다)"""
+    return originPDF.objects.filter(id=pdf_id).values_list("user_id", flat=True).first()
+
+
+def _replace_highlight(highlight_id, pdf_id, user_id, postings, length):
+    """하이라이트 하나의 색인 항목을 postings 로 바꾸고 통계에 증감을 반영한다."""
+    with transaction.atomic():
+        existing = SearchPosting.objects.filter(kind=SearchPosting.KIND_HIGHLIGHT, object_id=highlight_id)
+        old_units = existing.values_list("units", flat=True).first()
+        old_length = unpack_units(old_units)[0][4] if old_units is not None else None
+        existing.delete()
+        if postings:
+            SearchPosting.objects.bulk_create(postings)
+
+        units = (1 if postings else 0) - (1 if old_length is not None else 0)
+        delta = (length if postings else 0) - (old_length or 0)
+        if not units and not delta:
+            return
+        # 아직 OCR 색인이 없는 문서면 통계 행이 없을 수 있다
+        stats, _ = SearchIndexStats.objects.get_or_create(pdf_id_id=pdf_id)
+        SearchIndexStats.objects.filter(pk=stats.pk).update(
+            unit_count=F("unit_count") + units, unit_length=F("unit_length") + delta,
+        )
+        _add_user_stats(user_id, units, delta)
+
+
+def index_highlight(highlight):
+    user_id = _document_owner(highlight.pdf_id_id)
+    if user_id is None:
+        return
+    page_num = PDFpage.objects.filter(id=highlight.page_id_id).values_list("page_num", flat=True).first()
+    postings, length = make_postings(
+        user_id, highlight.pdf_id_id, SearchPosting.KIND_HIGHLIGHT, highlight.id,
+        highlight.page_id_id, page_num or 0, highlight.highlight_text,
+    )
+    _replace_highlight(highlight.id, highlight.pdf_id_id, user_id, postings, length)
+
+
+def unindex_highlight(highlight_id, pdf_id):
+    user_id = _document_owner(pdf_id)
+    if user_id is None:
+        return
+    _replace_highlight(highlight_id, pdf_id, user_id, [], 0)
+
+
+def unindex_documents(pdf_ids):
+    """
+    삭제 표시된 문서를 통계에서 뺀다. SearchPosting 행은 남겨 두고(purge 워커가 지움)
+    서재 검색은 deleted_at 으로 거른다.
+    """
+    stats = SearchIndexStats.objects.filter(pdf_id__in=pdf_ids)
+    per_user = defaultdict(lambda: [0, 0])
+    for user_id, unit_count, unit_length in stats.values_list("pdf_id__user_id", "unit_count", "unit_length"):
+        per_user[user_id][0] += unit_count
+        per_user[user_id][1] += unit_length
+    for user_id, (unit_count, unit_length) in per_user.items():
+        _add_user_stats(user_id, -unit_count, -unit_length)
+    stats.delete()
@@ -0,0 +1,70 @@
+import random
+import statistics
+import time
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+
+from chatbots.context import estimate_tokens
+from pdf_documents.ingest import ingest_ocr_result
+from pdf_documents.models import originPDF
+from searches.management.commands.bench_search import QUERIES, make_text
+from searches.models import ChunkIndex
+from searches.retrieval import build_chunk_index, retrieve_passages
+
+
+class Command(BaseCommand):
+    help = (
+        "합성 문서로 챗봇용 청크 색인(searches/retrieval.py)의 생성 시간 / 저장 크기와 "
+        "상위 k 개 발췌 검색 지연 시간(p50 / p95), 발췌 토큰 수와 문서 전체 토큰 수를 측정합니다."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--pages", type=int, nargs="+", default=[100, 1000])
+        parser.add_argument("--words-per-page", type=int, default=300)
+        parser.add_argument("--repeat", type=int, default=50)
+
+    def handle(self, *args, **options):
+        rng = random.Random(0)
+        for page_count in options["pages"]:
+            # 측정용 데이터는 남기지 않도록 항상 롤백
+            with transaction.atomic():
+                user = get_user_model().objects.create_user(email="bench-retrieval@example.com")
+                origin_pdf = originPDF.objects.create(user_id=user, title="bench", S3_url="https://example.com/bench.pdf")
+                pages = [
+                    {"page_num": n, "text": make_text(rng, options["words_per_page"])}
+                    for n in range(1, page_count + 1)
+                ]
+                ingest_ocr_result(origin_pdf, {"pages": pages, "figures": [], "matches": []})
+                document_tokens = sum(estimate_tokens(page["text"]) for page in pages)
+
+                started = time.perf_counter()
+                chunks = build_chunk_index(origin_pdf)
+                build_seconds = time.perf_counter() - started
+                size = len(ChunkIndex.objects.get(pdf_id=origin_pdf).data)
+                self.stdout.write(
+                    f"pages={page_count} chunks={chunks} build={build_seconds:.2f}s "
+                    f"stored={size / 1024:.1f}KiB document_tokens={document_tokens}"
+                )
+
+                self.stdout.write(f"{'query':>16} {'queries':>8} {'first_ms':>9} {'p50_ms':>8} {'p95_ms':>8} {'tokens':>7}")
+                for query in QUERIES:
+                    timings = []
+                    for _ in range(options["repeat"]):
+                        with CaptureQueriesContext(connection) as ctx:
+                            started = time.perf_counter()
+                            passages = retrieve_passages(origin_pdf, query)
+                            timings.append((time.perf_counter() - started) * 1000)
+                    # 첫 호출은 색인을 읽어 들이는 시간 포함, 이후는 프로세스 캐시 사용
+                    first = timings[0]
+                    timings = sorted(timings[1:]) or [first]
+                    p95 = timings[min(len(timings) - 1, int(len(timings) * 0.95))]
+                    tokens = sum(estimate_tokens(passage["text"]) for passage in passages)
+                    self.stdout.write(
+                        f"{query:>16} {len(ctx.captured_queries):>8} {first:>9.1f} "
+                        f"{statistics.median(timings):>8.1f} {p95:>8.1f} {tokens:>7}"
+                    )
+
+                transaction.set_rollback(True)
@@ -0,0 +1,104 @@
+import random
+import statistics
+import time
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+
+from pdf_documents.ingest import ingest_ocr_result
+from pdf_documents.models import originPDF
+from searches.indexing import index_document
+from searches.query import search_document, search_library
+
+WORDS = (
+    "인공지능", "데이터", "학습", "모델", "신경망", "검색", "문서", "페이지", "그림", "표",
+    "실험", "결과", "분석", "방법", "성능", "평가", "알고리즘", "구조", "입력", "출력",
+    "네트워크", "최적화", "손실", "함수", "정확도", "transformer", "attention", "GPU", "2024", "CMD_F",
+)
+PARTICLES = ("", "은", "는", "이", "가", "을", "를", "의", "에서", "으로")
+QUERIES = ("인공지능", "신경망 모델", "손실 함수", "attention", "정확도", "GPU", "최적화 알고리즘", "학")
+# 서재 검색 측정용: 문서 수와 상관없이 RARE_DOCUMENTS 개 문서에만 넣는 단어
+RARE_WORD = "양자얽힘"
+RARE_DOCUMENTS = 5
+LIBRARY_QUERIES = (RARE_WORD, "신경망 모델")
+
+
+def make_text(rng, word_count):
+    return " ".join(rng.choice(WORDS) + rng.choice(PARTICLES) for _ in range(word_count))
+
+
+class Command(BaseCommand):
+    help = (
+        "합성 문서로 검색 색인 생성 시간과 문서 안 검색(search_document) 지연 시간(p50 / p95)을 측정합니다. "
+        "--library-documents 를 주면 문서 수를 늘려 가며 서재 전체 검색(search_library)도 측정합니다."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--pages", type=int, nargs="+", default=[1000])
+        parser.add_argument("--words-per-page", type=int, default=300)
+        parser.add_argument("--repeat", type=int, default=20)
+        parser.add_argument("--library-documents", type=int, nargs="*", default=[],
+                            help="서재 검색 측정에 쓸 문서 수 (예: 10 100 1000)")
+        parser.add_argument("--library-pages", type=int, default=10, help="서재 검색 측정 문서당 페이지 수")
+
+    def handle(self, *args, **options):
+        rng = random.Random(0)
+        for page_count in options["pages"]:
+            # 측정용 데이터는 남기지 않도록 항상 롤백
+            with transaction.atomic():
+                user = get_user_model().objects.create_user(email="bench-search@example.com")
+                origin_pdf = originPDF.objects.create(user_id=user, title="bench", S3_url="https://example.com/bench.pdf")
+                pages = [
+                    {"page_num": n, "text": make_text(rng, options["words_per_page"])}
+                    for n in range(1, page_count + 1)
+                ]
+                ingest_ocr_result(origin_pdf, {"pages": pages, "figures": [], "matches": []})
+
+                started = time.perf_counter()
+                index_document(origin_pdf)
+                index_seconds = time.perf_counter() - started
+                self.stdout.write(f"pages={page_count} index={index_seconds:.2f}s")
+
+                self._measure(QUERIES, lambda query: search_document(origin_pdf, query)["total"], options["repeat"])
+
+                transaction.set_rollback(True)
+
+        for document_count in options["library_documents"]:
+            with transaction.atomic():
+                user = get_user_model().objects.create_user(email="bench-search@example.com")
+                for n in range(document_count):
+                    origin_pdf = originPDF.objects.create(
+                        user_id=user, title=f"bench {n}", S3_url="https://example.com/bench.pdf",
+                    )
+                    pages = [
+                        {"page_num": p, "text": make_text(rng, options["words_per_page"])}
+                        for p in range(1, options["library_pages"] + 1)
+                    ]
+                    if n < RARE_DOCUMENTS:
+                        pages[0]["text"] += f" {RARE_WORD}"
+                    ingest_ocr_result(origin_pdf, {"pages": pages, "figures": [], "matches": []})
+                    index_document(origin_pdf)
+                self.stdout.write(f"library documents={document_count} pages/doc={options['library_pages']}")
+                self._measure(
+                    LIBRARY_QUERIES, lambda query: search_library(user, query)["total_documents"], options["repeat"],
+                )
+
+                transaction.set_rollback(True)
+
+    def _measure(self, queries, search, repeat):
+        self.stdout.write(f"{'query':>16} {'total':>6} {'queries':>8} {'p50_ms':>8} {'p95_ms':>8}")
+        for query in queries:
+            timings = []
+            for _ in range(repeat):
+                with CaptureQueriesContext(connection) as ctx:
+                    started = time.perf_counter()
+                    total = search(query)
+                    timings.append((time.perf_counter() - started) * 1000)
+            timings.sort()
+            p95 = timings[min(len(timings) - 1, int(len(timings) * 0.95))]
+            self.stdout.write(
+                f"{query:>16} {total:>6} {len(ctx.captured_queries):>8} "
+                f"{statistics.median(timings):>8.1f} {p95:>8.1f}"
+            )
@@ -0,0 +1,35 @@
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from pdf_documents.models import originPDF, OCRJob
+from searches.indexing import index_document
+from searches.retrieval import build_chunk_index
+
+
+class Command(BaseCommand):
+    help = (
+        "OCR 이 끝난 문서의 검색 색인(페이지 / 매칭 텍스트 / 하이라이트)과 챗봇용 청크 색인을 다시 만듭니다. "
+        "검색 기능 추가 이전에 OCR 된 문서, 토크나이저를 바꾼 뒤, 색인을 비우는 마이그레이션 뒤에 실행합니다."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--pdf-id", type=int, nargs="*", default=None,
+                            help="색인할 originPDF id (생략하면 OCR 이 끝난 모든 문서)")
+        parser.add_argument("--missing-only", action="store_true",
+                            help="색인이 없는 문서만 처리")
+
+    def handle(self, *args, **options):
+        pdfs = originPDF.objects.filter(ocr_jobs__status=OCRJob.STATUS_DONE).distinct().order_by("id")
+        if options["pdf_id"]:
+            pdfs = pdfs.filter(id__in=options["pdf_id"])
+        if options["missing_only"]:
+            pdfs = pdfs.filter(search_stats__isnull=True)
+
+        total = 0
+        for origin_pdf in pdfs.iterator():
+            close_old_connections()
+            pages = index_document(origin_pdf)
+            chunks = build_chunk_index(origin_pdf)
+            total += 1
+            self.stdout.write(f"pdf {origin_pdf.id}: {pages} pages, {chunks} chunks")
+        self.stdout.write(f"{total} documents indexed")
@@ -0,0 +1,41 @@
+# Generated by Django 5.2.6 on 2026-10-18 17:40
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('pdf_documents', '0012_originpdf_version'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SearchIndexStats',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('page_count', models.PositiveIntegerField(default=0)),
+                ('total_length', models.PositiveBigIntegerField(default=0)),
+                ('indexed_at', models.DateTimeField(auto_now=True)),
+                ('pdf_id', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='search_stats', to='pdf_documents.originpdf')),
+            ],
+        ),
+        migrations.CreateModel(
+            name='SearchPosting',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('term', models.CharField(max_length=32)),
+                ('page_num', models.IntegerField()),
+                ('tf', models.PositiveIntegerField()),
+                ('length', models.PositiveIntegerField()),
+                ('page_id', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='pdf_documents.pdfpage')),
+                ('pdf_id', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='pdf_documents.originpdf')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['pdf_id', 'term'], name='searchposting_pdf_term_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,68 @@
+# 서재 전체 검색: 검색 단위 종류(kind) / 소유자(user_id) 추가, 사용자별 통계 추가.
+# 기존 색인은 페이지 본문만 있고 소유자 값이 없으므로 비우고 다시 만든다.
+# 적용 후 `python manage.py rebuild_search_index` 를 실행한다.
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+def clear_index(apps, schema_editor):
+    apps.get_model("searches", "SearchPosting").objects.all().delete()
+    apps.get_model("searches", "SearchIndexStats").objects.all().delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('searches', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RunPython(clear_index, migrations.RunPython.noop),
+        migrations.AddField(
+            model_name='searchposting',
+            name='kind',
+            field=models.CharField(choices=[('page', 'PDFpage.text'), ('match', 'MatchedText.raw_text / matched_text'), ('highlight', 'Highlight.highlight_text')], default='page', max_length=10),
+        ),
+        migrations.AddField(
+            model_name='searchposting',
+            name='object_id',
+            field=models.PositiveBigIntegerField(default=0),
+            preserve_default=False,
+        ),
+        migrations.AddField(
+            model_name='searchposting',
+            name='user_id',
+            field=models.ForeignKey(default=None, on_delete=django.db.models.deletion.CASCADE, to=settings.AUTH_USER_MODEL),
+            preserve_default=False,
+        ),
+        migrations.AddField(
+            model_name='searchindexstats',
+            name='unit_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='searchindexstats',
+            name='unit_length',
+            field=models.PositiveBigIntegerField(default=0),
+        ),
+        migrations.AddIndex(
+            model_name='searchposting',
+            index=models.Index(fields=['user_id', 'term'], name='searchposting_user_term_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='searchposting',
+            index=models.Index(fields=['kind', 'object_id'], name='searchposting_object_idx'),
+        ),
+        migrations.CreateModel(
+            name='SearchUserStats',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('unit_count', models.BigIntegerField(default=0)),
+                ('total_length', models.BigIntegerField(default=0)),
+                ('user_id', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='search_stats', to=settings.AUTH_USER_MODEL)),
+            ],
+        ),
+    ]
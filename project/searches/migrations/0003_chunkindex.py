@@ -0,0 +1,26 @@
+# 챗봇 참고 자료 검색용 문서별 청크 색인.
+# 기존 문서는 `python manage.py rebuild_search_index` 로 만든다.
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('searches', '0002_library_search'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ChunkIndex',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('chunk_count', models.PositiveIntegerField(default=0)),
+                ('term_count', models.PositiveIntegerField(default=0)),
+                ('data', models.BinaryField()),
+                ('built_at', models.DateTimeField(auto_now=True)),
+                ('pdf_id', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='chunk_index', to='pdf_documents.originpdf')),
+            ],
+        ),
+    ]
@@ -0,0 +1,49 @@
+# 검색 색인 행 묶기: (검색 단위, term) 마다 한 행이던 SearchPosting 을
+# (문서, 종류, term) 마다 단위 목록(units)을 묶은 행으로 바꾼다. (하이라이트는 하이라이트 하나의 term 마다 한 행)
+# 기존 행은 옮기지 않고 비우므로 적용 후 `python manage.py rebuild_search_index` 를 실행한다.
+
+from django.db import migrations, models
+
+
+def clear_index(apps, schema_editor):
+    apps.get_model("searches", "SearchPosting").objects.all().delete()
+    apps.get_model("searches", "SearchIndexStats").objects.all().delete()
+    apps.get_model("searches", "SearchUserStats").objects.all().delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('searches', '0003_chunkindex'),
+    ]
+
+    operations = [
+        migrations.RunPython(clear_index, migrations.RunPython.noop),
+        migrations.RemoveField(
+            model_name='searchposting',
+            name='length',
+        ),
+        migrations.RemoveField(
+            model_name='searchposting',
+            name='page_id',
+        ),
+        migrations.RemoveField(
+            model_name='searchposting',
+            name='page_num',
+        ),
+        migrations.RemoveField(
+            model_name='searchposting',
+            name='tf',
+        ),
+        migrations.AddField(
+            model_name='searchposting',
+            name='units',
+            field=models.BinaryField(default=b''),
+            preserve_default=False,
+        ),
+        migrations.AlterField(
+            model_name='searchposting',
+            name='object_id',
+            field=models.PositiveBigIntegerField(blank=True, null=True),
+        ),
+    ]
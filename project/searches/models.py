@@ -0,0 +1,111 @@
+import numpy as np
+from django.db import models
+from accounts.models import User
+from pdf_documents.models import originPDF
+
+
+# SearchPosting.units 한 항목: (object_id, page_id, page_num, tf, 단위 길이)
+UNIT_FIELDS = 5
+
+
+def pack_units(units):
+    """[(object_id, page_id, page_num, tf, length)] → bytes (little-endian int64)"""
+    return np.asarray(units, dtype="<i8").reshape(-1, UNIT_FIELDS).tobytes()
+
+
+def unpack_units(raw):
+    """pack_units 의 역. [[object_id, page_id, page_num, tf, length]]"""
+    return np.frombuffer(bytes(raw), dtype="<i8").reshape(-1, UNIT_FIELDS).tolist()
+
+
+class SearchPosting(models.Model):
+    """
+    역색인 항목: 검색 단위(페이지 본문 / OCR 매칭 텍스트 / 하이라이트) 종류 하나와 토큰(term) 하나에 대해
+    그 term 이 나온 단위 목록(units)을 묶어 둔 행.
+    단위마다 BM25 계산에 필요한 값(tf, 단위 길이)을 같이 저장해서 검색 시 원본 행을 읽지 않는다.
+    페이지 / 매칭 텍스트는 OCR 완료 시 문서 단위로 다시 만들면서 SEARCH_INDEX_BATCH_SIZE 개 단위씩 term 별 한 행으로 묶고
+    (단위 × term 마다 한 행이면 1000 페이지 문서가 100만 행 가까이 된다),
+    하이라이트는 저장/삭제 때마다 바뀌므로 하이라이트 하나의 term 마다 한 행으로 둔다. (searches/indexing.py)
+    """
+    KIND_PAGE = "page"
+    KIND_MATCH = "match"
+    KIND_HIGHLIGHT = "highlight"
+    KIND_CHOICES = [
+        (KIND_PAGE, "PDFpage.text"),
+        (KIND_MATCH, "MatchedText.raw_text / matched_text"),
+        (KIND_HIGHLIGHT, "Highlight.highlight_text"),
+    ]
+
+    term = models.CharField(max_length=32)
+    user_id = models.ForeignKey(User, on_delete=models.CASCADE)  # 문서 소유자 (서재 전체 검색 범위)
+    pdf_id = models.ForeignKey(originPDF, on_delete=models.CASCADE)
+    kind = models.CharField(max_length=10, choices=KIND_CHOICES, default=KIND_PAGE)
+    object_id = models.PositiveBigIntegerField(null=True, blank=True)  # 하이라이트 행만: Highlight.id
+    units = models.BinaryField()  # pack_units 로 묶은 (object_id, page_id, page_num, tf, 단위 길이) 목록
+
+    class Meta:
+        indexes = [
+            # 문서 안 검색: pdf_id = ? AND term IN (...) / term LIKE '가%'
+            models.Index(fields=["pdf_id", "term"], name="searchposting_pdf_term_idx"),
+            # 서재 전체 검색: user_id = ? AND term IN (...) — 문서 수가 아니라 일치하는 항목 수만큼 읽는다
+            models.Index(fields=["user_id", "term"], name="searchposting_user_term_idx"),
+            # 하이라이트 하나를 다시 색인할 때
+            models.Index(fields=["kind", "object_id"], name="searchposting_object_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.term} (PDF: {self.pdf_id_id}, {self.kind})"
+
+
+class SearchIndexStats(models.Model):
+    """
+    문서별 색인 통계.
+    page_count / total_length: 페이지 본문만 (문서 안 검색의 BM25 N, 평균 길이)
+    unit_count / unit_length: 모든 검색 단위 (서재 통계 SearchUserStats 를 갱신할 때 사용)
+    """
+    pdf_id = models.OneToOneField(originPDF, on_delete=models.CASCADE, related_name="search_stats")
+    page_count = models.PositiveIntegerField(default=0)
+    total_length = models.PositiveBigIntegerField(default=0)
+    unit_count = models.PositiveIntegerField(default=0)
+    unit_length = models.PositiveBigIntegerField(default=0)
+    indexed_at = models.DateTimeField(auto_now=True)
+
+    @property
+    def avg_length(self):
+        return self.total_length / self.page_count if self.page_count else 0
+
+    def __str__(self):
+        return f"PDF: {self.pdf_id_id} - {self.page_count} pages"
+
+
+class SearchUserStats(models.Model):
+    """
+    사용자(서재)별 색인 통계 (서재 전체 검색의 BM25 N, 평균 길이).
+    색인이 바뀔 때 증감만 반영하므로 검색할 때 문서 수만큼 집계하지 않는다.
+    """
+    user_id = models.OneToOneField(User, on_delete=models.CASCADE, related_name="search_stats")
+    unit_count = models.BigIntegerField(default=0)
+    total_length = models.BigIntegerField(default=0)
+
+    @property
+    def avg_length(self):
+        return self.total_length / self.unit_count if self.unit_count else 0
+
+    def __str__(self):
+        return f"User: {self.user_id_id} - {self.unit_count} units"
+
+
+class ChunkIndex(models.Model):
+    """
+    챗봇 참고 자료 검색용 문서별 청크 BM25 색인 (searches/retrieval.py).
+    청크 본문은 저장하지 않고 (원본 종류, 원본 id, 시작, 끝) 만 두며,
+    어휘 / 역색인 / 청크 정보는 NumPy 배열로 압축(np.savez_compressed)해서 data 한 컬럼에 담는다.
+    """
+    pdf_id = models.OneToOneField(originPDF, on_delete=models.CASCADE, related_name="chunk_index")
+    chunk_count = models.PositiveIntegerField(default=0)
+    term_count = models.PositiveIntegerField(default=0)
+    data = models.BinaryField()
+    built_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"PDF: {self.pdf_id_id} - {self.chunk_count} chunks"
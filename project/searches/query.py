@@ -0,0 +1,248 @@
+# searches/query.py
+"""
+검색 질의 처리.
+
+공통: 질의를 색인과 같은 토크나이저로 자르고 SearchPosting 에서 해당 term 의 행만 읽어 단위 목록을 풀어낸 뒤,
+질의의 모든 토큰이 나온 검색 단위를 BM25 로 점수 매긴다. (score_units)
+
+- search_document (DocumentSearchView): 문서 하나의 페이지 본문.
+  상위 페이지의 본문만 읽어서 스니펫을 만들고, 같은 페이지의 MatchedText 중
+  질의를 포함하는 항목의 text_box 를 hit box 로 붙인다.
+- search_library (LibrarySearchView): 사용자의 모든 문서의 페이지 / 매칭 텍스트 / 하이라이트.
+  (user_id, term) 인덱스로 일치하는 항목만 읽으므로 문서 수가 늘어도 읽는 양은 일치 항목 수에 비례한다.
+  결과는 문서별로 묶는다.
+두 경우 모두 쿼리 수는 색인 크기와 무관하게 고정이다.
+"""
+import math
+from collections import defaultdict
+
+from django.db.models import Q
+
+from highlights.models import Highlight
+from pdf_documents.models import originPDF, PDFpage, MatchedText
+
+from .models import SearchPosting, SearchIndexStats, SearchUserStats, unpack_units
+from .tokenizer import tokenize
+
+# BM25 파라미터 (일반적으로 쓰는 값)
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+SNIPPET_CONTEXT = 40  # 스니펫에서 일치 구간 앞뒤로 보여줄 글자 수
+
+
+def bm25_idf(doc_count, df):
+    return math.log(1 + (doc_count - df + 0.5) / (df + 0.5))
+
+
+def bm25_term_score(idf, tf, length, avg_length):
+    norm = 1 - BM25_B + BM25_B * (length / avg_length if avg_length else 1)
+    return idf * tf * (BM25_K1 + 1) / (tf + BM25_K1 * norm)
+
+
+def query_terms(query):
+    """질의 토큰(중복 제거, 순서 유지)"""
+    return list(dict.fromkeys(tokenize(query)))
+
+
+def term_filter(terms):
+    """
+    한 글자 한글 토큰은 색인에 2-gram 으로만 들어 있으므로 그 글자로 시작하는 term 을 찾는다.
+    (pdf_id, term) 인덱스의 범위 조회로 처리된다.
+    """
+    exact = [term for term in terms if len(term) > 1 or term.isascii()]
+    condition = Q(term__in=exact) if exact else Q()
+    for term in terms:
+        if term not in exact:
+            condition |= Q(term__startswith=term)
+    return condition
+
+
+def match_term(term, terms):
+    """색인의 term 이 어느 질의 토큰에 해당하는지"""
+    if term in terms:
+        return term
+    return term[:1]
+
+
+def make_snippet(text, query):
+    """본문에서 질의가 처음 나온 곳 주변을 잘라 (snippet, [시작, 끝]) 으로 반환한다."""
+    needle = query.strip().lower()
+    position = text.lower().find(needle) if needle else -1
+    if position < 0:
+        # 질의 전체가 붙어서 나오지 않으면(띄어쓰기 차이 등) 본문 앞부분
+        return text[:SNIPPET_CONTEXT * 2], None
+    start = max(0, position - SNIPPET_CONTEXT)
+    end = min(len(text), position + len(needle) + SNIPPET_CONTEXT)
+    return text[start:end], [position - start, position - start + len(needle)]
+
+
+def score_units(postings, terms, doc_count, avg_length):
+    """
+    postings: (term, 단위 key, tf, 단위 길이) 반복.
+    질의의 모든 토큰이 나온 단위만 [(BM25 점수, 단위 key)] 로 반환한다. (Ctrl+F 처럼 질의 전체를 찾는 용도)
+    """
+    unit_tf = defaultdict(dict)
+    unit_length = {}
+    for term, key, tf, length in postings:
+        token = match_term(term, terms)
+        unit_tf[key][token] = unit_tf[key].get(token, 0) + tf
+        unit_length[key] = length
+
+    df = defaultdict(int)
+    for tfs in unit_tf.values():
+        for token in tfs:
+            df[token] += 1
+    idf = {token: bm25_idf(doc_count, df[token]) for token in terms}
+
+    return [
+        (
+            sum(bm25_term_score(idf[token], tf, unit_length[key], avg_length) for token, tf in tfs.items()),
+            key,
+        )
+        for key, tfs in unit_tf.items()
+        if len(tfs) == len(terms)
+    ]
+
+
+def search_document(origin_pdf, query, limit=20):
+    """
+    문서 안에서 query 를 검색한다.
+    색인이 없으면 None, 있으면 {"total": 후보 페이지 수, "hits": [...]} 를 반환한다.
+    """
+    stats = SearchIndexStats.objects.filter(pdf_id=origin_pdf).first()
+    if stats is None:
+        return None
+
+    terms = query_terms(query)
+    if not terms:
+        return {"total": 0, "hits": []}
+
+    postings = (
+        SearchPosting.objects.filter(pdf_id=origin_pdf, kind=SearchPosting.KIND_PAGE)
+        .filter(term_filter(terms))
+        .values_list("term", "units")
+    )
+    scored = score_units(
+        (
+            (term, (page_id, page_num), tf, length)
+            for term, units in postings
+            for _, page_id, page_num, tf, length in unpack_units(units)
+        ),
+        terms, stats.page_count, stats.avg_length,
+    )
+    # 점수 내림차순, 같으면 앞 페이지 먼저
+    scored.sort(key=lambda row: (-row[0], row[1][1]))
+    top = scored[:limit]
+    top_ids = [page_id for _, (page_id, _) in top]
+
+    texts = dict(PDFpage.objects.filter(id__in=top_ids).values_list("id", "text"))
+    needle = query.strip().lower()
+    boxes = defaultdict(list)
+    matches = MatchedText.objects.filter(pdf_id=origin_pdf, page_id__in=top_ids).values_list(
+        "page_id", "raw_text", "matched_text", "text_box",
+    )
+    for page_id, raw_text, matched_text, text_box in matches:
+        if text_box and (needle in (raw_text or "").lower() or needle in (matched_text or "").lower()):
+            boxes[page_id].append(text_box)
+
+    hits = []
+    for score, (page_id, page_num) in top:
+        snippet, match = make_snippet(texts.get(page_id, ""), query)
+        hits.append({
+            "page_id": page_id,
+            "page_num": page_num,
+            "score": round(score, 4),
+            "snippet": snippet,
+            "match": match,
+            "boxes": boxes[page_id],
+        })
+    return {"total": len(scored), "hits": hits}
+
+
+def _unit_texts(kind_ids):
+    """kind → id 목록을 받아 (kind, id) → 본문 dict 를 만든다. (종류마다 쿼리 1번)"""
+    texts = {}
+    if kind_ids.get(SearchPosting.KIND_PAGE):
+        for page_id, text in PDFpage.objects.filter(id__in=kind_ids[SearchPosting.KIND_PAGE]).values_list("id", "text"):
+            texts[(SearchPosting.KIND_PAGE, page_id)] = text
+    if kind_ids.get(SearchPosting.KIND_MATCH):
+        matches = MatchedText.objects.filter(id__in=kind_ids[SearchPosting.KIND_MATCH]).values_list(
+            "id", "raw_text", "matched_text",
+        )
+        for match_id, raw_text, matched_text in matches:
+            texts[(SearchPosting.KIND_MATCH, match_id)] = f"{raw_text} {matched_text}"
+    if kind_ids.get(SearchPosting.KIND_HIGHLIGHT):
+        highlights = Highlight.objects.filter(id__in=kind_ids[SearchPosting.KIND_HIGHLIGHT]).values_list(
+            "id", "highlight_text",
+        )
+        for highlight_id, text in highlights:
+            texts[(SearchPosting.KIND_HIGHLIGHT, highlight_id)] = text
+    return texts
+
+
+def search_library(user, query, limit=20, hits_per_document=3):
+    """
+    사용자의 모든 문서에서 query 를 검색해 문서별로 묶어 반환한다.
+    문서 점수는 그 문서에서 가장 높은 단위 점수이다.
+    """
+    terms = query_terms(query)
+    stats = SearchUserStats.objects.filter(user_id=user).first()
+    if not terms or stats is None or not stats.unit_count:
+        return {"total_documents": 0, "results": []}
+
+    postings = (
+        SearchPosting.objects.filter(user_id=user, pdf_id__deleted_at__isnull=True)
+        .filter(term_filter(terms))
+        .values_list("term", "kind", "pdf_id", "units")
+    )
+    scored = score_units(
+        (
+            (term, (kind, object_id, pdf_id, page_id, page_num), tf, length)
+            for term, kind, pdf_id, units in postings
+            for object_id, page_id, page_num, tf, length in unpack_units(units)
+        ),
+        terms, stats.unit_count, stats.avg_length,
+    )
+
+    by_document = defaultdict(list)
+    for score, key in scored:
+        by_document[key[2]].append((score, key))
+    documents = sorted(
+        by_document.items(),
+        key=lambda item: (-max(score for score, _ in item[1]), item[0]),
+    )[:limit]
+
+    # 상위 문서의 상위 단위만 본문을 읽는다
+    kind_ids = defaultdict(list)
+    top_hits = {}
+    for pdf_id, units in documents:
+        units.sort(key=lambda row: (-row[0], row[1][4]))
+        top_hits[pdf_id] = units[:hits_per_document]
+        for _, (kind, object_id, *_rest) in top_hits[pdf_id]:
+            kind_ids[kind].append(object_id)
+    texts = _unit_texts(kind_ids)
+    titles = dict(originPDF.objects.filter(id__in=[pdf_id for pdf_id, _ in documents]).values_list("id", "title"))
+
+    results = []
+    for pdf_id, units in documents:
+        hits = []
+        for score, (kind, object_id, _, page_id, page_num) in top_hits[pdf_id]:
+            snippet, match = make_snippet(texts.get((kind, object_id), ""), query)
+            hits.append({
+                "kind": kind,
+                "id": object_id,
+                "page_id": page_id,
+                "page_num": page_num,
+                "score": round(score, 4),
+                "snippet": snippet,
+                "match": match,
+            })
+        results.append({
+            "pdf_id": pdf_id,
+            "title": titles.get(pdf_id, ""),
+            "score": hits[0]["score"] if hits else 0,
+            "hit_count": len(units),
+            "hits": hits,
+        })
+    return {"total_documents": len(by_document), "results": results}
@@ -0,0 +1,260 @@
+# searches/retrieval.py
+"""
+챗봇 참고 자료 검색 (질문에 figure / 하이라이트 / 선택 텍스트가 없을 때 chatbots/context.py 가 사용).
+
+- 색인: OCR 이 끝나면 페이지 본문을 CHAT_RETRIEVAL_CHUNK_CHARS 글자 안팎의 청크로 자르고
+  (문장/줄 경계 우선, CHAT_RETRIEVAL_CHUNK_OVERLAP 글자 겹침), MatchedText 는 항목 하나를 청크 하나로 둔다.
+  토큰은 검색 색인과 같은 토크나이저(searches/tokenizer.py)를 쓴다.
+  역색인은 term 순서의 CSR 배열(term_indptr / post_chunk / post_tf)로 만들어 ChunkIndex 한 행에 압축 저장한다.
+- 검색: 질의 term 마다 해당 구간을 잘라 BM25 점수를 NumPy 로 한 번에 더하고 argpartition 으로 상위 k 개를 고른다.
+  읽어 들인 색인은 프로세스 LRU(CHAT_RETRIEVAL_CACHE_SIZE)에 두고 built_at 이 바뀌면 다시 읽는다.
+  본문은 상위 청크의 원본 행만 읽어서 잘라낸다.
+"""
+import io
+import math
+import threading
+from collections import Counter, OrderedDict
+
+import numpy as np
+from django.conf import settings
+
+from pdf_documents.ingest import iter_keyset
+from pdf_documents.models import PDFpage, MatchedText
+
+from .models import ChunkIndex
+from .query import BM25_B, BM25_K1, query_terms
+from .tokenizer import MAX_TERM_LENGTH, tokenize
+
+KIND_PAGE = 0
+KIND_MATCH = 1
+
+# 청크를 자를 때 우선하는 경계 (뒤에 있을수록 약한 경계)
+_BOUNDARIES = ("\n\n", "\n", "다. ", ". ", "? ", "! ", " ")
+
+
+def split_chunks(text, size, overlap):
+    """text 를 size 글자 이하 청크의 (시작, 끝) 목록으로 자른다."""
+    spans = []
+    start = 0
+    length = len(text)
+    while start < length:
+        end = min(length, start + size)
+        if end < length:
+            # 청크 뒤쪽 절반에 있는 가장 강한 경계에서 자른다
+            for separator in _BOUNDARIES:
+                cut = text.rfind(separator, start + size // 2, end)
+                if cut >= 0:
+                    end = cut + len(separator)
+                    break
+        if text[start:end].strip():
+            spans.append((start, end))
+        if end >= length:
+            break
+        start = max(end - overlap, start + 1)
+    return spans
+
+
+def build_chunk_index(origin_pdf):
+    """문서의 청크 색인을 새로 만들어 저장하고 청크 수를 반환한다."""
+    size = settings.CHAT_RETRIEVAL_CHUNK_CHARS
+    overlap = settings.CHAT_RETRIEVAL_CHUNK_OVERLAP
+    read_batch = settings.OCR_INGEST_BATCH_SIZE
+    chunks = []   # (종류, 원본 id, 시작, 끝, page_num)
+    counters = []
+
+    def add(kind, source_id, start, end, page_num, text):
+        counts = Counter(tokenize(text))
+        if counts:
+            chunks.append((kind, source_id, start, end, page_num))
+            counters.append(counts)
+
+    for rows in iter_keyset(PDFpage.objects.filter(pdf_id=origin_pdf), ("page_num", "text"), read_batch):
+        for page_id, page_num, text in rows:
+            text = text or ""
+            for start, end in split_chunks(text, size, overlap):
+                add(KIND_PAGE, page_id, start, end, page_num, text[start:end])
+
+    # 같은 설명 문구가 figure 마다 반복되는 경우가 많아 같은 내용은 한 번만 넣는다
+    seen = set()
+    matches = MatchedText.objects.filter(pdf_id=origin_pdf)
+    for rows in iter_keyset(matches, ("page_num", "raw_text", "matched_text"), read_batch):
+        for match_id, page_num, raw_text, matched_text in rows:
+            text = f"{raw_text} {matched_text}"
+            if text in seen:
+                continue
+            seen.add(text)
+            add(KIND_MATCH, match_id, 0, len(text), page_num, text)
+
+    data = _pack(chunks, counters)
+    ChunkIndex.objects.update_or_create(
+        pdf_id=origin_pdf,
+        defaults={"chunk_count": len(chunks), "term_count": len(data["vocab"]), "data": _dump(data)},
+    )
+    return len(chunks)
+
+
+def _pack(chunks, counters):
+    """청크별 term 빈도를 term 순서의 CSR 배열로 만든다."""
+    vocab = sorted({term for counts in counters for term in counts})
+    term_ids = {term: i for i, term in enumerate(vocab)}
+    post_term, post_chunk, post_tf = [], [], []
+    for chunk_id, counts in enumerate(counters):
+        for term, tf in counts.items():
+            post_term.append(term_ids[term])
+            post_chunk.append(chunk_id)
+            post_tf.append(min(tf, 65535))
+
+    post_term = np.asarray(post_term, dtype=np.int32)
+    order = np.argsort(post_term, kind="stable")
+    term_indptr = np.zeros(len(vocab) + 1, dtype=np.int64)
+    np.cumsum(np.bincount(post_term, minlength=len(vocab)), out=term_indptr[1:])
+    meta = np.asarray(chunks, dtype=np.int64).reshape(-1, 5)
+    return {
+        "vocab": np.asarray(vocab, dtype=f"<U{MAX_TERM_LENGTH}"),
+        "term_indptr": term_indptr,
+        "post_chunk": np.asarray(post_chunk, dtype=np.int32)[order],
+        "post_tf": np.asarray(post_tf, dtype=np.uint16)[order],
+        "chunk_len": np.asarray([sum(counts.values()) for counts in counters], dtype=np.int32),
+        "chunk_kind": meta[:, 0].astype(np.uint8),
+        "chunk_source": meta[:, 1],
+        "chunk_span": meta[:, 2:4].astype(np.int32),
+        "chunk_page": meta[:, 4].astype(np.int32),
+    }
+
+
+def _dump(data):
+    buffer = io.BytesIO()
+    np.savez_compressed(buffer, **data)
+    return buffer.getvalue()
+
+
+class LoadedChunkIndex:
+    """ChunkIndex.data 를 읽어 둔 것. score / top_k 는 NumPy 연산만 한다."""
+
+    def __init__(self, raw):
+        with np.load(io.BytesIO(raw)) as data:
+            self.vocab = data["vocab"]
+            self.term_indptr = data["term_indptr"]
+            self.post_chunk = data["post_chunk"]
+            self.post_tf = data["post_tf"].astype(np.float32)
+            self.chunk_len = data["chunk_len"]
+            self.chunk_kind = data["chunk_kind"]
+            self.chunk_source = data["chunk_source"]
+            self.chunk_span = data["chunk_span"]
+            self.chunk_page = data["chunk_page"]
+        self.chunk_count = len(self.chunk_len)
+        avg_length = float(self.chunk_len.mean()) if self.chunk_count else 0.0
+        # BM25 분모의 길이 정규화 항은 질의와 무관하므로 미리 계산
+        ratio = self.chunk_len / avg_length if avg_length else np.ones(self.chunk_count)
+        self.norm = (BM25_K1 * (1 - BM25_B + BM25_B * ratio)).astype(np.float32)
+
+    def term_ranges(self, terms):
+        """질의 토큰별 어휘 구간 [lo, hi). 한 글자 한글 토큰은 그 글자로 시작하는 2-gram 전체"""
+        ranges = []
+        for term in terms:
+            if len(term) == 1 and not term.isascii():
+                lo = int(np.searchsorted(self.vocab, term, side="left"))
+                hi = int(np.searchsorted(self.vocab, term + "\uffff", side="left"))
+            else:
+                lo = int(np.searchsorted(self.vocab, term, side="left"))
+                hi = lo + 1 if lo < len(self.vocab) and self.vocab[lo] == term else lo
+            if lo < hi:
+                ranges.append((lo, hi))
+        return ranges
+
+    def score(self, terms):
+        scores = np.zeros(self.chunk_count, dtype=np.float32)
+        for lo, hi in self.term_ranges(terms):
+            for term_id in range(lo, hi):
+                start, end = self.term_indptr[term_id], self.term_indptr[term_id + 1]
+                df = end - start
+                idf = math.log(1 + (self.chunk_count - df + 0.5) / (df + 0.5))
+                chunk_ids = self.post_chunk[start:end]
+                tf = self.post_tf[start:end]
+                # 한 term 구간 안의 청크 id 는 겹치지 않으므로 fancy index 더하기로 충분하다
+                scores[chunk_ids] += idf * tf * (BM25_K1 + 1) / (tf + self.norm[chunk_ids])
+        return scores
+
+    def top_k(self, terms, k):
+        """[(chunk id, 점수)] 점수 내림차순"""
+        scores = self.score(terms)
+        candidates = np.flatnonzero(scores)
+        if len(candidates) > k:
+            candidates = candidates[np.argpartition(-scores[candidates], k - 1)[:k]]
+        candidates = candidates[np.argsort(-scores[candidates], kind="stable")]
+        return [(int(chunk_id), float(scores[chunk_id])) for chunk_id in candidates]
+
+
+_cache = OrderedDict()  # (pdf_id, built_at) → LoadedChunkIndex
+_cache_lock = threading.Lock()
+
+
+def get_chunk_index(origin_pdf):
+    """문서의 청크 색인 (없으면 None). 바뀌지 않았으면 프로세스 LRU 에서 꺼낸다."""
+    row = ChunkIndex.objects.filter(pdf_id=origin_pdf).values_list("id", "built_at").first()
+    if row is None:
+        return None
+    key = (origin_pdf.id, row[1])
+    with _cache_lock:
+        index = _cache.get(key)
+        if index is not None:
+            _cache.move_to_end(key)
+            return index
+
+    raw = ChunkIndex.objects.filter(id=row[0]).values_list("data", flat=True).first()
+    if raw is None:
+        return None
+    index = LoadedChunkIndex(bytes(raw))
+    with _cache_lock:
+        # 같은 문서의 예전 버전은 버린다
+        for old in [old for old in _cache if old[0] == origin_pdf.id]:
+            del _cache[old]
+        _cache[key] = index
+        while len(_cache) > settings.CHAT_RETRIEVAL_CACHE_SIZE:
+            _cache.popitem(last=False)
+    return index
+
+
+def retrieve_passages(origin_pdf, question, k=None):
+    """
+    질문과 관련도가 높은 청크 k 개를 [{"kind", "page_num", "score", "text"}] 로 반환한다.
+    색인이 없거나 일치하는 청크가 없으면 [].
+    """
+    k = k or settings.CHAT_RETRIEVAL_TOP_K
+    terms = query_terms(question)
+    if not terms:
+        return []
+    index = get_chunk_index(origin_pdf)
+    if index is None or not index.chunk_count:
+        return []
+    top = index.top_k(terms, k)
+    if not top:
+        return []
+
+    sources = {KIND_PAGE: set(), KIND_MATCH: set()}
+    for chunk_id, _ in top:
+        sources[int(index.chunk_kind[chunk_id])].add(int(index.chunk_source[chunk_id]))
+    texts = {}
+    if sources[KIND_PAGE]:
+        for page_id, text in PDFpage.objects.filter(id__in=sources[KIND_PAGE]).values_list("id", "text"):
+            texts[(KIND_PAGE, page_id)] = text or ""
+    if sources[KIND_MATCH]:
+        matches = MatchedText.objects.filter(id__in=sources[KIND_MATCH]).values_list("id", "raw_text", "matched_text")
+        for match_id, raw_text, matched_text in matches:
+            texts[(KIND_MATCH, match_id)] = f"{raw_text} {matched_text}"
+
+    passages = []
+    for chunk_id, score in top:
+        kind = int(index.chunk_kind[chunk_id])
+        start, end = (int(value) for value in index.chunk_span[chunk_id])
+        text = texts.get((kind, int(index.chunk_source[chunk_id])))
+        if text is None:
+            # 색인을 만든 뒤 원본 행이 지워진 경우
+            continue
+        passages.append({
+            "kind": "page" if kind == KIND_PAGE else "match",
+            "page_num": int(index.chunk_page[chunk_id]),
+            "score": round(score, 4),
+            "text": text[start:end].strip(),
+        })
+    return passages
@@ -0,0 +1,35 @@
+# searches/signals.py
+"""
+검색 색인 갱신.
+- OCR 결과를 저장하는 트랜잭션 안에서 문서 전체 색인과 챗봇용 청크 색인을 만든다. (run_ocr_worker 프로세스)
+  색인이 실패하면 OCR 결과도 롤백되고 작업이 failed 로 남으므로, 색인 없이 OCR 만 끝난 문서는 생기지 않는다.
+- 하이라이트가 저장/삭제되면 그 하이라이트의 색인만 바꾼다.
+"""
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from highlights.models import Highlight
+from pdf_documents.signals import ocr_ingested
+
+from .indexing import index_document, index_highlight, unindex_highlight
+from .retrieval import build_chunk_index
+
+
+@receiver(ocr_ingested)
+def index_ocr_result(sender, origin_pdf, **kwargs):
+    index_document(origin_pdf)
+
+
+@receiver(ocr_ingested)
+def build_ocr_chunk_index(sender, origin_pdf, **kwargs):
+    build_chunk_index(origin_pdf)
+
+
+@receiver(post_save, sender=Highlight)
+def index_saved_highlight(sender, instance, **kwargs):
+    index_highlight(instance)
+
+
+@receiver(post_delete, sender=Highlight)
+def unindex_deleted_highlight(sender, instance, **kwargs):
+    unindex_highlight(instance.id, instance.pdf_id_id)
@@ -0,0 +1,389 @@
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from highlights.models import Highlight, Tag
+from pdf_documents.deletion import soft_delete_documents
+from pdf_documents.ingest import ingest_ocr_result
+from pdf_documents.models import originPDF, PDFpage, MatchedText, OCRJob
+from pdf_documents.ocr import claim_next_job, enqueue_ocr_job, ingest_transaction, run_ocr_job
+from pdf_figures.models import PDFfigure
+
+from .indexing import index_document
+from .models import SearchPosting, SearchIndexStats, SearchUserStats, unpack_units
+from .query import search_document, search_library
+from .retrieval import build_chunk_index, get_chunk_index, retrieve_passages, split_chunks
+from .tokenizer import tokenize
+
+PAGES = [
+    {"page_num": 1, "text": "인공지능 모델 학습"},
+    {"page_num": 2, "text": "인공지능 인공지능 연구"},
+    {"page_num": 3, "text": "데이터 분석"},
+]
+
+
+def make_pdf(user, title="test"):
+    return originPDF.objects.create(
+        user_id=user, title=title, S3_url="https://example.com/test.pdf", s3_key=f"pdfs/{title}.pdf",
+    )
+
+
+def make_document(user, title="test", pages=PAGES):
+    origin_pdf = make_pdf(user, title)
+    ingest_ocr_result(origin_pdf, {"pages": pages, "figures": [], "matches": []})
+    return origin_pdf
+
+
+class TokenizerTests(TestCase):
+    def test_hangul_is_split_into_bigrams(self):
+        self.assertEqual(tokenize("인공지능은"), ["인공", "공지", "지능", "능은"])
+
+    def test_ascii_words_and_single_hangul(self):
+        self.assertEqual(tokenize("GPU로 학습"), ["gpu", "로", "학습"])
+
+    def test_normalizes_fullwidth(self):
+        self.assertEqual(tokenize("ＡＩ 모델"), ["ai", "모델"])
+
+
+class IndexDocumentTests(TestCase):
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(email="search-index@example.com")
+        self.origin_pdf = make_document(self.user)
+        self.pages = dict(PDFpage.objects.filter(pdf_id=self.origin_pdf).values_list("page_num", "id"))
+
+    def test_stats(self):
+        self.assertEqual(index_document(self.origin_pdf), 3)
+        stats = SearchIndexStats.objects.get(pdf_id=self.origin_pdf)
+        # 5 (인공 공지 지능 모델 학습) + 7 (인공 공지 지능 × 2, 연구) + 3 (데이 이터 분석)
+        self.assertEqual((stats.page_count, stats.total_length), (3, 15))
+        self.assertEqual((stats.unit_count, stats.unit_length), (3, 15))
+        self.assertEqual((self.user.search_stats.unit_count, self.user.search_stats.total_length), (3, 15))
+
+    def test_units_of_a_term_share_one_row(self):
+        index_document(self.origin_pdf)
+        rows = SearchPosting.objects.filter(pdf_id=self.origin_pdf, kind=SearchPosting.KIND_PAGE, term="인공")
+        self.assertEqual(rows.count(), 1)
+        self.assertEqual(unpack_units(rows.get().units), [
+            [self.pages[1], self.pages[1], 1, 1, 5],
+            [self.pages[2], self.pages[2], 2, 2, 7],
+        ])
+        # 페이지 × term 이 아니라 term 마다 한 행
+        self.assertEqual(SearchPosting.objects.filter(pdf_id=self.origin_pdf).count(), 9)
+
+    def test_small_batches_split_rows(self):
+        index_document(self.origin_pdf, batch_size=1)
+        rows = SearchPosting.objects.filter(pdf_id=self.origin_pdf, term="인공").order_by("id")
+        self.assertEqual([unpack_units(units) for units in rows.values_list("units", flat=True)], [
+            [[self.pages[1], self.pages[1], 1, 1, 5]],
+            [[self.pages[2], self.pages[2], 2, 2, 7]],
+        ])
+
+    def test_reindex_replaces_rows_and_stats(self):
+        index_document(self.origin_pdf)
+        index_document(self.origin_pdf)
+        self.assertEqual(SearchPosting.objects.filter(pdf_id=self.origin_pdf).count(), 9)
+        self.user.search_stats.refresh_from_db()
+        self.assertEqual((self.user.search_stats.unit_count, self.user.search_stats.total_length), (3, 15))
+
+
+class SearchDocumentTests(TestCase):
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(email="search-document@example.com")
+        self.origin_pdf = make_document(self.user)
+        page = PDFpage.objects.get(pdf_id=self.origin_pdf, page_num=1)
+        figure = PDFfigure.objects.create(
+            pdf_id=self.origin_pdf, page_id=page, figure_type="figure",
+            figure_box={"min_x": 0, "min_y": 0, "max_x": 1, "max_y": 1},
+        )
+        self.box = {"min_x": 10, "min_y": 20, "max_x": 30, "max_y": 40}
+        for raw_text, text_box in (("인공지능 모델", self.box), ("다른 설명", {"min_x": 0})):
+            MatchedText.objects.create(
+                pdf_id=self.origin_pdf, page_id=page, figure_id=figure, page_num=1,
+                raw_text=raw_text, matched_text="", text_box=text_box,
+            )
+        index_document(self.origin_pdf)
+
+    def test_ranking(self):
+        result = search_document(self.origin_pdf, "인공지능")
+        self.assertEqual(result["total"], 2)
+        # tf 가 높은 2 페이지가 먼저
+        self.assertEqual([hit["page_num"] for hit in result["hits"]], [2, 1])
+        self.assertGreater(result["hits"][0]["score"], result["hits"][1]["score"])
+
+    def test_all_query_tokens_must_match(self):
+        result = search_document(self.origin_pdf, "인공지능 연구")
+        self.assertEqual([hit["page_num"] for hit in result["hits"]], [2])
+
+    def test_snippet_and_boxes(self):
+        hit = search_document(self.origin_pdf, "모델")["hits"][0]
+        self.assertEqual(hit["page_num"], 1)
+        self.assertEqual(hit["snippet"], "인공지능 모델 학습")
+        self.assertEqual(hit["match"], [5, 7])
+        # 질의를 포함한 매칭 텍스트의 박스만
+        self.assertEqual(hit["boxes"], [self.box])
+
+    def test_single_hangul_matches_bigram_prefix(self):
+        result = search_document(self.origin_pdf, "학")
+        self.assertEqual([hit["page_num"] for hit in result["hits"]], [1])
+
+    def test_limit(self):
+        result = search_document(self.origin_pdf, "인공지능", limit=1)
+        self.assertEqual((result["total"], len(result["hits"])), (2, 1))
+
+    def test_not_indexed(self):
+        self.assertIsNone(search_document(make_document(self.user, "fresh"), "인공지능"))
+
+
+class LibrarySearchTests(TestCase):
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(email="search-library@example.com")
+        self.first = make_document(self.user, "first")
+        self.second = make_document(self.user, "second", pages=[{"page_num": 1, "text": "인공지능 인공지능 인공지능"}])
+        other = get_user_model().objects.create_user(email="search-library-other@example.com")
+        for origin_pdf in (self.first, self.second, make_document(other, "other")):
+            index_document(origin_pdf)
+
+    def test_groups_by_document_with_bm25(self):
+        result = search_library(self.user, "인공지능")
+        self.assertEqual(result["total_documents"], 2)
+        # 단위 4개(first 3 페이지 + second 1 페이지), 평균 길이 24 / 4 = 6, 세 토큰 모두 df 3 인 손 계산 값
+        self.assertEqual(
+            [(row["pdf_id"], row["score"], row["hit_count"]) for row in result["results"]],
+            [(self.second.id, 1.5187, 1), (self.first.id, 1.4054, 2)],
+        )
+        first_hits = result["results"][1]["hits"]
+        self.assertEqual([(hit["page_num"], hit["score"]) for hit in first_hits], [(2, 1.4054), (1, 1.1483)])
+        self.assertEqual(first_hits[0]["kind"], SearchPosting.KIND_PAGE)
+        self.assertEqual(first_hits[0]["snippet"], "인공지능 인공지능 연구")
+        self.assertEqual(result["results"][1]["title"], "first")
+
+    def test_limits(self):
+        result = search_library(self.user, "인공지능", limit=1, hits_per_document=1)
+        self.assertEqual(result["total_documents"], 2)
+        self.assertEqual([row["pdf_id"] for row in result["results"]], [self.second.id])
+        result = search_library(self.user, "인공지능", hits_per_document=1)
+        self.assertEqual((result["results"][1]["hit_count"], len(result["results"][1]["hits"])), (2, 1))
+
+    def test_soft_deleted_documents_are_excluded(self):
+        soft_delete_documents(originPDF.objects.filter(id=self.second.id))
+        result = search_library(self.user, "인공지능")
+        self.assertEqual([row["pdf_id"] for row in result["results"]], [self.first.id])
+        # 통계에서도 빠진다 (first 의 3 페이지, 길이 15)
+        stats = SearchUserStats.objects.get(user_id=self.user)
+        self.assertEqual((stats.unit_count, stats.total_length), (3, 15))
+        self.assertFalse(SearchIndexStats.objects.filter(pdf_id=self.second).exists())
+
+
+class HighlightIndexTests(TestCase):
+    """하이라이트는 저장/삭제 때마다 그 하이라이트의 색인과 통계만 바뀐다"""
+
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(email="search-highlight@example.com")
+        self.origin_pdf = make_document(self.user)
+        index_document(self.origin_pdf)
+        self.page = PDFpage.objects.get(pdf_id=self.origin_pdf, page_num=3)
+        self.tag = Tag.objects.create(pdf_id=self.origin_pdf, color="yellow", tag_detail="중요")
+
+    def stats(self):
+        document = SearchIndexStats.objects.get(pdf_id=self.origin_pdf)
+        user = SearchUserStats.objects.get(user_id=self.user)
+        return (document.unit_count, document.unit_length), (user.unit_count, user.total_length)
+
+    def highlight(self, text):
+        return Highlight.objects.create(
+            pdf_id=self.origin_pdf, page_id=self.page, Tag_id=self.tag,
+            highlight_text=text, highlight_box={"min_x": 0, "min_y": 0, "max_x": 1, "max_y": 1},
+        )
+
+    def test_create_update_delete(self):
+        self.assertEqual(self.stats(), ((3, 15), (3, 15)))
+
+        highlight = self.highlight("인공지능 정리")
+        # 인공 공지 지능 정리 = 4 토큰
+        self.assertEqual(self.stats(), ((4, 19), (4, 19)))
+        rows = SearchPosting.objects.filter(kind=SearchPosting.KIND_HIGHLIGHT, object_id=highlight.id)
+        self.assertEqual(rows.count(), 4)
+        self.assertEqual(unpack_units(rows.get(term="정리").units), [[highlight.id, self.page.id, 3, 1, 4]])
+        hits = search_library(self.user, "정리")["results"][0]["hits"]
+        self.assertEqual([(hit["kind"], hit["id"], hit["page_num"]) for hit in hits],
+                         [(SearchPosting.KIND_HIGHLIGHT, highlight.id, 3)])
+
+        highlight.highlight_text = "정리"
+        highlight.save()
+        self.assertEqual(self.stats(), ((4, 16), (4, 16)))
+        self.assertEqual(rows.count(), 1)
+
+        highlight.delete()
+        self.assertEqual(self.stats(), ((3, 15), (3, 15)))
+        self.assertFalse(rows.exists())
+        self.assertEqual(search_library(self.user, "정리")["total_documents"], 0)
+
+    def test_reindex_keeps_highlights(self):
+        highlight = self.highlight("인공지능 정리")
+        index_document(self.origin_pdf)
+        self.assertEqual(self.stats(), ((4, 19), (4, 19)))
+        self.assertEqual(
+            SearchPosting.objects.filter(kind=SearchPosting.KIND_HIGHLIGHT, object_id=highlight.id).count(), 4,
+        )
+
+    def test_highlight_on_deleted_document_is_ignored(self):
+        soft_delete_documents(originPDF.objects.filter(id=self.origin_pdf.id))
+        self.highlight("인공지능 정리")
+        self.assertFalse(SearchPosting.objects.filter(kind=SearchPosting.KIND_HIGHLIGHT).exists())
+        stats = SearchUserStats.objects.get(user_id=self.user)
+        self.assertEqual((stats.unit_count, stats.total_length), (0, 0))
+
+
+class SplitChunksTests(TestCase):
+    def test_cuts_at_sentence_boundaries(self):
+        text = "aaaa. bbbb. cccc."
+        self.assertEqual(split_chunks(text, 8, 0), [(0, 6), (6, 12), (12, 17)])
+
+    def test_overlap(self):
+        self.assertEqual(split_chunks("aaaa. bbbb. cccc.", 8, 2), [(0, 6), (4, 12), (10, 17)])
+
+    def test_short_and_blank_text(self):
+        self.assertEqual(split_chunks("short", 600, 100), [(0, 5)])
+        self.assertEqual(split_chunks("   ", 600, 100), [])
+
+
+@override_settings(CHAT_RETRIEVAL_CHUNK_CHARS=600, CHAT_RETRIEVAL_CHUNK_OVERLAP=100)
+class ChunkIndexTests(TestCase):
+    """
+    페이지 하나가 청크 하나인 작은 문서로 BM25 점수를 손으로 계산한 값과 비교한다.
+    청크 길이 2 / 3 / 1 (평균 2), apple / cherry 모두 df 2 → idf = ln(1 + 1.5 / 2.5) = ln 1.6
+    """
+    PAGES = [
+        {"page_num": 1, "text": "apple banana"},
+        {"page_num": 2, "text": "apple apple cherry"},
+        {"page_num": 3, "text": "cherry"},
+    ]
+
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(email="chunk-index@example.com")
+        self.origin_pdf = make_document(self.user, "chunks", pages=self.PAGES)
+        page = PDFpage.objects.get(pdf_id=self.origin_pdf, page_num=1)
+        figure = PDFfigure.objects.create(pdf_id=self.origin_pdf, page_id=page, figure_type="figure", figure_box={})
+        # 같은 설명 문구는 한 번만 청크가 된다
+        for _ in range(2):
+            MatchedText.objects.create(
+                pdf_id=self.origin_pdf, page_id=page, figure_id=figure, page_num=1,
+                raw_text="durian", matched_text="", text_box={},
+            )
+
+    def test_build(self):
+        self.assertEqual(build_chunk_index(self.origin_pdf), 4)
+        index = get_chunk_index(self.origin_pdf)
+        self.assertEqual(index.chunk_count, 4)
+        self.assertEqual(list(index.vocab), ["apple", "banana", "cherry", "durian"])
+        self.assertEqual(index.chunk_len.tolist(), [2, 3, 1, 1])
+        self.assertEqual(index.chunk_page.tolist(), [1, 2, 3, 1])
+        # 같은 built_at 이면 프로세스 LRU 에서 그대로 꺼낸다
+        self.assertIs(get_chunk_index(self.origin_pdf), index)
+
+    def test_scores_match_hand_computed_bm25(self):
+        PDFpage.objects.filter(pdf_id=self.origin_pdf).exclude(page_num__in=(1, 2, 3)).delete()
+        MatchedText.objects.filter(pdf_id=self.origin_pdf).delete()
+        build_chunk_index(self.origin_pdf)
+        index = get_chunk_index(self.origin_pdf)
+
+        # apple: 청크 1 (tf 1, 길이 2) = ln1.6 × 2.2 / (1 + 1.2) = 0.470004
+        #        청크 2 (tf 2, 길이 3) = ln1.6 × 4.4 / (2 + 1.2 × 1.375) = 0.566581
+        expected = [0.470004, 0.566581, 0.0]
+        for actual, value in zip(index.score(["apple"]).tolist(), expected):
+            self.assertAlmostEqual(actual, value, places=5)
+        # cherry: 청크 2 = ln1.6 × 2.2 / (1 + 1.65) = 0.390192, 청크 3 (길이 1) = ln1.6 × 2.2 / (1 + 0.75) = 0.590862
+        expected = [0.470004, 0.566581 + 0.390192, 0.590862]
+        for actual, value in zip(index.score(["apple", "cherry"]).tolist(), expected):
+            self.assertAlmostEqual(actual, value, places=5)
+
+    def test_top_k(self):
+        PDFpage.objects.filter(pdf_id=self.origin_pdf).exclude(page_num__in=(1, 2, 3)).delete()
+        MatchedText.objects.filter(pdf_id=self.origin_pdf).delete()
+        build_chunk_index(self.origin_pdf)
+        index = get_chunk_index(self.origin_pdf)
+        self.assertEqual([chunk_id for chunk_id, _ in index.top_k(["apple", "cherry"], 2)], [1, 2])
+        self.assertEqual([chunk_id for chunk_id, _ in index.top_k(["apple", "cherry"], 10)], [1, 2, 0])
+        # 일치하는 청크가 없으면 빈 목록
+        self.assertEqual(index.top_k(["zebra"], 2), [])
+
+    def test_retrieve_passages(self):
+        build_chunk_index(self.origin_pdf)
+        passages = retrieve_passages(self.origin_pdf, "cherry durian", k=2)
+        self.assertEqual(
+            [(passage["kind"], passage["page_num"], passage["text"]) for passage in passages],
+            [("match", 1, "durian"), ("page", 3, "cherry")],
+        )
+
+    def test_rebuild_reloads_index(self):
+        build_chunk_index(self.origin_pdf)
+        before = get_chunk_index(self.origin_pdf)
+        PDFpage.objects.create(pdf_id=self.origin_pdf, page_num=4, text="elderberry")
+        build_chunk_index(self.origin_pdf)
+        after = get_chunk_index(self.origin_pdf)
+        self.assertIsNot(after, before)
+        self.assertEqual(after.chunk_count, 5)
+
+    def test_without_index(self):
+        self.assertIsNone(get_chunk_index(self.origin_pdf))
+        self.assertEqual(retrieve_passages(self.origin_pdf, "apple"), [])
+
+
+class DocumentSearchViewTests(TestCase):
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(email="search-view@example.com")
+        self.origin_pdf = make_document(self.user)
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.url = reverse("searches:pdf-search", args=[self.origin_pdf.id])
+
+    def test_not_indexed_yet_is_409(self):
+        response = self.client.get(self.url, {"q": "인공지능"})
+        self.assertEqual(response.status_code, 409)
+
+    def test_indexed(self):
+        index_document(self.origin_pdf)
+        response = self.client.get(self.url, {"q": "인공지능"})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["total"], 2)
+
+    def test_missing_query_is_400(self):
+        self.assertEqual(self.client.get(self.url).status_code, 400)
+
+    def test_other_users_document_is_404(self):
+        other = get_user_model().objects.create_user(email="search-other@example.com")
+        url = reverse("searches:pdf-search", args=[make_document(other, "other").id])
+        self.assertEqual(self.client.get(url, {"q": "인공지능"}).status_code, 404)
+
+
+class IndexOnIngestTests(TestCase):
+    """검색 색인은 OCR 결과와 같은 트랜잭션에서 만든다"""
+
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(email="search-ingest@example.com")
+        self.origin_pdf = make_pdf(self.user, "ingest")
+        enqueue_ocr_job(self.origin_pdf)
+        self.job = claim_next_job()
+
+    def execute(self, job):
+        with ingest_transaction(job):
+            return ingest_ocr_result(job.pdf_id, {"pages": PAGES, "figures": [], "matches": []})
+
+    def test_index_is_built_with_ocr_result(self):
+        run_ocr_job(self.job, execute=self.execute)
+        self.assertEqual(self.job.status, OCRJob.STATUS_DONE)
+        self.assertEqual(SearchIndexStats.objects.get(pdf_id=self.origin_pdf).page_count, 3)
+        self.assertEqual(search_document(self.origin_pdf, "인공지능")["total"], 2)
+
+    def test_index_failure_fails_the_job(self):
+        with mock.patch("searches.signals.index_document", side_effect=RuntimeError("index")):
+            run_ocr_job(self.job, execute=self.execute)
+        self.job.refresh_from_db()
+        self.assertEqual(self.job.status, OCRJob.STATUS_FAILED)
+        # OCR 결과도 저장되지 않으므로 색인 없이 done 인 문서가 남지 않는다 (다시 OCR 요청 가능)
+        self.assertFalse(PDFpage.objects.filter(pdf_id=self.origin_pdf).exists())
+        self.assertFalse(SearchIndexStats.objects.filter(pdf_id=self.origin_pdf).exists())
+        self.assertTrue(enqueue_ocr_job(self.origin_pdf)[1])
@@ -0,0 +1,33 @@
+# searches/tokenizer.py
+"""
+검색용 토크나이저.
+
+한국어는 어절에 조사/어미가 붙어 공백 단위로는 부분 검색이 안 되므로
+한글(과 한자/가나) 연속 구간은 글자 2-gram 으로 자른다. ("인공지능" → 인공, 공지, 지능)
+영문/숫자는 소문자 단어 단위로 자른다.
+색인과 질의에 같은 함수를 쓰므로 질의의 모든 토큰이 나온 페이지가 후보가 된다.
+"""
+import re
+import unicodedata
+
+MAX_TERM_LENGTH = 32
+
+_RUN = re.compile(r"[가-힣ㄱ-ㆎ぀-ヿ一-鿿]+|[0-9a-z]+")
+
+
+def normalize(text):
+    # 전각/반각, 호환 자모 등을 통일하고 소문자로
+    return unicodedata.normalize("NFKC", text or "").lower()
+
+
+def tokenize(text):
+    tokens = []
+    for match in _RUN.finditer(normalize(text)):
+        run = match.group()
+        if run.isascii():
+            tokens.append(run[:MAX_TERM_LENGTH])
+        elif len(run) == 1:
+            tokens.append(run)
+        else:
+            tokens.extend(run[i:i + 2] for i in range(len(run) - 1))
+    return tokens
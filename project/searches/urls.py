@@ -0,0 +1,9 @@
+from django.urls import path
+from .views import DocumentSearchView, LibrarySearchView
+
+app_name = "searches"
+
+urlpatterns = [
+    path("pdfs/<int:pdf_id>/search/", DocumentSearchView.as_view(), name="pdf-search"),
+    path("search/", LibrarySearchView.as_view(), name="library-search"),
+]
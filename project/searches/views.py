@@ -0,0 +1,113 @@
+# searches/views.py
+
+from rest_framework.views import APIView
+from rest_framework.response import Response
+from rest_framework.permissions import IsAuthenticated
+from rest_framework import status
+
+from django.conf import settings
+
+from pdf_documents.models import originPDF
+from .query import search_document, search_library
+
+from drf_yasg.utils import swagger_auto_schema
+from drf_yasg import openapi
+
+
+def parse_search_params(request):
+    """(q, limit, 오류 Response) — 오류가 없으면 세 번째 값은 None"""
+    query = request.query_params.get("q", "").strip()
+    if not query:
+        return None, None, Response({"detail": "검색어(q)를 입력하세요."}, status=status.HTTP_400_BAD_REQUEST)
+    try:
+        limit = int(request.query_params.get("limit", settings.SEARCH_RESULT_LIMIT))
+    except ValueError:
+        return None, None, Response({"detail": "limit 은 정수여야 합니다."}, status=status.HTTP_400_BAD_REQUEST)
+    return query, max(1, min(limit, settings.SEARCH_RESULT_MAX_LIMIT)), None
+
+
+class DocumentSearchView(APIView):
+    """
+    특정 originPDF(pdf_id) 안에서 페이지 본문 검색 (OCR 완료 시 만든 색인 사용, searches/query.py)
+    """
+    permission_classes = [IsAuthenticated]
+
+    @swagger_auto_schema(
+        operation_summary="PDF 문서 안 검색",
+        operation_description=(
+            "지정한 PDF의 페이지 본문에서 `q`를 검색해 관련도(BM25) 순으로 페이지를 반환합니다.\n"
+            "- 한국어는 글자 2-gram 단위로 색인하므로 조사가 붙은 어절 안의 단어도 찾습니다.\n"
+            "- `hits[].snippet`: 일치 구간 주변 본문, `hits[].match`: snippet 안의 [시작, 끝] 위치\n"
+            "- `hits[].boxes`: 같은 페이지에서 질의를 포함한 OCR 매칭 텍스트의 박스 좌표\n"
+            "- OCR이 끝나기 전에는 색인이 없어 409를 반환합니다.\n"
+            "- 인증: Authorization: Bearer <access_token>"
+        ),
+        tags=["Search"],
+        manual_parameters=[
+            openapi.Parameter("q", openapi.IN_QUERY, type=openapi.TYPE_STRING, required=True,
+                              description="검색어"),
+            openapi.Parameter("limit", openapi.IN_QUERY, type=openapi.TYPE_INTEGER,
+                              description="반환할 최대 페이지 수 (기본 20, 최대 100)"),
+        ],
+        responses={200: "검색 결과", 400: "검색어 없음", 404: "해당 PDF 없음", 409: "검색 색인 없음"},
+    )
+    def get(self, request, pdf_id, *args, **kwargs):
+        # 1) 파라미터 확인
+        query, limit, error = parse_search_params(request)
+        if error:
+            return error
+
+        # 2) originPDF 조회
+        try:
+            origin_pdf = originPDF.objects.get(id=pdf_id, user_id=request.user)
+        except originPDF.DoesNotExist:
+            return Response(
+                {"detail": "해당 PDF를 찾을 수 없습니다."},
+                status=status.HTTP_404_NOT_FOUND
+            )
+
+        # 3) 검색
+        result = search_document(origin_pdf, query, limit=limit)
+        if result is None:
+            return Response(
+                {"detail": "검색 색인이 아직 없습니다. OCR이 끝난 뒤 다시 시도하세요."},
+                status=status.HTTP_409_CONFLICT
+            )
+
+        return Response({"query": query, **result}, status=status.HTTP_200_OK)
+
+
+class LibrarySearchView(APIView):
+    """
+    로그인한 사용자의 모든 문서(페이지 본문 / OCR 매칭 텍스트 / 하이라이트)에서 검색 (searches/query.py)
+    """
+    permission_classes = [IsAuthenticated]
+
+    @swagger_auto_schema(
+        operation_summary="내 서재 전체 검색",
+        operation_description=(
+            "내 모든 PDF의 페이지 본문, OCR 매칭 텍스트, 하이라이트에서 `q`를 검색해 "
+            "관련도(BM25) 순으로 문서별로 묶어 반환합니다.\n"
+            "- `results[].score`: 문서에서 가장 관련도가 높은 항목의 점수, `results[].hit_count`: 일치한 항목 수\n"
+            "- `results[].hits[]`: 문서별 상위 항목 (`kind`: page / match / highlight, `id`: 해당 행 id)\n"
+            "- 일치하는 색인 항목만 읽으므로 문서 수가 많아도 응답 시간은 일치 항목 수에 비례합니다.\n"
+            "- 인증: Authorization: Bearer <access_token>"
+        ),
+        tags=["Search"],
+        manual_parameters=[
+            openapi.Parameter("q", openapi.IN_QUERY, type=openapi.TYPE_STRING, required=True,
+                              description="검색어"),
+            openapi.Parameter("limit", openapi.IN_QUERY, type=openapi.TYPE_INTEGER,
+                              description="반환할 최대 문서 수 (기본 20, 최대 100)"),
+        ],
+        responses={200: "검색 결과", 400: "검색어 없음"},
+    )
+    def get(self, request, *args, **kwargs):
+        query, limit, error = parse_search_params(request)
+        if error:
+            return error
+
+        result = search_library(
+            request.user, query, limit=limit, hits_per_document=settings.SEARCH_HITS_PER_DOCUMENT,
+        )
+        return Response({"query": query, **result}, status=status.HTTP_200_OK)